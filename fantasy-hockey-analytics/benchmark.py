@@ -0,0 +1,533 @@
+"""
+Benchmark suite for Fantasy Hockey Analytics.
+
+Generates seeded synthetic leagues at several scales, times the main pipeline
+stages and writes machine-readable results (JSON). Exits non-zero when a stage
+is slower than the stored baseline by more than the allowed tolerance.
+
+Usage:
+    python benchmark.py                              # default scales
+    python benchmark.py --scales small medium        # pick scales
+    python benchmark.py --stages analyze_team        # pick stages
+    python benchmark.py --save-baseline              # store results as the new baseline
+    python benchmark.py --scales small --stages migrate_v1   # 1M-row v1 -> v2 migration
+    python benchmark.py --scales large --layouts rows wide   # compare storage layouts
+
+No Yahoo API access required.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.synthetic import (
+    generate_leagues,
+    generate_season_data,
+    generate_player_weeks,
+    generate_free_agents,
+    write_v1_database
+)
+from src.migrations import migrate, LATEST_VERSION
+from src.database import (
+    init_db,
+    save_season_data,
+    save_player_weeks,
+    get_all_teams,
+    get_all_category_outcomes,
+    set_storage_layout,
+    STORAGE_LAYOUTS,
+    LAYOUT_ROWS
+)
+from src.analytics import calculate_all_thresholds
+from src.team_analysis import analyze_team
+from src.snapshot import write_snapshot
+from src.bootstrap import calculate_threshold_intervals
+from src.schedule import calculate_sos_ratings
+from src.covariance import get_covariance_model
+from src.punt import analyze_punts
+from src.impact import calculate_category_impacts
+from src.live import fit_live_model
+from src.recommend import load_player_pool, recommend_players
+from src.lineup import optimize_lineup
+from src.trade import TradeSimulator
+from src.reports import write_league_reports
+from src.dashboard import build_dashboard
+from src.batch import run_batch
+from src.constants import ALL_CATEGORIES
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+DEFAULT_OUTPUT = "benchmark_results.json"
+DEFAULT_BASELINE = "benchmark_baseline.json"
+
+# teams x weeks x seasons x leagues
+SCALES = {
+    'small': {'teams': 10, 'weeks': 10, 'seasons': 1, 'leagues': 1},
+    'medium': {'teams': 12, 'weeks': 22, 'seasons': 3, 'leagues': 4},
+    'large': {'teams': 14, 'weeks': 25, 'seasons': 5, 'leagues': 10},
+}
+
+DEFAULT_SCALES = ['small', 'medium']
+
+# category_outcomes rows in the legacy database for the migrate_v1 stage
+DEFAULT_MIGRATION_ROWS = 1_000_000
+
+
+class Workspace:
+    """Synthetic data for one scale, one database per league-season."""
+
+    def __init__(self, root: str, scale: str, seed: int,
+                 migration_rows: int = DEFAULT_MIGRATION_ROWS, layout: str = LAYOUT_ROWS):
+        self.scale = scale
+        self.seed = seed
+        self.layout = layout
+        self.root = os.path.join(root, scale, layout)
+        self.migration_rows = migration_rows
+        self.legacy_template = None
+        self.params = SCALES[scale]
+        self.seasons = generate_leagues(
+            num_leagues=self.params['leagues'],
+            num_seasons=self.params['seasons'],
+            num_teams=self.params['teams'],
+            num_weeks=self.params['weeks'],
+            seed=seed
+        )
+        self.db_paths = []
+        for season_data in self.seasons:
+            league_dir = os.path.join(self.root, f"league_{season_data.league_id}_{season_data.season}")
+            os.makedirs(league_dir, exist_ok=True)
+            self.db_paths.append(os.path.join(league_dir, "fantasy_hockey.db"))
+
+    def populate(self):
+        """(Re)create every database from scratch."""
+        for season_data, db_path in zip(self.seasons, self.db_paths):
+            if os.path.exists(db_path):
+                os.remove(db_path)
+            init_db(db_path)
+            set_storage_layout(self.layout, db_path)
+            save_season_data(season_data, db_path)
+
+    def database_bytes(self) -> int:
+        return sum(os.path.getsize(db_path) for db_path in self.db_paths)
+
+    def build_legacy_template(self) -> str:
+        """Write a v1 database with about migration_rows category_outcomes rows (once)."""
+        if self.legacy_template is None:
+            params = self.params
+            rows_per_season = (params['teams'] // 2) * params['weeks'] * 11
+            num_seasons = max(1, -(-self.migration_rows // rows_per_season))
+            seasons = [
+                generate_season_data(num_teams=params['teams'], num_weeks=params['weeks'],
+                                     seed=self.seed * 1000 + i)
+                for i in range(num_seasons)
+            ]
+            self.legacy_template = os.path.join(self.root, "legacy_v1_template.db")
+            self.legacy_rows = write_v1_database(seasons, self.legacy_template)
+        return self.legacy_template
+
+
+# Stage functions: take a populated Workspace, return the number of items processed.
+
+def stage_save_season_data(ws: Workspace) -> int:
+    ws.populate()
+    return sum(len(s.matchups) for s in ws.seasons)
+
+
+def stage_calculate_all_thresholds(ws: Workspace) -> int:
+    for db_path in ws.db_paths:
+        calculate_all_thresholds(db_path)
+    return len(ws.db_paths)
+
+
+def stage_threshold_intervals(ws: Workspace) -> int:
+    """Bootstrap intervals computed from scratch (cache bypassed)."""
+    for db_path in ws.db_paths:
+        calculate_threshold_intervals(db_path, use_cache=False)
+    return len(ws.db_paths)
+
+
+def stage_sos_ratings(ws: Workspace) -> int:
+    """Strength-of-schedule fit for every team (cache bypassed, as after a fetch)."""
+    count = 0
+    for db_path in ws.db_paths:
+        count += len(calculate_sos_ratings(db_path, use_cache=False))
+    return count
+
+
+def stage_covariance_model(ws: Workspace) -> int:
+    """League and per-team category covariance fit (cache bypassed)."""
+    for db_path in ws.db_paths:
+        get_covariance_model(db_path, use_cache=False)
+    return len(ws.db_paths)
+
+
+def stage_full_scan(ws: Workspace) -> int:
+    """Read every stored category value (the analysis read path)."""
+    count = 0
+    for db_path in ws.db_paths:
+        for category in ALL_CATEGORIES:
+            count += len(get_all_category_outcomes(category, complete_only=False, db_path=db_path))
+    return count
+
+
+def stage_analyze_team(ws: Workspace) -> int:
+    count = 0
+    for db_path in ws.db_paths:
+        for team in get_all_teams(db_path):
+            analyze_team(team['team_id'], db_path)
+            count += 1
+    return count
+
+
+def stage_punt_analysis(ws: Workspace) -> int:
+    """Score all 2048 punt subsets for every team."""
+    count = 0
+    for db_path in ws.db_paths:
+        for team in get_all_teams(db_path):
+            analyze_punts(team['team_id'], db_path)
+            count += 1
+    return count
+
+
+def stage_category_impacts(ws: Workspace) -> int:
+    """Marginal category value for every team (one batch per database)."""
+    count = 0
+    for db_path in ws.db_paths:
+        count += len(calculate_category_impacts(db_path))
+    return count
+
+
+def stage_live_odds(ws: Workspace) -> int:
+    """Live odds for the last week's matchups as if 3 days were left (one poll per database)."""
+    count = 0
+    for season_data, db_path in zip(ws.seasons, ws.db_paths):
+        last_week = max(m.week for m in season_data.matchups)
+        matchups = [m for m in season_data.matchups if m.week == last_week]
+        count += len(fit_live_model(db_path).evaluate_matchups(matchups, 3 / 7))
+    return count
+
+
+def prepare_player_pool(ws: Workspace):
+    """Rosters plus a 2000-player free-agent pool in the first database (not timed)."""
+    db_path = ws.db_paths[0]
+    if len(load_player_pool(db_path)) == 0:
+        season_data = ws.seasons[0]
+        save_player_weeks(generate_player_weeks(season_data, ws.seed)
+                          + generate_free_agents(season_data, 2000, ws.seed), db_path)
+
+
+def stage_recommend(ws: Workspace) -> int:
+    """Top-10 free agents for every team of the first database (one pool load)."""
+    db_path = ws.db_paths[0]
+    pool = load_player_pool(db_path)
+    teams = get_all_teams(db_path)
+    for team in teams:
+        recommend_players(team['team_id'], db_path, pool=pool)
+    return len(teams)
+
+
+def stage_lineup(ws: Workspace) -> int:
+    """Optimal lineup for every team of the first database."""
+    db_path = ws.db_paths[0]
+    teams = get_all_teams(db_path)
+    for team in teams:
+        optimize_lineup(team['team_id'], db_path)
+    return len(teams)
+
+
+def stage_trade(ws: Workspace) -> int:
+    """Ten one-for-one trades between the first two teams of the first database (one simulator)."""
+    db_path = ws.db_paths[0]
+    simulator = TradeSimulator(db_path)
+    team1, team2 = simulator.team_ids[:2]
+    pairs = list(zip(simulator.rosters[team1], simulator.rosters[team2]))[:10]
+    for give, get in pairs:
+        simulator.evaluate_trade(team1, [give], team2, [get])
+    return len(pairs)
+
+
+def stage_reports(ws: Workspace) -> int:
+    """HTML threshold report plus every team's analysis for each database."""
+    count = 0
+    for i, db_path in enumerate(ws.db_paths):
+        count += len(write_league_reports(os.path.join(ws.root, "reports", str(i)), db_path, fmt='html'))
+    return count
+
+
+def stage_dashboard(ws: Workspace) -> int:
+    """Full dashboard build for each database (force, so every run does the work)."""
+    count = 0
+    for i, db_path in enumerate(ws.db_paths):
+        count += len(build_dashboard(os.path.join(ws.root, "dashboard", str(i)), db_path, force=True).written)
+    return count
+
+
+def stage_batch(ws: Workspace) -> int:
+    """Thresholds, intervals and every team for all databases on a process pool."""
+    return run_batch(ws.db_paths, io.StringIO()).succeeded
+
+
+def stage_write_snapshot(ws: Workspace) -> int:
+    for db_path in ws.db_paths:
+        write_snapshot(db_path)
+    return len(ws.db_paths)
+
+
+def prepare_snapshots(ws: Workspace):
+    """Make sure every database has a current snapshot (not timed)."""
+    stage_write_snapshot(ws)
+
+
+def stage_analyze_team_snapshot(ws: Workspace) -> int:
+    """analyze_team for every team, reading the memory-mapped snapshots."""
+    return stage_analyze_team(ws)
+
+
+def _run_cli(ws: Workspace, *cli_args) -> int:
+    """Run main.py as a subprocess against the first league-season database."""
+    result = subprocess.run(
+        [sys.executable, MAIN_SCRIPT, *cli_args],
+        cwd=os.path.dirname(ws.db_paths[0]),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"'main.py {' '.join(cli_args)}' failed: {result.stderr.strip()}")
+    return 1
+
+
+def stage_cli_status(ws: Workspace) -> int:
+    return _run_cli(ws, 'status')
+
+
+def stage_cli_analyze(ws: Workspace) -> int:
+    return _run_cli(ws, 'analyze')
+
+
+def stage_cli_team(ws: Workspace) -> int:
+    return _run_cli(ws, 'team', '--id', '1')
+
+
+def prepare_migrate_v1(ws: Workspace):
+    """Fresh copy of the legacy v1 database (not timed)."""
+    ws.legacy_db = os.path.join(ws.root, "legacy_v1.db")
+    shutil.copyfile(ws.build_legacy_template(), ws.legacy_db)
+
+
+def stage_migrate_v1(ws: Workspace) -> int:
+    if not migrate(ws.legacy_db, LATEST_VERSION):
+        raise RuntimeError("v1 -> v2 migration did not finish")
+    return ws.legacy_rows
+
+
+# Run in this order: save_season_data runs first and leaves the databases
+# populated; snapshot stages run after the SQLite-only stages
+STAGES = {
+    'save_season_data': stage_save_season_data,
+    'calculate_all_thresholds': stage_calculate_all_thresholds,
+    'threshold_intervals': stage_threshold_intervals,
+    'sos_ratings': stage_sos_ratings,
+    'covariance_model': stage_covariance_model,
+    'full_scan': stage_full_scan,
+    'analyze_team': stage_analyze_team,
+    'punt_analysis': stage_punt_analysis,
+    'category_impacts': stage_category_impacts,
+    'live_odds': stage_live_odds,
+    'recommend': stage_recommend,
+    'lineup': stage_lineup,
+    'trade': stage_trade,
+    'reports': stage_reports,
+    'dashboard': stage_dashboard,
+    'batch': stage_batch,
+    'cli_status': stage_cli_status,
+    'cli_analyze': stage_cli_analyze,
+    'cli_team': stage_cli_team,
+    'write_snapshot': stage_write_snapshot,
+    'analyze_team_snapshot': stage_analyze_team_snapshot,
+    'migrate_v1': stage_migrate_v1,
+}
+
+# Untimed setup run before every timed run of a stage
+PREPARE = {
+    'analyze_team_snapshot': prepare_snapshots,
+    'recommend': prepare_player_pool,
+    'lineup': prepare_player_pool,
+    'trade': prepare_player_pool,
+    'migrate_v1': prepare_migrate_v1,
+}
+
+# Slow, opt-in stages (select with --stages)
+OPTIONAL_STAGES = {'migrate_v1'}
+DEFAULT_STAGES = [stage for stage in STAGES if stage not in OPTIONAL_STAGES]
+
+
+def time_stage(func, ws: Workspace, repeat: int, prepare=None) -> dict:
+    """Best-of-N wall clock time for a stage."""
+    timings = []
+    items = 0
+    for _ in range(repeat):
+        if prepare:
+            prepare(ws)
+        start = time.perf_counter()
+        items = func(ws)
+        timings.append(time.perf_counter() - start)
+    return {'seconds': min(timings), 'items': items, 'runs': timings}
+
+
+def run_benchmarks(scales, stages, repeat: int, seed: int, workdir: str,
+                   migration_rows: int = DEFAULT_MIGRATION_ROWS, layouts=(LAYOUT_ROWS,)) -> list:
+    """Run the selected stages at each scale and storage layout. Returns a list of result dicts."""
+    results = []
+
+    for scale in scales:
+        params = SCALES[scale]
+        for layout in layouts:
+            print(f"\n=== Scale: {scale} "
+                  f"({params['teams']} teams x {params['weeks']} weeks x "
+                  f"{params['seasons']} seasons x {params['leagues']} leagues), layout: {layout} ===")
+
+            ws = Workspace(workdir, scale, seed, migration_rows, layout)
+            ws.populate()
+            db_bytes = ws.database_bytes()
+            print(f"  {'database size':<28} {db_bytes / 1024:>10.1f} KB")
+
+            for stage in [s for s in STAGES if s in stages]:
+                timing = time_stage(STAGES[stage], ws, repeat, PREPARE.get(stage))
+                results.append({
+                    'scale': scale,
+                    'layout': layout,
+                    'stage': stage,
+                    'seconds': timing['seconds'],
+                    'items': timing['items'],
+                    'runs': timing['runs'],
+                    'db_bytes': db_bytes,
+                })
+                print(f"  {stage:<28} {timing['seconds'] * 1000:>10.1f} ms  ({timing['items']} items)")
+
+    return results
+
+
+def compare_to_baseline(results: list, baseline: dict, tolerance: float,
+                        min_delta: float) -> list:
+    """Return a list of regression dicts for stages slower than baseline."""
+    baseline_times = {
+        (r['scale'], r.get('layout', LAYOUT_ROWS), r['stage']): r['seconds']
+        for r in baseline.get('results', [])
+    }
+    regressions = []
+
+    for r in results:
+        key = (r['scale'], r.get('layout', LAYOUT_ROWS), r['stage'])
+        if key not in baseline_times:
+            continue
+        base = baseline_times[key]
+        limit = base * (1 + tolerance)
+        # Ignore sub-millisecond noise on very fast stages
+        if r['seconds'] > limit and r['seconds'] - base > min_delta:
+            regressions.append({
+                'scale': r['scale'],
+                'layout': r.get('layout', LAYOUT_ROWS),
+                'stage': r['stage'],
+                'baseline_seconds': base,
+                'seconds': r['seconds'],
+                'slowdown': r['seconds'] / base if base > 0 else float('inf'),
+            })
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fantasy Hockey Analytics benchmark suite")
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=DEFAULT_SCALES,
+                        help='Data scales to run')
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=DEFAULT_STAGES,
+                        help='Stages to run (migrate_v1 only runs when selected)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per stage (best time is kept)')
+    parser.add_argument('--seed', type=int, default=42, help='Synthetic data seed')
+    parser.add_argument('--layouts', nargs='+', choices=STORAGE_LAYOUTS, default=[LAYOUT_ROWS],
+                        help='Storage layouts to compare')
+    parser.add_argument('--migration-rows', type=int, default=DEFAULT_MIGRATION_ROWS,
+                        help='category_outcomes rows in the legacy database for migrate_v1')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='Where to write JSON results')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed slowdown vs baseline before failing (0.25 = 25%%)')
+    parser.add_argument('--min-delta', type=float, default=0.005,
+                        help='Ignore regressions smaller than this many seconds')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Write these results to the baseline file')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated databases')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="fantasy_bench_")
+    print("=" * 70)
+    print("FANTASY HOCKEY ANALYTICS BENCHMARKS")
+    print("=" * 70)
+    print(f"Workspace: {workdir}")
+
+    try:
+        results = run_benchmarks(args.scales, args.stages, args.repeat, args.seed, workdir,
+                                  args.migration_rows, args.layouts)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'migration_rows': args.migration_rows,
+            'layouts': args.layouts,
+            'scales': {scale: SCALES[scale] for scale in args.scales},
+        },
+        'results': results,
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Results written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline} - run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+
+    regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta)
+    if regressions:
+        print("\n" + "=" * 70)
+        print(f"❌ {len(regressions)} STAGE(S) REGRESSED (tolerance {args.tolerance:.0%})")
+        print("=" * 70)
+        for r in regressions:
+            print(f"  {r['scale']:<8} {r['layout']:<5} {r['stage']:<28} "
+                  f"{r['baseline_seconds'] * 1000:.1f} ms -> {r['seconds'] * 1000:.1f} ms "
+                  f"({r['slowdown']:.2f}x)")
+        return 1
+
+    print(f"\n✅ No regressions vs {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
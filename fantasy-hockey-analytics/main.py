@@ -1,5 +1,7 @@
+import os
 import logging
 import sys
+import time
 import argparse
 from src.auth import get_yahoo_query
 from src.data_fetcher import DataFetcher
@@ -9,19 +11,72 @@ from src.display import (
     print_data_status, 
     print_fetch_summary,
     print_team_list,
-    print_team_analysis
+    print_team_analysis,
+    print_threshold_series,
+    print_compaction_report,
+    print_sos_table,
+    print_punt_analysis,
+    format_live_week,
+    LiveTable,
+    print_live_odds,
+    print_recommendations,
+    print_lineup,
+    print_trade
 )
 from src.database import (
     init_db, 
     save_season_data, 
     get_weeks_stored,
     get_all_teams,
+    get_team_by_id,
     team_exists,
-    drop_all_tables
+    save_player_weeks,
+    get_complete_player_weeks,
+    drop_all_tables,
+    get_schema_version,
+    compact_database,
+    get_storage_layout,
+    set_storage_layout,
+    STORAGE_LAYOUTS,
+    SCHEMA_VERSION
 )
-from src.analytics import calculate_all_thresholds, get_analysis_summary
-from src.team_analysis import analyze_team
-from src.config import get_my_team_id, is_my_team_configured
+from src.migrations import migrate, DEFAULT_BATCH_SIZE
+from src.analytics import (
+    calculate_all_thresholds,
+    calculate_cross_league_thresholds,
+    get_analysis_summary,
+    get_cross_league_summary
+)
+from src.sketches import rank_error
+from src.rolling import (
+    calculate_rolling_thresholds,
+    calculate_all_threshold_series,
+    describe_threshold_mode
+)
+from src.bootstrap import calculate_threshold_intervals, DEFAULT_RESAMPLES
+from src.team_analysis import analyze_team, PRIORITY_MODES
+from src.scenarios import apply_scenario, parse_scenario
+from src.schedule import calculate_sos_ratings
+from src.punt import analyze_punts, DEFAULT_MAX_PUNTS, DEFAULT_TOP
+from src.snapshot import write_snapshot, load_snapshot, remove_snapshot
+from src.watch import MatchupWatcher, watch, DEFAULT_INTERVAL
+from src.live import calculate_live_odds, fit_live_model, default_days_left, DAYS_PER_WEEK
+from src.recommend import recommend_players, RECENT_WEEKS, DEFAULT_TOP_K
+from src.lineup import optimize_lineup
+from src.reports import (
+    write_report,
+    write_league_reports,
+    threshold_report,
+    team_analysis_report,
+    FORMATS,
+    DEFAULT_REPORT_WORKERS
+)
+from src.dashboard import build_dashboard
+from src.server import create_server, DEFAULT_HOST, DEFAULT_PORT
+from src.batch import run_batch
+from src.trade import TradeSimulator, DEFAULT_SIMULATIONS, DEFAULT_SEASON_WEEKS, DEFAULT_PLAYOFF_TEAMS
+from src.config import get_my_team_id, is_my_team_configured, get_dashboard_dir
+from src.constants import ALL_CATEGORIES, ROSTER_SLOTS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,10 +87,11 @@ logging.basicConfig(level=logging.INFO)
 
 LEAGUE_ID = "16597"
 SEASON_YEAR = 2025
+DEFAULT_DASHBOARD_DIR = "dashboard"
 
 
-def fetch_data():
-    """Fetch latest data from Yahoo and persist to database."""
+def fetch_data(players: bool = True):
+    """Fetch latest data from Yahoo and persist to database (player stats too unless players=False)."""
     print("=" * 60)
     print("Fetching Data from Yahoo Fantasy API")
     print("=" * 60)
@@ -62,9 +118,43 @@ def fetch_data():
         # 6. Save to database
         save_season_data(season_data)
         
-        # 7. Display summary
+        # 7. Player rosters and weekly stats (weeks already stored complete are skipped)
+        player_rows = 0
+        if players:
+            stored_complete = set(get_complete_player_weeks())
+            week_complete = {}
+            for matchup in season_data.matchups:
+                week_complete[matchup.week] = week_complete.get(matchup.week, True) and matchup.is_complete
+            weeks = sorted(week for week in week_complete if week not in stored_complete)
+            team_ids = sorted({t.team_id for m in season_data.matchups for t in (m.team1, m.team2)})
+            print(f"Fetching player stats for {len(team_ids)} teams, {len(weeks)} week(s)...")
+            player_weeks = fetcher.fetch_player_weeks(team_ids, weeks)
+            # Free agents only for the weeks recommendations project from,
+            # even if those weeks' rosters are already stored complete
+            recent_weeks = sorted(week_complete)[-RECENT_WEEKS:]
+            print(f"Fetching free agents for {len(recent_weeks)} week(s)...")
+            player_weeks += fetcher.fetch_free_agents(recent_weeks)
+            save_player_weeks(player_weeks, complete_weeks=week_complete)
+            player_rows = len(player_weeks)
+        
+        # 8. Binary snapshot for fast analysis startup
+        snapshot_file = write_snapshot()
+        
+        # 9. Refit strength-of-schedule ratings for the new data
+        calculate_sos_ratings()
+        
+        # 10. Static dashboard: only pages whose weeks or teams changed
+        dashboard = build_dashboard(get_dashboard_dir()) if get_dashboard_dir() else None
+        
+        # 11. Display summary
         print_fetch_summary(season_data)
         print(f"\n✓ Data persisted to fantasy_hockey.db")
+        if players:
+            print(f"✓ {player_rows} player-week stat lines stored")
+        print(f"✓ Snapshot written to {snapshot_file}")
+        if dashboard:
+            print(f"✓ Dashboard: {len(dashboard.written)} pages rebuilt, "
+                  f"{len(dashboard.unchanged)} unchanged ({dashboard.output_dir})")
         
         return True
         
@@ -74,6 +164,154 @@ def fetch_data():
         return False
 
 
+def watch_command(args):
+    """Poll the in-progress week and redraw matchups as their stats change."""
+    watcher = None
+    try:
+        # One authenticated query and one connection for every poll
+        query = get_yahoo_query(LEAGUE_ID)
+        fetcher = DataFetcher(query, LEAGUE_ID)
+        week = args.week or fetcher.get_current_week()
+        
+        init_db()
+        watcher = MatchupWatcher(fetcher, week)
+        table = LiveTable()
+        last_change = "-"
+        odds_model = fit_live_model()  # None until a week has completed
+        
+        print(f"Watching week {week} every {args.interval:g}s (Ctrl-C to stop)\n")
+        
+        def show(result):
+            nonlocal last_change
+            if result.changed:
+                last_change = time.strftime("%H:%M:%S")
+            odds = None
+            if odds_model is not None:
+                odds = odds_model.evaluate_matchups(result.matchups, default_days_left() / DAYS_PER_WEEK)
+            table.render(format_live_week(result.week, result.matchups, last_change, odds))
+        
+        result = watch(watcher, args.interval, on_poll=show)
+        if result.week_complete:
+            # The week now counts in the analytics: refresh derived data like fetch does
+            snapshot_file = write_snapshot()
+            calculate_sos_ratings()
+            print(f"\n✓ Week {week} is complete and saved")
+            print(f"✓ Snapshot written to {snapshot_file}")
+            if get_dashboard_dir():
+                dashboard = build_dashboard(get_dashboard_dir())
+                print(f"✓ Dashboard: {len(dashboard.written)} pages rebuilt")
+        return True
+        
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+        return True
+        
+    except Exception as e:
+        print(f"\nError while watching: {e}")
+        logging.exception("Detailed Traceback:")
+        return False
+    
+    finally:
+        if watcher is not None:
+            watcher.close()
+
+
+def live_command(args):
+    """Show live win probabilities for the stored in-progress week."""
+    try:
+        init_db()
+        days_left = default_days_left() if args.days_left is None else args.days_left
+        odds = calculate_live_odds(days_left=days_left, week=args.week)
+        print_live_odds(odds, get_all_teams(), days_left)
+        return True
+        
+    except Exception as e:
+        print(f"\nError calculating live odds: {e}")
+        logging.exception("Detailed Traceback:")
+        return False
+
+
+def recommend_command(args):
+    """Rank available players by the matchup impact they would add to a team."""
+    try:
+        init_db()
+        
+        team_id = args.id or get_my_team_id()
+        if team_id == 0:
+            print("\nNo team specified. Set MY_TEAM_ID in .env or use --id <team_id>.")
+            print("Run 'python main.py team --list' to see available teams.")
+            return False
+        
+        if not team_exists(team_id):
+            print(f"\nTeam ID {team_id} not found.")
+            print("Run 'python main.py team --list' to see available teams.")
+            return False
+        
+        result = recommend_players(team_id, k=args.top, position=args.position, focus=args.focus)
+        print_recommendations(result, args.position)
+        return True
+        
+    except Exception as e:
+        print(f"\nError building recommendations: {e}")
+        logging.exception("Detailed Traceback:")
+        return False
+
+
+def lineup_command(args):
+    """Show the starters that maximize expected category wins this week."""
+    try:
+        init_db()
+        
+        team_id = args.id or get_my_team_id()
+        if team_id == 0:
+            print("\nNo team specified. Set MY_TEAM_ID in .env or use --id <team_id>.")
+            print("Run 'python main.py team --list' to see available teams.")
+            return False
+        
+        if not team_exists(team_id):
+            print(f"\nTeam ID {team_id} not found.")
+            print("Run 'python main.py team --list' to see available teams.")
+            return False
+        
+        print_lineup(optimize_lineup(team_id, week=args.week))
+        return True
+        
+    except Exception as e:
+        print(f"\nError optimizing lineup: {e}")
+        logging.exception("Detailed Traceback:")
+        return False
+
+
+def trade_command(args):
+    """Evaluate one or more candidate trades between two teams."""
+    try:
+        init_db()
+        
+        team_id = args.id or get_my_team_id()
+        if team_id == 0:
+            print("\nNo team specified. Set MY_TEAM_ID in .env or use --id <team_id>.")
+            print("Run 'python main.py team --list' to see available teams.")
+            return False
+        
+        for check_id in (team_id, args.partner):
+            if not team_exists(check_id):
+                print(f"\nTeam ID {check_id} not found.")
+                print("Run 'python main.py team --list' to see available teams.")
+                return False
+        
+        # One simulator for the batch: unchanged teams are simulated once
+        simulator = TradeSimulator(simulations=args.simulations, season_weeks=args.season_weeks,
+                                   playoff_teams=args.playoff_teams)
+        for give, get in zip(args.give, args.get):
+            print_trade(simulator.evaluate_trade(team_id, give, args.partner, get))
+        return True
+        
+    except Exception as e:
+        print(f"\nError evaluating trade: {e}")
+        logging.exception("Detailed Traceback:")
+        return False
+
+
 def show_status():
     """Show database status - which weeks are stored and their completion status."""
     print("=" * 60)
@@ -84,6 +322,9 @@ def show_status():
         init_db()  # Ensure DB exists
         weeks = get_weeks_stored()
         print_data_status(weeks)
+        if weeks:
+            snapshot_state = "current" if load_snapshot() else "missing or stale (run fetch to rebuild)"
+            print(f"Analysis snapshot: {snapshot_state}")
         return True
         
     except Exception as e:
@@ -92,7 +333,9 @@ def show_status():
         return False
 
 
-def analyze_data():
+def analyze_data(use_sketch: bool = False, merge_paths=None,
+                 window=None, decay=None, series: bool = False,
+                 confidence: bool = True, resamples: int = DEFAULT_RESAMPLES):
     """Run threshold analysis on stored complete weeks."""
     print("=" * 60)
     print("Running Threshold Analysis")
@@ -101,14 +344,45 @@ def analyze_data():
     try:
         init_db()  # Ensure DB exists
         
-        # Get analysis summary
-        summary = get_analysis_summary()
+        if merge_paths:
+            # Cross-league thresholds from merged sketches
+            db_paths = ["fantasy_hockey.db"] + list(merge_paths)
+            missing = [path for path in merge_paths if not os.path.exists(path)]
+            if missing:
+                print(f"Database not found: {', '.join(missing)}")
+                return False
+            summary = get_cross_league_summary(db_paths)
+            thresholds = calculate_cross_league_thresholds(db_paths)
+            print(f"Merged sketches from {len(db_paths)} league databases")
+        else:
+            # Get analysis summary
+            summary = get_analysis_summary()
+            
+            # Calculate thresholds for all categories
+            if window is not None or decay is not None:
+                thresholds = calculate_rolling_thresholds(window, decay)
+                summary['threshold_mode'] = describe_threshold_mode(window, decay)
+            else:
+                thresholds = calculate_all_thresholds(use_sketch=use_sketch)
         
-        # Calculate thresholds for all categories
-        thresholds = calculate_all_thresholds()
+        # Bootstrap intervals for exact full-season thresholds
+        intervals = None
+        exact_full_season = not (use_sketch or merge_paths or window is not None or decay is not None)
+        if confidence and exact_full_season:
+            intervals = calculate_threshold_intervals(resamples=resamples)
         
         # Display the report
-        print_threshold_report(thresholds, summary)
+        print_threshold_report(thresholds, summary, intervals)
+        
+        if use_sketch or merge_paths:
+            print(f"Percentiles estimated from quantile sketches "
+                  f"(rank error within ±{rank_error() * 100:.2f}%).")
+        
+        if series:
+            print_threshold_series(
+                calculate_all_threshold_series(window, decay),
+                describe_threshold_mode(window, decay)
+            )
         
         return True
         
@@ -170,7 +444,9 @@ def team_command(args):
             return False
         
         # Run analysis
-        result = analyze_team(team_id)
+        result = analyze_team(team_id, window=args.window, decay=args.decay, rank_by=args.rank_by)
+        if args.what_if:
+            result = apply_scenario(result, args.what_if)
         print_team_analysis(result)
         return True
         
@@ -180,40 +456,272 @@ def team_command(args):
         return False
 
 
+def sos_command(args):
+    """Show strength-of-schedule adjusted ratings for every team."""
+    try:
+        init_db()
+        teams = get_all_teams()
+        if not teams:
+            print("\nNo teams in database. Run 'python main.py fetch' first.")
+            return False
+        
+        ratings = calculate_sos_ratings()
+        print_sos_table(ratings, teams, category=args.category)
+        return True
+        
+    except Exception as e:
+        print(f"\nError calculating schedule-adjusted ratings: {e}")
+        logging.exception("Detailed Traceback:")
+        return False
+
+
+def punt_command(args):
+    """Show the cheapest categories to punt for a team."""
+    try:
+        init_db()
+        
+        team_id = args.id or get_my_team_id()
+        if team_id == 0:
+            print("\nNo team specified. Set MY_TEAM_ID in .env or use --id <team_id>.")
+            print("Run 'python main.py team --list' to see available teams.")
+            return False
+        
+        team = get_team_by_id(team_id)
+        if not team:
+            print(f"\nTeam ID {team_id} not found.")
+            print("Run 'python main.py team --list' to see available teams.")
+            return False
+        
+        analysis = analyze_punts(team_id, max_punts=args.max_punts, top=args.top)
+        print_punt_analysis(analysis, team['current_name'])
+        return True
+        
+    except Exception as e:
+        print(f"\nError during punt analysis: {e}")
+        logging.exception("Detailed Traceback:")
+        return False
+
+
 def migrate_command(args):
     """Migrate database schema."""
+    if args.reset:
+        return reset_database()
+    
     print("\n" + "=" * 60)
     print("DATABASE MIGRATION")
     print("=" * 60)
+    
+    try:
+        current_version = get_schema_version()
+        if current_version == 0:
+            print("No existing database - creating a new one.")
+            init_db()
+        elif current_version >= SCHEMA_VERSION:
+            print(f"Schema is already up to date (v{current_version}).")
+        else:
+            print(f"Upgrading schema v{current_version} -> v{SCHEMA_VERSION} in place.")
+            print("Existing data is preserved. Safe to interrupt and re-run.")
+            print("=" * 60)
+            
+            def report(step, done, total):
+                print(f"  {step}: {done}/{total}", end="\r" if done < total else "\n", flush=True)
+            
+            migrate(target_version=SCHEMA_VERSION, batch_size=args.batch_size, progress=report)
+            init_db()
+            
+            print("\n" + "=" * 60)
+            print("✓ Migration complete!")
+            print("=" * 60)
+        
+        if args.layout:
+            init_db()  # Layout tables exist on every current schema
+            current_layout = get_storage_layout()
+            if current_layout == args.layout:
+                print(f"Storage layout is already '{args.layout}'.")
+            else:
+                converted = set_storage_layout(args.layout)
+                remove_snapshot()  # Built from the old layout's data version
+                print(f"✓ Storage layout '{current_layout}' -> '{args.layout}' "
+                      f"({converted} matchups converted)")
+        
+        return True
+        
+    except KeyboardInterrupt:
+        print("\n\nMigration interrupted - run 'python main.py migrate' again to resume.")
+        return False
+        
+    except Exception as e:
+        print(f"\nError during migration: {e}")
+        logging.exception("Detailed Traceback:")
+        return False
+
+
+def report_command(args):
+    """Render the threshold report, one team's analysis, or every report for the league."""
+    try:
+        init_db()
+        
+        if args.output:
+            start = time.perf_counter()
+            paths = write_league_reports(args.output, fmt=args.format, max_workers=args.workers)
+            elapsed = time.perf_counter() - start
+            print(f"✓ Wrote {len(paths)} {args.format} reports to {args.output} in {elapsed:.2f}s")
+            return True
+        
+        if args.id:
+            if not team_exists(args.id):
+                print(f"\nTeam ID {args.id} not found.")
+                print("Run 'python main.py team --list' to see available teams.")
+                return False
+            write_report(team_analysis_report(analyze_team(args.id)), args.format)
+        else:
+            write_report(threshold_report(calculate_all_thresholds(), get_analysis_summary()), args.format)
+        return True
+        
+    except Exception as e:
+        print(f"\nError rendering report: {e}", file=sys.stderr)
+        logging.exception("Detailed Traceback:")
+        return False
+
+
+def dashboard_command(args):
+    """Build or update the static dashboard."""
+    try:
+        init_db()
+        output = args.output or get_dashboard_dir() or DEFAULT_DASHBOARD_DIR
+        result = build_dashboard(output, force=args.force)
+        print(f"✓ Dashboard in {output}: {len(result.written)} pages rebuilt, "
+              f"{len(result.unchanged)} unchanged, {len(result.removed)} removed")
+        return True
+        
+    except Exception as e:
+        print(f"\nError building dashboard: {e}")
+        logging.exception("Detailed Traceback:")
+        return False
+
+
+def serve_command(args):
+    """Serve analytics as JSON over HTTP until interrupted."""
+    server = None
+    try:
+        init_db()
+        server = create_server(host=args.host, port=args.port, simulations=args.simulations,
+                               season_weeks=args.season_weeks, playoff_teams=args.playoff_teams)
+        host, port = server.server_address[:2]
+        print(f"Serving analytics on http://{host}:{port}/ (Ctrl+C to stop)")
+        print("Endpoints: /status /teams /thresholds /teams/<id> /live /outlook /trade")
+        server.serve_forever()
+        return True
+        
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+        return True
+        
+    except Exception as e:
+        print(f"\nError running server: {e}")
+        logging.exception("Detailed Traceback:")
+        return False
+    
+    finally:
+        if server is not None:
+            server.server_close()
+
+
+def batch_command(args):
+    """Analyze many league databases on a process pool, streaming NDJSON."""
+    output = None
+    try:
+        targets = list(args.leagues)
+        if args.from_file:
+            with open(args.from_file) as f:
+                targets += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        if not targets:
+            print("No leagues given. Pass database paths or league IDs, or --from-file.", file=sys.stderr)
+            return False
+        
+        output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        summary = run_batch(targets, output, max_workers=args.workers, db_dir=args.db_dir,
+                            teams=not args.no_teams, confidence=not args.no_ci, resamples=args.resamples)
+        
+        # The summary stays off stdout when stdout carries the results
+        print(f"✓ {summary.succeeded}/{summary.leagues} leagues analyzed ({summary.failed} failed) "
+              f"in {summary.elapsed:.1f}s on {summary.workers} workers: "
+              f"{summary.leagues_per_minute:.1f} leagues/min",
+              file=sys.stdout if args.output else sys.stderr)
+        return summary.failed == 0
+        
+    except Exception as e:
+        print(f"\nError running batch: {e}", file=sys.stderr)
+        logging.exception("Detailed Traceback:")
+        return False
+    
+    finally:
+        if output is not None and output is not sys.stdout:
+            output.close()
+
+
+def compact_command(args):
+    """Remove orphaned/duplicate rows and reclaim space."""
+    print("=" * 60)
+    print("Compacting Database")
+    print("=" * 60)
+    
+    try:
+        init_db()  # Ensure DB exists and indexes are current
+        result = compact_database()
+        remove_snapshot()  # Stale once compaction bumped the data version
+        print_compaction_report(result)
+        return True
+        
+    except Exception as e:
+        print(f"Error compacting database: {e}")
+        logging.exception("Detailed Traceback:")
+        return False
+
+
+def reset_database():
+    """Drop all tables and recreate an empty schema (data must be re-fetched)."""
+    print("\n" + "=" * 60)
+    print("DATABASE RESET")
+    print("=" * 60)
     print("This will delete all existing data in the database.")
-    print("Data can be re-fetched from Yahoo after migration.")
+    print("Data can be re-fetched from Yahoo afterwards.")
     print("=" * 60)
     
-    confirm = input("\nProceed with migration? (yes/no): ")
+    confirm = input("\nProceed with reset? (yes/no): ")
     
     if confirm.lower() != 'yes':
-        print("\nMigration cancelled.")
+        print("\nReset cancelled.")
         return False
     
     try:
         print("\nDropping old tables...")
         drop_all_tables()
+        remove_snapshot()
         
         print("Creating new schema...")
         init_db()
         
         print("\n" + "=" * 60)
-        print("✓ Migration complete!")
+        print("✓ Reset complete!")
         print("=" * 60)
-        print("\nRun 'python main.py fetch' to reload data with new schema.")
+        print("\nRun 'python main.py fetch' to reload data.")
         return True
         
     except Exception as e:
-        print(f"\nError during migration: {e}")
+        print(f"\nError during reset: {e}")
         logging.exception("Detailed Traceback:")
         return False
 
 
+def add_threshold_mode_arguments(subparser):
+    """Rolling-window / recency-decay options shared by analyze and team."""
+    subparser.add_argument('--window', type=int, metavar='N',
+                           help='Only use the last N complete weeks for thresholds')
+    subparser.add_argument('--decay', type=float, metavar='D',
+                           help='Weight each older week by D (0-1) relative to the next')
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Fantasy Hockey Analytics - Phase 3: Team Performance Analysis",
@@ -221,12 +729,43 @@ def main():
         epilog="""
 Commands:
   fetch           Fetch latest data from Yahoo and persist to DB
+  fetch --skip-players          Matchup totals only (no roster/player stats)
   status          Show what weeks are stored and their completion status
+  watch           Live-update the current week, redrawing changed matchups
+  watch --interval 30 --week 12 Poll every 30s / watch a specific week
+  live            Win probabilities for the in-progress week (stored partial stats)
+  live --days-left 3            Override the days left in the scoring week
   analyze         Run threshold analysis on stored data (complete weeks only)
+  analyze --sketch              Thresholds from compact quantile sketches
+  analyze --merge <DB> [<DB>..] Thresholds across several league databases
+  analyze --window 4            Thresholds from the last 4 complete weeks
+  analyze --decay 0.8 --series  Recency-weighted thresholds, plus week-by-week series
+  analyze --no-ci               Skip bootstrap confidence intervals
   team            Analyze your team (requires MY_TEAM_ID in .env)
   team --list     Show all available teams
   team --id <ID>  Analyze a specific team by ID
-  migrate         Migrate database schema (drops existing data)
+  team --window N / --decay D   Team analysis against rolling/decayed thresholds
+  team --rank-by impact         Rank priorities by category wins gained per std
+  team --what-if hits=20 ppp=0.5  Re-assess with per-week stat changes
+  sos             Opponent-adjusted (strength-of-schedule) ratings for every team
+  sos --category gaa            Raw vs adjusted values for one category
+  punt [--id <ID>]              Cheapest categories to punt (all 2048 subsets)
+  recommend [--id <ID>]         Best available players by matchup impact
+  recommend --position D --top 5  Only players eligible at D
+  lineup [--id <ID>] [--week N] Starters maximizing expected category wins
+  trade --partner 5 --give 101 --get 502  Category wins and playoff odds, before/after
+  trade --partner 5 --give 101 --get 502 --give 102 --get 503  Several candidates at once
+  report --format json          Threshold report as JSON (--id <ID>: one team's analysis)
+  report --format html --output reports/  Every team's report, rendered in parallel
+  dashboard [--output DIR]      Static HTML dashboard; rebuilds only changed pages
+  dashboard --force             Rebuild every page
+  serve [--port 8765]           Local JSON API (thresholds, teams, live odds, simulations)
+  batch <DB|ID> [<DB|ID> ..]    Analyze many leagues in parallel, one JSON line per league
+  batch --from-file leagues.txt --db-dir leagues/ --output results.ndjson
+  migrate         Upgrade database schema in place (resumable, keeps data)
+  migrate --reset Drop all data and recreate an empty schema
+  migrate --layout wide         Store one row per team-week (smaller, faster scans)
+  compact         Remove duplicate rows left by re-fetches, VACUUM and ANALYZE
   
 Default behavior (no command): fetch + analyze
         """
@@ -237,48 +776,258 @@ Default behavior (no command): fetch + analyze
     
     # fetch command
     parser_fetch = subparsers.add_parser('fetch', help='Fetch data from Yahoo')
+    parser_fetch.add_argument('--skip-players', action='store_true',
+                              help='Skip roster and player weekly stats')
     
     # status command
     parser_status = subparsers.add_parser('status', help='Show database status')
     
+    # watch command
+    parser_watch = subparsers.add_parser('watch', help='Live-update the in-progress week')
+    parser_watch.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                              help=f'Seconds between polls (default {DEFAULT_INTERVAL})')
+    parser_watch.add_argument('--week', type=int, help='Week to watch (default: current week)')
+    
+    # live command
+    parser_live = subparsers.add_parser('live', help='Live win probabilities for the in-progress week')
+    parser_live.add_argument('--days-left', type=float,
+                             help='Days left in the scoring week (default: from today, Mon-Sun weeks)')
+    parser_live.add_argument('--week', type=int, help='In-progress week (default: latest)')
+    
     # analyze command
     parser_analyze = subparsers.add_parser('analyze', help='Run threshold analysis')
+    parser_analyze.add_argument('--sketch', action='store_true',
+                                help='Use quantile sketches instead of exact percentiles')
+    parser_analyze.add_argument('--merge', nargs='+', metavar='DB',
+                                help='Merge sketches from other league databases')
+    add_threshold_mode_arguments(parser_analyze)
+    parser_analyze.add_argument('--series', action='store_true',
+                                help='Also show median thresholds as of each week')
+    parser_analyze.add_argument('--no-ci', action='store_true',
+                                help='Skip bootstrap confidence intervals')
+    parser_analyze.add_argument('--resamples', type=int, default=DEFAULT_RESAMPLES,
+                                help='Bootstrap resamples for confidence intervals')
     
     # team command
     parser_team = subparsers.add_parser('team', help='Analyze team performance')
     parser_team.add_argument('--list', action='store_true', help='List all teams')
     parser_team.add_argument('--id', type=int, help='Team ID to analyze')
+    add_threshold_mode_arguments(parser_team)
+    parser_team.add_argument('--rank-by', choices=PRIORITY_MODES, default='gap',
+                             help="Rank improvement priorities by threshold gap or by matchup impact")
+    parser_team.add_argument('--what-if', nargs='+', metavar='CATEGORY=DELTA',
+                             help='Per-week stat changes to evaluate, e.g. hits=20 ppp=0.5')
+    
+    # sos command
+    parser_sos = subparsers.add_parser('sos', help='Strength-of-schedule adjusted ratings')
+    parser_sos.add_argument('--category', choices=ALL_CATEGORIES,
+                            help='Show raw vs adjusted detail for one category')
+    
+    # punt command
+    parser_punt = subparsers.add_parser('punt', help='Find the cheapest categories to punt')
+    parser_punt.add_argument('--id', type=int, help='Team ID (default: MY_TEAM_ID)')
+    parser_punt.add_argument('--max-punts', type=int, default=DEFAULT_MAX_PUNTS,
+                             help='Largest number of punted categories to report')
+    parser_punt.add_argument('--top', type=int, default=DEFAULT_TOP,
+                             help='Strategies shown per punt size')
+    
+    # recommend command
+    parser_recommend = subparsers.add_parser('recommend', help='Rank free agents by matchup impact')
+    parser_recommend.add_argument('--id', type=int, help='Team ID (default: MY_TEAM_ID)')
+    parser_recommend.add_argument('--top', type=int, default=DEFAULT_TOP_K,
+                                  help='Players to list')
+    parser_recommend.add_argument('--position', choices=list(ROSTER_SLOTS),
+                                  help='Only players eligible at this position')
+    parser_recommend.add_argument('--focus', type=int,
+                                  help='Score only the top N improvement priorities')
+    
+    # lineup command
+    parser_lineup = subparsers.add_parser('lineup', help='Optimal starters against this week\'s opponent')
+    parser_lineup.add_argument('--id', type=int, help='Team ID (default: MY_TEAM_ID)')
+    parser_lineup.add_argument('--week', type=int, help='Week to set (default: latest stored week)')
+    
+    # trade command
+    parser_trade = subparsers.add_parser('trade', help='Evaluate trades by category wins and playoff odds')
+    parser_trade.add_argument('--id', type=int, help='Your team ID (default: MY_TEAM_ID)')
+    parser_trade.add_argument('--partner', type=int, required=True, help='Team ID of the other side')
+    parser_trade.add_argument('--give', type=int, nargs='*', action='append', required=True,
+                              help='Player IDs sent to the partner (repeat with --get for more candidates)')
+    parser_trade.add_argument('--get', type=int, nargs='*', action='append', required=True,
+                              help='Player IDs received from the partner')
+    parser_trade.add_argument('--simulations', type=int, default=DEFAULT_SIMULATIONS,
+                              help='Simulated seasons')
+    parser_trade.add_argument('--season-weeks', type=int, default=DEFAULT_SEASON_WEEKS,
+                              help='Regular-season weeks')
+    parser_trade.add_argument('--playoff-teams', type=int, default=DEFAULT_PLAYOFF_TEAMS,
+                              help='Teams that make the playoffs')
+    
+    # report command
+    parser_report = subparsers.add_parser('report', help='Render reports as text, JSON or HTML')
+    parser_report.add_argument('--format', choices=FORMATS, default='text', help='Output format')
+    parser_report.add_argument('--id', type=int, help='One team\'s analysis instead of the thresholds')
+    parser_report.add_argument('--output', metavar='DIR',
+                               help='Write the threshold report and every team\'s analysis to DIR')
+    parser_report.add_argument('--workers', type=int, default=DEFAULT_REPORT_WORKERS,
+                               help='Teams rendered in parallel with --output')
+    
+    # dashboard command
+    parser_dashboard = subparsers.add_parser('dashboard', help='Build the static HTML dashboard')
+    parser_dashboard.add_argument('--output', metavar='DIR',
+                                  help=f'Output directory (default: DASHBOARD_DIR or {DEFAULT_DASHBOARD_DIR})')
+    parser_dashboard.add_argument('--force', action='store_true', help='Rebuild every page')
+    
+    # serve command
+    parser_serve = subparsers.add_parser('serve', help='Serve analytics as JSON over HTTP')
+    parser_serve.add_argument('--host', default=DEFAULT_HOST, help=f'Address to bind (default {DEFAULT_HOST})')
+    parser_serve.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default {DEFAULT_PORT})')
+    parser_serve.add_argument('--simulations', type=int, default=DEFAULT_SIMULATIONS,
+                              help='Simulated seasons for /outlook and /trade')
+    parser_serve.add_argument('--season-weeks', type=int, default=DEFAULT_SEASON_WEEKS,
+                              help='Regular-season weeks')
+    parser_serve.add_argument('--playoff-teams', type=int, default=DEFAULT_PLAYOFF_TEAMS,
+                              help='Teams that make the playoffs')
+    
+    # batch command
+    parser_batch = subparsers.add_parser('batch', help='Analyze many leagues on a process pool (NDJSON)')
+    parser_batch.add_argument('leagues', nargs='*', metavar='DB|ID',
+                              help='League database paths, or league IDs (league_<id>.db in --db-dir)')
+    parser_batch.add_argument('--from-file', metavar='FILE', help='Also read leagues from FILE, one per line')
+    parser_batch.add_argument('--db-dir', default='.', help='Directory holding league_<id>.db files')
+    parser_batch.add_argument('--workers', type=int, help='Worker processes (default: one per core)')
+    parser_batch.add_argument('--output', metavar='FILE', help='Write NDJSON to FILE instead of stdout')
+    parser_batch.add_argument('--no-teams', action='store_true', help='Thresholds only, no team analyses')
+    parser_batch.add_argument('--no-ci', action='store_true', help='Skip bootstrap confidence intervals')
+    parser_batch.add_argument('--resamples', type=int, default=DEFAULT_RESAMPLES,
+                              help='Bootstrap resamples for confidence intervals')
     
     # migrate command
-    parser_migrate = subparsers.add_parser('migrate', help='Migrate database schema')
+    parser_migrate = subparsers.add_parser('migrate', help='Upgrade database schema in place')
+    parser_migrate.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                                help='Rows copied per transaction')
+    parser_migrate.add_argument('--reset', action='store_true',
+                                help='Drop all data and recreate an empty schema instead')
+    parser_migrate.add_argument('--layout', choices=STORAGE_LAYOUTS,
+                                help="Convert stored values to this storage layout ('rows' or 'wide')")
+    
+    # compact command
+    parser_compact = subparsers.add_parser('compact', help='Deduplicate and compact the database')
     
     args = parser.parse_args()
     
-    # Welcome message
-    print("\nWelcome to Fantasy Hockey Analytics - Phase 3")
-    print("Team Performance Analysis\n")
+    # Welcome message (not in front of JSON/HTML/NDJSON on stdout)
+    ndjson_stdout = args.command == 'batch' and not args.output
+    if getattr(args, 'format', 'text') == 'text' and not ndjson_stdout:
+        print("\nWelcome to Fantasy Hockey Analytics - Phase 3")
+        print("Team Performance Analysis\n")
     
     # Execute based on command
     if args.command == 'fetch':
-        success = fetch_data()
+        success = fetch_data(players=not args.skip_players)
         sys.exit(0 if success else 1)
         
     elif args.command == 'status':
         success = show_status()
         sys.exit(0 if success else 1)
         
+    elif args.command == 'watch':
+        if args.interval <= 0:
+            parser.error("--interval must be positive")
+        success = watch_command(args)
+        sys.exit(0 if success else 1)
+        
+    elif args.command == 'live':
+        if args.days_left is not None and not 0 <= args.days_left <= DAYS_PER_WEEK:
+            parser.error(f"--days-left must be between 0 and {DAYS_PER_WEEK}")
+        success = live_command(args)
+        sys.exit(0 if success else 1)
+        
     elif args.command == 'analyze':
-        success = analyze_data()
+        if (args.window is not None or args.decay is not None) and (args.sketch or args.merge):
+            parser.error("--window/--decay cannot be combined with --sketch/--merge")
+        success = analyze_data(use_sketch=args.sketch, merge_paths=args.merge,
+                               window=args.window, decay=args.decay, series=args.series,
+                               confidence=not args.no_ci, resamples=args.resamples)
         sys.exit(0 if success else 1)
         
     elif args.command == 'team':
+        if args.what_if and args.rank_by != 'gap':
+            parser.error("--what-if ranks priorities by gap; it cannot be combined with --rank-by impact")
+        if args.what_if:
+            try:
+                args.what_if = parse_scenario(args.what_if)
+            except ValueError as e:
+                parser.error(str(e))
         success = team_command(args)
         sys.exit(0 if success else 1)
         
+    elif args.command == 'sos':
+        success = sos_command(args)
+        sys.exit(0 if success else 1)
+        
+    elif args.command == 'punt':
+        success = punt_command(args)
+        sys.exit(0 if success else 1)
+        
+    elif args.command == 'recommend':
+        if args.top <= 0:
+            parser.error("--top must be positive")
+        if args.focus is not None and args.focus <= 0:
+            parser.error("--focus must be positive")
+        success = recommend_command(args)
+        sys.exit(0 if success else 1)
+        
+    elif args.command == 'lineup':
+        success = lineup_command(args)
+        sys.exit(0 if success else 1)
+        
+    elif args.command == 'trade':
+        if len(args.give) != len(args.get):
+            parser.error("each --give needs a matching --get")
+        if any(not give and not get for give, get in zip(args.give, args.get)):
+            parser.error("each candidate trade needs at least one player")
+        if args.simulations <= 0:
+            parser.error("--simulations must be positive")
+        if args.season_weeks <= 0 or args.playoff_teams <= 0:
+            parser.error("--season-weeks and --playoff-teams must be positive")
+        success = trade_command(args)
+        sys.exit(0 if success else 1)
+        
+    elif args.command == 'report':
+        if args.workers <= 0:
+            parser.error("--workers must be positive")
+        success = report_command(args)
+        sys.exit(0 if success else 1)
+        
+    elif args.command == 'dashboard':
+        success = dashboard_command(args)
+        sys.exit(0 if success else 1)
+        
+    elif args.command == 'serve':
+        if not 0 <= args.port <= 65535:
+            parser.error("--port must be between 0 and 65535")
+        if args.simulations <= 0:
+            parser.error("--simulations must be positive")
+        if args.season_weeks <= 0 or args.playoff_teams <= 0:
+            parser.error("--season-weeks and --playoff-teams must be positive")
+        success = serve_command(args)
+        sys.exit(0 if success else 1)
+        
+    elif args.command == 'batch':
+        if args.workers is not None and args.workers <= 0:
+            parser.error("--workers must be positive")
+        if args.resamples <= 0:
+            parser.error("--resamples must be positive")
+        success = batch_command(args)
+        sys.exit(0 if success else 1)
+        
     elif args.command == 'migrate':
         success = migrate_command(args)
         sys.exit(0 if success else 1)
         
+    elif args.command == 'compact':
+        success = compact_command(args)
+        sys.exit(0 if success else 1)
+        
     else:
         # Default: fetch + analyze
         print("Running default mode: fetch + analyze\n")
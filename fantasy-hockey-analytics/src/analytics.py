@@ -1,11 +1,23 @@
 """Analytical engine for calculating winning thresholds across stat categories."""
 
+import os
+import logging
+import sqlite3
 import statistics
 from dataclasses import dataclass
-from typing import Dict, List
-from .database import get_all_category_outcomes, get_weeks_stored
+from typing import Dict, List, Optional, Tuple
+from .database import (
+    get_all_category_outcomes,
+    get_weeks_stored,
+    get_category_sketch,
+    rebuild_category_sketches
+)
+from .sketches import KLLSketch
+from .snapshot import StatCube, load_snapshot
 from .constants import ALL_CATEGORIES, LOWER_IS_BETTER
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class CategoryThresholds:
@@ -26,8 +38,23 @@ class CategoryThresholds:
     overlap_high: float  # upper bound of uncertain zone
 
 
-def calculate_thresholds(category: str, db_path: str = "fantasy_hockey.db") -> CategoryThresholds:
-    """Calculate all threshold metrics for a single category using complete weeks only."""
+def calculate_thresholds(category: str, db_path: str = "fantasy_hockey.db",
+                         cube: Optional[StatCube] = None) -> CategoryThresholds:
+    """
+    Calculate all threshold metrics for a single category using complete weeks only.
+    
+    Reads from the stat cube snapshot when one is given, otherwise from SQLite.
+    """
+    winning_values, losing_values, weeks_analyzed = get_decided_values(category, db_path, cube)
+    return _thresholds_from_values(category, winning_values, losing_values, weeks_analyzed)
+
+
+def get_decided_values(category: str, db_path: str = "fantasy_hockey.db",
+                       cube: Optional[StatCube] = None) -> Tuple[List[float], List[float], int]:
+    """(winning_values, losing_values, weeks_analyzed) for non-tie outcomes in complete weeks."""
+    if cube is not None:
+        _, winning, losing, weeks = cube.decided_outcomes(category, complete_only=True)
+        return winning.tolist(), losing.tolist(), len(set(weeks.tolist()))
     
     # Get all completed outcomes for this category
     outcomes = get_all_category_outcomes(category, complete_only=True, db_path=db_path)
@@ -45,44 +72,64 @@ def calculate_thresholds(category: str, db_path: str = "fantasy_hockey.db") -> C
     # Count weeks analyzed
     weeks_analyzed = len(set(outcome['week_number'] for outcome in outcomes))
     
+    return winning_values, losing_values, weeks_analyzed
+
+
+def _thresholds_from_values(category: str, winning_values: List[float],
+                            losing_values: List[float], weeks_analyzed: int) -> CategoryThresholds:
+    """Exact thresholds from the winning/losing values of decided outcomes."""
     # Require at least some data
     if not winning_values:
         # Return empty thresholds if no data
-        direction = 'lower_wins' if category in LOWER_IS_BETTER else 'higher_wins'
-        return CategoryThresholds(
-            category=category,
-            direction=direction,
-            sample_size=0,
-            weeks_analyzed=0,
-            min_winning=0.0,
-            max_winning=0.0,
-            median_winning=0.0,
-            p75_winning=0.0,
-            p90_winning=0.0,
-            max_losing=0.0,
-            min_losing=0.0,
-            overlap_exists=False,
-            overlap_low=0.0,
-            overlap_high=0.0
-        )
-    
-    # Calculate metrics
-    direction = 'lower_wins' if category in LOWER_IS_BETTER else 'higher_wins'
-    sample_size = len(winning_values)
-    
-    min_winning = min(winning_values)
-    max_winning = max(winning_values)
-    median_winning = statistics.median(winning_values)
+        return _empty_thresholds(category)
     
     # Calculate percentiles
     sorted_winning = sorted(winning_values)
     p75_idx = int(len(sorted_winning) * 0.75)
     p90_idx = int(len(sorted_winning) * 0.90)
-    p75_winning = sorted_winning[p75_idx] if p75_idx < len(sorted_winning) else max_winning
-    p90_winning = sorted_winning[p90_idx] if p90_idx < len(sorted_winning) else max_winning
+    max_winning = max(winning_values)
     
-    max_losing = max(losing_values)
-    min_losing = min(losing_values)
+    return _build_thresholds(
+        category=category,
+        sample_size=len(winning_values),
+        weeks_analyzed=weeks_analyzed,
+        min_winning=min(winning_values),
+        max_winning=max_winning,
+        median_winning=statistics.median(winning_values),
+        p75_winning=sorted_winning[p75_idx] if p75_idx < len(sorted_winning) else max_winning,
+        p90_winning=sorted_winning[p90_idx] if p90_idx < len(sorted_winning) else max_winning,
+        max_losing=max(losing_values),
+        min_losing=min(losing_values)
+    )
+
+
+def _empty_thresholds(category: str) -> CategoryThresholds:
+    """Thresholds for a category with no decided outcomes."""
+    direction = 'lower_wins' if category in LOWER_IS_BETTER else 'higher_wins'
+    return CategoryThresholds(
+        category=category,
+        direction=direction,
+        sample_size=0,
+        weeks_analyzed=0,
+        min_winning=0.0,
+        max_winning=0.0,
+        median_winning=0.0,
+        p75_winning=0.0,
+        p90_winning=0.0,
+        max_losing=0.0,
+        min_losing=0.0,
+        overlap_exists=False,
+        overlap_low=0.0,
+        overlap_high=0.0
+    )
+
+
+def _build_thresholds(category: str, sample_size: int, weeks_analyzed: int,
+                      min_winning: float, max_winning: float, median_winning: float,
+                      p75_winning: float, p90_winning: float,
+                      max_losing: float, min_losing: float) -> CategoryThresholds:
+    """Assemble CategoryThresholds from summary values, working out the overlap zone."""
+    direction = 'lower_wins' if category in LOWER_IS_BETTER else 'higher_wins'
     
     # Calculate overlap zone
     if direction == 'higher_wins':
@@ -114,16 +161,118 @@ def calculate_thresholds(category: str, db_path: str = "fantasy_hockey.db") -> C
     )
 
 
-def calculate_all_thresholds(db_path: str = "fantasy_hockey.db") -> Dict[str, CategoryThresholds]:
-    """Calculate thresholds for all categories. Returns dict keyed by category name."""
+def calculate_all_thresholds(db_path: str = "fantasy_hockey.db",
+                             use_sketch: bool = False) -> Dict[str, CategoryThresholds]:
+    """
+    Calculate thresholds for all categories. Returns dict keyed by category name.
+    
+    With use_sketch=True, percentiles come from the stored quantile sketches
+    instead of the raw category_outcomes rows (see src/sketches.py for error bounds).
+    Exact thresholds use the binary snapshot when it is current.
+    """
+    if use_sketch:
+        return calculate_all_thresholds_from_sketches(db_path)
+    
     thresholds = {}
+    cube = load_snapshot(db_path)
     
     for category in ALL_CATEGORIES:
-        thresholds[category] = calculate_thresholds(category, db_path)
+        thresholds[category] = calculate_thresholds(category, db_path, cube)
     
     return thresholds
 
 
+def _thresholds_from_sketch(category: str, sketch: KLLSketch, weeks_analyzed: int,
+                            min_losing: float, max_losing: float) -> CategoryThresholds:
+    """Build CategoryThresholds from a (possibly merged) winning-value sketch."""
+    if sketch.n == 0:
+        return _empty_thresholds(category)
+    
+    return _build_thresholds(
+        category=category,
+        sample_size=sketch.n,
+        weeks_analyzed=weeks_analyzed,
+        min_winning=sketch.min_value,
+        max_winning=sketch.max_value,
+        median_winning=sketch.quantile(0.50),
+        p75_winning=sketch.quantile(0.75),
+        p90_winning=sketch.quantile(0.90),
+        max_losing=max_losing,
+        min_losing=min_losing
+    )
+
+
+def _load_sketches(db_path: str, rebuild: bool = True) -> Dict[str, dict]:
+    """
+    Load stored sketches. Sketches that don't cover every complete week are
+    rebuilt, or with rebuild=False used as stored (with a warning).
+    """
+    complete_weeks = sorted(w['week'] for w in get_weeks_stored(db_path) if w['is_complete'])
+    
+    try:
+        sketches = {category: get_category_sketch(category, db_path) for category in ALL_CATEGORIES}
+    except sqlite3.OperationalError:
+        sketches = {category: None for category in ALL_CATEGORIES}  # Schema predates sketches
+    
+    if any(s is None or s['weeks'] != complete_weeks for s in sketches.values()):
+        if rebuild:
+            rebuild_category_sketches(db_path)
+            sketches = {category: get_category_sketch(category, db_path) for category in ALL_CATEGORIES}
+        else:
+            logger.warning(f"Sketches in {db_path} don't cover its {len(complete_weeks)} complete weeks; "
+                           f"using them as stored (analyze --sketch on that database rebuilds them)")
+    
+    return sketches
+
+
+def calculate_all_thresholds_from_sketches(db_path: str = "fantasy_hockey.db") -> Dict[str, CategoryThresholds]:
+    """Sketch-based thresholds for one league-season database (stale sketches are rebuilt)."""
+    return calculate_cross_league_thresholds([db_path], rebuild=True)
+
+
+def calculate_cross_league_thresholds(db_paths: List[str], rebuild: bool = False) -> Dict[str, CategoryThresholds]:
+    """
+    Merge per-league sketches into thresholds across many league-season databases.
+    
+    Only the compact sketches are read, never the category_outcomes rows.
+    weeks_analyzed is the total number of complete league-weeks merged.
+    The databases are only read: stale sketches are used as stored (with a
+    warning) unless rebuild=True. Raises FileNotFoundError for a missing
+    database (it is never created).
+    """
+    for db_path in db_paths:
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Database not found: {db_path}")
+    
+    merged = {
+        category: {'sketch': KLLSketch(), 'weeks': 0, 'min_losing': None, 'max_losing': None}
+        for category in ALL_CATEGORIES
+    }
+    
+    for db_path in db_paths:
+        for category, stored in _load_sketches(db_path, rebuild).items():
+            if stored is None:
+                continue
+            
+            target = merged[category]
+            target['sketch'].merge(stored['sketch'])
+            target['weeks'] += len(stored['weeks'])
+            
+            if stored['min_losing'] is not None:
+                if target['min_losing'] is None or stored['min_losing'] < target['min_losing']:
+                    target['min_losing'] = stored['min_losing']
+            if stored['max_losing'] is not None:
+                if target['max_losing'] is None or stored['max_losing'] > target['max_losing']:
+                    target['max_losing'] = stored['max_losing']
+    
+    return {
+        category: _thresholds_from_sketch(
+            category, m['sketch'], m['weeks'], m['min_losing'], m['max_losing']
+        )
+        for category, m in merged.items()
+    }
+
+
 def get_analysis_summary(db_path: str = "fantasy_hockey.db") -> dict:
     """Return metadata: weeks_analyzed, weeks_excluded, total_matchups, date_range."""
     weeks = get_weeks_stored(db_path)
@@ -143,3 +292,17 @@ def get_analysis_summary(db_path: str = "fantasy_hockey.db") -> dict:
         'complete_week_numbers': [w['week'] for w in complete_weeks],
         'incomplete_week_numbers': [w['week'] for w in incomplete_weeks]
     }
+
+
+def get_cross_league_summary(db_paths: List[str]) -> dict:
+    """Combine get_analysis_summary() across several league-season databases."""
+    summaries = [get_analysis_summary(db_path) for db_path in db_paths]
+    
+    return {
+        'weeks_analyzed': sum(s['weeks_analyzed'] for s in summaries),
+        'weeks_excluded': sum(s['weeks_excluded'] for s in summaries),
+        'total_matchups': sum(s['total_matchups'] for s in summaries),
+        'complete_week_numbers': sorted(set(w for s in summaries for w in s['complete_week_numbers'])),
+        'incomplete_week_numbers': sorted(set(w for s in summaries for w in s['incomplete_week_numbers'])),
+        'leagues': len(db_paths)
+    }
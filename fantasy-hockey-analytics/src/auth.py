@@ -1,5 +1,29 @@
+"""
+Yahoo OAuth session shared across leagues.
+
+YahooSession owns one OAuth2 token and one HTTP session (keep-alive
+connection pool). Every league's YahooFantasySportsQuery borrows them, so
+TLS and token setup happen once per process instead of once per league.
+
+The token is refreshed REFRESH_MARGIN seconds before it expires, on a
+background timer, so requests don't wait for it. Refreshes are coordinated
+through a lock file next to token.json: a worker that finds a newer token
+already on disk adopts it instead of refreshing again. token.json is only
+ever replaced whole (temp file + os.replace), so parallel workers never
+read a half-written token.
+"""
+
 import os
+import json
+import time
 import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from yahoo_oauth import OAuth2
 from yfpy.query import YahooFantasySportsQuery
 from dotenv import load_dotenv
 
@@ -8,53 +32,267 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+TOKEN_FILE = "token.json"
+TOKEN_LIFETIME = 3600     # Yahoo access tokens last an hour
+REFRESH_MARGIN = 300      # Refresh this many seconds before expiry
+MIN_VALIDITY = 60         # Refresh inline if a request finds less than this left
+RETRY_DELAY = 60          # Background refresh retry after a failure
+POOL_SIZE = 16            # Keep-alive connections kept per host
+LOCK_POLL = 0.05
+LOCK_STALE = 120          # A lock file older than this was left by a dead worker
+LOCK_TIMEOUT = 180
+
+TOKEN_FIELDS = ('access_token', 'refresh_token', 'token_time', 'token_type')
+
+
+def read_token(path: str = TOKEN_FILE) -> Optional[dict]:
+    """Stored token, or None if the file is missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"Failed to read {path}: {e}")
+        return None
+
+
+def write_token(token: dict, path: str = TOKEN_FILE):
+    """Replace the token file in one step (readers see the old or the new file, never a mix)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".token.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(token, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def token_lock(path: str = TOKEN_FILE, timeout: float = LOCK_TIMEOUT):
+    """Cross-process lock for refreshing `path` (an exclusively created lock file)."""
+    lock_path = path + ".lock"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > LOCK_STALE:
+                    os.remove(lock_path)  # Holder died mid-refresh
+                    continue
+            except FileNotFoundError:
+                continue  # Released between the two calls
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for {lock_path}")
+            time.sleep(LOCK_POLL)
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        yield
+    finally:
+        try:
+            os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+
+
+def _expires_in(token_time: float) -> float:
+    return token_time + TOKEN_LIFETIME - time.time()
+
+
+class SharedSessionQuery(YahooFantasySportsQuery):
+    """yfpy query for one league using a YahooSession's token and connections."""
+
+    def __init__(self, session: 'YahooSession', league_id: str, game_code: str = "nhl"):
+        self._session = session
+        super().__init__(
+            league_id=league_id,
+            game_code=game_code,
+            yahoo_consumer_key=session.client_id,
+            yahoo_consumer_secret=session.client_secret,
+            env_var_fallback=False,
+            browser_callback=False
+        )
+
+    def _authenticate(self):
+        # yfpy calls this once at construction and again after a 401
+        if getattr(self, 'oauth', None) is not None:
+            self._session.refresh(force=True)
+        self.oauth = self._session.oauth
+        # yfpy reads the token fields back from this dict
+        self._yahoo_access_token_dict.update({
+            "access_token": self.oauth.access_token,
+            "consumer_key": self.oauth.consumer_key,
+            "consumer_secret": self.oauth.consumer_secret,
+            "guid": self.oauth.guid,
+            "refresh_token": self.oauth.refresh_token,
+            "token_time": self.oauth.token_time,
+            "token_type": self.oauth.token_type,
+        })
+
+    def get_response(self, url: str):
+        self._session.ensure_fresh()
+        return super().get_response(url)
+
+
+class YahooSession:
+    """One authenticated keep-alive session and token for every league in the process."""
+
+    def __init__(self, token_path: str = TOKEN_FILE, client_id: Optional[str] = None,
+                 client_secret: Optional[str] = None, refresh_margin: float = REFRESH_MARGIN,
+                 pool_size: int = POOL_SIZE, background: bool = True):
+        self.client_id = client_id or os.getenv("YAHOO_CLIENT_ID")
+        self.client_secret = client_secret or os.getenv("YAHOO_CLIENT_SECRET")
+        if not self.client_id or not self.client_secret:
+            raise ValueError("Missing YAHOO_CLIENT_ID or YAHOO_CLIENT_SECRET in .env file.")
+
+        self.token_path = token_path
+        self.refresh_margin = refresh_margin
+        self.pool_size = pool_size
+        self.background = background
+        self.refreshes = 0  # Token refreshes this session made itself
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._queries: Dict[Tuple[str, str], SharedSessionQuery] = {}
+        self._oauth = None
+
+    @property
+    def oauth(self) -> OAuth2:
+        """The shared OAuth2 object (connected on first use)."""
+        with self._lock:
+            if self._oauth is None:
+                self._connect()
+            return self._oauth
+
+    def _stored_fields(self, stored: Optional[dict]) -> dict:
+        """OAuth2 keyword arguments from token.json."""
+        if not stored:
+            return {}
+        fields = {name: stored[name] for name in TOKEN_FIELDS if name in stored}
+        fields['guid'] = stored.get('guid', stored.get('xoauth_yahoo_guid'))
+        return fields
+
+    def _save(self, stored: Optional[dict]):
+        """Write the current token, keeping any other fields already in the file."""
+        token = dict(stored or {})
+        token.update({name: getattr(self._oauth, name) for name in TOKEN_FIELDS})
+        write_token(token, self.token_path)
+
+    def _connect(self):
+        with token_lock(self.token_path):
+            stored = read_token(self.token_path)
+            # yahoo_oauth refreshes a stale token (or asks for a verifier without one) here
+            self._oauth = OAuth2(self.client_id, self.client_secret, browser_callback=False,
+                                 store_file=False, **self._stored_fields(stored))
+            if not stored or self._oauth.token_time != stored.get('token_time'):
+                self.refreshes += 1
+                self._save(stored)
+            if _expires_in(self._oauth.token_time) < self.refresh_margin:
+                self._refresh_locked(stored, force=True)
+
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+        self._oauth.session.mount("https://", adapter)
+        self._schedule()
+
+    def _refresh_locked(self, stored: Optional[dict], force: bool):
+        """Adopt a newer token from disk, else refresh and persist (token lock held)."""
+        current = self._oauth.token_time
+        if stored and stored.get('access_token') and float(stored.get('token_time', 0)) > current \
+                and _expires_in(float(stored['token_time'])) >= self.refresh_margin:
+            # Another worker refreshed while this one waited
+            for name in TOKEN_FIELDS:
+                setattr(self._oauth, name, stored[name])
+        elif force or _expires_in(current) < self.refresh_margin:
+            self._oauth.refresh_access_token()
+            self.refreshes += 1
+            self._save(stored)
+        self._oauth.session.access_token = self._oauth.access_token
+
+    def refresh(self, force: bool = False):
+        """Refresh now if within the margin of expiry (or always with force)."""
+        with self._lock:
+            if self._oauth is None:
+                self._connect()
+                return
+            if not force and self.expires_in() >= self.refresh_margin:
+                self._schedule()
+                return
+            with token_lock(self.token_path):
+                self._refresh_locked(read_token(self.token_path), force)
+            self._schedule()
+
+    def expires_in(self) -> float:
+        """Seconds until the current access token expires."""
+        return _expires_in(self.oauth.token_time)
+
+    def ensure_fresh(self):
+        """Called before each request; only refreshes inline if the background refresh fell behind."""
+        threshold = MIN_VALIDITY if self.background else self.refresh_margin
+        if self.expires_in() < threshold:
+            self.refresh()
+
+    def _schedule(self, delay: Optional[float] = None):
+        """Background refresh refresh_margin seconds before expiry."""
+        if not self.background:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        if delay is None:
+            delay = max(0.0, self.expires_in() - self.refresh_margin)
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.warning(f"Background token refresh failed, retrying in {RETRY_DELAY}s: {e}")
+            self._schedule(RETRY_DELAY)
+
+    def query(self, league_id: str, game_code: str = "nhl") -> SharedSessionQuery:
+        """The league's query (created once per league and game code, all sharing this session)."""
+        with self._lock:
+            key = (str(league_id), game_code)
+            if key not in self._queries:
+                self._queries[key] = SharedSessionQuery(self, str(league_id), game_code)
+            return self._queries[key]
+
+    def close(self):
+        """Stop the background refresh and close pooled connections."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._oauth is not None:
+                self._oauth.session.close()
+                self._oauth = None
+            self._queries.clear()
+
+
+_default_session: Optional[YahooSession] = None
+_default_lock = threading.Lock()
+
+
+def get_session() -> YahooSession:
+    """The process-wide YahooSession (created on first use)."""
+    global _default_session
+    with _default_lock:
+        if _default_session is None:
+            _default_session = YahooSession()
+        return _default_session
+
+
 def get_yahoo_query(league_id: str, game_code: str = "nhl") -> YahooFantasySportsQuery:
     """
-    Initializes the YahooFantasySportsQuery object.
-    YFPY handles the OAuth flow automatically.
+    The league's YahooFantasySportsQuery, sharing one OAuth token and HTTP
+    session with every other league queried in this process.
     """
-    client_id = os.getenv("YAHOO_CLIENT_ID")
-    client_secret = os.getenv("YAHOO_CLIENT_SECRET")
-    
-    if not client_id or not client_secret:
-        raise ValueError("Missing YAHOO_CLIENT_ID or YAHOO_CLIENT_SECRET in .env file.")
-
-    # YFPY automatically uses 'token.json' (or .yfpy_token.json) for persistence
-    # We pass the directory where we want to store it, usually current dir.
-    # relative_key_path defaults to .
-    
-    import json
-    from pathlib import Path
-
-    # Load token data manually to ensure it's passed correctly
-    token_path = Path("token.json")
-    token_data = None
-    if token_path.exists():
-        try:
-            with open(token_path, "r") as f:
-                token_data = json.load(f)
-        except Exception as e:
-            logger.warning(f"Failed to read token.json: {e}")
-
-    # Inject missing fields required by yfpy when passing dict
-    if token_data:
-        if 'consumer_key' not in token_data:
-            token_data['consumer_key'] = client_id
-        if 'consumer_secret' not in token_data:
-            token_data['consumer_secret'] = client_secret
-        
-        # Ensure 'guid' exists (yfpy validation requires the key, even if None)
-        if 'guid' not in token_data:
-            token_data['guid'] = token_data.get('xoauth_yahoo_guid', None)
-
-    # Explicitly pass token data and disable browser callback
-    query = YahooFantasySportsQuery(
-        league_id=league_id,
-        game_code=game_code,
-        yahoo_consumer_key=client_id,
-        yahoo_consumer_secret=client_secret,
-        yahoo_access_token_json=token_data, 
-        browser_callback=False
-    )
-    
-    return query
+    return get_session().query(league_id, game_code)
@@ -0,0 +1,176 @@
+"""
+Batch analysis of many league databases on a process pool.
+
+Each league is one task: the threshold analysis (with bootstrap intervals)
+and every team's analysis, the same data `report --format json` carries.
+Thresholds and strength-of-schedule ratings are computed once per league
+and shared by its teams. A league without a current snapshot gets one
+first, so team analyses read the mapped cube instead of querying per
+category.
+
+Workers are long-lived processes (one per core by default). Each keeps its
+imports and three caches: an open connection per database (reopened if the
+file is replaced), databases whose schema it already brought up to date,
+and finished results keyed by (path, data_version), so a league listed
+twice is analyzed once. The whole analysis of a league runs on the cached
+connection (database.use_connection), so a worker opens each database once.
+Results stream back as one JSON object per line, in completion order; a
+failing league becomes an error line instead of stopping the batch.
+"""
+
+import os
+import json
+import time
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+from .database import init_db, get_all_teams, get_data_version, use_connection
+from .analytics import calculate_all_thresholds, get_analysis_summary
+from .bootstrap import calculate_threshold_intervals, DEFAULT_RESAMPLES
+from .schedule import calculate_sos_ratings
+from .team_analysis import analyze_team
+from .reports import threshold_report, team_analysis_report, _json_default
+from .snapshot import load_snapshot, write_snapshot
+
+LEAGUE_DB_PATTERN = "league_{league_id}.db"  # League IDs resolve to this name in db_dir
+RESULT_CACHE_SIZE = 64                       # Finished leagues kept per worker
+
+
+@dataclass
+class BatchSummary:
+    """Counts and timing of one batch run."""
+    leagues: int
+    succeeded: int
+    failed: int
+    elapsed: float
+    workers: int
+
+    @property
+    def leagues_per_minute(self) -> float:
+        return self.leagues / self.elapsed * 60 if self.elapsed > 0 else 0.0
+
+
+def resolve_league(target: str, db_dir: str = ".") -> str:
+    """Database path for a path or a league ID (LEAGUE_DB_PATTERN in db_dir)."""
+    if target.isdigit() and not os.path.exists(target):
+        return os.path.join(db_dir, LEAGUE_DB_PATTERN.format(league_id=target))
+    return target
+
+
+def analyze_league(db_path: str, teams: bool = True, confidence: bool = True,
+                   resamples: int = DEFAULT_RESAMPLES) -> dict:
+    """
+    Threshold report data plus every team's analysis data for one league.
+
+    Raises FileNotFoundError for a missing database (it is never created).
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database not found: {db_path}")
+
+    summary = get_analysis_summary(db_path)
+    thresholds = calculate_all_thresholds(db_path)
+    intervals = None
+    if confidence and summary['weeks_analyzed'] > 0:
+        intervals = calculate_threshold_intervals(db_path, resamples=resamples)
+    result = dict(threshold_report(thresholds, summary, intervals).data)
+
+    result['teams'] = []
+    if teams and summary['weeks_analyzed'] > 0:
+        if load_snapshot(db_path) is None:
+            write_snapshot(db_path)
+        calculate_sos_ratings(db_path)  # Cached in the database, read by every team
+        result['teams'] = [
+            team_analysis_report(analyze_team(team['team_id'], db_path, thresholds=thresholds)).data
+            for team in get_all_teams(db_path)
+        ]
+    return result
+
+
+# Per-worker state (each pool process has its own copy)
+_connections: Dict[str, Tuple[int, sqlite3.Connection]] = {}
+_migrated = set()
+_results: 'OrderedDict[tuple, dict]' = OrderedDict()
+
+
+def _connection(path: str) -> sqlite3.Connection:
+    """The worker's open connection to path (reopened if the file was replaced)."""
+    inode = os.stat(path).st_ino
+    cached = _connections.get(path)
+    if cached is None or cached[0] != inode:
+        if cached is not None:
+            cached[1].close()
+        _connections[path] = (inode, sqlite3.connect(path))
+    return _connections[path][1]
+
+
+def _analyze_cached(db_path: str, options: tuple) -> dict:
+    """analyze_league through the worker's connection, schema and result caches."""
+    path = os.path.abspath(db_path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Database not found: {db_path}")
+    if path not in _migrated:
+        init_db(path)
+        _migrated.add(path)
+
+    conn = _connection(path)
+    key = (path, get_data_version(path, conn=conn), options)
+    if key in _results:
+        _results.move_to_end(key)
+        return _results[key]
+    with use_connection(path, conn):
+        result = analyze_league(path, *options)
+    _results[key] = result
+    if len(_results) > RESULT_CACHE_SIZE:
+        _results.popitem(last=False)
+    return result
+
+
+def _run_league(index: int, target: str, db_path: str, options: tuple) -> Tuple[bool, str]:
+    """Success flag and one NDJSON line: the league's results, or its error."""
+    start = time.perf_counter()
+    line = {'index': index, 'league': target, 'db_path': db_path}
+    try:
+        line.update(ok=True, **_analyze_cached(db_path, options))
+    except Exception as e:
+        line.update(ok=False, error=f"{type(e).__name__}: {e}")
+    line['elapsed'] = round(time.perf_counter() - start, 4)
+    line['worker'] = os.getpid()
+    return line['ok'], json.dumps(line, separators=(',', ':'), default=_json_default)
+
+
+def run_batch(targets: Iterable[str], stream: TextIO, max_workers: Optional[int] = None,
+              db_dir: str = ".", teams: bool = True, confidence: bool = True,
+              resamples: int = DEFAULT_RESAMPLES) -> BatchSummary:
+    """
+    Analyze every target (database path or league ID), writing one JSON
+    line per league to `stream` as each finishes. max_workers defaults to
+    the number of cores; 1 runs in this process.
+    """
+    targets: List[str] = list(targets)
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(targets) or 1))
+    options = (teams, confidence, resamples)
+    tasks = [(i, target, resolve_league(target, db_dir), options) for i, target in enumerate(targets)]
+
+    start = time.perf_counter()
+    failed = 0
+
+    def emit(ok: bool, line: str):
+        nonlocal failed
+        failed += not ok
+        stream.write(line + "\n")
+        stream.flush()
+
+    if max_workers == 1:
+        for task in tasks:
+            emit(*_run_league(*task))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_run_league, *task) for task in tasks]
+            for future in as_completed(futures):
+                emit(*future.result())
+
+    return BatchSummary(leagues=len(tasks), succeeded=len(tasks) - failed, failed=failed,
+                        elapsed=time.perf_counter() - start, workers=max_workers)
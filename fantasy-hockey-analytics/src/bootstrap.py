@@ -0,0 +1,133 @@
+"""
+Bootstrap confidence intervals for league winning thresholds.
+
+Each category's winning values are resampled with replacement B times in one
+batch: a (B, n) index matrix is drawn, the resamples are sorted along each
+row, and the median / 75th / 90th percentile of every resample is read off
+with column indexing (same conventions as calculate_thresholds). The interval
+is the percentile interval of those B estimates.
+
+Results are cached in the database per data version (see src/cache.py), so
+repeated `analyze` runs on unchanged data cost one small query.
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+
+import numpy as np
+
+from .analytics import get_decided_values
+from .cache import get_cached, set_cached
+from .snapshot import load_snapshot
+from .constants import ALL_CATEGORIES
+
+DEFAULT_RESAMPLES = 1000
+DEFAULT_LEVEL = 0.90
+DEFAULT_SEED = 0
+
+# Largest resample matrix built at once (elements); bigger inputs are batched
+MAX_MATRIX_SIZE = 4_000_000
+
+
+@dataclass
+class ThresholdIntervals:
+    """Bootstrap confidence intervals for one category's thresholds."""
+    category: str
+    level: float       # e.g. 0.90 for a 90% interval
+    resamples: int
+    sample_size: int
+    median_low: float
+    median_high: float
+    p75_low: float
+    p75_high: float
+    p90_low: float
+    p90_high: float
+
+
+def bootstrap_percentiles(values, resamples: int = DEFAULT_RESAMPLES,
+                          rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Median, 75th and 90th percentile of each bootstrap resample.
+
+    Returns an array of shape (resamples, 3).
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    rng = rng or np.random.default_rng(DEFAULT_SEED)
+
+    lower_mid, upper_mid = (n - 1) // 2, n // 2
+    p75_idx = min(int(n * 0.75), n - 1)
+    p90_idx = min(int(n * 0.90), n - 1)
+
+    batch = max(1, MAX_MATRIX_SIZE // max(n, 1))
+    estimates = []
+    for start in range(0, resamples, batch):
+        rows = min(batch, resamples - start)
+        samples = np.sort(values[rng.integers(0, n, size=(rows, n))], axis=1)
+        estimates.append(np.column_stack([
+            (samples[:, lower_mid] + samples[:, upper_mid]) / 2,
+            samples[:, p75_idx],
+            samples[:, p90_idx],
+        ]))
+
+    return np.concatenate(estimates)
+
+
+def _interval_for(category: str, winning_values, resamples: int, level: float,
+                  rng: np.random.Generator) -> Optional[ThresholdIntervals]:
+    if len(winning_values) < 2:
+        return None  # Nothing to resample
+
+    estimates = bootstrap_percentiles(winning_values, resamples, rng)
+    tail = (1 - level) / 2
+    low, high = np.quantile(estimates, [tail, 1 - tail], axis=0)
+
+    return ThresholdIntervals(
+        category=category,
+        level=level,
+        resamples=resamples,
+        sample_size=len(winning_values),
+        median_low=float(low[0]),
+        median_high=float(high[0]),
+        p75_low=float(low[1]),
+        p75_high=float(high[1]),
+        p90_low=float(low[2]),
+        p90_high=float(high[2])
+    )
+
+
+def calculate_threshold_intervals(db_path: str = "fantasy_hockey.db",
+                                  resamples: int = DEFAULT_RESAMPLES,
+                                  level: float = DEFAULT_LEVEL,
+                                  seed: int = DEFAULT_SEED,
+                                  use_cache: bool = True) -> Dict[str, ThresholdIntervals]:
+    """
+    Bootstrap intervals for every category with at least two decided outcomes.
+
+    Deterministic for a given seed. Returns dict keyed by category.
+    """
+    if resamples < 1:
+        raise ValueError(f"resamples must be at least 1, got {resamples}")
+    if not 0.0 < level < 1.0:
+        raise ValueError(f"level must be in (0, 1), got {level}")
+
+    cache_key = f"threshold_intervals:resamples={resamples}:level={level}:seed={seed}"
+    if use_cache:
+        cached = get_cached(cache_key, db_path)
+        if cached is not None:
+            return {category: ThresholdIntervals(**entry) for category, entry in cached.items()}
+
+    cube = load_snapshot(db_path)
+    rng = np.random.default_rng(seed)
+
+    intervals = {}
+    for category in ALL_CATEGORIES:
+        winning_values, _, _ = get_decided_values(category, db_path, cube)
+        interval = _interval_for(category, winning_values, resamples, level, rng)
+        if interval is not None:
+            intervals[category] = interval
+
+    if use_cache:
+        set_cached(cache_key, {category: asdict(i) for category, i in intervals.items()}, db_path)
+
+    return intervals
@@ -0,0 +1,72 @@
+"""
+Cache for derived analysis results, stored in the league database.
+
+Entries are JSON payloads keyed by name and tagged with the database's
+data_version at the time they were computed. Every save bumps data_version,
+so entries computed from older data are never returned and are cleared on
+the next write.
+"""
+
+import json
+import sqlite3
+from typing import Any, Optional
+
+from .database import get_data_version, _connect
+
+
+def _ensure_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_cache (
+            key TEXT PRIMARY KEY,
+            data_version INTEGER NOT NULL,
+            payload TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def get_cached(key: str, db_path: str = "fantasy_hockey.db") -> Optional[Any]:
+    """Cached payload for key if it was computed from the current data, else None."""
+    data_version = get_data_version(db_path)
+    conn = _connect(db_path)
+    try:
+        row = conn.execute(
+            "SELECT payload FROM analysis_cache WHERE key = ? AND data_version = ?",
+            (key, data_version)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        row = None  # No cache table yet
+    conn.close()
+    return json.loads(row[0]) if row else None
+
+
+def set_cached(key: str, payload: Any, db_path: str = "fantasy_hockey.db"):
+    """Store a JSON-serializable payload for the current data version."""
+    data_version = get_data_version(db_path)
+    conn = _connect(db_path)
+    cursor = conn.cursor()
+    _ensure_table(cursor)
+
+    # Entries for older data can never be hit again
+    cursor.execute("DELETE FROM analysis_cache WHERE data_version != ?", (data_version,))
+    cursor.execute("""
+        INSERT INTO analysis_cache (key, data_version, payload) VALUES (?, ?, ?)
+        ON CONFLICT(key) DO UPDATE SET
+            data_version = excluded.data_version,
+            payload = excluded.payload,
+            created_at = CURRENT_TIMESTAMP
+    """, (key, data_version, json.dumps(payload, separators=(',', ':'))))
+
+    conn.commit()
+    conn.close()
+
+
+def clear_cache(db_path: str = "fantasy_hockey.db"):
+    """Remove every cached entry."""
+    conn = _connect(db_path)
+    try:
+        conn.execute("DELETE FROM analysis_cache")
+        conn.commit()
+    except sqlite3.OperationalError:
+        pass  # No cache table yet
+    conn.close()
@@ -0,0 +1,85 @@
+"""
+Exact multi-week aggregation of the goalie ratio categories.
+
+A week's SV% and GAA are ratios, so averaging weekly values weights a
+one-start week the same as a five-start week and counts weeks without a
+start as 0. When the fetcher captured the components (saves, shots against,
+goals against, minutes), the true ratio over any run of weeks is
+
+    SV% = sum(saves) / sum(shots_against)
+    GAA = 60 * sum(goals_against) / sum(minutes)
+
+ComponentSeries keeps per-team prefix sums of each component, so any
+window's totals (and its exact ratio) are two lookups. Teams with missing
+components (leagues that don't track them) get no series; callers fall back
+to the mean of the weekly ratios.
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Dict, List, Optional
+
+from .database import get_goalie_components
+from .constants import COMPONENT_FIELDS, RATIO_COMPONENTS
+
+
+@dataclass
+class ComponentSeries:
+    """Prefix sums of one team's goalie components over its stored weeks."""
+    team_id: int
+    weeks: List[int]
+    prefix: Dict[str, List[float]]  # field -> running totals, len(weeks) + 1 entries
+
+    @classmethod
+    def from_rows(cls, team_id: int, rows: List[dict]) -> Optional['ComponentSeries']:
+        """Build from one team's get_goalie_components() rows; None if any component is missing."""
+        if not rows or any(row[field] is None for row in rows for field in COMPONENT_FIELDS):
+            return None
+        prefix = {
+            field: [0.0] + list(accumulate(float(row[field]) for row in rows))
+            for field in COMPONENT_FIELDS
+        }
+        return cls(team_id=team_id, weeks=[row['week'] for row in rows], prefix=prefix)
+
+    def totals(self, start: int = 0, end: Optional[int] = None) -> Dict[str, float]:
+        """Component totals over weeks[start:end]."""
+        end = len(self.weeks) if end is None else end
+        return {field: sums[end] - sums[start] for field, sums in self.prefix.items()}
+
+    def ratio(self, category: str, start: int = 0, end: Optional[int] = None) -> Optional[float]:
+        """Exact SV% or GAA over weeks[start:end]; None without a goalie start."""
+        numerator, denominator, scale = RATIO_COMPONENTS[category]
+        end = len(self.weeks) if end is None else end
+        total = self.prefix[denominator][end] - self.prefix[denominator][start]
+        if total <= 0:
+            return None
+        return scale * (self.prefix[numerator][end] - self.prefix[numerator][start]) / total
+
+    def ratio_between(self, category: str, first_week: int, last_week: int) -> Optional[float]:
+        """Exact ratio over the stored weeks first_week..last_week (inclusive)."""
+        start = bisect_left(self.weeks, first_week)
+        end = bisect_right(self.weeks, last_week)
+        return self.ratio(category, start, end)
+
+
+def load_component_series(db_path: str = "fantasy_hockey.db",
+                          complete_only: bool = True) -> Dict[int, ComponentSeries]:
+    """Component series for every team whose stored weeks all have components."""
+    rows_by_team = {}
+    for row in get_goalie_components(complete_only=complete_only, db_path=db_path):
+        rows_by_team.setdefault(row['team_id'], []).append(row)
+
+    series = {}
+    for team_id, rows in rows_by_team.items():
+        team_series = ComponentSeries.from_rows(team_id, rows)
+        if team_series is not None:
+            series[team_id] = team_series
+    return series
+
+
+def get_team_component_series(team_id: int, db_path: str = "fantasy_hockey.db",
+                              complete_only: bool = True) -> Optional[ComponentSeries]:
+    """One team's component series, or None if it has no weeks or missing components."""
+    rows = get_goalie_components(team_id, complete_only=complete_only, db_path=db_path)
+    return ComponentSeries.from_rows(team_id, rows)
@@ -8,6 +8,9 @@ DB_PATH = os.getenv("FANTASY_DB_PATH", "fantasy_hockey.db")
 # User's team ID (set this in .env or override with --id flag)
 MY_TEAM_ID = int(os.getenv("MY_TEAM_ID", "0"))
 
+# Static dashboard directory, brought up to date after every fetch (unset: off)
+DASHBOARD_DIR = os.getenv("DASHBOARD_DIR", "")
+
 
 def get_my_team_id() -> int:
     """Get the configured team ID."""
@@ -17,3 +20,8 @@ def get_my_team_id() -> int:
 def is_my_team_configured() -> bool:
     """Check if user has configured their team ID."""
     return MY_TEAM_ID > 0
+
+
+def get_dashboard_dir() -> str:
+    """Get the configured dashboard directory ('' when not configured)."""
+    return DASHBOARD_DIR
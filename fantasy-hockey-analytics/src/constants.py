@@ -15,6 +15,31 @@ ID_TO_FIELD = {
     23: 'gaa'
 }
 
+# Yahoo goalie stat IDs for the components of SV% and GAA. Yahoo only
+# returns them when the league tracks them (scored or display-only stats).
+COMPONENT_STAT_IDS = {
+    22: 'goals_against',
+    24: 'shots_against',
+    25: 'saves',
+    28: 'minutes'  # Goalie time on ice
+}
+COMPONENT_FIELDS = ['saves', 'shots_against', 'goals_against', 'minutes']
+
+# Ratio categories as (numerator, denominator, scale) component fields:
+# SV% = saves / shots against, GAA = goals against * 60 / minutes
+RATIO_COMPONENTS = {
+    'save_pct': ('saves', 'shots_against', 1.0),
+    'gaa': ('goals_against', 'minutes', 60.0)
+}
+
+# Standard starting roster slots (players in any other slot, e.g. BN/IR, don't score)
+ROSTER_SLOTS = {'C': 2, 'LW': 2, 'RW': 2, 'D': 4, 'G': 2}
+BENCH_POSITIONS = {'BN', 'IR', 'IR+', 'NA'}
+
+# Free agents' weekly lines are stored under this team id and slot
+FREE_AGENT_TEAM_ID = 0
+FREE_AGENT_POSITION = 'FA'
+
 # Categories where lower is better (use internal field names)
 LOWER_IS_BETTER = {'gaa'}
 
@@ -0,0 +1,212 @@
+"""
+Category covariance model and correlated weekly stat sampler.
+
+Goals, assists, points, PPP and shots move together week to week, so
+simulations that draw each category independently misstate matchup odds.
+This module fits, from every complete team-week in the stat cube:
+
+    league   mean vector and covariance matrix over ALL_CATEGORIES
+    per team mean vector and covariance, shrunk toward the league covariance
+             (a team has ~10-25 weeks for 11 categories, so its own sample
+             covariance alone is singular)
+
+All teams are fitted in one pass (grouped sums of x and x x^T), and every
+covariance is factorised with one batched Cholesky call. Draws are
+mean + z @ L^T for standard normal z.
+
+Weeks without a goalie start (SV%/GAA stored as 0) are left out of the fit,
+as in team_analysis. Fitted parameters are cached per data version.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from .cache import get_cached, set_cached
+from .database import RATE_CATEGORIES
+from .snapshot import StatCube, load_snapshot, PRESENT, COMPLETE
+from .constants import ALL_CATEGORIES
+
+# Pseudo-weeks of league covariance blended into each team's covariance
+DEFAULT_SHRINKAGE_WEEKS = 10
+
+# Starting diagonal loading (fraction of each variance) for singular matrices
+JITTER = 1e-9
+
+
+@dataclass
+class CategoryCovarianceModel:
+    """Fitted means/covariances with Cholesky factors for correlated sampling."""
+    categories: List[str]
+    team_ids: List[int]
+    team_weeks: List[int]        # Weeks used per team
+    league_mean: np.ndarray      # [C]
+    league_cov: np.ndarray       # [C, C]
+    team_means: np.ndarray       # [T, C]
+    team_covs: np.ndarray        # [T, C, C]
+    shrinkage_weeks: int = DEFAULT_SHRINKAGE_WEEKS
+
+    def __post_init__(self):
+        self.team_index = {team_id: i for i, team_id in enumerate(self.team_ids)}
+        self.league_chol = _cholesky(self.league_cov)
+        self.team_chols = _cholesky(self.team_covs) if len(self.team_ids) else np.zeros((0,) + self.league_cov.shape)
+
+    def correlation(self, team_id: Optional[int] = None) -> np.ndarray:
+        """Category correlation matrix (league-wide, or for one team)."""
+        cov = self.league_cov if team_id is None else self.team_covs[self.team_index[team_id]]
+        std = np.sqrt(np.diag(cov))
+        std[std == 0] = 1.0
+        return cov / np.outer(std, std)
+
+    def sample(self, team_id: Optional[int] = None, size: int = 1,
+               rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Correlated weekly stat lines, shape (size, C), in `categories` order.
+
+        team_id=None draws for a league-average team. Unknown teams also fall
+        back to the league distribution.
+        """
+        rng = rng or np.random.default_rng()
+        if team_id is None or team_id not in self.team_index:
+            mean, chol = self.league_mean, self.league_chol
+        else:
+            i = self.team_index[team_id]
+            mean, chol = self.team_means[i], self.team_chols[i]
+        z = rng.standard_normal((size, len(self.categories)))
+        return mean + z @ chol.T
+
+    def sample_teams(self, team_ids: List[int], size: int = 1,
+                     rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """Draws for several teams at once, shape (len(team_ids), size, C)."""
+        rng = rng or np.random.default_rng()
+        rows = [self.team_index.get(t) for t in team_ids]
+        means = np.stack([self.league_mean if i is None else self.team_means[i] for i in rows])
+        chols = np.stack([self.league_chol if i is None else self.team_chols[i] for i in rows])
+        z = rng.standard_normal((len(team_ids), size, len(self.categories)))
+        return means[:, None, :] + np.einsum('tsj,tij->tsi', z, chols)
+
+    def to_payload(self) -> dict:
+        """JSON-serializable form for the analysis cache."""
+        return {
+            'categories': self.categories,
+            'team_ids': self.team_ids,
+            'team_weeks': self.team_weeks,
+            'league_mean': self.league_mean.tolist(),
+            'league_cov': self.league_cov.tolist(),
+            'team_means': self.team_means.tolist(),
+            'team_covs': self.team_covs.tolist(),
+            'shrinkage_weeks': self.shrinkage_weeks,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> 'CategoryCovarianceModel':
+        num_categories = len(payload['categories'])
+        return cls(
+            categories=payload['categories'],
+            team_ids=payload['team_ids'],
+            team_weeks=payload['team_weeks'],
+            league_mean=np.array(payload['league_mean']),
+            league_cov=np.array(payload['league_cov']),
+            team_means=np.array(payload['team_means']).reshape(-1, num_categories),
+            team_covs=np.array(payload['team_covs']).reshape(-1, num_categories, num_categories),
+            shrinkage_weeks=payload['shrinkage_weeks']
+        )
+
+
+def _cholesky(cov: np.ndarray) -> np.ndarray:
+    """
+    Batched Cholesky factor, loading the diagonal until it succeeds.
+
+    Points = goals + assists, so the covariance is always singular; a tiny
+    relative loading of each variance makes it positive definite.
+    """
+    variances = np.diagonal(cov, axis1=-2, axis2=-1)
+    loading = np.where(variances > 0, variances, 1.0)[..., None] * np.eye(cov.shape[-1])
+    jitter = 0.0
+    while True:
+        try:
+            return np.linalg.cholesky(cov + jitter * loading)
+        except np.linalg.LinAlgError:
+            jitter = JITTER if jitter == 0.0 else jitter * 10
+
+
+def _observations(cube: StatCube):
+    """(team rows, values [N, C]) for complete team-weeks with goalie data."""
+    required = PRESENT | COMPLETE
+    teams, weeks = np.nonzero((cube.flags & required) == required)
+    columns = [cube.category_index[c] for c in ALL_CATEGORIES]
+    values = cube.values[teams, weeks][:, columns]
+
+    started = np.ones(len(teams), dtype=bool)
+    for category in RATE_CATEGORIES:
+        started &= values[:, ALL_CATEGORIES.index(category)] != 0
+    return teams[started], values[started]
+
+
+def fit_covariance_model(cube: StatCube,
+                         shrinkage_weeks: int = DEFAULT_SHRINKAGE_WEEKS) -> CategoryCovarianceModel:
+    """Fit league and per-team covariance from a stat cube."""
+    teams, values = _observations(cube)
+    num_teams, num_categories = len(cube.team_ids), len(ALL_CATEGORIES)
+
+    if len(values) >= 2:
+        league_mean = values.mean(axis=0)
+        league_cov = np.cov(values, rowvar=False)
+    else:
+        league_mean = values.mean(axis=0) if len(values) else np.zeros(num_categories)
+        league_cov = np.zeros((num_categories, num_categories))
+
+    # Grouped first and second moments for every team at once
+    counts = np.bincount(teams, minlength=num_teams).astype(float)
+    sums = np.zeros((num_teams, num_categories))
+    outer = np.zeros((num_teams, num_categories, num_categories))
+    np.add.at(sums, teams, values)
+    np.add.at(outer, teams, np.einsum('ni,nj->nij', values, values))
+
+    safe_counts = np.maximum(counts, 1.0)
+    team_means = np.where(counts[:, None] > 0, sums / safe_counts[:, None], league_mean)
+    scatter = outer - np.einsum('t,ti,tj->tij', counts, team_means, team_means)
+
+    # Shrink toward the league: (scatter + k * league) / (n - 1 + k)
+    degrees = np.maximum(counts - 1.0, 0.0)
+    weights = np.maximum(degrees + shrinkage_weeks, 1.0)
+    team_covs = (scatter + shrinkage_weeks * league_cov) / weights[:, None, None]
+
+    return CategoryCovarianceModel(
+        categories=list(ALL_CATEGORIES),
+        team_ids=[int(t) for t in cube.team_ids],
+        team_weeks=[int(c) for c in counts],
+        league_mean=league_mean,
+        league_cov=league_cov,
+        team_means=team_means,
+        team_covs=team_covs,
+        shrinkage_weeks=shrinkage_weeks
+    )
+
+
+def get_covariance_model(db_path: str = "fantasy_hockey.db",
+                         shrinkage_weeks: int = DEFAULT_SHRINKAGE_WEEKS,
+                         use_cache: bool = True) -> CategoryCovarianceModel:
+    """
+    Covariance model for the stored league data.
+
+    Reads the stat cube snapshot when current (SQLite otherwise); the fitted
+    parameters are cached until the data changes.
+    """
+    if shrinkage_weeks < 0:
+        raise ValueError(f"shrinkage_weeks must be non-negative, got {shrinkage_weeks}")
+
+    cache_key = f"covariance_model:shrinkage={shrinkage_weeks}"
+    if use_cache:
+        cached = get_cached(cache_key, db_path)
+        if cached is not None:
+            return CategoryCovarianceModel.from_payload(cached)
+
+    cube = load_snapshot(db_path) or StatCube.from_database(db_path)
+    model = fit_covariance_model(cube, shrinkage_weeks)
+
+    if use_cache:
+        set_cached(cache_key, model.to_payload(), db_path)
+
+    return model
@@ -0,0 +1,289 @@
+"""
+Static dashboard: HTML pages with charts plus JSON data bundles.
+
+    index.html            thresholds per category (winning/losing ranges,
+                          median and 75th percentile) and the team list
+    team_<id>.html        the team analysis with a weekly chart per category
+                          against the winning median
+    data/league.json      thresholds and teams
+    data/team_<id>.json   weekly values and assessments
+
+Charts are inline SVG, so the site needs no scripts and can be published as
+static files.
+
+Regeneration is incremental. Each page's inputs are hashed from the stat
+cube before any analysis runs: the complete weeks' values and pairings (the
+league hash) plus the team's id and name. A page is rebuilt only when that
+hash differs from the one in manifest.json or its file is missing. A team's
+analysis is measured against league thresholds, so a new complete week
+rebuilds every page. A live-week refresh rebuilds nothing, and a renamed
+team rebuilds its own page and the index.
+"""
+
+import hashlib
+import html
+import json
+import os
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .analytics import calculate_all_thresholds, get_analysis_summary
+from .database import RATE_CATEGORIES, get_all_teams
+from .reports import html_page, html_sections, team_analysis_report
+from .schedule import calculate_sos_ratings
+from .snapshot import StatCube, load_snapshot, PRESENT, COMPLETE
+from .team_analysis import analyze_team
+from .constants import ALL_CATEGORIES, CATEGORY_DISPLAY_NAMES, LOWER_IS_BETTER
+
+DASHBOARD_VERSION = 1  # Part of every page hash: bump when page layouts change
+MANIFEST = "manifest.json"
+DATA_DIR = "data"
+CHART_WIDTH = 280
+CHART_HEIGHT = 90
+
+
+@dataclass
+class DashboardResult:
+    """Pages written, skipped as unchanged and removed by one build."""
+    output_dir: str
+    written: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+def _digest(*parts) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _complete_weeks(cube: StatCube) -> np.ndarray:
+    """Week columns with at least one complete matchup."""
+    required = PRESENT | COMPLETE
+    return np.nonzero(((cube.flags & required) == required).any(axis=0))[0]
+
+
+def page_hashes(cube: StatCube, teams: List[dict]) -> Dict[str, str]:
+    """Content hash of each page's inputs (page file -> hash)."""
+    weeks = _complete_weeks(cube)
+    required = PRESENT | COMPLETE
+    complete = (cube.flags[:, weeks] & required) == required
+    league = _digest(
+        DASHBOARD_VERSION,
+        cube.team_ids.tobytes(),
+        cube.weeks[weeks].tobytes(),
+        ",".join(sorted(cube.category_index)),
+        np.where(complete[..., None], cube.values[:, weeks], 0).tobytes(),
+        np.where(complete, cube.opponent[:, weeks], -1).tobytes(),
+    )
+    names = [(team['team_id'], team['current_name']) for team in teams]
+    hashes = {"index.html": _digest(league, names)}
+    if len(weeks):
+        for team_id, name in names:
+            hashes[f"team_{team_id}.html"] = _digest(league, team_id, name)
+    return hashes
+
+
+def _load_manifest(output_dir: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(output_dir, MANIFEST)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get('pages', {}) if manifest.get('version') == DASHBOARD_VERSION else {}
+
+
+def _write(path: str, content: str):
+    """Write through a temporary file so a reader never sees half a page."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+# Charts
+
+def _scale(value: float, low: float, high: float, size: float) -> float:
+    return 0.0 if high == low else (value - low) / (high - low) * size
+
+
+def line_chart(weeks: List[int], values: List[Optional[float]], reference: Optional[float] = None,
+               label: str = "") -> str:
+    """Weekly values as an SVG polyline, with an optional dashed reference line."""
+    points = [(w, v) for w, v in zip(weeks, values) if v is not None]
+    if not points:
+        return f'<svg width="{CHART_WIDTH}" height="{CHART_HEIGHT}"><text x="4" y="16">No data</text></svg>'
+    ys = [v for _, v in points] + ([reference] if reference is not None else [])
+    low, high = min(ys), max(ys)
+    pad = (high - low) * 0.1 or 1.0
+    low, high = low - pad, high + pad
+    first, last = weeks[0], weeks[-1]
+
+    def xy(week, value):
+        x = 4 + _scale(week, first, last, CHART_WIDTH - 8)
+        y = CHART_HEIGHT - 4 - _scale(value, low, high, CHART_HEIGHT - 8)
+        return f"{x:.1f},{y:.1f}"
+
+    out = [f'<svg width="{CHART_WIDTH}" height="{CHART_HEIGHT}" role="img" aria-label="{html.escape(label)}">']
+    if reference is not None:
+        y = xy(first, reference).split(",")[1]
+        out.append(f'<line x1="4" x2="{CHART_WIDTH - 4}" y1="{y}" y2="{y}" stroke="#999" stroke-dasharray="4 3"/>')
+    out.append(f'<polyline fill="none" stroke="#2a6fdb" stroke-width="2" '
+               f'points="{" ".join(xy(w, v) for w, v in points)}"/>')
+    for w, v in points:
+        x, y = xy(w, v).split(",")
+        out.append(f'<circle cx="{x}" cy="{y}" r="2.5" fill="#2a6fdb"><title>Week {w}: {v:g}</title></circle>')
+    out.append("</svg>")
+    return "".join(out)
+
+
+def range_chart(threshold: dict) -> str:
+    """Winning (green) and losing (red) value ranges with median and 75th percentile ticks."""
+    low = min(threshold['min_winning'], threshold['min_losing'])
+    high = max(threshold['max_winning'], threshold['max_losing'])
+    pad = (high - low) * 0.05 or 1.0
+    low, high = low - pad, high + pad
+
+    def x(value):
+        return 4 + _scale(value, low, high, CHART_WIDTH - 8)
+
+    def bar(start, end, y, color, name):
+        return (f'<rect x="{x(start):.1f}" y="{y}" width="{max(x(end) - x(start), 1):.1f}" height="10" '
+                f'fill="{color}"><title>{name}: {start:g} to {end:g}</title></rect>')
+
+    out = [f'<svg width="{CHART_WIDTH}" height="40">',
+           bar(threshold['min_winning'], threshold['max_winning'], 6, "#6cbf6c", "Winning values"),
+           bar(threshold['min_losing'], threshold['max_losing'], 22, "#e07b7b", "Losing values")]
+    for name, value in (("Median", threshold['median_winning']), ("75th %", threshold['p75_winning'])):
+        out.append(f'<line x1="{x(value):.1f}" x2="{x(value):.1f}" y1="2" y2="38" stroke="#222">'
+                   f'<title>{name}: {value:g}</title></line>')
+    out.append("</svg>")
+    return "".join(out)
+
+
+# Pages
+
+def _league_bundle(thresholds: dict, summary: dict, teams: List[dict]) -> dict:
+    return {
+        'weeks': summary['complete_week_numbers'],
+        'thresholds': {category: asdict(t) for category, t in thresholds.items()},
+        'teams': [{'team_id': t['team_id'], 'name': t['current_name'], 'page': f"team_{t['team_id']}.html"}
+                  for t in teams],
+    }
+
+
+def _index_page(bundle: dict) -> str:
+    esc = html.escape
+    body = ["<h1>League Dashboard</h1>"]
+    weeks = bundle['weeks']
+    if not weeks:
+        body.append('<p class="subtitle">No completed weeks yet.</p>')
+    else:
+        body.append(f'<p class="subtitle">{len(weeks)} complete weeks (weeks {weeks[0]}-{weeks[-1]})</p>')
+        body.append("<h2>Winning Thresholds</h2>")
+        body.append("<table><thead><tr><th>Category</th><th>Median</th><th>75th %</th>"
+                    "<th>Winning / losing values</th></tr></thead><tbody>")
+        for category in ALL_CATEGORIES:
+            threshold = bundle['thresholds'].get(category)
+            if not threshold or threshold['sample_size'] == 0:
+                continue
+            name = CATEGORY_DISPLAY_NAMES.get(category, category)
+            if category in LOWER_IS_BETTER:
+                name += " (lower wins)"
+            body.append(f"<tr><td>{esc(name)}</td><td>{threshold['median_winning']:g}</td>"
+                        f"<td>{threshold['p75_winning']:g}</td><td>{range_chart(threshold)}</td></tr>")
+        body.append("</tbody></table>")
+    body.append("<h2>Teams</h2><ul>")
+    for team in bundle['teams']:
+        link = f'<a href="{team["page"]}">{esc(team["name"])}</a>' if weeks else esc(team['name'])
+        body.append(f"<li>{link}</li>")
+    body.append('</ul><p class="note">Data: <a href="data/league.json">data/league.json</a></p>')
+    return html_page("League Dashboard", body)
+
+
+def _team_values(cube: StatCube, team_id: int) -> Dict[str, list]:
+    """The team's complete weeks and their values per category (rate stats None without a start)."""
+    t = cube.team_index[team_id]
+    required = PRESENT | COMPLETE
+    columns = np.nonzero((cube.flags[t] & required) == required)[0]
+    values = {'weeks': [int(w) for w in cube.weeks[columns]]}
+    for category in ALL_CATEGORIES:
+        series = cube.values[t, columns, cube.category_index[category]].tolist()
+        if category in RATE_CATEGORIES:
+            series = [None if v == 0 else v for v in series]
+        values[category] = series
+    return values
+
+
+def _team_page(result, weekly: Dict[str, list]) -> str:
+    esc = html.escape
+    body = ['<p><a href="index.html">&larr; League</a></p>']
+    body += html_sections(team_analysis_report(result))
+    body.append("<h2>Weekly Values</h2>")
+    body.append('<p class="note">Dashed line: the median winning value.</p><table><tbody>')
+    for category in ALL_CATEGORIES:
+        name = CATEGORY_DISPLAY_NAMES.get(category, category)
+        chart = line_chart(weekly['weeks'], weekly[category], result.assessments[category].threshold_median, name)
+        body.append(f"<tr><td>{esc(name)}</td><td>{chart}</td></tr>")
+    body.append(f'</tbody></table><p class="note">Data: <a href="data/team_{result.team_id}.json">'
+                f'data/team_{result.team_id}.json</a></p>')
+    return html_page(f"{result.team_name} - Team Dashboard", body)
+
+
+def build_dashboard(output_dir: str, db_path: str = "fantasy_hockey.db",
+                    force: bool = False) -> DashboardResult:
+    """
+    Write (or bring up to date) the dashboard in `output_dir`.
+
+    Only pages whose input hash changed are rebuilt (all of them with
+    force=True); pages for teams no longer in the league are removed.
+    """
+    os.makedirs(os.path.join(output_dir, DATA_DIR), exist_ok=True)
+    result = DashboardResult(output_dir)
+    cube = load_snapshot(db_path) or StatCube.from_database(db_path)
+    # Teams without a matchup in the cube have no values to chart
+    teams = [team for team in get_all_teams(db_path) if team['team_id'] in cube.team_index]
+    hashes = page_hashes(cube, teams)
+    manifest = _load_manifest(output_dir)
+
+    stale = [page for page, digest in hashes.items()
+             if force or manifest.get(page) != digest or not os.path.exists(os.path.join(output_dir, page))]
+    result.unchanged = [page for page in hashes if page not in stale]
+
+    if stale:
+        thresholds = calculate_all_thresholds(db_path)
+        summary = get_analysis_summary(db_path)
+        if "index.html" in stale:
+            bundle = _league_bundle(thresholds, summary, teams)
+            _write(os.path.join(output_dir, DATA_DIR, "league.json"), json.dumps(bundle, indent=2))
+            _write(os.path.join(output_dir, "index.html"), _index_page(bundle))
+            result.written.append("index.html")
+
+        team_pages = [page for page in stale if page != "index.html"]
+        if team_pages:
+            calculate_sos_ratings(db_path)  # Once for every team
+        for page in team_pages:
+            team_id = int(page[len("team_"):-len(".html")])
+            analysis = analyze_team(team_id, db_path, thresholds=thresholds)
+            weekly = _team_values(cube, team_id)
+            bundle = {'team_id': team_id, 'name': analysis.team_name, **weekly,
+                      'assessments': {c: asdict(a) for c, a in analysis.assessments.items()}}
+            _write(os.path.join(output_dir, DATA_DIR, f"team_{team_id}.json"), json.dumps(bundle, indent=2))
+            _write(os.path.join(output_dir, page), _team_page(analysis, weekly))
+            result.written.append(page)
+
+    for page in manifest:
+        if page not in hashes:
+            for path in (os.path.join(output_dir, page),
+                         os.path.join(output_dir, DATA_DIR, page.replace(".html", ".json"))):
+                if os.path.exists(path):
+                    os.remove(path)
+            result.removed.append(page)
+
+    _write(os.path.join(output_dir, MANIFEST),
+           json.dumps({'version': DASHBOARD_VERSION, 'pages': hashes}, indent=2, sort_keys=True))
+    return result
@@ -1,11 +1,20 @@
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
 from yfpy.query import YahooFantasySportsQuery
-from .models import TeamStats, Matchup, SeasonData
-from .constants import ID_TO_FIELD, LOWER_IS_BETTER
+from .models import TeamStats, Matchup, SeasonData, PlayerWeek
+from .constants import (ID_TO_FIELD, COMPONENT_STAT_IDS, LOWER_IS_BETTER,
+                        FREE_AGENT_TEAM_ID, FREE_AGENT_POSITION)
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Concurrent roster-stat requests (one per team-week)
+DEFAULT_PLAYER_WORKERS = 4
+
+# Free agents: best-ranked available players fetched, in Yahoo's page size
+DEFAULT_FREE_AGENT_LIMIT = 1000
+FREE_AGENT_PAGE_SIZE = 25
+
 class DataFetcher:
     def __init__(self, query: YahooFantasySportsQuery, league_id: str):
         self.query = query
@@ -15,6 +24,24 @@ class DataFetcher:
         """Finds the Yahoo Game ID for the specified NHL season."""
         return self.query.get_game_key_by_season(season)
 
+    def get_current_week(self) -> int:
+        """The league's current (possibly in-progress) scoring week."""
+        return int(self.query.get_league_metadata().current_week)
+
+    def fetch_week_raw(self, week: int) -> list:
+        """One week's yfpy matchups, unparsed (see matchup_key/matchup_fingerprint)."""
+        return self.query.get_league_matchups_by_week(chosen_week=week)
+
+    def matchup_key(self, yfpy_matchup) -> Tuple[str, str]:
+        """Stable identity of a matchup within a week (its two team keys)."""
+        return tuple(str(getattr(team, 'team_key', getattr(team, 'team_id', ''))) for team in yfpy_matchup.teams[:2])
+
+    def matchup_fingerprint(self, yfpy_matchup) -> tuple:
+        """Raw status and stat values; equal fingerprints mean nothing to reparse."""
+        return (str(yfpy_matchup.status),) + tuple(
+            tuple(self._raw_stats(team)) for team in yfpy_matchup.teams[:2]
+        )
+
     def fetch_season_data(self, game_id: str, start_week: int, end_week: int) -> SeasonData:
         all_matchups = []
         
@@ -36,6 +63,103 @@ class DataFetcher:
             matchups=all_matchups
         )
 
+    def fetch_player_weeks(self, team_ids: List[int], weeks: List[int],
+                           max_workers: int = DEFAULT_PLAYER_WORKERS) -> List[PlayerWeek]:
+        """
+        Roster and weekly stats for every player of every team in `weeks`.
+        
+        One request per team-week, run concurrently on `max_workers` threads
+        sharing the authenticated query. Failed team-weeks are logged and
+        skipped (like failed weeks in fetch_season_data); their week is not
+        counted as complete by get_complete_player_weeks, so it is fetched
+        again next time.
+        """
+        tasks = [(team_id, week) for week in weeks for team_id in team_ids]
+        players = []
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = {pool.submit(self._fetch_roster_stats, team_id, week): (team_id, week)
+                       for team_id, week in tasks}
+            for future in as_completed(futures):
+                team_id, week = futures[future]
+                try:
+                    players.extend(future.result())
+                except Exception as e:
+                    logger.error(f"Error fetching roster stats for team {team_id}, week {week}: {e}")
+        
+        players.sort(key=lambda p: (p.week, p.team_id, p.player_id))
+        return players
+
+    def fetch_free_agents(self, weeks: List[int], limit: int = DEFAULT_FREE_AGENT_LIMIT,
+                          max_workers: int = DEFAULT_PLAYER_WORKERS) -> List[PlayerWeek]:
+        """
+        Weekly stats of the `limit` best-ranked available players (free agents
+        and waivers) for each of `weeks`, stored under FREE_AGENT_TEAM_ID.
+        
+        Yahoo pages the player collection, so pages are requested concurrently
+        like roster stats. Failed or empty pages are logged and skipped.
+        """
+        tasks = [(week, start) for week in weeks for start in range(0, limit, FREE_AGENT_PAGE_SIZE)]
+        players = []
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = {pool.submit(self._fetch_free_agent_page, week, start): (week, start)
+                       for week, start in tasks}
+            for future in as_completed(futures):
+                week, start = futures[future]
+                try:
+                    players.extend(future.result())
+                except Exception as e:
+                    logger.warning(f"Error fetching free agents {start}+ for week {week}: {e}")
+        
+        # A player on two pages (ranks shift between requests) is kept once
+        unique = {(p.week, p.player_id): p for p in players}
+        return sorted(unique.values(), key=lambda p: (p.week, p.player_id))
+
+    def _fetch_free_agent_page(self, week: int, start: int) -> List[PlayerWeek]:
+        logger.info(f"Fetching free agents {start}+ for week {week}...")
+        page = self.query.query(
+            f"https://fantasysports.yahooapis.com/fantasy/v2/league/{self.query.get_league_key()}/players;"
+            f"status=A;sort=AR;start={start};count={FREE_AGENT_PAGE_SIZE}/stats;type=week;week={week}",
+            ["league", "players"]
+        )
+        page = page if isinstance(page, list) else [page]
+        return [self._extract_player(player, FREE_AGENT_TEAM_ID, week, FREE_AGENT_POSITION)
+                for player in page if player]
+
+    def _fetch_roster_stats(self, team_id: int, week: int) -> List[PlayerWeek]:
+        logger.info(f"Fetching roster stats for team {team_id}, week {week}...")
+        roster = self.query.get_team_roster_player_stats_by_week(team_id, chosen_week=week)
+        return [self._extract_player(player, team_id, week) for player in roster]
+
+    def _extract_player(self, player, team_id: int, week: int,
+                        selected_position: Optional[str] = None) -> PlayerWeek:
+        name = getattr(player, 'full_name', '') or getattr(getattr(player, 'name', None), 'full', '')
+        if isinstance(name, bytes):
+            name = name.decode('utf-8')
+        
+        stats = {}
+        for s_id, val in self._stat_pairs(getattr(player, 'stats', None) or []):
+            try:
+                if s_id in ID_TO_FIELD:
+                    stats[ID_TO_FIELD[s_id]] = float(val)
+                elif s_id in COMPONENT_STAT_IDS:
+                    stats[COMPONENT_STAT_IDS[s_id]] = self._parse_component(val)
+            except ValueError:
+                pass # leave unset
+        
+        return PlayerWeek(
+            player_id=int(player.player_id),
+            team_id=team_id,
+            week=week,
+            name=str(name),
+            nhl_team=str(getattr(player, 'editorial_team_abbr', '') or ''),
+            display_position=str(getattr(player, 'display_position', '') or ''),
+            eligible_positions=[str(p) for p in (getattr(player, 'eligible_positions', None) or [])],
+            selected_position=selected_position or str(getattr(player, 'selected_position_value', '') or ''),
+            stats=stats
+        )
+
     def _process_matchup(self, yfpy_matchup, week: int) -> Matchup:
         t1_raw = yfpy_matchup.teams[0]
         t2_raw = yfpy_matchup.teams[1]
@@ -93,47 +217,77 @@ class DataFetcher:
             manager_name=manager
         )
         
+        for s_id, val in self._raw_stats(team_obj):
+            if s_id in ID_TO_FIELD:
+                field_name = ID_TO_FIELD[s_id]
+                # Convert to int or float
+                try:
+                    if field_name in ['save_pct', 'gaa']:
+                        parsed_val = float(val)
+                    else:
+                        parsed_val = int(float(val)) # handle "7.0"
+                    setattr(ts, field_name, parsed_val)
+                except ValueError:
+                    pass # keep default 0
+            elif s_id in COMPONENT_STAT_IDS:
+                setattr(ts, COMPONENT_STAT_IDS[s_id], self._parse_component(val))
+        
+        # Shots against = saves + goals against when only those two are tracked
+        if ts.shots_against is None and ts.saves is not None and ts.goals_against is not None:
+            ts.shots_against = ts.saves + ts.goals_against
+        
+        return ts
+
+    @classmethod
+    def _raw_stats(cls, team_obj) -> List[Tuple[object, object]]:
+        """(stat_id, value) pairs from a yfpy team, unparsed ('-' becomes 0)."""
         # yfpy stores data in _extracted_data dictionary, NOT as direct attributes
         if hasattr(team_obj, '_extracted_data') and 'team_stats' in team_obj._extracted_data:
             team_stats_data = team_obj._extracted_data['team_stats']
             if isinstance(team_stats_data, dict) and 'stats' in team_stats_data:
-                stats_list = team_stats_data['stats']
-                
-                for stat_wrapper in stats_list:
-                    # stat_wrapper is a dict {'stat': StatObject}
-                    if isinstance(stat_wrapper, dict) and 'stat' in stat_wrapper:
-                        stat = stat_wrapper['stat']
-                    elif hasattr(stat_wrapper, 'stat'):
-                        stat = stat_wrapper.stat
-                    else:
-                        stat = stat_wrapper
-                    
-                    s_id = getattr(stat, 'stat_id', None)
-                    val = getattr(stat, 'value', 0)
-                    
-                    # Ensure ID is treated as int
-                    try:
-                        if s_id is not None:
-                            s_id = int(s_id)
-                    except ValueError:
-                        pass
-                    
-                    # value comes as string often, and might be '-'
-                    if val == '-': val = 0
-                    
-                    if s_id in ID_TO_FIELD:
-                        field_name = ID_TO_FIELD[s_id]
-                        # Convert to int or float
-                        try:
-                            if field_name in ['save_pct', 'gaa']:
-                                parsed_val = float(val)
-                            else:
-                                parsed_val = int(float(val)) # handle "7.0"
-                            setattr(ts, field_name, parsed_val)
-                        except ValueError:
-                            pass # keep default 0
-        
-        return ts
+                return cls._stat_pairs(team_stats_data['stats'])
+        return []
+
+    @staticmethod
+    def _stat_pairs(stats_list) -> List[Tuple[object, object]]:
+        """(stat_id, value) pairs from a yfpy stats list (teams and players)."""
+        pairs = []
+        for stat_wrapper in stats_list:
+            # stat_wrapper is a dict {'stat': StatObject}
+            if isinstance(stat_wrapper, dict) and 'stat' in stat_wrapper:
+                stat = stat_wrapper['stat']
+            elif hasattr(stat_wrapper, 'stat'):
+                stat = stat_wrapper.stat
+            else:
+                stat = stat_wrapper
+            
+            s_id = getattr(stat, 'stat_id', None)
+            val = getattr(stat, 'value', 0)
+            
+            # Ensure ID is treated as int
+            try:
+                if s_id is not None:
+                    s_id = int(s_id)
+            except ValueError:
+                pass
+            
+            # value comes as string often, and might be '-'
+            if val == '-': val = 0
+            
+            pairs.append((s_id, val))
+        return pairs
+
+    @staticmethod
+    def _parse_component(val) -> Optional[float]:
+        """Component stat as a float; goalie minutes may come as 'MMM:SS'."""
+        try:
+            text = str(val)
+            if ':' in text:
+                minutes, seconds = text.split(':', 1)
+                return int(minutes) + int(seconds) / 60.0
+            return float(text)
+        except ValueError:
+            return None
 
     def _determine_winners(self, t1: TeamStats, t2: TeamStats) -> Dict[str, str]:
         winners = {}
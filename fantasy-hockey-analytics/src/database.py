@@ -1,43 +1,89 @@
 """SQLite persistence layer for Fantasy Hockey Analytics - Schema v2 with Team IDs."""
 
+import json
+import os
 import sqlite3
-import sys
+import threading
+import time
+from contextlib import contextmanager
 from typing import List, Dict, Optional
 from datetime import datetime
-from .models import SeasonData, Matchup
-from .constants import ALL_CATEGORIES, LOWER_IS_BETTER
+from .models import SeasonData, Matchup, PlayerWeek
+from .constants import ALL_CATEGORIES, COMPONENT_FIELDS, LOWER_IS_BETTER, FREE_AGENT_TEAM_ID
+from .sketches import KLLSketch
+from .migrations import LATEST_VERSION, detect_version, migrate
 
-SCHEMA_VERSION = 2
+SCHEMA_VERSION = LATEST_VERSION
+
+# Storage layouts for per-category values (stored in db_meta)
+LAYOUT_ROWS = 'rows'  # category_outcomes: one row per matchup and category
+LAYOUT_WIDE = 'wide'  # team_weeks: one row per team-week, one column per category
+STORAGE_LAYOUTS = (LAYOUT_ROWS, LAYOUT_WIDE)
+
+# Categories that are rates; everything else is a count stored as INTEGER
+RATE_CATEGORIES = {'save_pct', 'gaa'}
+
+# Connections lent by use_connection(), per thread: absolute path -> connection
+_lent = threading.local()
+
+
+class _LentConnection:
+    """A use_connection() connection handed to one function: close() ends that use only."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_isolation_level', conn.isolation_level)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def close(self):
+        # What closing a private connection would do: drop uncommitted work
+        if self._conn.in_transaction:
+            self._conn.rollback()
+        self._conn.row_factory = None
+        self._conn.isolation_level = self._isolation_level
+
+
+def _connect(db_path: str):
+    """Connection for one call: the one lent to this thread for db_path, else a new one."""
+    conn = getattr(_lent, 'connections', {}).get(os.path.abspath(db_path))
+    return _LentConnection(conn) if conn is not None else sqlite3.connect(db_path)
+
+
+@contextmanager
+def use_connection(db_path: str, conn: sqlite3.Connection):
+    """
+    Route this thread's reads and writes of db_path through `conn` (left open).
+    
+    Every function here and in src/cache.py that takes db_path then reuses
+    the one connection instead of opening its own, so whole analyses run on
+    a caller's long-lived connection.
+    """
+    if not hasattr(_lent, 'connections'):
+        _lent.connections = {}
+    key = os.path.abspath(db_path)
+    previous = _lent.connections.get(key)
+    _lent.connections[key] = conn
+    try:
+        yield conn
+    finally:
+        if previous is None:
+            _lent.connections.pop(key, None)
+        else:
+            _lent.connections[key] = previous
 
 
 def get_schema_version(db_path: str = "fantasy_hockey.db") -> int:
-    """Check current schema version. Returns 1 if old schema, 2 if new, 0 if no database."""
+    """Check current schema version (PRAGMA user_version, inferred for older files). 0 if no database."""
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Check if teams table exists (v2 schema)
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='teams'
-        """)
-        
-        if cursor.fetchone():
-            conn.close()
-            return 2
-        
-        # Check if weekly_snapshots exists (v1 schema)
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='weekly_snapshots'
-        """)
-        
-        if cursor.fetchone():
-            conn.close()
-            return 1
-        
+        conn = _connect(db_path)
+        version = detect_version(conn)
         conn.close()
-        return 0  # No database
+        return version
         
     except sqlite3.OperationalError:
         return 0  # Database doesn't exist
@@ -45,7 +91,7 @@ def get_schema_version(db_path: str = "fantasy_hockey.db") -> int:
 
 def drop_all_tables(db_path: str = "fantasy_hockey.db"):
     """Drop all existing tables for migration."""
-    conn = sqlite3.connect(db_path)
+    conn = _connect(db_path)
     cursor = conn.cursor()
     
     # Get all table names
@@ -60,23 +106,16 @@ def drop_all_tables(db_path: str = "fantasy_hockey.db"):
 
 
 def init_db(db_path: str = "fantasy_hockey.db"):
-    """Create tables if they don't exist. Check for schema migration needs."""
+    """Create tables if they don't exist. Upgrades older schemas in place first."""
     
-    # Check if migration is needed
+    # Upgrade older databases in place (data is preserved)
     current_version = get_schema_version(db_path)
     
     if current_version > 0 and current_version < SCHEMA_VERSION:
-        print("\n" + "="*60)
-        print("DATABASE SCHEMA MIGRATION REQUIRED")
-        print("="*60)
-        print(f"Current schema version: {current_version}")
-        print(f"Required schema version: {SCHEMA_VERSION}")
-        print("\nThis will delete existing data (can be re-fetched from Yahoo).")
-        print("Run 'python main.py migrate' to proceed.")
-        print("="*60)
-        sys.exit(1)
-    
-    conn = sqlite3.connect(db_path)
+        print(f"Upgrading database schema v{current_version} -> v{SCHEMA_VERSION} (data is preserved)...")
+        migrate(db_path, SCHEMA_VERSION)
+    
+    conn = _connect(db_path)
     cursor = conn.cursor()
     
     # Create teams table (NEW in v2)
@@ -145,15 +184,139 @@ def init_db(db_path: str = "fantasy_hockey.db"):
         ON category_outcomes(team2_id, category, is_complete)
     """)
     
+    # Week replacement on re-fetch deletes by week
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_category_outcomes_week 
+        ON category_outcomes(week_number)
+    """)
+    
+    # Wide layout: one row per team-week, winners derived on read
+    category_columns = ",\n            ".join(
+        f"{category} {'REAL' if category in RATE_CATEGORIES else 'INTEGER'} NOT NULL"
+        for category in ALL_CATEGORIES
+    )
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS team_weeks (
+            team_id INTEGER NOT NULL,
+            week_number INTEGER NOT NULL,
+            opponent_id INTEGER NOT NULL,
+            matchup_id INTEGER NOT NULL REFERENCES matchup_results(id),
+            slot INTEGER NOT NULL,
+            is_complete BOOLEAN NOT NULL,
+            {category_columns},
+            PRIMARY KEY (team_id, week_number)
+        ) WITHOUT ROWID
+    """)
+    
+    # Goalie ratio components per team-week (NULL when Yahoo doesn't report them),
+    # kept in both storage layouts for exact multi-week SV% and GAA
+    component_columns = ",\n            ".join(f"{field} REAL" for field in COMPONENT_FIELDS)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS goalie_components (
+            team_id INTEGER NOT NULL,
+            week_number INTEGER NOT NULL,
+            is_complete BOOLEAN NOT NULL,
+            {component_columns},
+            PRIMARY KEY (team_id, week_number)
+        ) WITHOUT ROWID
+    """)
+    
+    # Player-level data: one players row per player, one player_weeks row per
+    # player and week on a fantasy roster (team_id, week_number, player_id)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS players (
+            player_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            nhl_team TEXT,
+            display_position TEXT,
+            eligible_positions TEXT,
+            last_seen_week INTEGER
+        )
+    """)
+    
+    player_columns = ",\n            ".join(
+        [f"{category} {'REAL' if category in RATE_CATEGORIES else 'INTEGER'} NOT NULL DEFAULT 0"
+         for category in ALL_CATEGORIES] +
+        [f"{field} REAL" for field in COMPONENT_FIELDS]
+    )
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS player_weeks (
+            team_id INTEGER NOT NULL,
+            week_number INTEGER NOT NULL,
+            player_id INTEGER NOT NULL REFERENCES players(player_id),
+            selected_position TEXT,
+            is_complete BOOLEAN NOT NULL,
+            {player_columns},
+            PRIMARY KEY (team_id, week_number, player_id)
+        ) WITHOUT ROWID
+    """)
+    
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_player_weeks_player
+        ON player_weeks(player_id, week_number)
+    """)
+    
+    # Database-level settings (e.g. storage layout)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS db_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+    """)
+    
+    # Per-category quantile sketches of complete weeks (for sketch-based thresholds)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS category_sketches (
+            category TEXT PRIMARY KEY,
+            weeks TEXT NOT NULL,
+            winning_sketch TEXT NOT NULL,
+            min_losing REAL,
+            max_losing REAL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
     conn.commit()
+    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.close()
 
 
-def save_season_data(data: SeasonData, db_path: str = "fantasy_hockey.db"):
-    """Persist a SeasonData object. Updates existing weeks if re-fetched."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+def save_season_data(data: SeasonData, db_path: str = "fantasy_hockey.db",
+                     conn: Optional[sqlite3.Connection] = None):
+    """
+    Persist a SeasonData object. Updates existing weeks if re-fetched.
     
+    Each stored week is replaced as a whole (matchups and their category
+    outcomes) and the save is a single transaction: on error nothing changes.
+    An open `conn` is used (and left open) instead of db_path when given.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = _connect(db_path)
+    try:
+        _save_season_data(conn.cursor(), data)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
+
+
+def _delete_week(cursor, week_num: int):
+    """Remove a week's matchups and every dependent category_outcomes/team_weeks/goalie_components row."""
+    cursor.execute("""
+        DELETE FROM category_outcomes
+        WHERE week_number = ?
+           OR matchup_id IN (SELECT id FROM matchup_results WHERE week_number = ?)
+    """, (week_num, week_num))
+    cursor.execute("DELETE FROM team_weeks WHERE week_number = ?", (week_num,))
+    cursor.execute("DELETE FROM goalie_components WHERE week_number = ?", (week_num,))
+    cursor.execute("DELETE FROM matchup_results WHERE week_number = ?", (week_num,))
+
+
+def _save_season_data(cursor, data: SeasonData):
     # Group matchups by week
     weeks_data = {}
     for matchup in data.matchups:
@@ -161,11 +324,26 @@ def save_season_data(data: SeasonData, db_path: str = "fantasy_hockey.db"):
             weeks_data[matchup.week] = []
         weeks_data[matchup.week].append(matchup)
     
+    # Complete weeks already folded into the quantile sketches
+    sketched_weeks = _get_sketched_weeks(cursor)
+    wide = _get_storage_layout(cursor) == LAYOUT_WIDE
+    rebuild_sketches = False
+    
+    # Invalidates binary snapshots built from the previous data
+    _bump_data_version(cursor)
+    
     # Process each week
     for week_num, matchups in weeks_data.items():
         # Determine if week is complete (all matchups in week must be complete)
         is_complete = all(m.is_complete for m in matchups)
         
+        # Newly complete weeks get added to the sketches once; a sketched
+        # week whose values changed (stat corrections) forces a rebuild
+        sketch_values = {category: [] for category in ALL_CATEGORIES}
+        update_sketches = is_complete and week_num not in sketched_weeks
+        corrected = is_complete and week_num in sketched_weeks
+        previous_values = _stored_sketch_values(cursor, week_num, wide) if corrected else None
+        
         # Insert or update weekly snapshot
         cursor.execute("""
             INSERT INTO weekly_snapshots (week_number, is_complete, fetched_at)
@@ -180,78 +358,547 @@ def save_season_data(data: SeasonData, db_path: str = "fantasy_hockey.db"):
         snapshot_id = cursor.fetchone()[0]
         
         # Delete existing matchup data for this week (to handle re-fetches)
-        cursor.execute("DELETE FROM matchup_results WHERE week_number = ?", (week_num,))
+        _delete_week(cursor, week_num)
         
         # Insert matchups for this week
         for matchup in matchups:
-            # Upsert teams
-            for team in [matchup.team1, matchup.team2]:
-                cursor.execute("""
-                    INSERT INTO teams (team_id, current_name, manager_name, first_seen_week, last_seen_week)
-                    VALUES (?, ?, ?, ?, ?)
-                    ON CONFLICT(team_id) DO UPDATE SET
-                        current_name = excluded.current_name,
-                        last_seen_week = excluded.last_seen_week
-                """, (team.team_id, team.team_name, team.manager_name, week_num, week_num))
-            
-            # Calculate category wins
-            t1_wins = sum(1 for winner in matchup.category_winners.values() 
-                         if winner == matchup.team1.team_name)
-            t2_wins = sum(1 for winner in matchup.category_winners.values() 
-                         if winner == matchup.team2.team_name)
-            ties = sum(1 for winner in matchup.category_winners.values() 
-                      if winner == "Tie")
-            
-            # Insert matchup result
+            _insert_matchup(cursor, snapshot_id, matchup, wide,
+                            sketch_values if is_complete else None)
+        
+        if update_sketches:
+            _fold_week_into_sketches(cursor, week_num, sketch_values)
+            sketched_weeks.add(week_num)
+        elif corrected and _sorted_values(sketch_values) != _sorted_values(previous_values):
+            rebuild_sketches = True
+    
+    if rebuild_sketches:
+        _rebuild_sketches(cursor, wide)
+
+
+def _insert_matchup(cursor, snapshot_id: int, matchup: Matchup, wide: bool,
+                    sketch_values: Optional[Dict[str, list]] = None):
+    """
+    Insert one matchup and its per-category rows (after any old rows are deleted).
+    
+    Decided categories' (winning, losing) values are appended to sketch_values if given.
+    """
+    week_num = matchup.week
+    
+    # Upsert teams
+    for team in [matchup.team1, matchup.team2]:
+        cursor.execute("""
+            INSERT INTO teams (team_id, current_name, manager_name, first_seen_week, last_seen_week)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(team_id) DO UPDATE SET
+                current_name = excluded.current_name,
+                last_seen_week = excluded.last_seen_week
+        """, (team.team_id, team.team_name, team.manager_name, week_num, week_num))
+    
+    # Calculate category wins
+    t1_wins = sum(1 for winner in matchup.category_winners.values() 
+                 if winner == matchup.team1.team_name)
+    t2_wins = sum(1 for winner in matchup.category_winners.values() 
+                 if winner == matchup.team2.team_name)
+    ties = sum(1 for winner in matchup.category_winners.values() 
+              if winner == "Tie")
+    
+    # Insert matchup result
+    cursor.execute("""
+        INSERT INTO matchup_results 
+        (snapshot_id, week_number, team1_id, team2_id,
+         team1_category_wins, team2_category_wins, ties, is_complete)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, (snapshot_id, week_num, matchup.team1.team_id, matchup.team2.team_id,
+          t1_wins, t2_wins, ties, matchup.is_complete))
+    
+    matchup_id = cursor.lastrowid
+    
+    if wide:
+        _insert_team_weeks(cursor, matchup_id, matchup)
+    _insert_goalie_components(cursor, matchup)
+    
+    # Insert category outcomes
+    for category in ALL_CATEGORIES:
+        team1_value = getattr(matchup.team1, category)
+        team2_value = getattr(matchup.team2, category)
+        winner_name = matchup.category_winners.get(category, "Tie")
+        
+        # Determine winner_team_id and winning/losing values
+        if winner_name == "Tie":
+            winner_team_id = None
+            winning_value = None
+            losing_value = None
+        elif winner_name == matchup.team1.team_name:
+            winner_team_id = matchup.team1.team_id
+            winning_value = team1_value
+            losing_value = team2_value
+        else:
+            winner_team_id = matchup.team2.team_id
+            winning_value = team2_value
+            losing_value = team1_value
+        
+        if not wide:
             cursor.execute("""
-                INSERT INTO matchup_results 
-                (snapshot_id, week_number, team1_id, team2_id,
-                 team1_category_wins, team2_category_wins, ties, is_complete)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (snapshot_id, week_num, matchup.team1.team_id, matchup.team2.team_id,
-                  t1_wins, t2_wins, ties, matchup.is_complete))
+                INSERT INTO category_outcomes
+                (matchup_id, week_number, category, team1_id, team2_id,
+                 team1_value, team2_value, winner_team_id, winning_value, losing_value, is_complete)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (matchup_id, week_num, category, matchup.team1.team_id, matchup.team2.team_id,
+                  team1_value, team2_value, winner_team_id, winning_value, losing_value, matchup.is_complete))
+        
+        if sketch_values is not None and winner_team_id is not None:
+            sketch_values[category].append((winning_value, losing_value))
+
+
+def replace_matchups(conn: sqlite3.Connection, matchups: List[Matchup]):
+    """
+    Replace individual in-progress matchups on an open connection (live polling).
+    
+    Only the given matchups' rows are rewritten, in one transaction. Weeks
+    whose matchups are all complete must go through save_season_data()
+    instead, so they are folded into the quantile sketches.
+    """
+    cursor = conn.cursor()
+    try:
+        wide = _get_storage_layout(cursor) == LAYOUT_WIDE
+        _bump_data_version(cursor)
+        
+        for matchup in matchups:
+            cursor.execute("""
+                INSERT INTO weekly_snapshots (week_number, is_complete, fetched_at)
+                VALUES (?, 0, ?)
+                ON CONFLICT(week_number) DO UPDATE SET
+                    is_complete = 0,
+                    fetched_at = excluded.fetched_at
+            """, (matchup.week, datetime.now()))
+            cursor.execute("SELECT id FROM weekly_snapshots WHERE week_number = ?", (matchup.week,))
+            snapshot_id = cursor.fetchone()[0]
             
-            matchup_id = cursor.lastrowid
+            # Old rows of this pairing (either side order)
+            team_ids = (matchup.team1.team_id, matchup.team2.team_id)
+            cursor.execute("""
+                SELECT id FROM matchup_results
+                WHERE week_number = ? AND team1_id IN (?, ?) AND team2_id IN (?, ?)
+            """, (matchup.week, *team_ids, *team_ids))
+            for (matchup_id,) in cursor.fetchall():
+                cursor.execute("DELETE FROM category_outcomes WHERE matchup_id = ?", (matchup_id,))
+                cursor.execute("DELETE FROM matchup_results WHERE id = ?", (matchup_id,))
+            for table in ('team_weeks', 'goalie_components'):
+                cursor.execute(f"""
+                    DELETE FROM {table} WHERE week_number = ? AND team_id IN (?, ?)
+                """, (matchup.week, *team_ids))
             
-            # Insert category outcomes
-            for category in ALL_CATEGORIES:
-                team1_value = getattr(matchup.team1, category)
-                team2_value = getattr(matchup.team2, category)
-                winner_name = matchup.category_winners.get(category, "Tie")
-                
-                # Determine winner_team_id and winning/losing values
-                if winner_name == "Tie":
-                    winner_team_id = None
-                    winning_value = None
-                    losing_value = None
-                elif winner_name == matchup.team1.team_name:
-                    winner_team_id = matchup.team1.team_id
-                    winning_value = team1_value
-                    losing_value = team2_value
-                else:
-                    winner_team_id = matchup.team2.team_id
-                    winning_value = team2_value
-                    losing_value = team1_value
-                
-                cursor.execute("""
-                    INSERT INTO category_outcomes
-                    (matchup_id, week_number, category, team1_id, team2_id,
-                     team1_value, team2_value, winner_team_id, winning_value, losing_value, is_complete)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (matchup_id, week_num, category, matchup.team1.team_id, matchup.team2.team_id,
-                      team1_value, team2_value, winner_team_id, winning_value, losing_value, matchup.is_complete))
+            _insert_matchup(cursor, snapshot_id, matchup, wide)
+        
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def _insert_team_weeks(cursor, matchup_id: int, matchup: Matchup):
+    """Wide layout: one row per side of the matchup."""
+    columns = ", ".join(ALL_CATEGORIES)
+    placeholders = ", ".join("?" for _ in ALL_CATEGORIES)
+    sides = [(1, matchup.team1, matchup.team2), (2, matchup.team2, matchup.team1)]
+    
+    for slot, team, opponent in sides:
+        cursor.execute(f"""
+            INSERT INTO team_weeks
+            (team_id, week_number, opponent_id, matchup_id, slot, is_complete, {columns})
+            VALUES (?, ?, ?, ?, ?, ?, {placeholders})
+        """, (team.team_id, matchup.week, opponent.team_id, matchup_id, slot, matchup.is_complete,
+              *[getattr(team, category) for category in ALL_CATEGORIES]))
+
+
+def _insert_goalie_components(cursor, matchup: Matchup):
+    """One row per side of the matchup; missing components stay NULL."""
+    columns = ", ".join(COMPONENT_FIELDS)
+    placeholders = ", ".join("?" for _ in COMPONENT_FIELDS)
+    
+    for team in (matchup.team1, matchup.team2):
+        cursor.execute(f"""
+            INSERT INTO goalie_components
+            (team_id, week_number, is_complete, {columns})
+            VALUES (?, ?, ?, {placeholders})
+        """, (team.team_id, matchup.week, matchup.is_complete,
+              *[getattr(team, field) for field in COMPONENT_FIELDS]))
+
+
+def _get_storage_layout(cursor) -> str:
+    try:
+        cursor.execute("SELECT value FROM db_meta WHERE key = 'storage_layout'")
+    except sqlite3.OperationalError:
+        return LAYOUT_ROWS  # Created before db_meta existed
+    row = cursor.fetchone()
+    return row[0] if row else LAYOUT_ROWS
+
+
+def _bump_data_version(cursor):
+    """Mark every cached result and snapshot built from the current data stale."""
+    cursor.execute("""
+        INSERT INTO db_meta (key, value) VALUES ('data_version', '1')
+        ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1
+    """)
+
+
+def get_data_version(db_path: str = "fantasy_hockey.db",
+                     conn: Optional[sqlite3.Connection] = None) -> int:
+    """
+    Counter bumped by every save, compaction and layout change (0 if nothing was saved yet).
     
+    An open `conn` is used (and left open) instead of db_path when given.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = _connect(db_path)
+    try:
+        row = conn.execute("SELECT value FROM db_meta WHERE key = 'data_version'").fetchone()
+    except sqlite3.OperationalError:
+        row = None  # Created before db_meta existed
+    if own_conn:
+        conn.close()
+    return int(row[0]) if row else 0
+
+
+def get_storage_layout(db_path: str = "fantasy_hockey.db") -> str:
+    """Current storage layout: 'rows' (category_outcomes) or 'wide' (team_weeks)."""
+    conn = _connect(db_path)
+    layout = _get_storage_layout(conn.cursor())
+    conn.close()
+    return layout
+
+
+def set_storage_layout(layout: str, db_path: str = "fantasy_hockey.db") -> int:
+    """
+    Convert stored values to another layout in one transaction, then VACUUM.
+    
+    Returns the number of matchups converted (0 if already in that layout).
+    """
+    if layout not in STORAGE_LAYOUTS:
+        raise ValueError(f"Unknown storage layout '{layout}' (expected one of {STORAGE_LAYOUTS})")
+    
+    conn = _connect(db_path)
+    cursor = conn.cursor()
+    
+    try:
+        if _get_storage_layout(cursor) == layout:
+            return 0
+        
+        cursor.execute("SELECT COUNT(*) FROM matchup_results")
+        matchups = cursor.fetchone()[0]
+        
+        if layout == LAYOUT_WIDE:
+            _outcome_rows_to_team_weeks(cursor)
+            cursor.execute("DELETE FROM category_outcomes")
+        else:
+            _team_weeks_to_outcome_rows(cursor)
+            cursor.execute("DELETE FROM team_weeks")
+        
+        cursor.execute("""
+            INSERT INTO db_meta (key, value) VALUES ('storage_layout', ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+        """, (layout,))
+        _bump_data_version(cursor)
+        conn.commit()
+        
+        # Reclaim the space of the old layout
+        conn.isolation_level = None
+        cursor.execute("VACUUM")
+        return matchups
+        
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+        
+    finally:
+        conn.close()
+
+
+def _outcome_rows_to_team_weeks(cursor):
+    """Pivot category_outcomes into two team_weeks rows per matchup."""
+    columns = ", ".join(ALL_CATEGORIES)
+    
+    for slot, team, opponent in [(1, 'team1', 'team2'), (2, 'team2', 'team1')]:
+        pivots = ", ".join(
+            f"MAX(CASE WHEN c.category = '{category}' THEN c.{team}_value END)"
+            for category in ALL_CATEGORIES
+        )
+        cursor.execute(f"""
+            INSERT INTO team_weeks
+            (team_id, week_number, opponent_id, matchup_id, slot, is_complete, {columns})
+            SELECT m.{team}_id, m.week_number, m.{opponent}_id, m.id, {slot}, m.is_complete, {pivots}
+            FROM matchup_results m
+            JOIN category_outcomes c ON c.matchup_id = m.id
+            GROUP BY m.id
+        """)
+
+
+def _team_weeks_to_outcome_rows(cursor):
+    """Unpivot team_weeks into category_outcomes rows, in matchup order."""
+    rows = []
+    for category in ALL_CATEGORIES:
+        for o in _read_wide_outcomes(cursor, category, complete_only=False):
+            rows.append((o['matchup_id'], o['week_number'], category, o['team1_id'], o['team2_id'],
+                         o['team1_value'], o['team2_value'], o['winner_team_id'],
+                         o['winning_value'], o['losing_value'], o['is_complete']))
+    
+    rows.sort(key=lambda row: (row[0], ALL_CATEGORIES.index(row[2])))
+    cursor.executemany("""
+        INSERT INTO category_outcomes
+        (matchup_id, week_number, category, team1_id, team2_id,
+         team1_value, team2_value, winner_team_id, winning_value, losing_value, is_complete)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+
+
+def _derive_winner(category: str, team1_id: int, team2_id: int, v1, v2):
+    """(winner_team_id, winning_value, losing_value) using the fetcher's rules; ties -> Nones."""
+    if v1 == v2:
+        return None, None, None
+    if (v1 < v2) == (category in LOWER_IS_BETTER):
+        return team1_id, v1, v2
+    return team2_id, v2, v1
+
+
+def _read_wide_outcomes(cursor, category: str, complete_only: bool) -> List[dict]:
+    """category_outcomes-shaped dicts for one category, built from team_weeks."""
+    if category not in ALL_CATEGORIES:
+        return []
+    
+    complete_filter = "AND a.is_complete = 1" if complete_only else ""
+    cursor.execute(f"""
+        SELECT a.matchup_id, a.week_number, a.team_id, b.team_id,
+               a.{category}, b.{category}, a.is_complete
+        FROM team_weeks a
+        JOIN team_weeks b ON b.team_id = a.opponent_id AND b.week_number = a.week_number
+        WHERE a.slot = 1 {complete_filter}
+        ORDER BY a.matchup_id
+    """)
+    
+    results = []
+    for matchup_id, week_number, team1_id, team2_id, v1, v2, is_complete in cursor.fetchall():
+        winner_team_id, winning_value, losing_value = _derive_winner(category, team1_id, team2_id, v1, v2)
+        results.append({
+            'matchup_id': matchup_id,
+            'week_number': week_number,
+            'category': category,
+            'team1_id': team1_id,
+            'team2_id': team2_id,
+            'team1_value': v1,
+            'team2_value': v2,
+            'winner_team_id': winner_team_id,
+            'winning_value': winning_value,
+            'losing_value': losing_value,
+            'is_complete': is_complete,
+        })
+    return results
+
+
+def _get_sketched_weeks(cursor) -> set:
+    """Weeks already included in the category sketches."""
+    cursor.execute("SELECT weeks FROM category_sketches LIMIT 1")
+    row = cursor.fetchone()
+    return set(json.loads(row[0])) if row else set()
+
+
+def _stored_sketch_values(cursor, week_num: int, wide: bool) -> Dict[str, list]:
+    """A stored week's decided (winning_value, losing_value) pairs per category."""
+    values = {category: [] for category in ALL_CATEGORIES}
+    if wide:
+        for category in ALL_CATEGORIES:
+            values[category] = [(o['winning_value'], o['losing_value'])
+                                for o in _read_wide_outcomes(cursor, category, complete_only=False)
+                                if o['week_number'] == week_num and o['winner_team_id'] is not None]
+        return values
+    
+    cursor.execute("""
+        SELECT category, winning_value, losing_value FROM category_outcomes
+        WHERE week_number = ? AND winner_team_id IS NOT NULL
+    """, (week_num,))
+    for category, winning_value, losing_value in cursor.fetchall():
+        if category in values:
+            values[category].append((winning_value, losing_value))
+    return values
+
+
+def _sorted_values(sketch_values: Dict[str, list]) -> Dict[str, list]:
+    return {category: sorted(pairs) for category, pairs in sketch_values.items()}
+
+
+def _rebuild_sketches(cursor, wide: bool):
+    """Refold every complete week's stored outcomes into fresh category sketches."""
+    cursor.execute("SELECT week_number FROM weekly_snapshots WHERE is_complete = 1 ORDER BY week_number")
+    complete_weeks = [row[0] for row in cursor.fetchall()]
+    
+    cursor.execute("DELETE FROM category_sketches")
+    for week_num in complete_weeks:
+        _fold_week_into_sketches(cursor, week_num, _stored_sketch_values(cursor, week_num, wide))
+
+
+def _fold_week_into_sketches(cursor, week_num: int, sketch_values: Dict[str, list]):
+    """Add one complete week's (winning_value, losing_value) pairs to each category sketch."""
+    for category in ALL_CATEGORIES:
+        cursor.execute("""
+            SELECT weeks, winning_sketch, min_losing, max_losing
+            FROM category_sketches WHERE category = ?
+        """, (category,))
+        row = cursor.fetchone()
+        
+        if row:
+            weeks = json.loads(row[0])
+            sketch = KLLSketch.from_json(row[1])
+            min_losing, max_losing = row[2], row[3]
+        else:
+            weeks, sketch, min_losing, max_losing = [], KLLSketch(), None, None
+        
+        for winning_value, losing_value in sketch_values[category]:
+            sketch.update(winning_value)
+            min_losing = losing_value if min_losing is None else min(min_losing, losing_value)
+            max_losing = losing_value if max_losing is None else max(max_losing, losing_value)
+        
+        weeks.append(week_num)
+        cursor.execute("""
+            INSERT INTO category_sketches (category, weeks, winning_sketch, min_losing, max_losing, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(category) DO UPDATE SET
+                weeks = excluded.weeks,
+                winning_sketch = excluded.winning_sketch,
+                min_losing = excluded.min_losing,
+                max_losing = excluded.max_losing,
+                updated_at = excluded.updated_at
+        """, (category, json.dumps(sorted(weeks)), sketch.to_json(), min_losing, max_losing, datetime.now()))
+
+
+def rebuild_category_sketches(db_path: str = "fantasy_hockey.db"):
+    """Rebuild all category sketches from the complete weeks' stored outcomes."""
+    conn = _connect(db_path)
+    cursor = conn.cursor()
+    _rebuild_sketches(cursor, _get_storage_layout(cursor) == LAYOUT_WIDE)
+    conn.commit()
+    conn.close()
+
+
+def get_category_sketch(category: str, db_path: str = "fantasy_hockey.db") -> Optional[dict]:
+    """
+    Return the stored sketch for a category, or None.
+    
+    Returns {category, weeks, sketch (KLLSketch), min_losing, max_losing}.
+    """
+    conn = _connect(db_path)
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT weeks, winning_sketch, min_losing, max_losing
+        FROM category_sketches WHERE category = ?
+    """, (category,))
+    row = cursor.fetchone()
+    conn.close()
+    
+    if not row:
+        return None
+    
+    return {
+        'category': category,
+        'weeks': json.loads(row[0]),
+        'sketch': KLLSketch.from_json(row[1]),
+        'min_losing': row[2],
+        'max_losing': row[3]
+    }
+
+
+def _database_size(db_path: str) -> int:
+    """Bytes on disk, including a WAL file if present."""
+    return sum(os.path.getsize(path) for path in (db_path, db_path + "-wal")
+               if os.path.exists(path))
+
+
+def time_outcome_scan(db_path: str = "fantasy_hockey.db") -> float:
+    """Seconds to read every category's outcomes (the analysis read path)."""
+    start = time.perf_counter()
+    for category in ALL_CATEGORIES:
+        get_all_category_outcomes(category, complete_only=False, db_path=db_path)
+    return time.perf_counter() - start
+
+
+def compact_database(db_path: str = "fantasy_hockey.db") -> dict:
+    """
+    Remove orphaned/duplicate category_outcomes rows, then VACUUM and ANALYZE.
+    
+    Orphans are rows whose matchup no longer exists (left behind by re-fetches
+    before weeks were replaced as a whole). Duplicates are extra rows for the
+    same matchup and category; the newest is kept.
+    
+    Returns before/after row counts, file sizes and outcome scan times.
+    """
+    size_before = _database_size(db_path)
+    scan_before = time_outcome_scan(db_path)
+    
+    conn = _connect(db_path)
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT COUNT(*) FROM category_outcomes")
+    rows_before = cursor.fetchone()[0]
+    
+    cursor.execute("""
+        DELETE FROM category_outcomes
+        WHERE matchup_id IS NULL
+           OR matchup_id NOT IN (SELECT id FROM matchup_results)
+    """)
+    orphans_removed = cursor.rowcount
+    
+    cursor.execute("""
+        DELETE FROM category_outcomes
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM category_outcomes GROUP BY matchup_id, category
+        )
+    """)
+    duplicates_removed = cursor.rowcount
+    
+    cursor.execute("SELECT COUNT(*) FROM category_outcomes")
+    rows_after = cursor.fetchone()[0]
+    
+    _bump_data_version(cursor)
     conn.commit()
+    
+    # VACUUM can't run inside a transaction
+    conn.isolation_level = None
+    cursor.execute("VACUUM")
+    cursor.execute("ANALYZE")
     conn.close()
+    
+    if orphans_removed or duplicates_removed:
+        rebuild_category_sketches(db_path)
+    
+    return {
+        'rows_before': rows_before,
+        'rows_after': rows_after,
+        'orphans_removed': orphans_removed,
+        'duplicates_removed': duplicates_removed,
+        'size_before': size_before,
+        'size_after': _database_size(db_path),
+        'scan_before': scan_before,
+        'scan_after': time_outcome_scan(db_path),
+    }
 
 
 def get_all_category_outcomes(category: str, complete_only: bool = True, 
                                db_path: str = "fantasy_hockey.db") -> List[dict]:
-    """Fetch all outcomes for a specific category. Defaults to complete weeks only."""
-    conn = sqlite3.connect(db_path)
+    """
+    Fetch all outcomes for a specific category. Defaults to complete weeks only.
+    
+    Works with either storage layout; wide-layout rows have no 'id' key.
+    """
+    conn = _connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
+    if _get_storage_layout(cursor) == LAYOUT_WIDE:
+        results = _read_wide_outcomes(cursor, category, complete_only)
+        conn.close()
+        return results
+    
     query = """
         SELECT * FROM category_outcomes
         WHERE category = ?
@@ -270,7 +917,7 @@ def get_all_category_outcomes(category: str, complete_only: bool = True,
 
 def get_weeks_stored(db_path: str = "fantasy_hockey.db") -> List[dict]:
     """Return list of weeks with completion status: [{'week': 1, 'is_complete': True}, ...]"""
-    conn = sqlite3.connect(db_path)
+    conn = _connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -287,7 +934,7 @@ def get_weeks_stored(db_path: str = "fantasy_hockey.db") -> List[dict]:
 
 def get_incomplete_weeks(db_path: str = "fantasy_hockey.db") -> List[int]:
     """Return list of week numbers that are still in progress."""
-    conn = sqlite3.connect(db_path)
+    conn = _connect(db_path)
     cursor = conn.cursor()
     
     cursor.execute("""
@@ -306,7 +953,7 @@ def get_incomplete_weeks(db_path: str = "fantasy_hockey.db") -> List[int]:
 
 def get_all_teams(db_path: str = "fantasy_hockey.db") -> List[dict]:
     """Return all teams: [{team_id, current_name, manager_name}, ...]"""
-    conn = sqlite3.connect(db_path)
+    conn = _connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -323,7 +970,7 @@ def get_all_teams(db_path: str = "fantasy_hockey.db") -> List[dict]:
 
 def get_team_by_id(team_id: int, db_path: str = "fantasy_hockey.db") -> Optional[dict]:
     """Return team info or None."""
-    conn = sqlite3.connect(db_path)
+    conn = _connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
@@ -345,6 +992,33 @@ def team_exists(team_id: int, db_path: str = "fantasy_hockey.db") -> bool:
     return team is not None
 
 
+def get_team_records(db_path: str = "fantasy_hockey.db") -> Dict[int, dict]:
+    """
+    Win-loss-tie records from complete matchups.
+    
+    Returns {team_id: {wins, losses, ties, category_wins}}; a matchup is won
+    with more category wins than the opponent.
+    """
+    conn = _connect(db_path)
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT team1_id, team2_id, team1_category_wins, team2_category_wins
+        FROM matchup_results
+        WHERE is_complete = 1
+    """)
+    
+    records = {}
+    for team1_id, team2_id, wins1, wins2 in cursor.fetchall():
+        for team_id, own, other in ((team1_id, wins1 or 0, wins2 or 0), (team2_id, wins2 or 0, wins1 or 0)):
+            record = records.setdefault(team_id, {'wins': 0, 'losses': 0, 'ties': 0, 'category_wins': 0})
+            record['wins' if own > other else 'losses' if own < other else 'ties'] += 1
+            record['category_wins'] += own
+    
+    conn.close()
+    return records
+
+
 def get_team_category_values(team_id: int, category: str,
                               complete_only: bool = True,
                               db_path: str = "fantasy_hockey.db") -> List[dict]:
@@ -353,10 +1027,15 @@ def get_team_category_values(team_id: int, category: str,
     
     Returns list of {week, team_value, opponent_value, won} dicts.
     """
-    conn = sqlite3.connect(db_path)
+    conn = _connect(db_path)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
+    if _get_storage_layout(cursor) == LAYOUT_WIDE:
+        results = _read_wide_team_values(cursor, team_id, category, complete_only)
+        conn.close()
+        return results
+    
     # Build query conditions
     complete_filter = "AND is_complete = 1" if complete_only else ""
     
@@ -401,3 +1080,186 @@ def get_team_category_values(team_id: int, category: str,
     
     conn.close()
     return results
+
+
+def _read_wide_team_values(cursor, team_id: int, category: str, complete_only: bool) -> List[dict]:
+    """get_team_category_values for the wide layout (a primary-key range scan per team)."""
+    if category not in ALL_CATEGORIES:
+        return []
+    
+    complete_filter = "AND t.is_complete = 1" if complete_only else ""
+    cursor.execute(f"""
+        SELECT t.week_number, t.{category}, o.{category}
+        FROM team_weeks t
+        JOIN team_weeks o ON o.team_id = t.opponent_id AND o.week_number = t.week_number
+        WHERE t.team_id = ? {complete_filter}
+        ORDER BY t.week_number
+    """, (team_id,))
+    
+    results = []
+    for week, team_value, opponent_value in cursor.fetchall():
+        if team_value == opponent_value:
+            won = None
+        else:
+            won = 1 if (team_value < opponent_value) == (category in LOWER_IS_BETTER) else 0
+        results.append({
+            'week': week,
+            'team_value': team_value,
+            'opponent_value': opponent_value,
+            'won': won,
+        })
+    return results
+
+
+def get_goalie_components(team_id: Optional[int] = None, complete_only: bool = True,
+                          db_path: str = "fantasy_hockey.db") -> List[dict]:
+    """
+    Query goalie_components, ordered by team and week.
+    
+    Returns list of {team_id, week, saves, shots_against, goals_against, minutes}
+    dicts (component values may be None). All teams when team_id is None.
+    """
+    conn = _connect(db_path)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    
+    conditions = []
+    params = []
+    if team_id is not None:
+        conditions.append("team_id = ?")
+        params.append(team_id)
+    if complete_only:
+        conditions.append("is_complete = 1")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    cursor.execute(f"""
+        SELECT team_id, week_number as week, {', '.join(COMPONENT_FIELDS)}
+        FROM goalie_components
+        {where}
+        ORDER BY team_id, week_number
+    """, params)
+    results = [dict(row) for row in cursor.fetchall()]
+    
+    conn.close()
+    return results
+
+
+def save_player_weeks(players: List[PlayerWeek], db_path: str = "fantasy_hockey.db",
+                      complete_weeks: Optional[Dict[int, bool]] = None):
+    """
+    Persist player weekly stats. Each fetched team-week replaces its stored rows.
+    
+    A week is complete when `complete_weeks` says so, otherwise when its
+    matchups are stored as complete (weekly_snapshots). Single transaction.
+    """
+    conn = _connect(db_path)
+    cursor = conn.cursor()
+    try:
+        if complete_weeks is None:
+            cursor.execute("SELECT week_number, is_complete FROM weekly_snapshots")
+            complete_weeks = {week: bool(done) for week, done in cursor.fetchall()}
+        
+        _bump_data_version(cursor)
+        
+        team_weeks = sorted({(p.team_id, p.week) for p in players})
+        cursor.executemany("DELETE FROM player_weeks WHERE team_id = ? AND week_number = ?", team_weeks)
+        
+        cursor.executemany("""
+            INSERT INTO players (player_id, name, nhl_team, display_position, eligible_positions, last_seen_week)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(player_id) DO UPDATE SET
+                name = excluded.name,
+                nhl_team = excluded.nhl_team,
+                display_position = excluded.display_position,
+                eligible_positions = excluded.eligible_positions,
+                last_seen_week = MAX(last_seen_week, excluded.last_seen_week)
+        """, [(p.player_id, p.name, p.nhl_team, p.display_position,
+               ",".join(p.eligible_positions), p.week) for p in players])
+        
+        fields = ALL_CATEGORIES + COMPONENT_FIELDS
+        cursor.executemany(f"""
+            INSERT INTO player_weeks
+            (team_id, week_number, player_id, selected_position, is_complete, {', '.join(fields)})
+            VALUES (?, ?, ?, ?, ?, {', '.join('?' for _ in fields)})
+        """, [(p.team_id, p.week, p.player_id, p.selected_position, complete_weeks.get(p.week, False),
+               *[p.stats.get(category, 0) for category in ALL_CATEGORIES],
+               *[p.stats.get(field) for field in COMPONENT_FIELDS]) for p in players])
+        
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def get_complete_player_weeks(db_path: str = "fantasy_hockey.db") -> List[int]:
+    """
+    Weeks whose player stats are stored as complete (no need to fetch again).
+    
+    Every team with a matchup that week must have rows, so a team-week whose
+    fetch failed keeps its week open for the next fetch.
+    """
+    conn = _connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT p.week_number FROM player_weeks p
+        WHERE p.team_id != ?
+        GROUP BY p.week_number
+        HAVING MIN(p.is_complete) = 1
+           AND COUNT(DISTINCT p.team_id) >= (
+               SELECT COUNT(*) FROM (
+                   SELECT team1_id FROM matchup_results WHERE week_number = p.week_number
+                   UNION
+                   SELECT team2_id FROM matchup_results WHERE week_number = p.week_number
+               )
+           )
+        ORDER BY p.week_number
+    """, (FREE_AGENT_TEAM_ID,))
+    weeks = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    return weeks
+
+
+def get_player_weeks(team_id: Optional[int] = None, week: Optional[int] = None,
+                     complete_only: bool = True,
+                     db_path: str = "fantasy_hockey.db") -> List[dict]:
+    """
+    Query player_weeks joined with players, ordered by week, team and player.
+    
+    Returns list of {player_id, name, team_id, week, selected_position,
+    eligible_positions (list), <categories>, <components>} dicts.
+    """
+    conn = _connect(db_path)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    
+    conditions = []
+    params = []
+    if team_id is not None:
+        conditions.append("pw.team_id = ?")
+        params.append(team_id)
+    if week is not None:
+        conditions.append("pw.week_number = ?")
+        params.append(week)
+    if complete_only:
+        conditions.append("pw.is_complete = 1")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    fields = ", ".join(f"pw.{field}" for field in ALL_CATEGORIES + COMPONENT_FIELDS)
+    cursor.execute(f"""
+        SELECT pw.player_id, p.name, pw.team_id, pw.week_number as week,
+               pw.selected_position, p.eligible_positions, {fields}
+        FROM player_weeks pw
+        JOIN players p ON p.player_id = pw.player_id
+        {where}
+        ORDER BY pw.week_number, pw.team_id, pw.player_id
+    """, params)
+    results = []
+    for row in cursor.fetchall():
+        result = dict(row)
+        result['eligible_positions'] = [p for p in (result['eligible_positions'] or "").split(",") if p]
+        results.append(result)
+    
+    conn.close()
+    return results
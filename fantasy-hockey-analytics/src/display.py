@@ -1,6 +1,8 @@
-from typing import Dict, List
+import sys
+from typing import Dict, List, Optional
 from .models import SeasonData, Matchup
 from .constants import CATEGORY_DISPLAY_NAMES, ALL_CATEGORIES, LOWER_IS_BETTER
+from .reports import write_report, threshold_report, fetch_summary_report, team_analysis_report
 
 def print_season_summary(data: SeasonData):
     current_week = 0
@@ -17,11 +19,17 @@ def print_season_summary(data: SeasonData):
         print_matchup_detail(m)
 
 def print_matchup_detail(m: Matchup):
-    print(f"Matchup: {m.team1.team_name} vs {m.team2.team_name}")
+    for line in format_matchup_detail(m):
+        print(line)
+
+
+def format_matchup_detail(m: Matchup) -> List[str]:
+    """The lines print_matchup_detail prints (one per category, plus header and result)."""
+    lines = [f"Matchup: {m.team1.team_name} vs {m.team2.team_name}"]
     
     # Headers
-    print(f"{'Category':<15} | {m.team1.team_name:<20} | {m.team2.team_name:<20} | Winner")
-    print("-" * 75)
+    lines.append(f"{'Category':<15} | {m.team1.team_name:<20} | {m.team2.team_name:<20} | Winner")
+    lines.append("-" * 75)
     
     # Categories
     # We'll use the STAT_MAPPING values implicitly or iteration
@@ -53,88 +61,110 @@ def print_matchup_detail(m: Matchup):
             win_display = "Tie"
             ties += 1
             
-        print(f"{label:<15} | {v1:<20} | {v2:<20} | {win_display}")
+        lines.append(f"{label:<15} | {v1:<20} | {v2:<20} | {win_display}")
     
-    print("-" * 75)
+    lines.append("-" * 75)
     result_str = f"Result: {m.team1.team_name} wins {t1_wins}-{t2_wins}-{ties}" if t1_wins > t2_wins else f"Result: {m.team2.team_name} wins {t2_wins}-{t1_wins}-{ties}"
     if t1_wins == t2_wins: result_str = f"Result: Tie {t1_wins}-{t2_wins}-{ties}"
-    print(result_str)
-    print("")
+    lines.append(result_str)
+    lines.append("")
+    return lines
+
+
+def format_live_week(week: int, matchups: List[Matchup], last_change: str,
+                     odds: Optional[List['MatchupOdds']] = None) -> List[str]:
+    """
+    Watch-mode block: a status line, then print_matchup_detail lines for every
+    matchup (with a live win probability line when odds are given).
+    """
+    complete = sum(1 for m in matchups if m.is_complete)
+    lines = [f"Week {week} live - {complete}/{len(matchups)} matchups final - last change {last_change}", ""]
+    for i, m in enumerate(matchups):
+        detail = format_matchup_detail(m)
+        if odds is not None:
+            o = odds[i]
+            detail.insert(-1, f"Live odds: {m.team1.team_name} {o.team1_win * 100:.1f}% | "
+                              f"Tie {o.tie * 100:.1f}% | {m.team2.team_name} {o.team2_win * 100:.1f}%")
+        lines.extend(detail)
+    return lines
 
 
-def print_threshold_report(thresholds: Dict[str, 'CategoryThresholds'], summary: dict):
+class LiveTable:
+    """
+    Terminal block redrawn in place: only lines that differ from the last
+    render are rewritten (ANSI cursor moves), so a poll that changes one
+    matchup touches a handful of lines. A change in line count redraws all.
+    """
+    
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.lines: List[str] = []
+    
+    def render(self, lines: List[str]) -> int:
+        """Draw `lines` below the previous render's position; returns lines written."""
+        if len(lines) != len(self.lines):
+            if self.lines:
+                # Back to the top of the old block and clear it
+                self.stream.write(f"\x1b[{len(self.lines)}F\x1b[J")
+            self.stream.write("".join(f"{line}\n" for line in lines))
+            self.lines = list(lines)
+            self.stream.flush()
+            return len(lines)
+        
+        out = []
+        written = 0
+        for i, (old, new) in enumerate(zip(self.lines, lines)):
+            if old != new:
+                up = len(lines) - i
+                # Up to line i, clear it, write, then back down below the block
+                out.append(f"\x1b[{up}F\x1b[2K{new}\x1b[{up}E")
+                written += 1
+        if out:
+            self.stream.write("".join(out))
+            self.stream.flush()
+        self.lines = list(lines)
+        return written
+
+
+def print_threshold_report(thresholds: Dict[str, 'CategoryThresholds'], summary: dict,
+                           intervals: Optional[Dict[str, 'ThresholdIntervals']] = None,
+                           fmt: str = 'text'):
     """Display a table showing winning thresholds per category with analysis metadata."""
+    write_report(threshold_report(thresholds, summary, intervals), fmt)
+
+
+def print_threshold_series(series: Dict[str, list], mode: str):
+    """Display the median winning value per category as of each complete week."""
     
-    # Check if we have any data
-    if summary['weeks_analyzed'] == 0:
-        print("\n" + "=" * 80)
-        print("Insufficient Data")
-        print("=" * 80)
-        print("No completed weeks available for analysis.")
-        if summary['weeks_excluded'] > 0:
-            print(f"Week(s) {', '.join(map(str, summary['incomplete_week_numbers']))} in progress - excluded from analysis")
-        print("=" * 80)
+    weeks = [week for week, _ in next(iter(series.values()), [])]
+    if not weeks:
+        print("\nNo completed weeks available for a threshold series.")
         return
     
-    # Build header
-    print("\n" + "=" * 80)
-    print("League Winning Thresholds")
-    print("=" * 80)
-    
-    # Analysis period info
-    week_nums = summary['complete_week_numbers']
-    if week_nums:
-        week_range = f"Weeks {min(week_nums)}-{max(week_nums)}" if len(week_nums) > 1 else f"Week {week_nums[0]}"
-        print(f"Analysis Period: {week_range} ({summary['weeks_analyzed']} complete weeks, ~{summary['total_matchups']} matchups)")
-    
-    if summary['weeks_excluded'] > 0:
-        incomplete_str = ', '.join(map(str, summary['incomplete_week_numbers']))
-        print(f"Week(s) {incomplete_str} in progress - excluded from analysis")
-    
-    print("-" * 80)
-    
-    # Table header
-    print(f"{'Category':<12} {'Dir':<6} {'Min Win':<10} {'Median':<10} {'75th %':<10} {'Max Lose':<10} {'Overlap Zone':<15}")
-    print("-" * 80)
-    
-    # Print each category
-    for category in ALL_CATEGORIES:
-        threshold = thresholds.get(category)
-        if not threshold or threshold.sample_size == 0:
-            continue
-        
-        display_name = CATEGORY_DISPLAY_NAMES.get(category, category)
-        direction = "Lower" if category in LOWER_IS_BETTER else "Higher"
-        
-        # Format values based on category type
-        if category in ['save_pct', 'gaa']:
-            min_win = f"{threshold.min_winning:.3f}"
-            median = f"{threshold.median_winning:.3f}"
-            p75 = f"{threshold.p75_winning:.3f}"
-            max_lose = f"{threshold.max_losing:.3f}"
-            
-            if threshold.overlap_exists:
-                overlap = f"{threshold.overlap_low:.3f}-{threshold.overlap_high:.3f}"
-            else:
-                overlap = "None"
-        else:
-            min_win = f"{int(threshold.min_winning)}"
-            median = f"{int(threshold.median_winning)}"
-            p75 = f"{int(threshold.p75_winning)}"
-            max_lose = f"{int(threshold.max_losing)}"
-            
-            if threshold.overlap_exists:
-                overlap = f"{int(threshold.overlap_low)}-{int(threshold.overlap_high)}"
+    width = 8 + 9 * len(ALL_CATEGORIES)
+    print("\n" + "=" * width)
+    print(f"Median Winning Value by Week ({mode})")
+    print("=" * width)
+    
+    header = f"{'Week':<8}" + "".join(
+        f"{CATEGORY_DISPLAY_NAMES.get(c, c)[:8]:>9}" for c in ALL_CATEGORIES
+    )
+    print(header)
+    print("-" * width)
+    
+    for i, week in enumerate(weeks):
+        row = f"{week:<8}"
+        for category in ALL_CATEGORIES:
+            threshold = series[category][i][1]
+            if threshold.sample_size == 0:
+                row += f"{'--':>9}"
+            elif category in ['save_pct', 'gaa']:
+                row += f"{threshold.median_winning:>9.3f}"
             else:
-                overlap = "None"
-        
-        print(f"{display_name:<12} {direction:<6} {min_win:<10} {median:<10} {p75:<10} {max_lose:<10} {overlap:<15}")
+                row += f"{threshold.median_winning:>9.1f}"
+        print(row)
     
-    print("-" * 80)
-    print("\nNote: 'Overlap Zone' = range where both wins and losses occurred.")
-    print("      Above the zone (or below for GAA) = likely win.")
-    print("      Below the zone (or above for GAA) = likely loss.")
-    print("=" * 80)
+    print("=" * width)
 
 
 def print_data_status(weeks: List[dict]):
@@ -164,34 +194,33 @@ def print_data_status(weeks: List[dict]):
     print("=" * 60)
 
 
-def print_fetch_summary(season_data: SeasonData):
-    """Display summary of fetched data showing complete vs incomplete weeks."""
+def print_compaction_report(result: dict):
+    """Show rows, space and scan time recovered by compaction."""
+    
+    def mb(size):
+        return size / (1024 * 1024)
     
-    # Group by week
-    weeks_info = {}
-    for matchup in season_data.matchups:
-        week_num = matchup.week
-        if week_num not in weeks_info:
-            weeks_info[week_num] = {'count': 0, 'complete': True}
-        weeks_info[week_num]['count'] += 1
-        if not matchup.is_complete:
-            weeks_info[week_num]['complete'] = False
+    removed = result['rows_before'] - result['rows_after']
     
     print("\n" + "=" * 60)
-    print("Fetch Summary")
+    print("Compaction Report")
     print("=" * 60)
-    
-    for week_num in sorted(weeks_info.keys()):
-        info = weeks_info[week_num]
-        status = "complete" if info['complete'] else "in progress"
-        print(f"Week {week_num}: {info['count']} matchups ({status})")
-    
-    complete_count = sum(1 for info in weeks_info.values() if info['complete'])
-    incomplete_count = len(weeks_info) - complete_count
-    
+    print(f"Category outcome rows: {result['rows_before']:,} -> {result['rows_after']:,}")
+    print(f"  Orphaned rows removed:  {result['orphans_removed']:,}")
+    print(f"  Duplicate rows removed: {result['duplicates_removed']:,}")
     print("-" * 60)
-    print(f"Summary: {len(weeks_info)} weeks stored ({complete_count} complete, {incomplete_count} in progress)")
+    print(f"Database size: {mb(result['size_before']):.2f} MB -> {mb(result['size_after']):.2f} MB "
+          f"({mb(max(0, result['size_before'] - result['size_after'])):.2f} MB recovered)")
+    print(f"Outcome scan:  {result['scan_before'] * 1000:.1f} ms -> {result['scan_after'] * 1000:.1f} ms")
     print("=" * 60)
+    
+    if removed == 0:
+        print("\nNo orphaned or duplicate rows found.")
+
+
+def print_fetch_summary(season_data: SeasonData, fmt: str = 'text'):
+    """Display summary of fetched data showing complete vs incomplete weeks."""
+    write_report(fetch_summary_report(season_data), fmt)
 
 
 # PHASE 3: Team Analysis Display Functions
@@ -216,129 +245,234 @@ def print_team_list(teams: List[dict]):
     print("\nUse 'python main.py team --id <ID>' to analyze a specific team")
 
 
-def print_team_analysis(result: 'TeamAnalysisResult'):
-    """Display team analysis report."""
-    from .team_analysis import TeamAnalysisResult  # Import here to avoid circular dependency
+def print_sos_table(ratings: Dict[int, Dict[str, 'ScheduleAdjustedRating']],
+                    teams: List[dict], category: Optional[str] = None):
+    """
+    Display strength-of-schedule adjusted ratings.
+    
+    With a category: raw vs adjusted average per team, best first.
+    Without: adjusted average per team in every category.
+    """
+    names = {team['team_id']: team['current_name'] for team in teams}
     
     print("\n" + "=" * 90)
-    print(f"Team Analysis: {result.team_name} (ID: {result.team_id})")
-    print(f"Performance vs League Winning Thresholds ({result.weeks_analyzed} weeks analyzed)")
+    print("Strength-of-Schedule Adjusted Ratings (complete weeks)")
     print("=" * 90)
     
-    # Table header (Renamed "Median" to "To Win")
-    print(f"{'Category':<13} {'You':<8} {'To Win':<8} {'Gap':<9} {'Win%':<7} {'Status':<18} {'Trend':<15}")
-    print("-" * 90)
+    if not ratings:
+        print("No complete weeks available for analysis.")
+        print("=" * 90)
+        return
     
-    # Print each category
-    for category in ALL_CATEGORIES:
-        assessment = result.assessments[category]
-        
+    if category:
         display_name = CATEGORY_DISPLAY_NAMES.get(category, category)
+        decimals = 3 if category in ['save_pct', 'gaa'] else 1
+        rows = [r[category] for r in ratings.values() if category in r]
+        rows.sort(key=lambda r: r.adjusted_average, reverse=category not in LOWER_IS_BETTER)
         
-        # Format team average
-        if category in ['save_pct', 'gaa']:
-            you_val = f"{assessment.team_average:.3f}" if assessment.team_average > 0 else "0.000"
-            median_val = f"{assessment.threshold_median:.3f}"
-        else:
-            you_val = f"{int(assessment.team_average)}" if assessment.team_average > 0 else "0"
-            median_val = f"{int(assessment.threshold_median)}"
-        
-        # Format gap
-        if assessment.assessment == 'no_data':
-            gap_str = "--"
-        elif category in ['save_pct', 'gaa']:
-            gap_str = f"{assessment.gap:+.3f}"
-        else:
-            gap_str = f"{assessment.gap:+.1f}"
-        
-        # Format win rate
-        if assessment.win_rate < 0 or assessment.wins + assessment.losses == 0:
-            winrate_str = "--"
-        else:
-            winrate_str = f"{assessment.win_rate*100:.0f}%"
-        
-        # Status with indicator
-        status_indicators = {
-            'dominant': '🟢',
-            'strong': '🟢',
-            'competitive': '🟡',
-            'weak': '🔴',
-            'critical': '🔴',
-            'no_data': '⚪'
-        }
-        
-        indicator = status_indicators.get(assessment.assessment, '⚪')
-        status_text = assessment.assessment.capitalize()
-        status_str = f"{indicator} {status_text}"
-        
-        # Trend with arrow
-        trend_indicators = {
-            'improving': '↗',
-            'stable': '→',
-            'declining': '↘',
-            'insufficient_data': '?'
-        }
-        
-        trend_arrow = trend_indicators.get(assessment.trend, '?')
-        trend_str = f"{trend_arrow} {assessment.trend.replace('_', ' ').capitalize()}"
-        
-        print(f"{display_name:<13} {you_val:<8} {median_val:<8} {gap_str:<9} {winrate_str:<7} {status_str:<25} {trend_str:<15}")
+        print(f"{display_name} ({'lower' if category in LOWER_IS_BETTER else 'higher'} is better)")
+        print("-" * 90)
+        print(f"{'Rank':<6} {'Team':<30} {'Weeks':<7} {'Raw':<10} {'Adjusted':<10} {'Schedule':<10} {'Allows':<10}")
+        print("-" * 90)
+        for rank, r in enumerate(rows, 1):
+            name = names.get(r.team_id, f"Team {r.team_id}")[:29]
+            print(f"{rank:<6} {name:<30} {r.weeks:<7} {r.raw_average:<10.{decimals}f} "
+                  f"{r.adjusted_average:<10.{decimals}f} {r.schedule_effect:<+10.{decimals}f} "
+                  f"{r.opponent_effect:<+10.{decimals}f}")
+        print("-" * 90)
+        print('"Schedule" = how much opponents moved the raw average (Raw = Adjusted + Schedule)')
+        print('"Allows"   = how much this team moves its opponents\' values')
+    else:
+        labels = [CATEGORY_DISPLAY_NAMES.get(c, c)[:6] for c in ALL_CATEGORIES]
+        print(f"{'Team':<12}" + "".join(f"{label:>7}" for label in labels))
+        print("-" * 90)
+        for team_id in sorted(ratings, key=lambda t: names.get(t, '')):
+            cells = []
+            for c in ALL_CATEGORIES:
+                rating = ratings[team_id].get(c)
+                if rating is None:
+                    cells.append(f"{'--':>7}")
+                elif c in ['save_pct', 'gaa']:
+                    cells.append(f"{rating.adjusted_average:>7.3f}")
+                else:
+                    cells.append(f"{rating.adjusted_average:>7.1f}")
+            name = names.get(team_id, f"Team {team_id}")[:11]
+            print(f"{name:<12}" + "".join(cells))
+        print("-" * 90)
+        print("Weekly averages against an average opponent.")
+        print("Use 'python main.py sos --category <name>' for raw vs adjusted detail.")
+    print("=" * 90)
+
+
+def print_punt_analysis(analysis: 'PuntAnalysis', team_name: str):
+    """Display the cheapest categories to punt for a team."""
+    print("\n" + "=" * 80)
+    print(f"Punt Analysis: {team_name} (ID: {analysis.team_id})")
+    print(f"{analysis.weeks} complete weeks vs {analysis.opponents} opponents "
+          f"(all {2 ** len(ALL_CATEGORIES)} category subsets scored)")
+    print("=" * 80)
     
-    print("-" * 90)
+    # Per-category odds
+    print(f"{'Category':<13} {'Win% vs league':<15}")
+    print("-" * 80)
+    for category in ALL_CATEGORIES:
+        display_name = CATEGORY_DISPLAY_NAMES.get(category, category)
+        print(f"{display_name:<13} {analysis.category_win_probs[category] * 100:>6.1f}%")
+    print("-" * 80)
+    
+    baseline = analysis.baseline
+    print(f"No punt: {baseline.expected_category_wins:.2f} category wins/week, "
+          f"{baseline.matchup_win_prob * 100:.1f}% matchup win probability")
+    
+    for size, strategies in analysis.strategies.items():
+        print(f"\nBest {size}-category punt{'s' if size > 1 else ''}:")
+        print(f"  {'Punt':<36} {'Cat Wins':<10} {'Win%':<8} {'Change':<8}")
+        for s in strategies:
+            punted = ", ".join(CATEGORY_DISPLAY_NAMES.get(c, c) for c in s.punted)
+            win_pct = f"{s.matchup_win_prob * 100:.1f}%"
+            print(f"  {punted:<36} {s.expected_category_wins:<10.2f} {win_pct:<8} {s.change * 100:+.1f}")
+    
+    print("\n" + "-" * 80)
+    print("Punted categories are conceded; 'Change' is the drop in matchup win probability.")
+    print("The cheapest punts are where roster spots can move with the least damage.")
+    print("=" * 80)
 
-    # Added Legend
-    print("=" * 90)
-    print("HOW TO READ THIS:")
-    print('  "To Win"  = Typical score among category winners (median across all matchups)')
-    print('  "Gap"     = Your average minus To Win (positive = you\'re ahead)')
-    print('  "Win%"    = How often you won this category head-to-head')
-    print("")
-    print("  Status: 🟢 Strong (≥ To Win) | 🟡 Competitive (in range) | 🔴 Weak (below min)")
-    print("  Trend:  Last 3 weeks vs first 3 weeks (↗ improving, ↘ declining)")
-    print("")
-    print("  Note: GAA is inverted — lower is better, so negative Gap = good")
-    print("=" * 90)
+
+def print_live_odds(odds: List['MatchupOdds'], teams: List[dict], days_left: float):
+    """Display live win probabilities for every in-progress matchup."""
+    names = {team['team_id']: team['current_name'] for team in teams}
     
-    # Improvement Priorities
-    if result.improvement_priorities:
-        print("\n📈 IMPROVEMENT PRIORITIES:")
-        print("-" * 90)
-        for category, gap in result.improvement_priorities:
-            display_name = CATEGORY_DISPLAY_NAMES.get(category, category)
-            direction = result.assessments[category].direction
-            
-            if category in ['save_pct', 'gaa']:
-                gap_display = f"{abs(gap):.3f}"
-            else:
-                gap_display = f"{abs(gap):.1f}"
-            
-            if direction == 'lower_wins':
-                print(f"  • {display_name}: {gap_display} above median (lower is better)")
-            else:
-                print(f"  • {display_name}: {gap_display} below median")
-    else:
-        print("\n✅ No improvement needed - all categories at or above threshold!")
+    print("\n" + "=" * 90)
+    if not odds:
+        print("Live Win Probabilities")
+        print("=" * 90)
+        print("No week in progress. Run 'python main.py fetch' during a live week.")
+        print("=" * 90)
+        return
     
-    # Strengths
-    if result.strengths:
-        print("\n💪 STRENGTHS:")
+    print(f"Live Win Probabilities: Week {odds[0].week} ({days_left:g} of 7 days left)")
+    print("=" * 90)
+    labels = [CATEGORY_DISPLAY_NAMES.get(c, c)[:6] for c in ALL_CATEGORIES]
+    
+    for o in odds:
+        name1 = names.get(o.team1_id, f"Team {o.team1_id}")
+        name2 = names.get(o.team2_id, f"Team {o.team2_id}")
+        print(f"{name1} {o.team1_win * 100:.1f}%  |  Tie {o.tie * 100:.1f}%  |  {name2} {o.team2_win * 100:.1f}%")
+        print(f"  {'':<12}" + "".join(f"{label:>7}" for label in labels))
+        print(f"  {name1[:11]:<12}" + "".join(f"{o.category_win[c] * 100:>6.0f}%" for c in ALL_CATEGORIES))
         print("-" * 90)
-        for category, assessment_type in result.strengths:
-            display_name = CATEGORY_DISPLAY_NAMES.get(category, category)
-            cat_assessment = result.assessments[category]
-            
-            if category in ['save_pct', 'gaa']:
-                gap_display = f"{cat_assessment.gap:+.3f}"
-            else:
-                gap_display = f"{cat_assessment.gap:+.1f}"
-            
-            if assessment_type == 'dominant':
-                print(f"  ✓ {display_name} - Dominant (gap: {gap_display})")
-            else:
-                print(f"  ✓ {display_name} - Strong (gap: {gap_display})")
     
-    # Legend
-    print("\n" + "-" * 90)
-    print("Status: 🟢 Strong/Dominant | 🟡 Competitive | 🔴 Weak/Critical | ⚪ No Data")
-    print("Trend:  ↗ Improving | → Stable | ↘ Declining | ? Insufficient data")
+    print("Category odds are the first team's chance to win it (ties excluded).")
+    print("Projections scale each team's complete-week distribution to the days left.")
     print("=" * 90)
+
+
+def print_recommendations(result: 'RecommendationResult', position: Optional[str] = None):
+    """Display the top available players for a team."""
+    print("\n" + "=" * 90)
+    title = f"Free-Agent Recommendations: {result.team_name} (ID: {result.team_id})"
+    print(title + (f" - {position} only" if position else ""))
+    weeks = f"weeks {result.weeks[0]}-{result.weeks[-1]}" if result.weeks else "no weeks"
+    print(f"{result.pool_size} available players, mean weekly lines over {weeks}")
+    print("=" * 90)
+    
+    if not result.recommendations:
+        if result.pool_size == 0:
+            print("No player stats stored. Run 'python main.py fetch' (without --skip-players).")
+        else:
+            print("No available players match.")
+        print("=" * 90)
+        return
+    
+    focus = ", ".join(CATEGORY_DISPLAY_NAMES.get(c, c) for c, _ in result.priorities[:5])
+    print(f"Top priorities: {focus}")
+    print(f"{'#':<4}{'Player':<24}{'Pos':<8}{'NHL':<6}{'Wins+':<8}{'Biggest gains'}")
+    print("-" * 90)
+    for rank, rec in enumerate(result.recommendations, 1):
+        top = sorted(rec.gains.items(), key=lambda x: x[1], reverse=True)[:3]
+        gains = ", ".join(f"{CATEGORY_DISPLAY_NAMES.get(c, c)} {g:+.2f}" for c, g in top if g > 0)
+        positions = ",".join(rec.positions)
+        print(f"{rank:<4}{rec.name[:23]:<24}{positions:<8}{rec.nhl_team:<6}{rec.score:<+8.2f}{gains}")
+    print("-" * 90)
+    print("Wins+ = expected extra category wins per matchup from adding the player's weekly line")
+    print(f"({result.evaluated} of {result.pool_size} players scored; the rest could not reach the top {len(result.recommendations)})")
+    print("=" * 90)
+
+
+def print_lineup(result: 'LineupResult'):
+    """Display the optimal lineup against this week's opponent."""
+    print("\n" + "=" * 80)
+    print(f"Optimal Lineup: {result.team_name} (ID: {result.team_id})")
+    print(f"Week {result.week} vs {result.opponent_name} (ID: {result.opponent_id})")
+    print("=" * 80)
+    
+    current = set(result.current_starters)
+    print(f"{'Slot':<6}{'Player':<26}{'Eligible':<12}")
+    print("-" * 80)
+    for slot, player_id in result.starters:
+        if player_id is None:
+            print(f"{slot:<6}{'(leave empty)':<26}")
+            continue
+        change = "" if not current or player_id in current else "  ← start"
+        eligible = ",".join(result.positions.get(player_id, []))
+        print(f"{slot:<6}{result.names.get(player_id, str(player_id))[:25]:<26}{eligible:<12}{change}")
+    if result.bench:
+        bench = []
+        for player_id in result.bench:
+            marker = " (sit)" if player_id in current else ""
+            bench.append(f"{result.names.get(player_id, str(player_id))}{marker}")
+        print(f"{'BN':<6}{', '.join(bench)}")
+    print("-" * 80)
+    
+    labels = [CATEGORY_DISPLAY_NAMES.get(c, c)[:6] for c in ALL_CATEGORIES]
+    print("".join(f"{label:>7}" for label in labels))
+    print("".join(f"{result.category_win[c] * 100:>6.0f}%" if c in result.category_win else f"{'--':>7}"
+                  for c in ALL_CATEGORIES))
+    print("-" * 80)
+    summary = f"Expected category wins: {result.expected_wins:.2f}"
+    if result.current_expected_wins is not None:
+        summary += f" (lineup as set: {result.current_expected_wins:.2f}, "
+        summary += f"{result.expected_wins - result.current_expected_wins:+.2f})"
+    print(summary)
+    print(f"Category odds vs the opponent's complete weeks; "
+          f"{result.nodes} search nodes, {result.pruned} pruned by the bound.")
+    print("=" * 80)
+
+
+def print_trade(result: 'TradeResult'):
+    """Display both sides of a candidate trade, before and after."""
+    def players(ids):
+        return ", ".join(result.names.get(p, str(p)) for p in ids) or "nothing"
+    
+    print("\n" + "=" * 80)
+    first, second = result.sides
+    print(f"Trade: {first.team_name} (ID: {first.team_id}) <-> {second.team_name} (ID: {second.team_id})")
+    print(f"{result.simulations} simulations of the {result.remaining_weeks} remaining weeks")
+    print("=" * 80)
+    
+    for side in result.sides:
+        print(f"\n{side.team_name} sends {players(side.sends)}; receives {players(side.receives)}")
+        print(f"  {'':<22}{'Before':>10}{'After':>10}{'Change':>10}")
+        before, after = side.before, side.after
+        print(f"  {'Category wins/week':<22}{before.expected_wins:>10.2f}{after.expected_wins:>10.2f}"
+              f"{after.expected_wins - before.expected_wins:>+10.2f}")
+        print(f"  {'Season points':<22}{before.expected_points:>10.1f}{after.expected_points:>10.1f}"
+              f"{after.expected_points - before.expected_points:>+10.1f}")
+        print(f"  {'Playoff odds':<22}{before.playoff_odds * 100:>9.1f}%{after.playoff_odds * 100:>9.1f}%"
+              f"{(after.playoff_odds - before.playoff_odds) * 100:>+9.1f}%")
+        changes = sorted(((after.category_win[c] - before.category_win[c], c) for c in ALL_CATEGORIES),
+                         reverse=True)
+        moved = ", ".join(f"{CATEGORY_DISPLAY_NAMES.get(c, c)} {d * 100:+.0f}%" for d, c in changes if abs(d) >= 0.005)
+        print(f"  Category win odds: {moved or 'unchanged'}")
+    
+    print("\n" + "-" * 80)
+    if result.sampled:
+        print(f"Simulated {result.sampled} team rosters for this trade; the rest came from the cache")
+    else:
+        print("Every team simulation came from the cache")
+    print("=" * 80)
+
+
+def print_team_analysis(result: 'TeamAnalysisResult', fmt: str = 'text'):
+    """Display team analysis report."""
+    write_report(team_analysis_report(result), fmt)
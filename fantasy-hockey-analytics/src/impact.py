@@ -0,0 +1,124 @@
+"""
+Marginal category value: how much one more unit of a stat is worth.
+
+For each category the league's complete weekly values form an empirical win
+curve W(v): the share of league team-weeks a weekly value v beats (ties
+half; reversed for GAA). A team's expected category win rate is the mean of
+W over its own weekly values, and the marginal value of a category is the
+finite difference of that mean when every weekly value moves by one unit or
+by one league standard deviation in the winning direction:
+
+    gain = mean(W(x + delta)) - mean(W(x))
+
+Expressed in expected category wins per matchup, gains are comparable across
+categories with very different units (hits vs SV%). Every team is evaluated
+in one batch per category: one searchsorted over all team-weeks for each of
+W(x) and W(x + delta), then grouped means by team.
+
+Goalie rate stats skip weeks without a goalie start, as elsewhere.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .database import RATE_CATEGORIES
+from .snapshot import StatCube, load_snapshot, PRESENT, COMPLETE
+from .constants import ALL_CATEGORIES, LOWER_IS_BETTER
+
+# Size of "one unit" per category (counting stats: 1)
+STAT_UNITS = {
+    'save_pct': 0.001,  # One point of save percentage
+    'gaa': 0.01,
+}
+
+
+@dataclass
+class CategoryImpact:
+    """Marginal value of one category for one team."""
+    category: str
+    unit: float           # Step used for gain_per_unit
+    league_std: float     # Step used for gain_per_std
+    win_rate: float       # Expected category win rate vs the league's weeks
+    gain_per_unit: float  # Expected category wins per matchup from +1 unit (-1 for GAA)
+    gain_per_std: float   # ... from one standard deviation
+
+
+def win_curve(league_values: np.ndarray, values: np.ndarray, lower_is_better: bool) -> np.ndarray:
+    """Share of league weekly values each of `values` beats (ties half). league_values sorted."""
+    below = np.searchsorted(league_values, values, side='left')
+    not_above = np.searchsorted(league_values, values, side='right')
+    ties = not_above - below
+    wins = len(league_values) - not_above if lower_is_better else below
+    return (wins + 0.5 * ties) / len(league_values)
+
+
+def category_values(cube: StatCube, category: str) -> Tuple[np.ndarray, np.ndarray]:
+    """(values, team rows) of every complete team-week; rate stats only weeks with a start."""
+    required = PRESENT | COMPLETE
+    teams, weeks = np.nonzero((cube.flags & required) == required)
+    values = cube.values[teams, weeks, cube.category_index[category]]
+    if category in RATE_CATEGORIES:
+        started = values != 0
+        values, teams = values[started], teams[started]
+    return values, teams
+
+
+def shifted_win_rates(league_values: np.ndarray, values: np.ndarray, moves: np.ndarray,
+                      lower_is_better: bool) -> np.ndarray:
+    """Mean win curve over `values` with every value moved by each of `moves` ([moves] -> [moves])."""
+    shifted = values[None, :] + moves[:, None]
+    return win_curve(league_values, shifted.ravel(), lower_is_better).reshape(shifted.shape).mean(axis=1)
+
+
+def _grouped_mean(teams: np.ndarray, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    return np.bincount(teams, weights=values, minlength=len(counts)) / np.maximum(counts, 1)
+
+
+def calculate_category_impacts(db_path: str = "fantasy_hockey.db",
+                               cube: Optional[StatCube] = None) -> Dict[int, Dict[str, CategoryImpact]]:
+    """
+    Marginal category values for every team, keyed by team_id then category.
+
+    Uses the stat cube snapshot when current (SQLite otherwise).
+    """
+    cube = cube or load_snapshot(db_path) or StatCube.from_database(db_path)
+
+    impacts = {}
+    for category in ALL_CATEGORIES:
+        observed, teams = category_values(cube, category)
+        if len(observed) == 0:
+            continue
+
+        lower = category in LOWER_IS_BETTER
+        league = np.sort(observed)
+        unit = STAT_UNITS.get(category, 1.0)
+        league_std = float(league.std())
+        direction = -1.0 if lower else 1.0
+
+        # Every team at once: win curve at x, x + unit and x + std
+        counts = np.bincount(teams, minlength=len(cube.team_ids))
+        base = _grouped_mean(teams, win_curve(league, observed, lower), counts)
+        plus_unit = _grouped_mean(teams, win_curve(league, observed + direction * unit, lower), counts)
+        plus_std = _grouped_mean(teams, win_curve(league, observed + direction * league_std, lower), counts)
+
+        for t in np.nonzero(counts)[0]:
+            team_id = int(cube.team_ids[t])
+            impacts.setdefault(team_id, {})[category] = CategoryImpact(
+                category=category,
+                unit=unit,
+                league_std=league_std,
+                win_rate=float(base[t]),
+                gain_per_unit=float(plus_unit[t] - base[t]),
+                gain_per_std=float(plus_std[t] - base[t])
+            )
+
+    return impacts
+
+
+def get_impact_priorities(impacts: Dict[str, CategoryImpact]) -> List[Tuple[str, float]]:
+    """(category, gain_per_std) sorted by biggest win-probability gain first."""
+    priorities = [(category, impact.gain_per_std) for category, impact in impacts.items()]
+    priorities.sort(key=lambda x: x[1], reverse=True)
+    return priorities
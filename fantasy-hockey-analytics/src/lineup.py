@@ -0,0 +1,273 @@
+"""
+Lineup optimizer: the starters that maximize expected category wins
+against this week's opponent.
+
+Each active rostered player (IR/NA excluded) is projected by the mean
+weekly line over recent complete weeks (recommend.load_player_pool). A
+lineup's category totals are its starters' summed lines, with SV%/GAA from
+the summed goalie components. Each category's win curve W(v) is the share
+of the opponent's complete weeks a weekly total v beats (ties half; the
+league's weeks when the opponent has fewer than MIN_WEEKS), and a lineup's
+value is the sum of W over the categories: expected category wins.
+
+The search fills the ROSTER_SLOTS slots in order, goalies first, each with
+an eligible unused player or nobody (an empty slot is sometimes right: a
+weak goalie can cost more in SV%/GAA than the start adds). Branch and bound:
+
+- bound: each counting total plus the best possible addition from the
+  remaining slots (best eligible player per slot, ignoring that a player
+  fills one slot only). Curves are monotone, so no completion beats it.
+  SV%/GAA are exact once the goalie slots are filled and count as wins
+  before. Branches whose bound can't beat the best lineup so far are cut.
+- caching: totals depend only on which players were placed, so a (slot,
+  players used) state reached again in another order is skipped, and
+  identical slots take players in a fixed order (part of the state).
+- the first incumbent is the greedy lineup; candidates are tried best first.
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .database import RATE_CATEGORIES, get_team_by_id, get_player_weeks
+from .impact import category_values
+from .recommend import load_player_pool
+from .snapshot import StatCube, load_snapshot, PRESENT
+from .constants import (ALL_CATEGORIES, COMPONENT_FIELDS, LOWER_IS_BETTER, RATIO_COMPONENTS,
+                        ROSTER_SLOTS, BENCH_POSITIONS)
+
+MIN_WEEKS = 3  # Opponent weeks needed to use the opponent's own curves
+INACTIVE_POSITIONS = BENCH_POSITIONS - {'BN'}  # Injured / not active: can't start
+
+
+@dataclass
+class LineupResult:
+    """Optimal starters for one team's week."""
+    team_id: int
+    team_name: str
+    week: int
+    opponent_id: int
+    opponent_name: str
+    starters: List[Tuple[str, Optional[int]]]  # (slot, player_id or None) in slot order
+    bench: List[int]
+    names: Dict[int, str]
+    positions: Dict[int, List[str]]
+    expected_wins: float
+    category_win: Dict[str, float]
+    current_expected_wins: Optional[float] = None  # Lineup as currently set, if any
+    current_starters: List[int] = field(default_factory=list)
+    nodes: int = 0    # Search nodes visited
+    pruned: int = 0   # ... cut by the bound
+
+
+def lineup_slots() -> List[str]:
+    """Starting slots in search order: goalies first, then ROSTER_SLOTS order."""
+    slots = ['G'] * ROSTER_SLOTS.get('G', 0)
+    return slots + [pos for pos, count in ROSTER_SLOTS.items() if pos != 'G' for _ in range(count)]
+
+
+class LineupSearch:
+    """Branch-and-bound over slot assignments for one roster and one set of win curves."""
+
+    def __init__(self, values: np.ndarray, components: np.ndarray, eligible: List[List[str]],
+                 curves: Dict[str, List[float]], slots: Optional[List[str]] = None):
+        """
+        values [players, ALL_CATEGORIES] and components [players,
+        COMPONENT_FIELDS] are weekly projections; curves maps each category
+        to the sorted weekly values its win curve is built from.
+        """
+        self.slots = slots or lineup_slots()
+        self.curves = curves
+        self.counting = [c for c in ALL_CATEGORIES if c not in RATE_CATEGORIES and c in curves]
+        self.rates = [c for c in ALL_CATEGORIES if c in RATE_CATEGORIES and c in curves]
+        self.x = values[:, [ALL_CATEGORIES.index(c) for c in self.counting]]
+        self.components = components
+        self.goalie_slots = sum(1 for slot in self.slots if slot == 'G')
+        self.nodes = 0
+        self.pruned = 0
+
+        # Candidates per slot, best first (counting stats in curve standard deviations)
+        scale = np.array([max(float(np.std(curves[c])), 1e-9) for c in self.counting])
+        merit = (self.x / scale).sum(axis=1)
+        self.candidates = [
+            sorted((p for p in range(len(values)) if slot in eligible[p]), key=lambda p: (-merit[p], p))
+            for slot in self.slots
+        ]
+
+        # Best possible addition from slots i.. (empty slot = 0)
+        best = np.array([
+            np.maximum(self.x[cands].max(axis=0), 0.0) if cands else np.zeros(len(self.counting))
+            for cands in self.candidates
+        ]).reshape(len(self.slots), len(self.counting))
+        self.remaining = np.vstack([np.cumsum(best[::-1], axis=0)[::-1], np.zeros(len(self.counting))])
+
+    def _win(self, category: str, value: float) -> float:
+        """Win curve at one value (scalar impact.win_curve)."""
+        curve = self.curves[category]
+        below = bisect_left(curve, value)
+        not_above = bisect_right(curve, value)
+        wins = len(curve) - not_above if category in LOWER_IS_BETTER else below
+        return (wins + 0.5 * (not_above - below)) / len(curve)
+
+    def _rate_wins(self, components: np.ndarray) -> List[float]:
+        wins = []
+        for category in self.rates:
+            numerator, denominator, scale = RATIO_COMPONENTS[category]
+            den = components[COMPONENT_FIELDS.index(denominator)]
+            if den <= 0:
+                wins.append(0.0)  # No goalie start: the category is lost
+            else:
+                wins.append(self._win(category, scale * components[COMPONENT_FIELDS.index(numerator)] / den))
+        return wins
+
+    def category_wins(self, picks: List[Optional[int]]) -> Dict[str, float]:
+        """Win probability per category for a lineup (player index or None per slot)."""
+        starters = [p for p in picks if p is not None]
+        totals = self.x[starters].sum(axis=0) if starters else np.zeros(len(self.counting))
+        components = self.components[starters].sum(axis=0) if starters else np.zeros(len(COMPONENT_FIELDS))
+        wins = {c: self._win(c, totals[i]) for i, c in enumerate(self.counting)}
+        wins.update(zip(self.rates, self._rate_wins(components)))
+        return wins
+
+    def evaluate(self, picks: List[Optional[int]]) -> float:
+        return sum(self.category_wins(picks).values())
+
+    def greedy(self) -> List[Optional[int]]:
+        """Best-merit unused eligible player for each slot in order."""
+        used = set()
+        picks = []
+        for cands in self.candidates:
+            pick = next((p for p in cands if p not in used), None)
+            picks.append(pick)
+            if pick is not None:
+                used.add(pick)
+        return picks
+
+    def solve(self, prune: bool = True) -> Tuple[List[Optional[int]], float]:
+        """Optimal picks per slot and their expected category wins (prune=False: exhaustive)."""
+        best_picks = self.greedy()
+        best_value = self.evaluate(best_picks)
+        visited = set()
+        num_slots = len(self.slots)
+        self.nodes = self.pruned = 0
+
+        def bound(i, totals, components) -> float:
+            value = sum(self._win(c, totals[k] + self.remaining[i, k]) for k, c in enumerate(self.counting))
+            if i >= self.goalie_slots:
+                return value + sum(self._rate_wins(components))
+            return value + len(self.rates)
+
+        def visit(i, used, picks, totals, components, start):
+            nonlocal best_picks, best_value
+            self.nodes += 1
+            if i == num_slots:
+                value = sum(self._win(c, totals[k]) for k, c in enumerate(self.counting))
+                value += sum(self._rate_wins(components))
+                if value > best_value + 1e-12:
+                    best_picks, best_value = list(picks), value
+                return
+            # Identical consecutive slots: strictly later candidates only (None last)
+            first = start + 1 if i > 0 and self.slots[i] == self.slots[i - 1] else 0
+            if (i, used, first) in visited:
+                return
+            visited.add((i, used, first))
+            if prune and bound(i, totals, components) <= best_value + 1e-12:
+                self.pruned += 1
+                return
+
+            cands = self.candidates[i]
+            for rank in range(first, len(cands)):
+                p = cands[rank]
+                if used >> p & 1:
+                    continue
+                picks.append(p)
+                visit(i + 1, used | (1 << p), picks, totals + self.x[p], components + self.components[p], rank)
+                picks.pop()
+            picks.append(None)
+            visit(i + 1, used, picks, totals, components, len(cands) - 1)
+            picks.pop()
+
+        visit(0, 0, [], np.zeros(len(self.counting)), np.zeros(len(COMPONENT_FIELDS)), -1)
+        return best_picks, best_value
+
+
+def optimize_lineup(team_id: int, db_path: str = "fantasy_hockey.db",
+                    week: Optional[int] = None) -> LineupResult:
+    """
+    Optimal starters for `team_id` against its opponent in `week` (default:
+    the latest stored week), from the team's latest stored roster.
+
+    Raises ValueError for an unknown team, no player stats, no matchup that
+    week or no complete weeks to build win curves from.
+    """
+    team = get_team_by_id(team_id, db_path)
+    if not team:
+        raise ValueError(f"Team ID {team_id} not found in database")
+
+    rows = get_player_weeks(team_id=team_id, complete_only=False, db_path=db_path)
+    if not rows:
+        raise ValueError(f"No player stats stored for team {team_id}. Run 'python main.py fetch'.")
+    latest = max(row['week'] for row in rows)
+    roster = [row for row in rows if row['week'] == latest and row['selected_position'] not in INACTIVE_POSITIONS]
+    current = {row['player_id']: row['selected_position'] for row in roster
+               if row['selected_position'] in ROSTER_SLOTS}
+
+    # This week's opponent
+    cube = load_snapshot(db_path) or StatCube.from_database(db_path)
+    t = cube.team_index.get(team_id)
+    played = [] if t is None else [int(cube.weeks[w]) for w in np.nonzero(cube.flags[t] & PRESENT)[0]]
+    week = week if week is not None else (played[-1] if played else None)
+    if week not in played:
+        raise ValueError(f"Team {team_id} has no matchup stored for week {week}")
+    opponent_row = int(cube.opponent[t, int(np.searchsorted(cube.weeks, week))])
+    opponent_id = int(cube.team_ids[opponent_row])
+
+    curves = {}
+    for category in ALL_CATEGORIES:
+        values, teams = category_values(cube, category)
+        own = values[teams == opponent_row]
+        values = own if len(own) >= MIN_WEEKS else values
+        if len(values):
+            curves[category] = np.sort(values).tolist()
+    if not curves:
+        raise ValueError("No complete weeks to build win curves from. Need at least one completed week.")
+
+    pool = load_player_pool(db_path, player_ids=[row['player_id'] for row in roster])
+    search = LineupSearch(pool.values, pool.components, pool.positions, curves)
+    picks, expected = search.solve()
+
+    ids = pool.player_ids.tolist()
+    current_picks = _current_picks(search.slots, {ids.index(p): slot for p, slot in current.items() if p in ids})
+    starters = [(slot, None if p is None else ids[p]) for slot, p in zip(search.slots, picks)]
+    started = {player_id for _, player_id in starters}
+    opponent = get_team_by_id(opponent_id, db_path)
+
+    return LineupResult(
+        team_id=team_id,
+        team_name=team['current_name'],
+        week=week,
+        opponent_id=opponent_id,
+        opponent_name=opponent['current_name'] if opponent else f"Team {opponent_id}",
+        starters=starters,
+        bench=[row['player_id'] for row in roster if row['player_id'] not in started],
+        names={row['player_id']: row['name'] for row in roster},
+        positions={row['player_id']: row['eligible_positions'] for row in roster},
+        expected_wins=expected,
+        category_win=search.category_wins(picks),
+        current_expected_wins=search.evaluate(current_picks) if current else None,
+        current_starters=sorted(current),
+        nodes=search.nodes,
+        pruned=search.pruned
+    )
+
+
+def _current_picks(slots: List[str], starters: Dict[int, str]) -> List[Optional[int]]:
+    """Slot picks for the lineup as set (player index -> selected slot)."""
+    picks = [None] * len(slots)
+    for p, selected in sorted(starters.items()):
+        free = next((i for i, slot in enumerate(slots) if slot == selected and picks[i] is None), None)
+        if free is not None:
+            picks[free] = p
+    return picks
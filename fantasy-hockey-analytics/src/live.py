@@ -0,0 +1,244 @@
+"""
+Live in-week win probabilities from partial stats.
+
+In-progress weeks are excluded from the analytics, but mid-week is when the
+odds matter. A matchup's final value in a category is its current partial
+total plus what the remaining days add. With a fraction r of the week left
+and the team's complete-week mean mu and standard deviation sigma:
+
+    counting stats   final ~ N(current + r * mu, r * sigma^2)
+    SV% / GAA        final ~ N((1 - r) * current + r * mu, r * sigma^2)
+
+(the rest of the week is a smaller sample, so its ratio varies sigma^2 / r,
+weighted by r; before a team's first goalie start the final ratio is just
+the remaining days' ratio, N(mu, sigma^2 / r)). The difference of the two
+teams' finals is normal, giving each category's win/tie/loss probability
+(counting stats use a +-0.5 continuity band for ties). The overall result is
+the distribution of category wins minus losses, built one category at a time.
+
+Every matchup and category is evaluated in one numpy pass, so odds can be
+refreshed on every watch poll. Teams with fewer than MIN_WEEKS complete
+weeks (or goalie-start weeks) use the league's distribution instead.
+"""
+
+import datetime
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .database import RATE_CATEGORIES
+from .models import Matchup
+from .snapshot import StatCube, load_snapshot, PRESENT, COMPLETE, TEAM1
+from .constants import ALL_CATEGORIES, LOWER_IS_BETTER
+
+DAYS_PER_WEEK = 7
+MIN_WEEKS = 3  # Complete weeks needed to use a team's own distribution
+
+
+@dataclass
+class MatchupOdds:
+    """Live probabilities for one in-progress matchup (team1's perspective per category)."""
+    week: int
+    team1_id: int
+    team2_id: int
+    category_win: Dict[str, float]   # P(team1 wins the category)
+    category_tie: Dict[str, float]
+    team1_win: float                 # P(team1 wins more categories)
+    team2_win: float
+    tie: float
+
+
+def default_days_left(today: Optional[datetime.date] = None) -> int:
+    """Days left in a Monday-Sunday scoring week, counting today (Mon 7 ... Sun 1)."""
+    today = today or datetime.date.today()
+    return DAYS_PER_WEEK - today.weekday()
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal CDF (Abramowitz-Stegun 7.1.26, |error| < 1.5e-7)."""
+    z = np.abs(x) / math.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+class LiveOddsModel:
+    """Per-team weekly category distributions and the vectorized live projection."""
+
+    def __init__(self, team_ids: np.ndarray, mean: np.ndarray, std: np.ndarray,
+                 categories: List[str] = None):
+        self.team_ids = team_ids
+        self.mean = mean  # [teams + 1, categories]; last row = league
+        self.std = std
+        self.categories = list(categories or ALL_CATEGORIES)
+        self.team_index = {int(t): i for i, t in enumerate(team_ids)}
+
+    @classmethod
+    def from_cube(cls, cube: StatCube) -> 'LiveOddsModel':
+        """Fit from the cube's complete weeks (goalie rate stats: weeks with a start)."""
+        num_teams = len(cube.team_ids)
+        num_categories = len(cube.categories)
+        required = PRESENT | COMPLETE
+        complete = (cube.flags & required) == required
+
+        mean = np.zeros((num_teams + 1, num_categories))
+        std = np.zeros((num_teams + 1, num_categories))
+        for c, category in enumerate(cube.categories):
+            values = cube.values[:, :, c]
+            mask = complete & (values != 0) if category in RATE_CATEGORIES else complete
+            counts = mask.sum(axis=1)
+            sums = np.where(mask, values, 0.0).sum(axis=1)
+            squares = np.where(mask, values ** 2, 0.0).sum(axis=1)
+
+            league_n = counts.sum()
+            if league_n == 0:
+                continue
+            league_mean = sums.sum() / league_n
+            league_var = max(squares.sum() / league_n - league_mean ** 2, 0.0)
+
+            own = counts >= MIN_WEEKS
+            safe = np.maximum(counts, 1)
+            team_mean = sums / safe
+            team_var = np.maximum(squares / safe - team_mean ** 2, 0.0) * safe / np.maximum(safe - 1, 1)
+            mean[:num_teams, c] = np.where(own, team_mean, league_mean)
+            std[:num_teams, c] = np.sqrt(np.where(own, team_var, league_var))
+            mean[num_teams, c] = league_mean
+            std[num_teams, c] = math.sqrt(league_var)
+
+        return cls(cube.team_ids, mean, std, cube.categories)
+
+    def _rows(self, team_ids: np.ndarray) -> np.ndarray:
+        """Model rows for team_ids; unknown teams get the league row."""
+        league = len(self.team_ids)
+        return np.array([self.team_index.get(int(t), league) for t in team_ids.ravel()]).reshape(team_ids.shape)
+
+    def probabilities(self, current: np.ndarray, team_ids: np.ndarray,
+                      remaining: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized core for M matchups.
+
+        current [M, 2, categories] partial totals, team_ids [M, 2], remaining [M]
+        fraction of the week left. Returns (category_win [M, C], category_tie
+        [M, C], overall [M, 3] = team1 win, tie, team2 win).
+        """
+        rows = self._rows(team_ids)
+        mu = self.mean[rows]      # [M, 2, C]
+        sigma = self.std[rows]
+        r = np.clip(np.asarray(remaining, dtype=float), 0.0, 1.0)[:, None, None]
+
+        rate = np.array([c in RATE_CATEGORIES for c in self.categories])
+        started = current != 0
+        # Rate stats: weight of the remaining days in the final ratio
+        weight = np.where(started, r, np.where(r > 0, 1.0, 0.0))
+        projected_mean = np.where(rate, (1 - weight) * current + weight * mu, current + r * mu)
+        projected_var = np.where(
+            rate,
+            np.where(r > 0, weight ** 2 * sigma ** 2 / np.maximum(r, 1e-12), 0.0),
+            r * sigma ** 2
+        )
+
+        diff_mean = projected_mean[:, 0] - projected_mean[:, 1]
+        diff_sd = np.sqrt(projected_var[:, 0] + projected_var[:, 1])
+        diff_sd = np.maximum(diff_sd, 1e-12)
+
+        lower = np.array([c in LOWER_IS_BETTER for c in self.categories])
+        band = np.where(rate, 0.0, 0.5)  # Integer totals tie within +-0.5
+        above = 1.0 - _norm_cdf((band - diff_mean) / diff_sd)    # P(diff > band)
+        below = _norm_cdf((-band - diff_mean) / diff_sd)         # P(diff < -band)
+        win = np.where(lower, below, above)
+        loss = np.where(lower, above, below)
+        tie = np.clip(1.0 - win - loss, 0.0, 1.0)
+
+        # Distribution of (category wins - losses), offset by C
+        num_categories = len(self.categories)
+        dist = np.zeros((len(current), 2 * num_categories + 1))
+        dist[:, num_categories] = 1.0
+        for c in range(num_categories):
+            nxt = dist * tie[:, c:c + 1]
+            nxt[:, 1:] += dist[:, :-1] * win[:, c:c + 1]
+            nxt[:, :-1] += dist[:, 1:] * loss[:, c:c + 1]
+            dist = nxt
+
+        overall = np.stack([
+            dist[:, num_categories + 1:].sum(axis=1),
+            dist[:, num_categories],
+            dist[:, :num_categories].sum(axis=1)
+        ], axis=1)
+        return win, tie, overall
+
+    def evaluate(self, week: int, team_ids: np.ndarray, current: np.ndarray,
+                 remaining) -> List[MatchupOdds]:
+        """MatchupOdds for M matchups (team_ids [M, 2], current [M, 2, C], remaining scalar or [M])."""
+        if len(team_ids) == 0:
+            return []
+        remaining = np.broadcast_to(np.asarray(remaining, dtype=float), (len(team_ids),))
+        win, tie, overall = self.probabilities(current, team_ids, remaining)
+        return [
+            MatchupOdds(
+                week=week,
+                team1_id=int(team_ids[m, 0]),
+                team2_id=int(team_ids[m, 1]),
+                category_win=dict(zip(self.categories, win[m].tolist())),
+                category_tie=dict(zip(self.categories, tie[m].tolist())),
+                team1_win=float(overall[m, 0]),
+                team2_win=float(overall[m, 2]),
+                tie=float(overall[m, 1])
+            )
+            for m in range(len(team_ids))
+        ]
+
+    def evaluate_matchups(self, matchups: List[Matchup], remaining: float) -> List[MatchupOdds]:
+        """Odds for parsed matchups of one week (e.g. a watch poll); final matchups are settled."""
+        if not matchups:
+            return []
+        remaining = np.array([0.0 if m.is_complete else remaining for m in matchups])
+        team_ids = np.array([[m.team1.team_id, m.team2.team_id] for m in matchups])
+        current = np.array([
+            [[float(getattr(team, category)) for category in self.categories] for team in (m.team1, m.team2)]
+            for m in matchups
+        ])
+        return self.evaluate(matchups[0].week, team_ids, current, remaining)
+
+
+def fit_live_model(db_path: str = "fantasy_hockey.db",
+                   cube: Optional[StatCube] = None) -> Optional[LiveOddsModel]:
+    """Live odds model from the stored complete weeks; None if there are none."""
+    cube = cube or load_snapshot(db_path) or StatCube.from_database(db_path)
+    if not np.any(cube.flags & COMPLETE):
+        return None
+    return LiveOddsModel.from_cube(cube)
+
+
+def calculate_live_odds(db_path: str = "fantasy_hockey.db", days_left: Optional[float] = None,
+                        week: Optional[int] = None) -> List[MatchupOdds]:
+    """
+    Live odds for every matchup of the stored in-progress week (the latest
+    one unless `week` is given). Empty if no week is in progress.
+    
+    Raises ValueError without a complete week to learn distributions from.
+    """
+    days_left = default_days_left() if days_left is None else days_left
+    if not 0 <= days_left <= DAYS_PER_WEEK:
+        raise ValueError(f"days_left must be between 0 and {DAYS_PER_WEEK}, got {days_left}")
+
+    cube = load_snapshot(db_path) or StatCube.from_database(db_path)
+    in_progress = ((cube.flags & PRESENT) != 0) & ((cube.flags & COMPLETE) == 0)
+    live_weeks = [int(cube.weeks[w]) for w in np.nonzero(in_progress.any(axis=0))[0]]
+    if week is None:
+        if not live_weeks:
+            return []
+        week = live_weeks[-1]
+    elif week not in live_weeks:
+        raise ValueError(f"Week {week} is not in progress")
+
+    w = int(np.searchsorted(cube.weeks, week))
+    rows = np.nonzero(in_progress[:, w] & ((cube.flags[:, w] & TEAM1) != 0))[0]
+    pairs = np.stack([rows, cube.opponent[rows, w]], axis=1)
+
+    model = fit_live_model(db_path, cube)
+    if model is None:
+        raise ValueError("No complete weeks to project from. Need at least one completed week.")
+    return model.evaluate(week, cube.team_ids[pairs], cube.values[pairs, w], days_left / DAYS_PER_WEEK)
@@ -0,0 +1,386 @@
+"""
+Versioned, resumable in-place schema migrations.
+
+The schema version is stored in SQLite's PRAGMA user_version. Databases created
+before versioning are detected from their tables (teams => v2,
+weekly_snapshots only => v1) and stamped.
+
+Each migration copies data forward into new tables in fixed-size batches. Every
+batch runs in its own transaction together with a progress marker in
+schema_migration_progress, so an interrupted run (Ctrl-C, crash, power loss)
+resumes from the last committed batch. The final swap (drop old tables,
+rename new ones, bump user_version) is a single transaction.
+"""
+
+import sqlite3
+from typing import Callable, Dict, Optional
+
+DEFAULT_BATCH_SIZE = 50000
+
+# The Phase 2 (v1) schema: teams identified by name only.
+# Kept for detecting, testing and benchmarking the v1 -> v2 upgrade.
+V1_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS weekly_snapshots (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        week_number INTEGER NOT NULL,
+        fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_complete BOOLEAN NOT NULL,
+        UNIQUE(week_number)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS matchup_results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        snapshot_id INTEGER REFERENCES weekly_snapshots(id),
+        week_number INTEGER NOT NULL,
+        team1_name TEXT NOT NULL,
+        team2_name TEXT NOT NULL,
+        team1_manager TEXT,
+        team2_manager TEXT,
+        team1_category_wins INTEGER,
+        team2_category_wins INTEGER,
+        ties INTEGER,
+        is_complete BOOLEAN NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS category_outcomes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        matchup_id INTEGER REFERENCES matchup_results(id),
+        week_number INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        team1_value REAL NOT NULL,
+        team2_value REAL NOT NULL,
+        winner TEXT,
+        winning_value REAL,
+        losing_value REAL,
+        is_complete BOOLEAN NOT NULL
+    )
+    """,
+]
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)
+    ).fetchone()
+    return row is not None
+
+
+def get_user_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def detect_version(conn: sqlite3.Connection) -> int:
+    """Schema version of an open database: user_version, or inferred for older files. 0 = empty."""
+    version = get_user_version(conn)
+    if version > 0:
+        return version
+
+    # Interrupted v1 -> v2 migration: old tables are still in place
+    if _table_exists(conn, 'matchup_results_v2'):
+        return 1
+    if _table_exists(conn, 'teams'):
+        return 2
+    if _table_exists(conn, 'weekly_snapshots'):
+        return 1
+    return 0
+
+
+def _ensure_progress_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migration_progress (
+            target_version INTEGER NOT NULL,
+            step TEXT NOT NULL,
+            last_id INTEGER NOT NULL DEFAULT 0,
+            done BOOLEAN NOT NULL DEFAULT 0,
+            PRIMARY KEY (target_version, step)
+        )
+    """)
+
+
+def _get_progress(conn: sqlite3.Connection, version: int, step: str):
+    row = conn.execute("""
+        SELECT last_id, done FROM schema_migration_progress
+        WHERE target_version = ? AND step = ?
+    """, (version, step)).fetchone()
+    return (row[0], bool(row[1])) if row else (0, False)
+
+
+def _set_progress(conn: sqlite3.Connection, version: int, step: str, last_id: int, done: bool):
+    conn.execute("""
+        INSERT INTO schema_migration_progress (target_version, step, last_id, done)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(target_version, step) DO UPDATE SET
+            last_id = excluded.last_id,
+            done = excluded.done
+    """, (version, step, last_id, done))
+
+
+class _BatchBudget:
+    """Counts committed batches; lets callers stop a migration early."""
+
+    def __init__(self, max_batches: Optional[int]):
+        self.max_batches = max_batches
+        self.used = 0
+
+    def exhausted(self) -> bool:
+        return self.max_batches is not None and self.used >= self.max_batches
+
+
+def _copy_in_batches(conn: sqlite3.Connection, version: int, step: str,
+                     source_table: str, insert_sql: str, batch_size: int,
+                     budget: _BatchBudget, progress: Optional[Callable]) -> bool:
+    """
+    Run insert_sql for consecutive id ranges of source_table, one transaction per batch.
+
+    insert_sql receives (low_id, high_id) parameters. Returns True when the step is done.
+    """
+    last_id, done = _get_progress(conn, version, step)
+    if done:
+        return True
+
+    max_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {source_table}").fetchone()[0]
+
+    while last_id < max_id:
+        if budget.exhausted():
+            return False
+
+        high_id = min(last_id + batch_size, max_id)
+        conn.execute("BEGIN")
+        try:
+            conn.execute(insert_sql, (last_id, high_id))
+            _set_progress(conn, version, step, high_id, False)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        last_id = high_id
+        budget.used += 1
+        if progress:
+            progress(step, last_id, max_id)
+
+    conn.execute("BEGIN")
+    _set_progress(conn, version, step, last_id, True)
+    conn.execute("COMMIT")
+    return True
+
+
+def _migrate_v1_to_v2(conn: sqlite3.Connection, batch_size: int,
+                      budget: _BatchBudget, progress: Optional[Callable]) -> bool:
+    """
+    v1 (team names) -> v2 (persistent team IDs).
+
+    v1 databases never stored Yahoo team IDs, so each distinct team name gets a
+    provisional ID in order of first appearance. The next fetch of the same
+    weeks replaces those matchups with Yahoo's IDs.
+    """
+    version = 2
+
+    # Step 1: teams + name -> id map (small, single transaction)
+    _, done = _get_progress(conn, version, 'teams')
+    if not done:
+        conn.execute("BEGIN")
+        try:
+            conn.execute("DROP TABLE IF EXISTS teams")
+            conn.execute("DROP TABLE IF EXISTS v1_team_ids")
+            conn.execute("""
+                CREATE TABLE v1_team_ids (
+                    team_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL UNIQUE
+                )
+            """)
+            conn.execute("""
+                INSERT INTO v1_team_ids (name)
+                SELECT name FROM (
+                    SELECT team1_name AS name, MIN(id) AS first_id FROM matchup_results GROUP BY team1_name
+                    UNION ALL
+                    SELECT team2_name AS name, MIN(id) AS first_id FROM matchup_results GROUP BY team2_name
+                )
+                GROUP BY name
+                ORDER BY MIN(first_id), name
+            """)
+            conn.execute("""
+                CREATE TABLE teams (
+                    team_id INTEGER PRIMARY KEY,
+                    current_name TEXT NOT NULL,
+                    manager_name TEXT,
+                    first_seen_week INTEGER,
+                    last_seen_week INTEGER
+                )
+            """)
+            conn.execute("""
+                INSERT INTO teams (team_id, current_name, manager_name, first_seen_week, last_seen_week)
+                SELECT t.team_id, t.name,
+                    (SELECT CASE WHEN m.team1_name = t.name THEN m.team1_manager ELSE m.team2_manager END
+                     FROM matchup_results m
+                     WHERE m.team1_name = t.name OR m.team2_name = t.name
+                     ORDER BY m.id DESC LIMIT 1),
+                    (SELECT MIN(week_number) FROM matchup_results m
+                     WHERE m.team1_name = t.name OR m.team2_name = t.name),
+                    (SELECT MAX(week_number) FROM matchup_results m
+                     WHERE m.team1_name = t.name OR m.team2_name = t.name)
+                FROM v1_team_ids t
+            """)
+            conn.execute("""
+                CREATE TABLE matchup_results_v2 (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    snapshot_id INTEGER REFERENCES weekly_snapshots(id),
+                    week_number INTEGER NOT NULL,
+                    team1_id INTEGER NOT NULL REFERENCES teams(team_id),
+                    team2_id INTEGER NOT NULL REFERENCES teams(team_id),
+                    team1_category_wins INTEGER,
+                    team2_category_wins INTEGER,
+                    ties INTEGER,
+                    is_complete BOOLEAN NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE category_outcomes_v2 (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    matchup_id INTEGER REFERENCES matchup_results(id),
+                    week_number INTEGER NOT NULL,
+                    category TEXT NOT NULL,
+                    team1_id INTEGER NOT NULL,
+                    team2_id INTEGER NOT NULL,
+                    team1_value REAL NOT NULL,
+                    team2_value REAL NOT NULL,
+                    winner_team_id INTEGER,
+                    winning_value REAL,
+                    losing_value REAL,
+                    is_complete BOOLEAN NOT NULL
+                )
+            """)
+            _set_progress(conn, version, 'teams', 0, True)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if progress:
+            progress('teams', 1, 1)
+
+    # Step 2: matchup_results, keeping ids so category_outcomes.matchup_id stays valid
+    done = _copy_in_batches(conn, version, 'matchup_results', 'matchup_results', """
+        INSERT INTO matchup_results_v2
+            (id, snapshot_id, week_number, team1_id, team2_id,
+             team1_category_wins, team2_category_wins, ties, is_complete)
+        SELECT m.id, m.snapshot_id, m.week_number, t1.team_id, t2.team_id,
+               m.team1_category_wins, m.team2_category_wins, m.ties, m.is_complete
+        FROM matchup_results m
+        JOIN v1_team_ids t1 ON t1.name = m.team1_name
+        JOIN v1_team_ids t2 ON t2.name = m.team2_name
+        WHERE m.id > ? AND m.id <= ?
+    """, batch_size, budget, progress)
+    if not done:
+        return False
+
+    # Step 3: category_outcomes, resolving winner names to team IDs
+    done = _copy_in_batches(conn, version, 'category_outcomes', 'category_outcomes', """
+        INSERT INTO category_outcomes_v2
+            (id, matchup_id, week_number, category, team1_id, team2_id,
+             team1_value, team2_value, winner_team_id, winning_value, losing_value, is_complete)
+        SELECT c.id, c.matchup_id, c.week_number, c.category, m.team1_id, m.team2_id,
+               c.team1_value, c.team2_value,
+               CASE
+                   WHEN c.winner IS NULL OR c.winner = 'Tie' THEN NULL
+                   WHEN c.winner = t1.name THEN m.team1_id
+                   WHEN c.winner = t2.name THEN m.team2_id
+                   ELSE NULL
+               END,
+               c.winning_value, c.losing_value, c.is_complete
+        FROM category_outcomes c
+        JOIN matchup_results_v2 m ON m.id = c.matchup_id
+        JOIN v1_team_ids t1 ON t1.team_id = m.team1_id
+        JOIN v1_team_ids t2 ON t2.team_id = m.team2_id
+        WHERE c.id > ? AND c.id <= ?
+    """, batch_size, budget, progress)
+    if not done:
+        return False
+
+    # Step 4: swap tables and bump the version atomically
+    conn.execute("BEGIN")
+    try:
+        conn.execute("DROP TABLE category_outcomes")
+        conn.execute("DROP TABLE matchup_results")
+        conn.execute("ALTER TABLE matchup_results_v2 RENAME TO matchup_results")
+        conn.execute("ALTER TABLE category_outcomes_v2 RENAME TO category_outcomes")
+        conn.execute("DROP TABLE v1_team_ids")
+        conn.execute("DELETE FROM schema_migration_progress WHERE target_version = ?", (version,))
+        conn.execute(f"PRAGMA user_version = {version}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    return True
+
+
+# target version -> migration function (from target - 1)
+MIGRATIONS: Dict[int, Callable] = {
+    2: _migrate_v1_to_v2,
+}
+
+LATEST_VERSION = max(MIGRATIONS)
+
+
+def migrate(db_path: str = "fantasy_hockey.db", target_version: int = LATEST_VERSION,
+            batch_size: int = DEFAULT_BATCH_SIZE, max_batches: Optional[int] = None,
+            progress: Optional[Callable] = None) -> bool:
+    """
+    Upgrade a database in place to target_version, preserving data.
+
+    Safe to interrupt and re-run: completed batches are not copied again.
+    max_batches stops after that many copy batches (returns False), which lets
+    large upgrades run in slices. progress(step, done, total) is called after
+    each batch.
+
+    Returns True when the database is at target_version.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        version = detect_version(conn)
+
+        if version == 0:
+            return True  # Empty database - init_db creates the current schema
+
+        if get_user_version(conn) == 0 and version > 1:
+            # Pre-versioning database that already has this schema: just stamp it
+            conn.execute(f"PRAGMA user_version = {version}")
+
+        if version > target_version:
+            raise ValueError(
+                f"Database schema v{version} is newer than this version of the app (v{target_version})"
+            )
+
+        _ensure_progress_table(conn)
+        budget = _BatchBudget(max_batches)
+
+        while version < target_version:
+            next_version = version + 1
+            if next_version not in MIGRATIONS:
+                raise ValueError(f"No migration from schema v{version} to v{next_version}")
+
+            if not MIGRATIONS[next_version](conn, batch_size, budget, progress):
+                return False
+
+            conn.execute(f"PRAGMA user_version = {next_version}")
+            version = next_version
+
+        return True
+    finally:
+        conn.close()
+
+
+def pending_migration(db_path: str = "fantasy_hockey.db") -> Optional[tuple]:
+    """(current_version, target_version) if the database needs upgrading, else None."""
+    conn = sqlite3.connect(db_path)
+    try:
+        version = detect_version(conn)
+    finally:
+        conn.close()
+
+    if 0 < version < LATEST_VERSION:
+        return (version, LATEST_VERSION)
+    return None
@@ -17,6 +17,24 @@ class TeamStats:
     goalie_wins: int = 0
     save_pct: float = 0.0
     gaa: float = 0.0
+    # Goalie ratio components (None when Yahoo doesn't report them)
+    saves: Optional[float] = None
+    shots_against: Optional[float] = None
+    goals_against: Optional[float] = None
+    minutes: Optional[float] = None
+
+@dataclass
+class PlayerWeek:
+    """One player's stats for one week on one fantasy team."""
+    player_id: int  # Yahoo's player ID
+    team_id: int  # Fantasy team that rostered the player that week
+    week: int
+    name: str
+    nhl_team: str = ""
+    display_position: str = ""  # e.g. 'C,LW'
+    eligible_positions: List[str] = field(default_factory=list)
+    selected_position: str = ""  # Roster slot that week (BN/IR don't count)
+    stats: Dict[str, float] = field(default_factory=dict)  # Categories and goalie components
 
 @dataclass
 class Matchup:
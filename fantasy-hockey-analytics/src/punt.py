@@ -0,0 +1,182 @@
+"""
+Punt-strategy analysis over every subset of the 11 categories.
+
+For one team, the per-category win probability against each opponent is
+computed once from complete weeks: the share of (team week, opponent week)
+pairs the team wins, ties counting half. A punt strategy is a bitmask over
+ALL_CATEGORIES; punted categories are conceded (win probability 0).
+
+All 2048 masks are scored together as arrays of shape (masks, opponents, ...):
+expected category wins is a masked sum, and the matchup win probability
+(winning at least 6 of 11 categories) comes from the Poisson-binomial
+distribution of category wins, built with one vectorized pass per category.
+Categories are treated as independent here.
+
+Punting never raises a team's odds by itself; it shows which categories can
+be given up at the least cost, i.e. where roster resources are best moved
+away from. Strategies are therefore ranked within each punt size.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .database import RATE_CATEGORIES
+from .snapshot import StatCube, load_snapshot, PRESENT, COMPLETE
+from .constants import ALL_CATEGORIES, LOWER_IS_BETTER
+
+NUM_MASKS = 1 << len(ALL_CATEGORIES)
+
+# Category wins needed to take a matchup
+WINS_NEEDED = len(ALL_CATEGORIES) // 2 + 1
+
+DEFAULT_MAX_PUNTS = 3
+DEFAULT_TOP = 3
+
+
+@dataclass
+class PuntStrategy:
+    """Outcome of conceding a set of categories."""
+    punted: Tuple[str, ...]
+    expected_category_wins: float  # Per matchup, averaged over opponents
+    matchup_win_prob: float        # Averaged over opponents
+    expected_matchup_wins: float   # Summed over opponents (one matchup each)
+    change: float                  # matchup_win_prob minus the no-punt baseline
+
+
+@dataclass
+class PuntAnalysis:
+    """Punt strategies for one team."""
+    team_id: int
+    opponents: int
+    weeks: int
+    category_win_probs: Dict[str, float]  # Averaged over opponents
+    baseline: PuntStrategy
+    strategies: Dict[int, List[PuntStrategy]]  # punt size -> best strategies first
+
+
+def _weekly_values(cube: StatCube) -> Dict[int, List[np.ndarray]]:
+    """team row -> per-category arrays of complete-week values (no-goalie weeks dropped)."""
+    required = PRESENT | COMPLETE
+    result = {}
+    for t in range(len(cube.team_ids)):
+        weeks = np.nonzero((cube.flags[t] & required) == required)[0]
+        per_category = []
+        for category in ALL_CATEGORIES:
+            values = cube.values[t, weeks, cube.category_index[category]]
+            if category in RATE_CATEGORIES:
+                values = values[values != 0]
+            per_category.append(np.sort(values))
+        result[t] = per_category
+    return result
+
+
+def _pairwise_win_prob(team_values: np.ndarray, opponent_values: np.ndarray,
+                       lower_is_better: bool) -> float:
+    """P(team week beats opponent week) over all pairs, ties half. Inputs sorted."""
+    if len(team_values) == 0 or len(opponent_values) == 0:
+        return 0.5  # No information either way
+    below = np.searchsorted(opponent_values, team_values, side='left')
+    not_above = np.searchsorted(opponent_values, team_values, side='right')
+    ties = (not_above - below).sum()
+    if lower_is_better:
+        wins = (len(opponent_values) - not_above).sum()
+    else:
+        wins = below.sum()
+    return float((wins + 0.5 * ties) / (len(team_values) * len(opponent_values)))
+
+
+def category_win_matrix(cube: StatCube, team_id: int) -> Tuple[List[int], np.ndarray]:
+    """(opponent team_ids, win probabilities [opponents, categories])."""
+    weekly = _weekly_values(cube)
+    t = cube.team_index[team_id]
+    opponents = [o for o in range(len(cube.team_ids)) if o != t]
+
+    probs = np.empty((len(opponents), len(ALL_CATEGORIES)))
+    for i, o in enumerate(opponents):
+        for c, category in enumerate(ALL_CATEGORIES):
+            probs[i, c] = _pairwise_win_prob(weekly[t][c], weekly[o][c], category in LOWER_IS_BETTER)
+    return [int(cube.team_ids[o]) for o in opponents], probs
+
+
+def punt_masks() -> np.ndarray:
+    """[2048, 11] boolean matrix; row m has bit c set when category c is punted."""
+    masks = np.arange(NUM_MASKS)
+    return ((masks[:, None] >> np.arange(len(ALL_CATEGORIES))) & 1).astype(bool)
+
+
+def score_all_subsets(probs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every punt mask against every opponent.
+
+    probs: [opponents, categories]. Returns (expected category wins, matchup
+    win probability), each [masks, opponents].
+    """
+    kept = ~punt_masks()
+    p = probs[None, :, :] * kept[:, None, :]  # [M, O, C]
+
+    # Poisson-binomial distribution of category wins, one category at a time
+    dist = np.zeros(p.shape[:2] + (len(ALL_CATEGORIES) + 1,))
+    dist[..., 0] = 1.0
+    for c in range(len(ALL_CATEGORIES)):
+        pc = p[..., c:c + 1]
+        shifted = np.zeros_like(dist)
+        shifted[..., 1:] = dist[..., :-1] * pc
+        dist = dist * (1.0 - pc) + shifted
+
+    return p.sum(axis=2), dist[..., WINS_NEEDED:].sum(axis=2)
+
+
+def _strategy(mask: int, expected_wins: np.ndarray, win_prob: np.ndarray,
+              baseline_prob: float) -> PuntStrategy:
+    punted = tuple(c for i, c in enumerate(ALL_CATEGORIES) if mask >> i & 1)
+    return PuntStrategy(
+        punted=punted,
+        expected_category_wins=float(expected_wins[mask].mean()),
+        matchup_win_prob=float(win_prob[mask].mean()),
+        expected_matchup_wins=float(win_prob[mask].sum()),
+        change=float(win_prob[mask].mean() - baseline_prob)
+    )
+
+
+def analyze_punts(team_id: int, db_path: str = "fantasy_hockey.db",
+                  max_punts: int = DEFAULT_MAX_PUNTS, top: int = DEFAULT_TOP,
+                  cube: Optional[StatCube] = None) -> PuntAnalysis:
+    """
+    Best punt strategies for a team, `top` per punt size from 1 to max_punts.
+
+    Uses the stat cube snapshot when current (SQLite otherwise).
+    """
+    if not 1 <= max_punts <= len(ALL_CATEGORIES):
+        raise ValueError(f"max_punts must be between 1 and {len(ALL_CATEGORIES)}, got {max_punts}")
+
+    cube = cube or load_snapshot(db_path) or StatCube.from_database(db_path)
+    if team_id not in cube.team_index:
+        raise ValueError(f"Team ID {team_id} has no stored matchups")
+
+    opponents, probs = category_win_matrix(cube, team_id)
+    if not opponents:
+        raise ValueError("Need at least one opponent to analyze punts")
+
+    expected_wins, win_prob = score_all_subsets(probs)
+    baseline_prob = float(win_prob[0].mean())
+
+    # Rank masks of each size by mean matchup win probability
+    sizes = punt_masks().sum(axis=1)
+    order = np.argsort(-win_prob.mean(axis=1), kind='stable')
+    strategies = {}
+    for size in range(1, max_punts + 1):
+        best = order[sizes[order] == size][:top]
+        strategies[size] = [_strategy(int(m), expected_wins, win_prob, baseline_prob) for m in best]
+
+    t = cube.team_index[team_id]
+    required = PRESENT | COMPLETE
+    return PuntAnalysis(
+        team_id=team_id,
+        opponents=len(opponents),
+        weeks=int(((cube.flags[t] & required) == required).sum()),
+        category_win_probs={c: float(probs[:, i].mean()) for i, c in enumerate(ALL_CATEGORIES)},
+        baseline=_strategy(0, expected_wins, win_prob, baseline_prob),
+        strategies=strategies
+    )
@@ -0,0 +1,307 @@
+"""
+Free-agent recommendations ranked by marginal matchup impact.
+
+A player's projection is the mean weekly line over the last RECENT_WEEKS
+complete weeks of stored player stats (any team or slot, or the free-agent
+pool). Adding that line to a team's week moves each category by the
+player's projection (goalies: the team's SV%/GAA after adding the goalie's
+saves, shots, goals against and minutes to its mean weekly components).
+Each move is valued like the impact priorities of analyze_team, on the
+league's win curve W over the team's own complete weeks x:
+
+    gain(c) = mean(W(x + move(c))) - mean(W(x))
+    score   = sum of gain(c) over the priority categories
+
+so a score is expected extra category wins per matchup, and big moves
+saturate instead of growing linearly.
+
+Ranking uses a precomputed per-category index: the pool's players in
+descending order of each counting stat. The win curve is monotone, so a
+player's gain follows the order of its move and the index is the same for
+every team; it is built once per pool (the two goalie rate columns are
+ordered per team from their moves, which are cheap arithmetic). The
+threshold algorithm walks the columns in step, SCORE_BLOCK depths at a
+time: only players the walk reaches get their win-curve gains computed.
+The best k are kept in a min-heap, and the walk stops once the k-th score
+reaches the sum of the current column values, which bounds every player not
+yet reached. Players the walk never reaches are never scored.
+"""
+
+import heapq
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .database import RATE_CATEGORIES, get_complete_player_weeks, get_team_by_id
+from .components import get_team_component_series
+from .team_analysis import analyze_team
+from .impact import category_values, shifted_win_rates
+from .snapshot import StatCube, load_snapshot
+from .constants import ALL_CATEGORIES, COMPONENT_FIELDS, LOWER_IS_BETTER, RATIO_COMPONENTS, FREE_AGENT_TEAM_ID
+
+RECENT_WEEKS = 4   # Complete weeks averaged into a player's projection
+DEFAULT_TOP_K = 10
+SCORE_BLOCK = 32   # Index depths scored per batch by threshold_top_k
+
+
+@dataclass
+class Recommendation:
+    """One recommended player and where its value comes from."""
+    player_id: int
+    name: str
+    nhl_team: str
+    positions: List[str]
+    score: float                # Expected category wins gained per matchup
+    gains: Dict[str, float]     # ... by category
+    projection: Dict[str, float]  # Mean weekly line
+
+
+@dataclass
+class RecommendationResult:
+    """Top free agents for one team."""
+    team_id: int
+    team_name: str
+    priorities: List[Tuple[str, float]]  # Categories scored (analyze_team impact priorities)
+    weeks: List[int]                     # Weeks averaged into projections
+    pool_size: int                       # Available players considered
+    evaluated: int                       # Players whose gains were computed before the search stopped
+    recommendations: List[Recommendation] = field(default_factory=list)
+
+
+class PlayerPool:
+    """Available players' mean weekly lines plus the per-category rank index."""
+
+    def __init__(self, player_ids: np.ndarray, names: List[str], nhl_teams: List[str],
+                 positions: List[List[str]], values: np.ndarray, components: np.ndarray,
+                 weeks: List[int]):
+        self.player_ids = player_ids
+        self.names = names
+        self.nhl_teams = nhl_teams
+        self.positions = positions
+        self.values = values          # [players, ALL_CATEGORIES]
+        self.components = components  # [players, COMPONENT_FIELDS]; 0 for skaters
+        self.weeks = weeks
+        # Counting stats rank the same for every team: sort once
+        self.index = {
+            category: np.argsort(-values[:, c], kind='stable')
+            for c, category in enumerate(ALL_CATEGORIES) if category not in RATE_CATEGORIES
+        }
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    @classmethod
+    def from_rows(cls, rows: List[dict], weeks: List[int]) -> 'PlayerPool':
+        """Build from load_player_pool()-style rows (one per player, mean weekly values)."""
+        return cls(
+            player_ids=np.array([row['player_id'] for row in rows], dtype=np.int64),
+            names=[row['name'] for row in rows],
+            nhl_teams=[row['nhl_team'] for row in rows],
+            positions=[row['eligible_positions'] for row in rows],
+            values=np.array([[row[c] for c in ALL_CATEGORIES] for row in rows], dtype=float).reshape(-1, len(ALL_CATEGORIES)),
+            components=np.array([[row[f] for f in COMPONENT_FIELDS] for row in rows], dtype=float).reshape(-1, len(COMPONENT_FIELDS)),
+            weeks=weeks
+        )
+
+    def eligible(self, position: str) -> np.ndarray:
+        return np.array([position in positions for positions in self.positions], dtype=bool)
+
+
+def load_player_pool(db_path: str = "fantasy_hockey.db", weeks: int = RECENT_WEEKS,
+                     player_ids: Optional[List[int]] = None) -> PlayerPool:
+    """
+    Players not on any roster in the latest stored week (or exactly
+    `player_ids`), with mean weekly lines over the last `weeks` complete
+    player-stat weeks. Players without a line in those weeks are left out.
+    """
+    window = get_complete_player_weeks(db_path)[-weeks:]
+    if not window:
+        return PlayerPool.from_rows([], [])
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    averages = ", ".join(
+        [f"AVG(pw.{c}) as {c}" for c in ALL_CATEGORIES]
+        + [f"COALESCE(AVG(pw.{f}), 0) as {f}" for f in COMPONENT_FIELDS]
+    )
+    marks = ", ".join("?" for _ in window)
+    if player_ids is None:
+        players = """pw.player_id NOT IN (
+              SELECT player_id FROM player_weeks
+              WHERE team_id != ? AND week_number = (SELECT MAX(week_number) FROM player_weeks)
+          )"""
+        params = [FREE_AGENT_TEAM_ID]
+    else:
+        players = f"pw.player_id IN ({', '.join('?' for _ in player_ids)})"
+        params = list(player_ids)
+    cursor.execute(f"""
+        SELECT pw.player_id, p.name, p.nhl_team, p.eligible_positions, {averages}
+        FROM player_weeks pw
+        JOIN players p ON p.player_id = pw.player_id
+        WHERE pw.week_number IN ({marks})
+          AND {players}
+        GROUP BY pw.player_id
+        ORDER BY pw.player_id
+    """, (*window, *params))
+    rows = []
+    for row in cursor.fetchall():
+        row = dict(row)
+        row['eligible_positions'] = row['eligible_positions'].split(",") if row['eligible_positions'] else []
+        rows.append(row)
+    conn.close()
+    return PlayerPool.from_rows(rows, window)
+
+
+def threshold_top_k(orders: List[np.ndarray], score: Callable[[np.ndarray], np.ndarray], k: int,
+                    eligible: Optional[np.ndarray] = None) -> Tuple[List[Tuple[int, float]], int]:
+    """
+    Top k rows by the sum of their columns (threshold algorithm).
+
+    orders[j] lists every row in non-increasing order of column j.
+    score(rows) returns those rows' columns [len(rows), len(orders)]; it is
+    only called for rows the walk reaches, SCORE_BLOCK depths at a time.
+    Returns ([(row, score)] best first, ties by lower row) and the number of rows scored.
+    """
+    if k <= 0 or not orders or len(orders[0]) == 0:
+        return [], 0
+    num_players = len(orders[0])
+
+    values = np.zeros((num_players, len(orders)))
+    scored = np.zeros(num_players, dtype=bool)
+    seen = np.zeros(num_players, dtype=bool)
+    heap = []  # (score, -row): the worst kept player on top
+    for start in range(0, num_players, SCORE_BLOCK):
+        stop = min(start + SCORE_BLOCK, num_players)
+        reached = np.unique(np.concatenate([order[start:stop] for order in orders]))
+        new = reached[~scored[reached]]
+        if len(new):
+            values[new] = score(new)
+            scored[new] = True
+
+        for depth in range(start, stop):
+            bound = 0.0
+            for j, order in enumerate(orders):
+                row = order[depth]
+                bound += values[row, j]
+                if seen[row]:
+                    continue
+                seen[row] = True
+                if eligible is not None and not eligible[row]:
+                    continue
+                item = (float(values[row].sum()), -int(row))
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            # No unseen player can beat the sum of the values at this depth
+            if len(heap) == k and heap[0][0] >= bound:
+                return _ranked(heap), int(scored.sum())
+
+    return _ranked(heap), int(scored.sum())
+
+
+def _ranked(heap: list) -> List[Tuple[int, float]]:
+    return [(-neg_row, score) for score, neg_row in sorted(heap, reverse=True)]
+
+
+def _rate_moves(pool: PlayerPool, category: str, team_week: Dict[str, float]) -> np.ndarray:
+    """Change in a team's weekly SV% or GAA from adding each player's components."""
+    numerator, denominator, scale = RATIO_COMPONENTS[category]
+    num = pool.components[:, COMPONENT_FIELDS.index(numerator)]
+    den = pool.components[:, COMPONENT_FIELDS.index(denominator)]
+    base_num, base_den = team_week[numerator], team_week[denominator]
+    if base_den <= 0:
+        return np.zeros(len(pool))
+    return scale * ((base_num + num) / (base_den + den) - base_num / base_den)
+
+
+def recommend_players(team_id: int, db_path: str = "fantasy_hockey.db", k: int = DEFAULT_TOP_K,
+                      position: Optional[str] = None, focus: Optional[int] = None,
+                      pool: Optional[PlayerPool] = None) -> RecommendationResult:
+    """
+    Rank available players for a team by expected category wins added.
+
+    Scores the categories in analyze_team's impact priorities (only the top
+    `focus` of them when given); `position` limits the list to players
+    eligible there. Pass `pool` to reuse one PlayerPool across teams.
+
+    Raises ValueError for an unknown team or no analyzable data.
+    """
+    team = get_team_by_id(team_id, db_path)
+    if not team:
+        raise ValueError(f"Team ID {team_id} not found in database")
+    analysis = analyze_team(team_id, db_path, rank_by='impact')
+    priorities = analysis.improvement_priorities[:focus] if focus else analysis.improvement_priorities
+
+    pool = pool if pool is not None else load_player_pool(db_path)
+    result = RecommendationResult(team_id=team_id, team_name=team['current_name'], priorities=priorities,
+                                  weeks=pool.weeks, pool_size=len(pool), evaluated=0)
+    if len(pool) == 0:
+        return result
+
+    # Team's mean weekly goalie components, for the rate categories
+    series = get_team_component_series(team_id, db_path)
+    team_week = None
+    if series is not None:
+        team_week = {name: total / len(series.weeks) for name, total in series.totals().items()}
+
+    cube = load_snapshot(db_path) or StatCube.from_database(db_path)
+    team_row = cube.team_index.get(team_id, -1)
+
+    categories, orders, curves = [], [], []
+    for category, _ in priorities:
+        values, teams = category_values(cube, category)
+        team_values = values[teams == team_row]
+        if len(team_values) == 0:
+            continue
+        if category in RATE_CATEGORIES:
+            if team_week is None:
+                continue
+            moves = _rate_moves(pool, category, team_week)
+        else:
+            moves = pool.values[:, ALL_CATEGORIES.index(category)]
+
+        # Gains rise with the move (fall, for GAA), so moves give the order
+        lower = category in LOWER_IS_BETTER
+        league = np.sort(values)
+        base = shifted_win_rates(league, team_values, np.zeros(1), lower)[0]
+        if category in RATE_CATEGORIES:
+            order = np.argsort(moves if lower else -moves, kind='stable')
+        else:
+            order = pool.index[category]
+
+        categories.append(category)
+        orders.append(order)
+        curves.append((moves, league, team_values, lower, base))
+
+    def score_rows(rows: np.ndarray) -> np.ndarray:
+        """Win-curve gains of `rows`, once per distinct move (many players share a line)."""
+        gains = np.zeros((len(rows), len(curves)))
+        for j, (moves, league, team_values, lower, base) in enumerate(curves):
+            distinct, inverse = np.unique(moves[rows], return_inverse=True)
+            gains[:, j] = (shifted_win_rates(league, team_values, distinct, lower) - base)[inverse.ravel()]
+        return gains
+
+    eligible = pool.eligible(position) if position else None
+    if orders:
+        ranked, result.evaluated = threshold_top_k(orders, score_rows, k, eligible)
+    else:
+        # Nothing to score: the first k eligible players, all at zero
+        rows = np.nonzero(eligible)[0] if eligible is not None else np.arange(len(pool))
+        ranked = [(int(row), 0.0) for row in rows[:k]]
+    gains = score_rows(np.array([row for row, _ in ranked], dtype=np.int64))
+
+    for (row, score), row_gains in zip(ranked, gains):
+        result.recommendations.append(Recommendation(
+            player_id=int(pool.player_ids[row]),
+            name=pool.names[row],
+            nhl_team=pool.nhl_teams[row],
+            positions=pool.positions[row],
+            score=score,
+            gains=dict(zip(categories, row_gains.tolist())),
+            projection=dict(zip(ALL_CATEGORIES, pool.values[row].tolist()))
+        ))
+    return result
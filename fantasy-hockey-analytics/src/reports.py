@@ -0,0 +1,449 @@
+"""
+Report documents and their text, JSON and HTML renderers.
+
+A report is built once as a structured document: a title, subtitle lines
+and sections, each with optional lines, a table and notes. The report also
+carries its raw values (`data`) for machine-readable output. A renderer
+turns the whole document into one string, which is written in a single
+buffered write instead of one print per line:
+
+    text   the terminal layout (what display.py prints)
+    json   title, sections and raw values
+    html   a standalone page with one <table> per section
+
+write_league_reports() builds the threshold report and every team's
+analysis for one league database. Teams are analyzed, rendered and written
+in a thread pool; SQLite reads and numpy release the GIL for most of that
+work. League-wide results are computed once before the pool starts: the
+thresholds are passed to every team's analysis and the strength-of-schedule
+ratings are cached, so the workers only read them.
+"""
+
+import html
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, TextIO
+
+from .analytics import calculate_all_thresholds, get_analysis_summary
+from .database import get_all_teams
+from .models import SeasonData
+from .schedule import calculate_sos_ratings
+from .team_analysis import analyze_team
+from .constants import CATEGORY_DISPLAY_NAMES, ALL_CATEGORIES, LOWER_IS_BETTER
+
+FORMATS = ('text', 'json', 'html')
+EXTENSIONS = {'text': 'txt', 'json': 'json', 'html': 'html'}
+DEFAULT_REPORT_WORKERS = 8
+
+STATUS_INDICATORS = {
+    'dominant': '🟢',
+    'strong': '🟢',
+    'competitive': '🟡',
+    'weak': '🔴',
+    'critical': '🔴',
+    'no_data': '⚪'
+}
+
+TREND_INDICATORS = {
+    'improving': '↗',
+    'stable': '→',
+    'declining': '↘',
+    'insufficient_data': '?'
+}
+
+
+@dataclass
+class Table:
+    """Pre-formatted cells; widths are the text layout's column widths."""
+    columns: List[str]
+    widths: List[int]
+    rows: List[List[str]] = field(default_factory=list)
+
+
+@dataclass
+class Section:
+    """A titled block: lines, then a table, then notes (all optional)."""
+    title: Optional[str] = None
+    lines: List[str] = field(default_factory=list)
+    table: Optional[Table] = None
+    notes: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Report:
+    """One complete report, ready for any renderer."""
+    kind: str                  # 'thresholds', 'team_analysis', 'fetch_summary'
+    title: str
+    subtitle: List[str] = field(default_factory=list)
+    sections: List[Section] = field(default_factory=list)
+    data: Dict[str, Any] = field(default_factory=dict)
+    width: int = 80            # Rule width in the text layout
+
+
+# Renderers
+
+def _text_row(cells: List[str], widths: List[int]) -> str:
+    return " ".join(f"{cell:<{width}}" for cell, width in zip(cells, widths)).rstrip()
+
+
+def render_text(report: Report) -> str:
+    """The terminal layout: rules, aligned tables."""
+    rule, thin = "=" * report.width, "-" * report.width
+    out = ["", rule, report.title, *report.subtitle, rule]
+    for section in report.sections:
+        if section.title:
+            out += ["", section.title, thin]
+        out += section.lines
+        if section.table:
+            widths = section.table.widths
+            out += [_text_row(section.table.columns, widths), thin]
+            out += [_text_row(cells, widths) for cells in section.table.rows]
+            out.append(thin)
+        out += section.notes
+    out.append(rule)
+    return "\n".join(out) + "\n"
+
+
+def _json_default(value):
+    """numpy scalars and arrays in report data."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def render_json(report: Report) -> str:
+    """Title, sections as rows of cells, and the raw values."""
+    document = {
+        'report': report.kind,
+        'title': report.title,
+        'subtitle': report.subtitle,
+        'sections': [
+            {
+                'title': section.title,
+                'lines': section.lines,
+                'columns': section.table.columns if section.table else [],
+                'rows': section.table.rows if section.table else [],
+                'notes': section.notes,
+            }
+            for section in report.sections
+        ],
+        'data': report.data,
+    }
+    return json.dumps(document, indent=2, default=_json_default) + "\n"
+
+
+HTML_STYLE = (
+    "body{font-family:system-ui,sans-serif;margin:2em;color:#222}"
+    "table{border-collapse:collapse;margin:.5em 0}"
+    "th,td{border:1px solid #ccc;padding:.25em .6em;text-align:left}"
+    "th{background:#f0f0f0}.subtitle,.note{color:#555}"
+)
+
+
+def html_page(title: str, body: List[str]) -> str:
+    """A standalone page around body elements."""
+    esc = html.escape
+    out = ["<!DOCTYPE html>", '<html><head><meta charset="utf-8">',
+           f"<title>{esc(title)}</title><style>{HTML_STYLE}</style></head><body>"]
+    out += body
+    out.append("</body></html>")
+    return "\n".join(out) + "\n"
+
+
+def html_sections(report: Report) -> List[str]:
+    """The report's heading, subtitle and sections as HTML elements."""
+    esc = html.escape
+    out = [f"<h1>{esc(report.title)}</h1>"]
+    out += [f'<p class="subtitle">{esc(line)}</p>' for line in report.subtitle]
+    for section in report.sections:
+        if section.title:
+            out.append(f"<h2>{esc(section.title)}</h2>")
+        out += [f"<p>{esc(line)}</p>" for line in section.lines if line.strip()]
+        if section.table:
+            out.append("<table><thead><tr>" + "".join(f"<th>{esc(c)}</th>" for c in section.table.columns)
+                       + "</tr></thead><tbody>")
+            out += ["<tr>" + "".join(f"<td>{esc(cell)}</td>" for cell in cells) + "</tr>"
+                    for cells in section.table.rows]
+            out.append("</tbody></table>")
+        out += [f'<p class="note">{esc(line.strip())}</p>' for line in section.notes if line.strip()]
+    return out
+
+
+def render_html(report: Report) -> str:
+    """A standalone page."""
+    return html_page(report.title, html_sections(report))
+
+
+RENDERERS = {'text': render_text, 'json': render_json, 'html': render_html}
+
+
+def render(report: Report, fmt: str = 'text') -> str:
+    if fmt not in RENDERERS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got '{fmt}'")
+    return RENDERERS[fmt](report)
+
+
+def write_report(report: Report, fmt: str = 'text', stream: Optional[TextIO] = None):
+    """Render and write in one call."""
+    stream = stream or sys.stdout
+    stream.write(render(report, fmt))
+    stream.flush()
+
+
+# Builders
+
+def _format_value(category: str, value: float) -> str:
+    return f"{value:.3f}" if category in ('save_pct', 'gaa') else f"{int(value)}"
+
+
+def threshold_report(thresholds: Dict[str, 'CategoryThresholds'], summary: dict,
+                     intervals: Optional[Dict[str, 'ThresholdIntervals']] = None) -> Report:
+    """League winning thresholds, with bootstrap intervals when given."""
+    data = {
+        'summary': summary,
+        'thresholds': {category: asdict(t) for category, t in thresholds.items()},
+        'intervals': {category: asdict(i) for category, i in intervals.items()} if intervals else None,
+    }
+
+    if summary['weeks_analyzed'] == 0:
+        subtitle = ["No completed weeks available for analysis."]
+        if summary['weeks_excluded'] > 0:
+            subtitle.append(f"Week(s) {', '.join(map(str, summary['incomplete_week_numbers']))} "
+                            f"in progress - excluded from analysis")
+        return Report('thresholds', "Insufficient Data", subtitle, data=data)
+
+    subtitle = []
+    week_nums = summary['complete_week_numbers']
+    if week_nums:
+        week_range = f"Weeks {min(week_nums)}-{max(week_nums)}" if len(week_nums) > 1 else f"Week {week_nums[0]}"
+        subtitle.append(f"Analysis Period: {week_range} ({summary['weeks_analyzed']} complete weeks, "
+                        f"~{summary['total_matchups']} matchups)")
+    if summary['weeks_excluded'] > 0:
+        subtitle.append(f"Week(s) {', '.join(map(str, summary['incomplete_week_numbers']))} "
+                        f"in progress - excluded from analysis")
+    if summary.get('threshold_mode', 'full season') != 'full season':
+        subtitle.append(f"Threshold mode: {summary['threshold_mode']}")
+
+    table = Table(['Category', 'Dir', 'Min Win', 'Median', '75th %', 'Max Lose', 'Overlap Zone'],
+                  [12, 6, 10, 10, 10, 10, 15])
+    for category in ALL_CATEGORIES:
+        threshold = thresholds.get(category)
+        if not threshold or threshold.sample_size == 0:
+            continue
+        if threshold.overlap_exists:
+            overlap = f"{_format_value(category, threshold.overlap_low)}-{_format_value(category, threshold.overlap_high)}"
+        else:
+            overlap = "None"
+        table.rows.append([
+            CATEGORY_DISPLAY_NAMES.get(category, category),
+            "Lower" if category in LOWER_IS_BETTER else "Higher",
+            _format_value(category, threshold.min_winning),
+            _format_value(category, threshold.median_winning),
+            _format_value(category, threshold.p75_winning),
+            _format_value(category, threshold.max_losing),
+            overlap
+        ])
+    sections = [Section(table=table)]
+
+    if intervals:
+        first = next(iter(intervals.values()))
+        interval_table = Table(['Category', 'Samples', 'Median', '75th %', '90th %'], [12, 8, 20, 20, 20])
+        for category in ALL_CATEGORIES:
+            interval = intervals.get(category)
+            threshold = thresholds.get(category)
+            if not interval or not threshold or threshold.sample_size == 0:
+                continue
+            decimals = 3 if category in ('save_pct', 'gaa') else 0
+            interval_table.rows.append([
+                CATEGORY_DISPLAY_NAMES.get(category, category),
+                str(interval.sample_size),
+                f"{interval.median_low:.{decimals}f}-{interval.median_high:.{decimals}f}",
+                f"{interval.p75_low:.{decimals}f}-{interval.p75_high:.{decimals}f}",
+                f"{interval.p90_low:.{decimals}f}-{interval.p90_high:.{decimals}f}"
+            ])
+        sections.append(Section(
+            title=f"Confidence Intervals ({first.level:.0%}, {first.resamples} bootstrap resamples)",
+            table=interval_table))
+
+    sections.append(Section(notes=[
+        "",
+        "Note: 'Overlap Zone' = range where both wins and losses occurred.",
+        "      Above the zone (or below for GAA) = likely win.",
+        "      Below the zone (or above for GAA) = likely loss.",
+    ]))
+    return Report('thresholds', "League Winning Thresholds", subtitle, sections, data)
+
+
+def fetch_summary_report(season_data: SeasonData) -> Report:
+    """Weeks fetched, with their matchup counts and completion."""
+    weeks_info = {}
+    for matchup in season_data.matchups:
+        info = weeks_info.setdefault(matchup.week, {'count': 0, 'complete': True})
+        info['count'] += 1
+        if not matchup.is_complete:
+            info['complete'] = False
+
+    complete_count = sum(1 for info in weeks_info.values() if info['complete'])
+    incomplete_count = len(weeks_info) - complete_count
+    lines = [
+        f"Week {week}: {info['count']} matchups ({'complete' if info['complete'] else 'in progress'})"
+        for week, info in sorted(weeks_info.items())
+    ]
+    summary = Section(notes=[
+        "-" * 60,
+        f"Summary: {len(weeks_info)} weeks stored ({complete_count} complete, {incomplete_count} in progress)"
+    ])
+    data = {'weeks': {str(week): info for week, info in sorted(weeks_info.items())},
+            'complete': complete_count, 'in_progress': incomplete_count}
+    return Report('fetch_summary', "Fetch Summary", sections=[Section(lines=lines), summary], data=data, width=60)
+
+
+def _gap_text(category: str, gap: float) -> str:
+    return f"{gap:+.3f}" if category in ('save_pct', 'gaa') else f"{gap:+.1f}"
+
+
+def team_analysis_report(result: 'TeamAnalysisResult') -> Report:
+    """A team's performance against the league's winning thresholds."""
+    subtitle = [f"Performance vs League Winning Thresholds ({result.weeks_analyzed} weeks analyzed)"]
+    if result.threshold_mode != 'full season':
+        subtitle.append(f"Thresholds: {result.threshold_mode}")
+    if result.scenario:
+        changes = ", ".join(
+            f"{CATEGORY_DISPLAY_NAMES.get(c, c)} {delta:+g}/week" for c, delta in result.scenario.items()
+        )
+        subtitle.append(f"What-if: {changes}")
+
+    table = Table(['Category', 'You', 'Adj.', 'To Win', 'Gap', 'Win%', 'Status', 'Trend'],
+                  [13, 8, 8, 8, 9, 7, 18, 15])
+    for category in ALL_CATEGORIES:
+        assessment = result.assessments[category]
+        rate = category in ('save_pct', 'gaa')
+        you = _format_value(category, assessment.team_average) if assessment.team_average > 0 else (
+            "0.000" if rate else "0")
+
+        if assessment.adjusted_average is None:
+            adjusted = "--"
+        else:
+            adjusted = f"{assessment.adjusted_average:.3f}" if rate else f"{assessment.adjusted_average:.1f}"
+        gap = "--" if assessment.assessment == 'no_data' else _gap_text(category, assessment.gap)
+        if assessment.win_rate < 0 or assessment.wins + assessment.losses == 0:
+            win_rate = "--"
+        else:
+            win_rate = f"{assessment.win_rate * 100:.0f}%"
+        status = f"{STATUS_INDICATORS.get(assessment.assessment, '⚪')} {assessment.assessment.capitalize()}"
+        trend = f"{TREND_INDICATORS.get(assessment.trend, '?')} {assessment.trend.replace('_', ' ').capitalize()}"
+
+        table.rows.append([CATEGORY_DISPLAY_NAMES.get(category, category), you, adjusted,
+                           _format_value(category, assessment.threshold_median), gap, win_rate, status, trend])
+
+    sections = [
+        Section(table=table),
+        Section(title="HOW TO READ THIS:", lines=[
+            '  "Adj."    = Your average against an average opponent (see `python main.py sos`)',
+            '  "To Win"  = Typical score among category winners (median across all matchups)',
+            '  "Gap"     = Your average minus To Win (positive = you\'re ahead)',
+            '  "Win%"    = How often you won this category head-to-head',
+            "",
+            "  Status: 🟢 Strong (≥ To Win) | 🟡 Competitive (in range) | 🔴 Weak (below min)",
+            "  Trend:  Last 3 weeks vs first 3 weeks (↗ improving, ↘ declining)",
+            "",
+            "  Note: GAA is inverted — lower is better, so negative Gap = good",
+        ]),
+        _priorities_section(result),
+    ]
+
+    if result.strengths:
+        lines = []
+        for category, assessment_type in result.strengths:
+            display_name = CATEGORY_DISPLAY_NAMES.get(category, category)
+            gap = _gap_text(category, result.assessments[category].gap)
+            label = "Dominant" if assessment_type == 'dominant' else "Strong"
+            lines.append(f"  ✓ {display_name} - {label} (gap: {gap})")
+        sections.append(Section(title="💪 STRENGTHS:", lines=lines))
+
+    sections.append(Section(notes=[
+        "",
+        "-" * 90,
+        "Status: 🟢 Strong/Dominant | 🟡 Competitive | 🔴 Weak/Critical | ⚪ No Data",
+        "Trend:  ↗ Improving | → Stable | ↘ Declining | ? Insufficient data",
+    ]))
+    return Report('team_analysis', f"Team Analysis: {result.team_name} (ID: {result.team_id})",
+                  subtitle, sections, asdict(result), width=90)
+
+
+def _priorities_section(result: 'TeamAnalysisResult') -> Section:
+    """Improvement priorities, by gap or by matchup impact."""
+    if result.priority_mode == 'impact':
+        section = Section(title="📈 IMPROVEMENT PRIORITIES (by matchup impact):")
+        if not result.improvement_priorities:
+            section.lines.append("  No category data available.")
+            return section
+        section.table = Table(['  Category', 'Win% now', '+1 std', 'Wins gained', 'Per unit'], [15, 10, 16, 13, 14])
+        for category, gain in result.improvement_priorities:
+            impact = result.impacts[category]
+            sign = "-" if category in LOWER_IS_BETTER else "+"
+            if category in ('save_pct', 'gaa'):
+                step, unit = f"{sign}{impact.league_std:.3f}", f"{sign}{impact.unit:g}"
+            else:
+                step, unit = f"{sign}{impact.league_std:.1f}", f"{sign}1"
+            section.table.rows.append([
+                f"  {CATEGORY_DISPLAY_NAMES.get(category, category)}", f"{impact.win_rate * 100:.0f}%",
+                step, f"{gain:+.3f}", f"{impact.gain_per_unit:+.3f}/{unit}"
+            ])
+        section.notes.append("  Wins gained = expected extra category wins per matchup against the league's weeks")
+        return section
+
+    if not result.improvement_priorities:
+        return Section(lines=["", "✅ No improvement needed - all categories at or above threshold!"])
+
+    section = Section(title="📈 IMPROVEMENT PRIORITIES:")
+    for category, gap in result.improvement_priorities:
+        display_name = CATEGORY_DISPLAY_NAMES.get(category, category)
+        gap_display = f"{abs(gap):.3f}" if category in ('save_pct', 'gaa') else f"{abs(gap):.1f}"
+        if result.assessments[category].direction == 'lower_wins':
+            section.lines.append(f"  • {display_name}: {gap_display} above median (lower is better)")
+        else:
+            section.lines.append(f"  • {display_name}: {gap_display} below median")
+    return section
+
+
+# League batches
+
+def write_league_reports(output_dir: str, db_path: str = "fantasy_hockey.db", fmt: str = 'html',
+                         max_workers: int = DEFAULT_REPORT_WORKERS) -> List[str]:
+    """
+    Threshold report plus every team's analysis for one league, one file
+    each in `output_dir` (thresholds.<ext>, team_<id>.<ext>). Returns the
+    paths written, thresholds first, then teams by id.
+
+    Teams are skipped (only the threshold report is written) when there are
+    no complete weeks to analyze.
+    """
+    if fmt not in RENDERERS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got '{fmt}'")
+    os.makedirs(output_dir, exist_ok=True)
+
+    def write(name: str, report: Report) -> str:
+        path = os.path.join(output_dir, f"{name}.{EXTENSIONS[fmt]}")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render(report, fmt))
+        return path
+
+    summary = get_analysis_summary(db_path)
+    thresholds = calculate_all_thresholds(db_path)
+    paths = [write("thresholds", threshold_report(thresholds, summary))]
+    if summary['weeks_analyzed'] == 0:
+        return paths
+
+    calculate_sos_ratings(db_path)  # Cached once, read by every worker
+
+    def team_report(team: dict) -> str:
+        result = analyze_team(team['team_id'], db_path, thresholds=thresholds)
+        return write(f"team_{team['team_id']}", team_analysis_report(result))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        paths += list(pool.map(team_report, get_all_teams(db_path)))
+    return paths
@@ -0,0 +1,226 @@
+"""
+Rolling-window and recency-weighted league thresholds.
+
+Thresholds are computed week by week with incremental order statistics:
+each category's winning values are mapped to ranks once, then a Fenwick tree
+over those ranks is updated as weeks enter (and, for rolling windows, leave)
+the window. Any percentile is an O(log n) lookup, so a full
+"thresholds by week" series costs about the same as one exact calculation.
+
+Recency decay gives week w the weight decay^(latest - w). Rather than
+re-weighting old weeks every step, new weeks are added with weight
+(1/decay)^(w - first) and percentiles are read relative to the total weight,
+which is equivalent. In a rolling window those weights would grow without
+bound, so once one passes MAX_WEIGHT the weighted tree is rebuilt relative
+to the oldest week still in the window.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+from .database import get_all_category_outcomes, get_weeks_stored
+from .analytics import CategoryThresholds, _build_thresholds, _empty_thresholds
+from .snapshot import load_snapshot
+from .constants import ALL_CATEGORIES
+
+MAX_WEIGHT = 1e12  # Rebase decayed weights before they lose float precision
+
+
+class _RankTree:
+    """Fenwick tree over a fixed set of values supporting weighted order statistics."""
+
+    def __init__(self, values):
+        self.values = sorted(set(values))
+        self.index = {value: i for i, value in enumerate(self.values)}
+        self.tree = [0.0] * (len(self.values) + 1)
+        self.total = 0.0
+        self._top_bit = 1 << (len(self.values).bit_length() - 1) if self.values else 0
+
+    def add(self, value: float, weight: float = 1.0):
+        """Add weight for a value (negative weight removes it)."""
+        self.total += weight
+        i = self.index[value] + 1
+        while i < len(self.tree):
+            self.tree[i] += weight
+            i += i & -i
+
+    def kth(self, target: float) -> float:
+        """Smallest value whose cumulative weight exceeds target."""
+        position = 0
+        remaining = target
+        step = self._top_bit
+        while step:
+            nxt = position + step
+            if nxt < len(self.tree) and self.tree[nxt] <= remaining:
+                position = nxt
+                remaining -= self.tree[nxt]
+            step >>= 1
+        return self.values[min(position, len(self.values) - 1)]
+
+
+class RollingThresholdState:
+    """Incrementally maintained thresholds for one category over a window of weeks."""
+
+    def __init__(self, category: str, all_pairs: List[Tuple[float, float]],
+                 decay: Optional[float] = None):
+        self.category = category
+        self.decay = decay if decay is not None and decay < 1.0 else None
+        # Counts are exact integers; decayed weights are only used for percentiles
+        self.winning = _RankTree(w for w, _ in all_pairs)
+        self.losing = _RankTree(l for _, l in all_pairs)
+        self.weighted = _RankTree(w for w, _ in all_pairs) if self.decay else None
+        self.count = 0
+        self.weeks: Dict[int, Tuple[List[Tuple[float, float]], float]] = {}
+        self._first_week: Optional[int] = None
+
+    def _weight(self, week: int) -> float:
+        if self._first_week is None:
+            self._first_week = week
+        weight = (1.0 / self.decay) ** (week - self._first_week)
+        if weight > MAX_WEIGHT and self.weeks:
+            self._rebase(min(self.weeks))
+            weight = (1.0 / self.decay) ** (week - self._first_week)
+        return weight
+
+    def _rebase(self, first_week: int):
+        """Rebuild the weighted tree with weights relative to first_week."""
+        self._first_week = first_week
+        self.weighted = _RankTree(self.weighted.values)
+        for week, (pairs, _) in self.weeks.items():
+            weight = (1.0 / self.decay) ** (week - first_week)
+            self.weeks[week] = (pairs, weight)
+            for winning_value, _ in pairs:
+                self.weighted.add(winning_value, weight)
+
+    def add_week(self, week: int, pairs: List[Tuple[float, float]]):
+        weight = self._weight(week) if self.decay else 1.0
+        self.weeks[week] = (pairs, weight)
+        for winning_value, losing_value in pairs:
+            self.winning.add(winning_value)
+            self.losing.add(losing_value)
+            if self.weighted:
+                self.weighted.add(winning_value, weight)
+        self.count += len(pairs)
+
+    def remove_week(self, week: int):
+        pairs, weight = self.weeks.pop(week)
+        for winning_value, losing_value in pairs:
+            self.winning.add(winning_value, -1.0)
+            self.losing.add(losing_value, -1.0)
+            if self.weighted:
+                self.weighted.add(winning_value, -weight)
+        self.count -= len(pairs)
+
+    def _percentile(self, q: float) -> float:
+        if self.weighted:
+            return self.weighted.kth(q * self.weighted.total)
+        return self.winning.kth(int(self.count * q))
+
+    def _median(self) -> float:
+        if self.weighted:
+            return self._percentile(0.5)
+        # Unweighted: match statistics.median (average the middle pair)
+        n = self.count
+        if n % 2 == 1:
+            return self.winning.kth(n // 2)
+        return (self.winning.kth(n // 2 - 1) + self.winning.kth(n // 2)) / 2
+
+    def thresholds(self) -> CategoryThresholds:
+        if self.count == 0:
+            return _empty_thresholds(self.category)
+
+        return _build_thresholds(
+            category=self.category,
+            sample_size=self.count,
+            weeks_analyzed=len(self.weeks),
+            min_winning=self.winning.kth(0),
+            max_winning=self.winning.kth(self.count - 1),
+            median_winning=self._median(),
+            p75_winning=self._percentile(0.75),
+            p90_winning=self._percentile(0.90),
+            max_losing=self.losing.kth(self.count - 1),
+            min_losing=self.losing.kth(0)
+        )
+
+
+def _validate(window: Optional[int], decay: Optional[float]):
+    if window is not None and window < 1:
+        raise ValueError(f"window must be at least 1 week, got {window}")
+    if decay is not None and not (0.0 < decay <= 1.0):
+        raise ValueError(f"decay must be in (0, 1], got {decay}")
+
+
+def _complete_week_pairs(category: str, db_path: str) -> Tuple[List[int], Dict[int, list]]:
+    """Complete weeks in order, and each week's (winning_value, losing_value) pairs (snapshot if current)."""
+    complete_weeks = sorted(w['week'] for w in get_weeks_stored(db_path) if w['is_complete'])
+    pairs_by_week = {week: [] for week in complete_weeks}
+
+    cube = load_snapshot(db_path)
+    if cube is not None:
+        weeks, winning, losing, _ = cube.decided_outcomes(category, complete_only=True)
+        for week, winning_value, losing_value in zip(weeks.tolist(), winning.tolist(), losing.tolist()):
+            if week in pairs_by_week:
+                pairs_by_week[week].append((winning_value, losing_value))
+        return complete_weeks, pairs_by_week
+
+    for outcome in get_all_category_outcomes(category, complete_only=True, db_path=db_path):
+        if outcome['winner_team_id'] is not None and outcome['week_number'] in pairs_by_week:
+            pairs_by_week[outcome['week_number']].append(
+                (outcome['winning_value'], outcome['losing_value'])
+            )
+
+    return complete_weeks, pairs_by_week
+
+
+def calculate_threshold_series(category: str, window: Optional[int] = None,
+                               decay: Optional[float] = None,
+                               db_path: str = "fantasy_hockey.db") -> List[Tuple[int, CategoryThresholds]]:
+    """
+    Thresholds as of each complete week: [(week, CategoryThresholds), ...].
+
+    window: only the last N complete weeks count (None = all weeks so far)
+    decay:  weight of a week relative to the week after it (None or 1.0 = no decay)
+    """
+    _validate(window, decay)
+    complete_weeks, pairs_by_week = _complete_week_pairs(category, db_path)
+
+    all_pairs = [pair for pairs in pairs_by_week.values() for pair in pairs]
+    state = RollingThresholdState(category, all_pairs, decay=decay)
+
+    series = []
+    for i, week in enumerate(complete_weeks):
+        state.add_week(week, pairs_by_week[week])
+        if window is not None and i >= window:
+            state.remove_week(complete_weeks[i - window])
+        series.append((week, state.thresholds()))
+
+    return series
+
+
+def calculate_rolling_thresholds(window: Optional[int] = None, decay: Optional[float] = None,
+                                 db_path: str = "fantasy_hockey.db") -> Dict[str, CategoryThresholds]:
+    """Latest rolling/decayed thresholds for every category. Returns dict keyed by category."""
+    thresholds = {}
+    for category in ALL_CATEGORIES:
+        series = calculate_threshold_series(category, window, decay, db_path)
+        thresholds[category] = series[-1][1] if series else _empty_thresholds(category)
+    return thresholds
+
+
+def calculate_all_threshold_series(window: Optional[int] = None, decay: Optional[float] = None,
+                                   db_path: str = "fantasy_hockey.db") -> Dict[str, List[Tuple[int, CategoryThresholds]]]:
+    """Threshold time series for every category."""
+    return {
+        category: calculate_threshold_series(category, window, decay, db_path)
+        for category in ALL_CATEGORIES
+    }
+
+
+def describe_threshold_mode(window: Optional[int] = None, decay: Optional[float] = None) -> str:
+    """Human readable label for a threshold mode, e.g. 'last 4 complete weeks'."""
+    parts = []
+    if window is not None:
+        parts.append(f"last {window} complete week{'s' if window != 1 else ''}")
+    if decay is not None and decay < 1.0:
+        half_life = math.log(0.5) / math.log(decay)
+        parts.append(f"recency decay {decay:g}/week (half-life {half_life:.1f} weeks)")
+    return ", ".join(parts) if parts else "full season"
@@ -0,0 +1,126 @@
+"""
+What-if scenarios on top of a team analysis.
+
+A ScenarioEngine wraps a baseline TeamAnalysisResult, which already carries
+everything needed: each category's weekly values, the opponent's value in
+those weeks, and the thresholds the assessments were made against. A
+scenario is a dict of per-week stat deltas ({'hits': 20, 'ppp': 0.5}).
+Only the categories it touches are re-assessed (average, gap, head-to-head
+record, assessment, trend); priorities and strengths are then rebuilt from
+the 11 assessments. Nothing is read from the database and no thresholds are
+recomputed, so thousands of scenarios per second are cheap.
+
+Categories without data (e.g. no goalie starts) stay 'no_data'.
+"""
+
+from dataclasses import replace
+from typing import Dict, Iterable, List
+
+from .team_analysis import (
+    CategoryAssessment,
+    TeamAnalysisResult,
+    calculate_assessment,
+    calculate_gap,
+    calculate_trend,
+    trend_from_averages,
+    get_improvement_priorities,
+    identify_strengths
+)
+from .constants import ALL_CATEGORIES, LOWER_IS_BETTER
+
+
+def parse_scenario(items: Iterable[str]) -> Dict[str, float]:
+    """Parse ['hits=20', 'ppp=+0.5'] into {'hits': 20.0, 'ppp': 0.5}."""
+    deltas = {}
+    for item in items:
+        category, sep, value = item.partition('=')
+        category = category.strip().lower()
+        if not sep or category not in ALL_CATEGORIES:
+            raise ValueError(f"Expected CATEGORY=DELTA with a category from {', '.join(ALL_CATEGORIES)}, got '{item}'")
+        try:
+            deltas[category] = deltas.get(category, 0.0) + float(value)
+        except ValueError:
+            raise ValueError(f"Delta for {category} is not a number: '{value}'")
+    return deltas
+
+
+class ScenarioEngine:
+    """Evaluate stat-delta scenarios against one baseline team analysis."""
+
+    def __init__(self, baseline: TeamAnalysisResult):
+        if baseline.thresholds is None:
+            raise ValueError("Baseline analysis has no thresholds; use analyze_team() to build it")
+        if baseline.priority_mode != 'gap':
+            raise ValueError("What-if scenarios re-rank priorities by gap; analyze with rank_by='gap'")
+        self.baseline = baseline
+
+    def _shift(self, base: CategoryAssessment, delta: float) -> CategoryAssessment:
+        """Re-assess one category with every weekly value moved by delta."""
+        threshold = self.baseline.thresholds[base.category]
+        weekly_values = [v + delta for v in base.weekly_values]
+        # Shift the baseline average (exact component ratio for SV%/GAA)
+        team_average = base.team_average + delta
+        # Same trend basis as the baseline: component ratios when it used them
+        if base.trend_averages is not None:
+            early_avg, recent_avg = (average + delta for average in base.trend_averages)
+            trend = trend_from_averages(early_avg, recent_avg, base.direction)
+            trend_averages = (early_avg, recent_avg)
+        else:
+            trend = calculate_trend(weekly_values, base.direction)
+            trend_averages = None
+
+        lower = base.category in LOWER_IS_BETTER
+        wins = losses = ties = 0
+        for team_value, opponent_value in zip(weekly_values, base.opponent_values):
+            if team_value == opponent_value:
+                ties += 1
+            elif (team_value < opponent_value) == lower:
+                wins += 1
+            else:
+                losses += 1
+        decisions = wins + losses
+
+        return replace(
+            base,
+            team_average=team_average,
+            weekly_values=weekly_values,
+            gap=calculate_gap(team_average, threshold.median_winning, base.direction),
+            win_rate=wins / decisions if decisions > 0 else -1,
+            wins=wins,
+            losses=losses,
+            ties=ties,
+            assessment=calculate_assessment(team_average, threshold, base.direction),
+            trend=trend,
+            trend_averages=trend_averages,
+            # Adjusted values move with the raw average; the schedule does not
+            adjusted_average=(base.adjusted_average + delta
+                              if base.adjusted_average is not None else None)
+        )
+
+    def evaluate(self, deltas: Dict[str, float]) -> TeamAnalysisResult:
+        """The baseline analysis with `deltas` added to every week of each category."""
+        unknown = set(deltas) - set(ALL_CATEGORIES)
+        if unknown:
+            raise ValueError(f"Unknown categories in scenario: {', '.join(sorted(unknown))}")
+
+        assessments = dict(self.baseline.assessments)
+        for category, delta in deltas.items():
+            base = assessments[category]
+            if delta and base.assessment != 'no_data':
+                assessments[category] = self._shift(base, delta)
+
+        return replace(
+            self.baseline,
+            assessments=assessments,
+            improvement_priorities=get_improvement_priorities(assessments),
+            strengths=identify_strengths(assessments),
+            scenario=dict(deltas)
+        )
+
+    def evaluate_many(self, scenarios: Iterable[Dict[str, float]]) -> List[TeamAnalysisResult]:
+        return [self.evaluate(deltas) for deltas in scenarios]
+
+
+def apply_scenario(baseline: TeamAnalysisResult, deltas: Dict[str, float]) -> TeamAnalysisResult:
+    """One-off scenario; build a ScenarioEngine to evaluate many against the same baseline."""
+    return ScenarioEngine(baseline).evaluate(deltas)
@@ -0,0 +1,144 @@
+"""
+Strength-of-schedule adjusted team ratings.
+
+Every complete team-week is one observation of an additive model per category:
+
+    value(team, week) = league_mean + rating[team] + allowed[opponent] + noise
+
+`rating` is what the team produces against an average opponent; `allowed` is
+how much a team moves its opponents' numbers (e.g. shots or goals against
+pushing up opponent GAA). Both vectors are constrained to sum to zero so the
+model is identifiable, and all teams are fitted at once with one
+numpy.linalg.lstsq call. Categories that share the same observations (every
+counting stat) are solved together as multiple right-hand sides.
+
+Because each team's residuals sum to zero, a team's raw average splits
+exactly into adjusted_average + schedule_effect.
+
+Goalie rate stats skip weeks with no goalie starts (value 0), the same weeks
+team_analysis treats as missing data.
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .cache import get_cached, set_cached
+from .snapshot import StatCube, load_snapshot, PRESENT, COMPLETE
+from .database import RATE_CATEGORIES
+from .constants import ALL_CATEGORIES
+
+CACHE_KEY = "sos_ratings"
+
+
+@dataclass
+class ScheduleAdjustedRating:
+    """One team's opponent-adjusted value in one category."""
+    team_id: int
+    category: str
+    weeks: int
+    raw_average: float
+    adjusted_average: float  # Expected weekly value against an average opponent
+    schedule_effect: float   # raw_average - adjusted_average (what the schedule added)
+    opponent_effect: float   # How much this team moves its opponents' values
+
+
+def _design_matrix(teams: np.ndarray, opponents: np.ndarray, num_teams: int) -> np.ndarray:
+    """[mean | team ratings | opponent effects] indicators plus two sum-to-zero rows."""
+    n = len(teams)
+    design = np.zeros((n + 2, 1 + 2 * num_teams))
+    rows = np.arange(n)
+    design[:n, 0] = 1.0
+    design[rows, 1 + teams] = 1.0
+    design[rows, 1 + num_teams + opponents] = 1.0
+    design[n, 1:1 + num_teams] = 1.0
+    design[n + 1, 1 + num_teams:] = 1.0
+    return design
+
+
+def _fit(cube: StatCube, categories: List[str], teams: np.ndarray, weeks: np.ndarray,
+         ratings: Dict[int, Dict[str, ScheduleAdjustedRating]]):
+    """Solve one least-squares problem for categories observed on the same team-weeks."""
+    if len(teams) == 0:
+        return
+    num_teams = len(cube.team_ids)
+    opponents = cube.opponent[teams, weeks]
+    columns = [cube.category_index[c] for c in categories]
+
+    observed = cube.values[teams, weeks][:, columns]
+    targets = np.vstack([observed, np.zeros((2, len(categories)))])
+    solution = np.linalg.lstsq(_design_matrix(teams, opponents, num_teams), targets, rcond=None)[0]
+
+    league_mean = solution[0]
+    team_ratings = solution[1:1 + num_teams]
+    allowed = solution[1 + num_teams:]
+
+    counts = np.bincount(teams, minlength=num_teams)
+    raw_totals = np.zeros((num_teams, len(categories)))
+    schedule_totals = np.zeros((num_teams, len(categories)))
+    np.add.at(raw_totals, teams, observed)
+    np.add.at(schedule_totals, teams, allowed[opponents])
+
+    for t in np.nonzero(counts)[0]:
+        team_id = int(cube.team_ids[t])
+        for j, category in enumerate(categories):
+            ratings.setdefault(team_id, {})[category] = ScheduleAdjustedRating(
+                team_id=team_id,
+                category=category,
+                weeks=int(counts[t]),
+                raw_average=float(raw_totals[t, j] / counts[t]),
+                adjusted_average=float(league_mean[j] + team_ratings[t, j]),
+                schedule_effect=float(schedule_totals[t, j] / counts[t]),
+                opponent_effect=float(allowed[t, j])
+            )
+
+
+def fit_sos_ratings(cube: StatCube) -> Dict[int, Dict[str, ScheduleAdjustedRating]]:
+    """Fit ratings for every team and category from a stat cube."""
+    required = PRESENT | COMPLETE
+    teams, weeks = np.nonzero((cube.flags & required) == required)
+
+    ratings = {}
+    counting = [c for c in ALL_CATEGORIES if c not in RATE_CATEGORIES]
+    _fit(cube, counting, teams, weeks, ratings)
+
+    for category in ALL_CATEGORIES:
+        if category in RATE_CATEGORIES:
+            started = cube.values[teams, weeks, cube.category_index[category]] != 0
+            _fit(cube, [category], teams[started], weeks[started], ratings)
+
+    return ratings
+
+
+def calculate_sos_ratings(db_path: str = "fantasy_hockey.db",
+                          use_cache: bool = True) -> Dict[int, Dict[str, ScheduleAdjustedRating]]:
+    """
+    Opponent-adjusted ratings keyed by team_id, then category.
+
+    Reads the stat cube snapshot when current (SQLite otherwise) and caches
+    the result until the data changes.
+    """
+    if use_cache:
+        cached = get_cached(CACHE_KEY, db_path)
+        if cached is not None:
+            return {
+                int(team_id): {c: ScheduleAdjustedRating(**r) for c, r in by_category.items()}
+                for team_id, by_category in cached.items()
+            }
+
+    cube = load_snapshot(db_path) or StatCube.from_database(db_path)
+    ratings = fit_sos_ratings(cube)
+
+    if use_cache:
+        set_cached(CACHE_KEY, {
+            str(team_id): {c: asdict(r) for c, r in by_category.items()}
+            for team_id, by_category in ratings.items()
+        }, db_path)
+
+    return ratings
+
+
+def get_team_sos(team_id: int, db_path: str = "fantasy_hockey.db") -> Optional[Dict[str, ScheduleAdjustedRating]]:
+    """One team's ratings by category, or None if it has no complete weeks."""
+    return calculate_sos_ratings(db_path).get(team_id)
@@ -0,0 +1,303 @@
+"""
+Read-only local HTTP API serving analytics as JSON.
+
+Every CLI invocation pays interpreter startup, imports, init_db and a full
+recomputation. `serve` keeps one process warm instead: each response body
+is computed once per data version and kept encoded, so repeated requests
+are a dictionary lookup and a socket write. Every save bumps data_version;
+the first request after that drops the whole cache. Trade and live keys
+come from the query string, so the cache is an LRU of CACHE_SIZE entries
+rather than growing with every distinct request. Concurrent requests for
+the same uncached result wait for one computation instead of repeating it.
+
+Endpoints (GET only):
+
+    /status                   Stored weeks, data version and cache counters
+    /teams                    Every team
+    /thresholds               Threshold report (as `report --format json`)
+    /teams/<id>               Team analysis report (?rank_by=impact)
+    /live                     Live win probabilities (?days_left=0-7&week=N)
+    /outlook                  Simulated rest of season for every team
+    /trade                    ?team=1&partner=5&give=101,102&get=502
+
+Built on the standard library's threaded HTTP server with HTTP/1.1
+keep-alive, bound to localhost by default.
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .analytics import calculate_all_thresholds, get_analysis_summary
+from .database import get_all_teams, get_weeks_stored
+from .live import calculate_live_odds, default_days_left, DAYS_PER_WEEK
+from .reports import render, threshold_report, team_analysis_report
+from .team_analysis import analyze_team, PRIORITY_MODES
+from .trade import TradeSimulator, DEFAULT_SIMULATIONS, DEFAULT_SEASON_WEEKS, DEFAULT_PLAYOFF_TEAMS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+CACHE_SIZE = 256  # Cached values kept per data version (least recently used dropped first)
+
+TEAM_PATH = re.compile(r"^/teams/(\d+)$")
+
+
+class NotFound(LookupError):
+    """Unknown endpoint or team (HTTP 404)."""
+
+
+def _encode(payload: Any) -> bytes:
+    """Compact JSON for a response body (numpy values become lists/floats)."""
+    return json.dumps(payload, separators=(',', ':'),
+                      default=lambda v: v.tolist() if hasattr(v, 'tolist') else str(v)).encode('utf-8')
+
+
+class AnalyticsService:
+    """Analytics results cached in memory per data version."""
+
+    def __init__(self, db_path: str = "fantasy_hockey.db", simulations: int = DEFAULT_SIMULATIONS,
+                 season_weeks: int = DEFAULT_SEASON_WEEKS, playoff_teams: int = DEFAULT_PLAYOFF_TEAMS):
+        self.db_path = db_path
+        self.simulations = simulations
+        self.season_weeks = season_weeks
+        self.playoff_teams = playoff_teams
+        self.hits = 0
+        self.misses = 0
+
+        # One long-lived connection just for the version check on each request
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._values: 'OrderedDict[tuple, Any]' = OrderedDict()
+        self._pending: Dict[tuple, threading.Lock] = {}
+
+        # TradeSimulator keeps its own roster-fingerprint cache but is not thread-safe
+        self._simulator: Optional[TradeSimulator] = None
+        self._simulator_lock = threading.Lock()
+
+    def close(self):
+        self._conn.close()
+
+    def data_version(self) -> int:
+        """Same counter as database.get_data_version, on the service's connection."""
+        with self._lock:
+            try:
+                row = self._conn.execute("SELECT value FROM db_meta WHERE key = 'data_version'").fetchone()
+            except sqlite3.OperationalError:
+                row = None  # Created before db_meta existed
+        return int(row[0]) if row else 0
+
+    def cached(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        """compute() once per data version; concurrent callers of the same key share one run."""
+        version = self.data_version()
+        with self._lock:
+            if version != self._version:
+                self._values.clear()
+                self._version = version
+            if key in self._values:
+                self.hits += 1
+                self._values.move_to_end(key)
+                return self._values[key]
+            key_lock = self._pending.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._values:  # Computed while this caller waited
+                    self.hits += 1
+                    self._values.move_to_end(key)
+                    return self._values[key]
+                self.misses += 1
+            try:
+                value = compute()
+            except BaseException:
+                with self._lock:
+                    self._pending.pop(key, None)
+                raise
+            # Stored before the key lock is dropped, so no caller can slip
+            # between the two and start a second computation
+            with self._lock:
+                if self._version == version:  # Not stored if new data arrived meanwhile
+                    self._values[key] = value
+                    while len(self._values) > CACHE_SIZE:
+                        self._values.popitem(last=False)
+                self._pending.pop(key, None)
+        return value
+
+    def _thresholds(self):
+        return self.cached(('thresholds',), lambda: calculate_all_thresholds(self.db_path))
+
+    def _require_team(self, team_id: int):
+        team_ids = self.cached(('team_ids',), lambda: {t['team_id'] for t in get_all_teams(self.db_path)})
+        if team_id not in team_ids:
+            raise NotFound(f"Team ID {team_id} not found")
+
+    def _simulate(self, action: Callable[[TradeSimulator], Any]) -> Any:
+        with self._simulator_lock:
+            if self._simulator is None:
+                self._simulator = TradeSimulator(self.db_path, simulations=self.simulations,
+                                                 season_weeks=self.season_weeks,
+                                                 playoff_teams=self.playoff_teams)
+            return action(self._simulator)
+
+    # Endpoints: each returns an encoded JSON body
+
+    def status(self) -> bytes:
+        weeks = self.cached(('weeks',), lambda: get_weeks_stored(self.db_path))
+        return _encode({
+            'data_version': self._version,
+            'weeks': weeks,
+            'complete_weeks': sum(1 for w in weeks if w['is_complete']),
+            'cache': {'entries': len(self._values), 'hits': self.hits, 'misses': self.misses},
+        })
+
+    def teams(self) -> bytes:
+        return self.cached(('body', 'teams'), lambda: _encode(get_all_teams(self.db_path)))
+
+    def thresholds(self) -> bytes:
+        return self.cached(('body', 'thresholds'), lambda: render(
+            threshold_report(self._thresholds(), get_analysis_summary(self.db_path)), 'json'
+        ).encode('utf-8'))
+
+    def team(self, team_id: int, rank_by: str = 'gap') -> bytes:
+        if rank_by not in PRIORITY_MODES:
+            raise ValueError(f"rank_by must be one of {PRIORITY_MODES}, got '{rank_by}'")
+        self._require_team(team_id)
+        return self.cached(('body', 'team', team_id, rank_by), lambda: render(
+            team_analysis_report(analyze_team(team_id, self.db_path, rank_by=rank_by,
+                                              thresholds=self._thresholds())), 'json'
+        ).encode('utf-8'))
+
+    def live(self, days_left: Optional[int] = None, week: Optional[int] = None) -> bytes:
+        days_left = default_days_left() if days_left is None else days_left
+        if not 0 <= days_left <= DAYS_PER_WEEK:  # Checked before it becomes a cache key
+            raise ValueError(f"days_left must be a whole number of days from 0 to {DAYS_PER_WEEK}, got {days_left}")
+        return self.cached(('body', 'live', days_left, week), lambda: _encode({
+            'days_left': days_left,
+            'matchups': [asdict(o) for o in calculate_live_odds(self.db_path, days_left=days_left, week=week)],
+        }))
+
+    def outlook(self) -> bytes:
+        def compute():
+            outlooks, remaining = self._simulate(lambda s: (s.outlooks(), s.remaining_weeks))
+            return _encode({
+                'remaining_weeks': remaining,
+                'simulations': self.simulations,
+                'teams': {team_id: asdict(o) for team_id, o in outlooks.items()},
+            })
+        return self.cached(('body', 'outlook'), compute)
+
+    def trade(self, team_id: int, partner: int, give: List[int], get: List[int]) -> bytes:
+        for check_id in (team_id, partner):
+            self._require_team(check_id)
+
+        def compute():
+            result = self._simulate(lambda s: s.evaluate_trade(team_id, give, partner, get))
+            players = set(give) | set(get)
+            return _encode({
+                'remaining_weeks': result.remaining_weeks,
+                'simulations': result.simulations,
+                'players': {p: result.names.get(p) for p in sorted(players)},
+                'sides': [asdict(side) for side in result.sides],
+            })
+        key = ('body', 'trade', team_id, partner, tuple(sorted(give)), tuple(sorted(get)))
+        return self.cached(key, compute)
+
+    def handle(self, target: str) -> bytes:
+        """Response body for a request target (path and query string)."""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        path = url.path.rstrip('/') or '/'
+
+        if path == '/status':
+            return self.status()
+        if path == '/teams':
+            return self.teams()
+        if path == '/thresholds':
+            return self.thresholds()
+        match = TEAM_PATH.match(path)
+        if match:
+            return self.team(int(match.group(1)), _param(query, 'rank_by', str, 'gap'))
+        if path == '/live':
+            return self.live(_param(query, 'days_left', int), _param(query, 'week', int))
+        if path == '/outlook':
+            return self.outlook()
+        if path == '/trade':
+            team_id = _param(query, 'team', int)
+            partner = _param(query, 'partner', int)
+            if team_id is None or partner is None:
+                raise ValueError("trade needs team and partner")
+            return self.trade(team_id, partner, _id_list(query, 'give'), _id_list(query, 'get'))
+        raise NotFound(f"No endpoint {path}")
+
+
+def _param(query: Dict[str, List[str]], name: str, cast: Callable, default=None):
+    """Single query parameter converted with cast (ValueError on bad input)."""
+    if name not in query:
+        return default
+    try:
+        return cast(query[name][-1])
+    except ValueError:
+        raise ValueError(f"Invalid {name}: '{query[name][-1]}'")
+
+
+def _id_list(query: Dict[str, List[str]], name: str) -> List[int]:
+    """Player ids from repeated and/or comma-separated parameters."""
+    values = [v for item in query.get(name, []) for v in item.split(',') if v]
+    try:
+        return [int(v) for v in values]
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {','.join(values)}")
+
+
+class AnalyticsHandler(BaseHTTPRequestHandler):
+    """GET requests answered from the server's AnalyticsService."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive: dashboards reuse one connection
+    disable_nagle_algorithm = True  # Headers and body are separate writes; don't wait for the ACK
+
+    def do_GET(self):
+        try:
+            status, body = 200, self.server.service.handle(self.path)
+        except NotFound as e:
+            status, body = 404, _encode({'error': str(e)})
+        except ValueError as e:
+            status, body = 400, _encode({'error': str(e)})
+        except Exception as e:
+            logging.exception("Detailed Traceback:")
+            status, body = 500, _encode({'error': str(e)})
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.debug("%s - %s", self.address_string(), format % args)
+
+
+class AnalyticsServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding one AnalyticsService."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: AnalyticsService):
+        super().__init__(address, AnalyticsHandler)
+        self.service = service
+
+    def server_close(self):
+        super().server_close()
+        self.service.close()
+
+
+def create_server(db_path: str = "fantasy_hockey.db", host: str = DEFAULT_HOST,
+                  port: int = DEFAULT_PORT, **service_options) -> AnalyticsServer:
+    """Bound server (port 0 picks a free one); call serve_forever() to run it."""
+    return AnalyticsServer((host, port), AnalyticsService(db_path, **service_options))
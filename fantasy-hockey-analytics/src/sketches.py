@@ -0,0 +1,180 @@
+"""
+Mergeable streaming quantile sketches (KLL) for league thresholds.
+
+A KLL sketch keeps a hierarchy of small sorted buffers ("compactors"). Items at
+level h stand for 2^h original values. When a level fills up it is sorted and
+every other item is promoted to the next level, so memory stays at roughly
+3k items no matter how many values are added. Two sketches merge by
+concatenating their levels and compacting again, so per-league sketches can be
+combined into cross-league thresholds without touching the raw rows.
+
+Error bound: with the default k=200 the normalized rank error of any quantile
+is within about 1.7/k (~0.85%) for typical inputs and below 1.65% with 99%
+confidence. A sketch that has seen no more than k values is exact. Min and max
+are always tracked exactly.
+"""
+
+import json
+import math
+import random
+from typing import List, Optional
+
+DEFAULT_K = 200
+
+# Capacity shrinks by this factor for each level below the top
+CAPACITY_DECAY = 2.0 / 3.0
+
+# Documented normalized rank error at 99% confidence for a given k
+RANK_ERROR_99 = {100: 0.0266, 200: 0.0165, 400: 0.0093}
+
+
+def rank_error(k: int = DEFAULT_K) -> float:
+    """Approximate normalized rank error (99% confidence) for sketch size k."""
+    if k in RANK_ERROR_99:
+        return RANK_ERROR_99[k]
+    return 3.3 / k
+
+
+class KLLSketch:
+    """Streaming, mergeable quantile sketch."""
+
+    def __init__(self, k: int = DEFAULT_K):
+        if k < 8:
+            raise ValueError(f"k must be at least 8, got {k}")
+        self.k = k
+        self.n = 0
+        self.min_value: Optional[float] = None
+        self.max_value: Optional[float] = None
+        self.compactors: List[List[float]] = [[]]
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * CAPACITY_DECAY ** depth)))
+
+    def _stored_items(self) -> int:
+        return sum(len(c) for c in self.compactors)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def update(self, value: float):
+        """Add a single value."""
+        value = float(value)
+        self.n += 1
+        if self.min_value is None or value < self.min_value:
+            self.min_value = value
+        if self.max_value is None or value > self.max_value:
+            self.max_value = value
+
+        self.compactors[0].append(value)
+        if self._stored_items() > self._max_size():
+            self._compress()
+
+    def extend(self, values):
+        """Add many values."""
+        for value in values:
+            self.update(value)
+
+    def _compact_level(self, level: int):
+        """Sort one level and promote every other item to the level above."""
+        if level + 1 == len(self.compactors):
+            self.compactors.append([])
+
+        items = sorted(self.compactors[level])
+        # Deterministic coin flip so saved sketches reproduce exactly
+        coin = random.Random(self.n * 31 + level)
+
+        keep = []
+        if len(items) % 2 == 1:
+            keep = [items.pop(0)] if coin.random() < 0.5 else [items.pop()]
+
+        offset = coin.randrange(2)
+        self.compactors[level + 1].extend(items[offset::2])
+        self.compactors[level] = keep
+
+    def _compress(self):
+        """Compact levels until the sketch is back within its size budget."""
+        while self._stored_items() > self._max_size():
+            for level in range(len(self.compactors)):
+                if len(self.compactors[level]) >= self._capacity(level):
+                    self._compact_level(level)
+                    break
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Fold another sketch into this one (in place). Returns self."""
+        if other.n == 0:
+            return self
+
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+
+        self.n += other.n
+        if self.min_value is None or other.min_value < self.min_value:
+            self.min_value = other.min_value
+        if self.max_value is None or other.max_value > self.max_value:
+            self.max_value = other.max_value
+
+        self._compress()
+        return self
+
+    def quantile(self, q: float) -> float:
+        """
+        Value at quantile q (0.0 to 1.0).
+
+        Nearest rank: the item with 0-based (weighted) rank int(n * q), as
+        the exact p75/p90 thresholds do. The exact median instead averages
+        the middle pair for even n (statistics.median), so on an exact
+        sketch quantile(0.5) is the upper middle item, not their mean; the
+        module's rank error bound applies on top of that difference.
+        """
+        if self.n == 0:
+            raise ValueError("quantile of empty sketch")
+        if q <= 0:
+            return self.min_value
+        if q >= 1:
+            return self.max_value
+
+        weighted = sorted(
+            (value, 1 << level)
+            for level, items in enumerate(self.compactors)
+            for value in items
+        )
+        total = sum(weight for _, weight in weighted)
+        target = q * total
+
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative > target:
+                return value
+        return self.max_value
+
+    def to_dict(self) -> dict:
+        return {
+            'k': self.k,
+            'n': self.n,
+            'min': self.min_value,
+            'max': self.max_value,
+            'levels': self.compactors,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'KLLSketch':
+        sketch = cls(data['k'])
+        sketch.n = data['n']
+        sketch.min_value = data['min']
+        sketch.max_value = data['max']
+        sketch.compactors = [list(level) for level in data['levels']] or [[]]
+        return sketch
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text: str) -> 'KLLSketch':
+        return cls.from_dict(json.loads(text))
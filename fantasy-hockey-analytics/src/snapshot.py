@@ -0,0 +1,254 @@
+"""
+Memory-mapped binary snapshot of the stat cube (teams x weeks x categories).
+
+`fetch` writes <db>.snap next to the database. Analytics map the file and
+read the arrays in place, so no SQLite rows are decoded. The snapshot stores
+the database's data_version; when the database has been saved since (or the
+file is missing/corrupt), readers fall back to SQLite.
+
+File layout (little-endian, every array starts on an 8-byte boundary):
+
+    header      magic 'FHSNAP01', format, data_version, teams, weeks, categories
+    categories  16-byte ASCII names, in ALL_CATEGORIES order
+    team_ids    int64[teams]
+    weeks       int64[weeks]
+    opponent    int32[teams, weeks]              row index of the opponent, -1 if none
+    flags       uint8[teams, weeks]              PRESENT | COMPLETE | TEAM1
+    values      float64[teams, weeks, categories]
+"""
+
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .database import get_all_category_outcomes, get_data_version
+from .constants import ALL_CATEGORIES, LOWER_IS_BETTER
+
+MAGIC = b"FHSNAP01"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sIQIII")  # magic, format, data_version, teams, weeks, categories
+NAME_BYTES = 16
+
+# flags bits
+PRESENT = 1   # team played this week
+COMPLETE = 2  # the matchup is final
+TEAM1 = 4     # team is team1 in its matchup (one row per matchup has this)
+
+
+def snapshot_path(db_path: str) -> str:
+    return db_path + ".snap"
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _layout(num_teams: int, num_weeks: int, num_categories: int) -> Dict[str, Tuple[int, str, tuple]]:
+    """name -> (offset, dtype, shape) for every array in the file."""
+    arrays = [
+        ('team_ids', '<i8', (num_teams,)),
+        ('weeks', '<i8', (num_weeks,)),
+        ('opponent', '<i4', (num_teams, num_weeks)),
+        ('flags', 'u1', (num_teams, num_weeks)),
+        ('values', '<f8', (num_teams, num_weeks, num_categories)),
+    ]
+    offset = _align(HEADER.size + NAME_BYTES * num_categories)
+    layout = {}
+    for name, dtype, shape in arrays:
+        layout[name] = (offset, dtype, shape)
+        offset = _align(offset + np.dtype(dtype).itemsize * int(np.prod(shape)))
+    layout['_end'] = (offset, '', ())
+    return layout
+
+
+class StatCube:
+    """Per team-week category values with matchup structure, as numpy arrays."""
+
+    def __init__(self, team_ids, weeks, opponent, flags, values,
+                 categories: List[str] = None, data_version: int = 0):
+        self.team_ids = team_ids
+        self.weeks = weeks
+        self.opponent = opponent
+        self.flags = flags
+        self.values = values
+        self.categories = list(categories or ALL_CATEGORIES)
+        self.data_version = data_version
+        self.team_index = {int(t): i for i, t in enumerate(team_ids)}
+        self.category_index = {c: i for i, c in enumerate(self.categories)}
+        self._mmap = None
+
+    @classmethod
+    def from_database(cls, db_path: str = "fantasy_hockey.db") -> 'StatCube':
+        """Build the cube from SQLite (either storage layout)."""
+        data_version = get_data_version(db_path)
+        per_category = {
+            category: get_all_category_outcomes(category, complete_only=False, db_path=db_path)
+            for category in ALL_CATEGORIES
+        }
+
+        matchups = {}
+        for category, outcomes in per_category.items():
+            for o in outcomes:
+                matchups.setdefault((o['week_number'], o['team1_id'], o['team2_id']), {
+                    'is_complete': bool(o['is_complete']),
+                })[category] = (o['team1_value'], o['team2_value'])
+
+        team_ids = np.array(sorted({t for _, t1, t2 in matchups for t in (t1, t2)}), dtype='<i8')
+        weeks = np.array(sorted({w for w, _, _ in matchups}), dtype='<i8')
+        team_pos = {int(t): i for i, t in enumerate(team_ids)}
+        week_pos = {int(w): i for i, w in enumerate(weeks)}
+
+        shape = (len(team_ids), len(weeks))
+        opponent = np.full(shape, -1, dtype='<i4')
+        flags = np.zeros(shape, dtype='u1')
+        values = np.zeros(shape + (len(ALL_CATEGORIES),), dtype='<f8')
+
+        for (week, t1, t2), matchup in matchups.items():
+            w, i1, i2 = week_pos[week], team_pos[t1], team_pos[t2]
+            complete = COMPLETE if matchup['is_complete'] else 0
+            opponent[i1, w], opponent[i2, w] = i2, i1
+            flags[i1, w] = PRESENT | complete | TEAM1
+            flags[i2, w] = PRESENT | complete
+            for c, category in enumerate(ALL_CATEGORIES):
+                if category in matchup:
+                    values[i1, w, c], values[i2, w, c] = matchup[category]
+
+        return cls(team_ids, weeks, opponent, flags, values, data_version=data_version)
+
+    def write(self, path: str):
+        """Write the snapshot atomically (temp file + rename)."""
+        layout = _layout(len(self.team_ids), len(self.weeks), len(self.categories))
+        buffer = bytearray(layout['_end'][0])
+
+        HEADER.pack_into(buffer, 0, MAGIC, FORMAT_VERSION, self.data_version,
+                         len(self.team_ids), len(self.weeks), len(self.categories))
+        for i, category in enumerate(self.categories):
+            name = category.encode('ascii')[:NAME_BYTES]
+            start = HEADER.size + i * NAME_BYTES
+            buffer[start:start + len(name)] = name
+
+        for name in ('team_ids', 'weeks', 'opponent', 'flags', 'values'):
+            offset, dtype, shape = layout[name]
+            data = np.ascontiguousarray(getattr(self, name), dtype=dtype).tobytes()
+            buffer[offset:offset + len(data)] = data
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(buffer)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def open(cls, path: str) -> Optional['StatCube']:
+        """Map a snapshot file. Returns None if it is missing, corrupt or another format."""
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None  # Missing or empty file
+
+        try:
+            magic, fmt, data_version, num_teams, num_weeks, num_categories = HEADER.unpack_from(mapped, 0)
+        except struct.error:
+            mapped.close()
+            return None
+
+        layout = _layout(num_teams, num_weeks, num_categories)
+        if magic != MAGIC or fmt != FORMAT_VERSION or len(mapped) < layout['_end'][0]:
+            mapped.close()
+            return None
+
+        categories = [
+            bytes(mapped[HEADER.size + i * NAME_BYTES:HEADER.size + (i + 1) * NAME_BYTES])
+            .rstrip(b"\0").decode('ascii')
+            for i in range(num_categories)
+        ]
+
+        arrays = {}
+        for name in ('team_ids', 'weeks', 'opponent', 'flags', 'values'):
+            offset, dtype, shape = layout[name]
+            count = int(np.prod(shape))
+            arrays[name] = np.frombuffer(mapped, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+        cube = cls(categories=categories, data_version=data_version, **arrays)
+        cube._mmap = mapped
+        return cube
+
+    def decided_outcomes(self, category: str, complete_only: bool = True):
+        """
+        Matchups decided in this category: (weeks, winning_values, losing_values) arrays,
+        plus the weeks of every matchup considered (ties included).
+        """
+        c = self.category_index[category]
+        mask = (self.flags & TEAM1) != 0
+        if complete_only:
+            mask &= (self.flags & COMPLETE) != 0
+
+        rows, cols = np.nonzero(mask)
+        v1 = self.values[rows, cols, c]
+        v2 = self.values[self.opponent[rows, cols], cols, c]
+
+        decided = v1 != v2
+        team1_wins = (v1 < v2) if category in LOWER_IS_BETTER else (v1 > v2)
+        winning = np.where(team1_wins, v1, v2)[decided]
+        losing = np.where(team1_wins, v2, v1)[decided]
+
+        all_weeks = self.weeks[cols]
+        return all_weeks[decided], winning, losing, all_weeks
+
+    def team_category_values(self, team_id: int, category: str,
+                             complete_only: bool = True) -> List[dict]:
+        """Same result as database.get_team_category_values."""
+        if team_id not in self.team_index or category not in self.category_index:
+            return []
+        t, c = self.team_index[team_id], self.category_index[category]
+
+        required = PRESENT | COMPLETE if complete_only else PRESENT
+        cols = np.nonzero((self.flags[t] & required) == required)[0]
+        team_values = self.values[t, cols, c]
+        opponent_values = self.values[self.opponent[t, cols], cols, c]
+
+        results = []
+        for week, team_value, opponent_value in zip(self.weeks[cols].tolist(),
+                                                    team_values.tolist(),
+                                                    opponent_values.tolist()):
+            if team_value == opponent_value:
+                won = None
+            else:
+                won = 1 if (team_value < opponent_value) == (category in LOWER_IS_BETTER) else 0
+            results.append({
+                'week': week,
+                'team_value': team_value,
+                'opponent_value': opponent_value,
+                'won': won,
+            })
+        return results
+
+
+def write_snapshot(db_path: str = "fantasy_hockey.db") -> str:
+    """Build the stat cube from the database and write <db>.snap. Returns the path."""
+    path = snapshot_path(db_path)
+    StatCube.from_database(db_path).write(path)
+    return path
+
+
+def load_snapshot(db_path: str = "fantasy_hockey.db") -> Optional[StatCube]:
+    """The mapped snapshot if it matches the database's current data, else None."""
+    path = snapshot_path(db_path)
+    if not os.path.exists(path) or not os.path.exists(db_path):
+        return None
+
+    cube = StatCube.open(path)
+    if cube is None:
+        return None
+    if cube.categories != list(ALL_CATEGORIES) or cube.data_version != get_data_version(db_path):
+        return None  # Stale: the database changed after the snapshot was written
+    return cube
+
+
+def remove_snapshot(db_path: str = "fantasy_hockey.db"):
+    path = snapshot_path(db_path)
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,452 @@
+"""Seeded synthetic league generator for benchmarks and stress tests."""
+
+import math
+import random
+import sqlite3
+from typing import Dict, List, Optional
+from .models import TeamStats, Matchup, SeasonData, PlayerWeek
+from .constants import (ALL_CATEGORIES, COMPONENT_FIELDS, LOWER_IS_BETTER, ROSTER_SLOTS, BENCH_POSITIONS,
+                        FREE_AGENT_TEAM_ID, FREE_AGENT_POSITION)
+from .migrations import V1_SCHEMA
+
+# Typical weekly team totals for a 10-12 team head-to-head league: (mean, std dev)
+SKATER_PROFILE = {
+    'goals': (24.0, 6.0),
+    'assists': (38.0, 8.0),
+    'plus_minus': (2.0, 8.0),
+    'pim': (22.0, 9.0),
+    'ppp': (12.0, 4.0),
+    'hits': (110.0, 25.0),
+    'shots': (220.0, 30.0),
+}
+
+GOALIE_STARTS = (4.0, 1.5)
+SAVE_PCT = (0.905, 0.015)
+SHOTS_AGAINST_PER_START = (30.0, 5.0)
+MINUTES_PER_START = (59.0, 3.0)  # Occasionally pulled or into overtime
+
+# Chance a team starts no goalies at all in a given week
+ZERO_GOALIE_RATE = 0.03
+
+# Player generation: bench beyond the ROSTER_SLOTS starters, and how much of a
+# team total a defenseman produces relative to a forward
+BENCH_ROSTER = ['C', 'LW', 'D', 'G']
+POSITION_WEIGHTS = {
+    'D': {'goals': 0.45, 'assists': 0.8, 'ppp': 0.7, 'hits': 1.3, 'pim': 1.2, 'shots': 0.7},
+}
+NHL_TEAMS = ['BOS', 'COL', 'EDM', 'FLA', 'NYR', 'TOR', 'VAN', 'VGK']
+FREE_AGENT_POSITIONS = ['C', 'C', 'LW', 'LW', 'RW', 'RW', 'D', 'D', 'D', 'G']
+FREE_AGENT_FIRST_ID = 100000
+
+
+def round_robin_schedule(num_teams: int, num_weeks: int) -> List[List[tuple]]:
+    """Return per-week lists of (team1_id, team2_id) pairs using the circle method."""
+    if num_teams < 2 or num_teams % 2 != 0:
+        raise ValueError(f"num_teams must be an even number >= 2, got {num_teams}")
+
+    team_ids = list(range(1, num_teams + 1))
+    rounds = []
+    for _ in range(num_teams - 1):
+        half = num_teams // 2
+        rounds.append([(team_ids[i], team_ids[num_teams - 1 - i]) for i in range(half)])
+        # Keep the first team fixed, rotate the rest
+        team_ids = [team_ids[0]] + [team_ids[-1]] + team_ids[1:-1]
+
+    return [rounds[week % len(rounds)] for week in range(num_weeks)]
+
+
+def determine_winners(t1: TeamStats, t2: TeamStats) -> Dict[str, str]:
+    """Category winners by team name, using the same rules as the Yahoo fetcher."""
+    winners = {}
+    for category in ALL_CATEGORIES:
+        v1 = getattr(t1, category)
+        v2 = getattr(t2, category)
+
+        if v1 == v2:
+            winners[category] = "Tie"
+        elif category in LOWER_IS_BETTER:
+            winners[category] = t1.team_name if v1 < v2 else t2.team_name
+        else:
+            winners[category] = t1.team_name if v1 > v2 else t2.team_name
+    return winners
+
+
+def _team_strengths(rng: random.Random, team_ids: List[int]) -> Dict[int, Dict[str, float]]:
+    """Latent per-team multipliers so some teams are consistently better at a category."""
+    strengths = {}
+    for team_id in team_ids:
+        strengths[team_id] = {
+            category: rng.gauss(1.0, 0.12) for category in SKATER_PROFILE
+        }
+        strengths[team_id]['goalie'] = rng.gauss(1.0, 0.08)
+    return strengths
+
+
+def _drift_strengths(rng: random.Random, strengths: Dict[int, Dict[str, float]]):
+    """Move team strengths a little between seasons (trades, aging, etc.)."""
+    for team_strength in strengths.values():
+        for key in team_strength:
+            team_strength[key] = 0.7 * team_strength[key] + 0.3 * rng.gauss(1.0, 0.12)
+
+
+def _generate_team_week(rng: random.Random, team_id: int, team_name: str,
+                        strength: Dict[str, float]) -> TeamStats:
+    """Generate one team's weekly stat line."""
+    stats = TeamStats(team_id=team_id, team_name=team_name, manager_name=f"Manager {team_id}")
+
+    # Skater categories scale with the team's latent strength
+    for category, (mean, std) in SKATER_PROFILE.items():
+        value = rng.gauss(mean * strength[category], std)
+        if category != 'plus_minus':
+            value = max(0.0, value)
+        setattr(stats, category, int(round(value)))
+
+    # Points are goals + assists; PPP can't exceed points
+    stats.points = stats.goals + stats.assists
+    stats.ppp = min(stats.ppp, stats.points)
+
+    # Goalies
+    if rng.random() < ZERO_GOALIE_RATE:
+        # No starts: wins, SV% and GAA are 0, components are tracked as 0
+        stats.saves = stats.shots_against = stats.goals_against = stats.minutes = 0.0
+        return stats
+
+    starts = max(1, int(round(rng.gauss(*GOALIE_STARTS))))
+    win_prob = min(0.9, max(0.1, 0.5 * strength['goalie']))
+    stats.goalie_wins = sum(1 for _ in range(starts) if rng.random() < win_prob)
+
+    # SV% and GAA derive from the components, as Yahoo computes them
+    shots_against = sum(max(10, int(round(rng.gauss(*SHOTS_AGAINST_PER_START)))) for _ in range(starts))
+    save_pct = rng.gauss(SAVE_PCT[0] + (strength['goalie'] - 1.0) * 0.05, SAVE_PCT[1])
+    saves = int(round(shots_against * min(0.990, max(0.800, save_pct))))
+    minutes = sum(min(65.0, max(20.0, rng.gauss(*MINUTES_PER_START))) for _ in range(starts))
+
+    stats.shots_against = float(shots_against)
+    stats.saves = float(saves)
+    stats.goals_against = float(shots_against - saves)
+    stats.minutes = round(minutes, 2)
+    stats.save_pct = round(stats.saves / stats.shots_against, 3)
+    stats.gaa = round(stats.goals_against * 60 / stats.minutes, 2)
+
+    return stats
+
+
+def generate_season_data(num_teams: int = 10, num_weeks: int = 20, seed: int = 0,
+                         league_id: int = 99999, season: str = "2025-2026",
+                         incomplete_weeks: int = 0,
+                         strengths: Optional[Dict[int, Dict[str, float]]] = None) -> SeasonData:
+    """
+    Generate a realistic SeasonData for one league-season.
+
+    The same seed always produces the same data. The last `incomplete_weeks`
+    weeks are marked in progress, like a live season.
+    """
+    rng = random.Random(seed)
+    team_ids = list(range(1, num_teams + 1))
+    if strengths is None:
+        strengths = _team_strengths(rng, team_ids)
+
+    schedule = round_robin_schedule(num_teams, num_weeks)
+    matchups = []
+
+    for week_index, pairs in enumerate(schedule):
+        week = week_index + 1
+        is_complete = week <= num_weeks - incomplete_weeks
+
+        for team1_id, team2_id in pairs:
+            team1 = _generate_team_week(rng, team1_id, f"Team {team1_id}", strengths[team1_id])
+            team2 = _generate_team_week(rng, team2_id, f"Team {team2_id}", strengths[team2_id])
+
+            matchups.append(Matchup(
+                week=week,
+                team1=team1,
+                team2=team2,
+                category_winners=determine_winners(team1, team2),
+                is_complete=is_complete
+            ))
+
+    return SeasonData(league_id=league_id, season=season, matchups=matchups)
+
+
+def _split(rng: random.Random, total: int, weights: List[float]) -> List[int]:
+    """Integer shares of `total` proportional to weights (largest remainder; any sign)."""
+    raw = [total * w / sum(weights) for w in weights]
+    shares = [math.floor(r) for r in raw]
+    order = sorted(range(len(raw)), key=lambda i: (raw[i] - shares[i], rng.random()), reverse=True)
+    for i in order[:total - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+def _roster(rng: random.Random, team_id: int) -> List[dict]:
+    """Starters fill ROSTER_SLOTS, plus a bench of three skaters and a goalie."""
+    slots = [pos for pos, count in ROSTER_SLOTS.items() for _ in range(count)]
+    slots += ['BN'] * len(BENCH_ROSTER)
+    positions = [pos for pos, count in ROSTER_SLOTS.items() for _ in range(count)] + BENCH_ROSTER
+
+    roster = []
+    for i, (slot, position) in enumerate(zip(slots, positions)):
+        eligible = [position]
+        if position in ('C', 'LW', 'RW') and rng.random() < 0.3:
+            eligible.append(rng.choice([p for p in ('C', 'LW', 'RW') if p != position]))
+        roster.append({
+            'player_id': team_id * 100 + i + 1,
+            'position': position,
+            'eligible': eligible,
+            'slot': slot,
+            'talent': max(0.3, rng.gauss(1.0, 0.25)),
+        })
+    return roster
+
+
+def _player_stats(categories: Dict[str, float], components: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    stats = {category: 0 for category in ALL_CATEGORIES}
+    stats.update(categories)
+    stats.update(components or {field: None for field in COMPONENT_FIELDS})
+    return stats
+
+
+def _goalie_rates(saves: float, shots_against: float, goals_against: float, minutes: float) -> Dict[str, float]:
+    return {
+        'save_pct': round(saves / shots_against, 3) if shots_against else 0.0,
+        'gaa': round(goals_against * 60 / minutes, 2) if minutes else 0.0,
+    }
+
+
+def _unrostered_line(rng: random.Random, player: dict, num_skaters: int) -> Dict[str, float]:
+    """A line that doesn't count toward any team total (bench or free agent)."""
+    if player['position'] == 'G':
+        shots_against = max(0, int(round(rng.gauss(55, 15) * player['talent'])))
+        saves = int(round(shots_against * min(0.95, max(0.85, rng.gauss(0.9, 0.015)))))
+        minutes = round(shots_against * 2.0, 2)
+        components = {'saves': float(saves), 'shots_against': float(shots_against),
+                      'goals_against': float(shots_against - saves), 'minutes': minutes}
+        categories = {'goalie_wins': rng.randint(0, 1) if shots_against else 0}
+        categories.update(_goalie_rates(saves, shots_against, shots_against - saves, minutes))
+        return _player_stats(categories, components)
+
+    categories = {}
+    for category, (mean, std) in SKATER_PROFILE.items():
+        scale = player['talent'] * POSITION_WEIGHTS.get(player['position'], {}).get(category, 1.0)
+        value = rng.gauss(mean * scale / num_skaters, std / num_skaters ** 0.5)
+        categories[category] = int(round(value if category == 'plus_minus' else max(0.0, value)))
+    categories['points'] = categories['goals'] + categories['assists']
+    categories['ppp'] = min(categories['points'], int(round(rng.random() * categories['points'] * 0.4)))
+    return _player_stats(categories)
+
+
+def generate_player_weeks(data: SeasonData, seed: int = 0) -> List[PlayerWeek]:
+    """
+    Player weekly stats consistent with `data`: each team-week's starters sum
+    exactly to the team's category totals (and goalie components). Bench
+    players get their own, non-counting lines. The same seed and data always
+    produce the same players.
+    """
+    rng = random.Random(seed)
+    rosters = {}
+    players = []
+
+    for matchup in sorted(data.matchups, key=lambda m: m.week):
+        for team in (matchup.team1, matchup.team2):
+            roster = rosters.setdefault(team.team_id, _roster(rng, team.team_id))
+            skaters = [p for p in roster if p['slot'] not in BENCH_POSITIONS and p['position'] != 'G']
+            goalies = [p for p in roster if p['slot'] == 'G']
+            lines = {}
+
+            # Starting skaters split the team's skater totals
+            split = {}
+            for category in SKATER_PROFILE:
+                weights = [
+                    p['talent'] * POSITION_WEIGHTS.get(p['position'], {}).get(category, 1.0)
+                    * max(0.05, rng.gauss(1.0, 0.3))
+                    for p in skaters
+                ]
+                split[category] = _split(rng, getattr(team, category), weights)
+            points = [g + a for g, a in zip(split['goals'], split['assists'])]
+            # Power-play points are a subset of each player's points
+            owners = [i for i, n in enumerate(points) for _ in range(n)]
+            ppp = [0] * len(skaters)
+            for unit in rng.sample(range(len(owners)), min(team.ppp, len(owners))):
+                ppp[owners[unit]] += 1
+            for i, p in enumerate(skaters):
+                categories = {category: split[category][i] for category in SKATER_PROFILE}
+                categories.update(points=points[i], ppp=ppp[i])
+                lines[p['player_id']] = _player_stats(categories)
+
+            # Starting goalies split wins and components
+            share = rng.uniform(0.5, 0.85)
+            weights = [share, 1 - share]
+            minutes_total = team.minutes or 0.0
+            saves = _split(rng, int(team.saves or 0), weights)
+            goals_against = _split(rng, int(team.goals_against or 0), weights)
+            wins = _split(rng, team.goalie_wins, weights)
+            minutes = [round(minutes_total * weights[0], 2)]
+            minutes.append(round(minutes_total - minutes[0], 2))
+            for i, p in enumerate(goalies):
+                shots_against = saves[i] + goals_against[i]
+                components = {'saves': float(saves[i]), 'shots_against': float(shots_against),
+                              'goals_against': float(goals_against[i]), 'minutes': minutes[i]}
+                categories = {'goalie_wins': wins[i]}
+                categories.update(_goalie_rates(saves[i], shots_against, goals_against[i], minutes[i]))
+                lines[p['player_id']] = _player_stats(categories, components)
+
+            # Bench lines don't count towards the team totals
+            for p in roster:
+                if p['slot'] in BENCH_POSITIONS:
+                    lines[p['player_id']] = _unrostered_line(rng, p, len(skaters))
+
+            for p in roster:
+                players.append(PlayerWeek(
+                    player_id=p['player_id'],
+                    team_id=team.team_id,
+                    week=matchup.week,
+                    name=f"Player {p['player_id']}",
+                    nhl_team=NHL_TEAMS[p['player_id'] % len(NHL_TEAMS)],
+                    display_position=",".join(p['eligible']),
+                    eligible_positions=list(p['eligible']),
+                    selected_position=p['slot'],
+                    stats=lines[p['player_id']]
+                ))
+
+    return players
+
+
+def generate_free_agents(data: SeasonData, count: int = 1000, seed: int = 0) -> List[PlayerWeek]:
+    """
+    A pool of `count` unrostered players with a line for every week of
+    `data` (team_id FREE_AGENT_TEAM_ID). Talent is spread wider than on
+    rosters, so a few free agents out-produce the typical starter.
+    """
+    rng = random.Random(seed)
+    num_skaters = sum(n for pos, n in ROSTER_SLOTS.items() if pos != 'G')
+    pool = []
+    for i in range(count):
+        position = rng.choice(FREE_AGENT_POSITIONS)
+        eligible = [position]
+        if position in ('C', 'LW', 'RW') and rng.random() < 0.3:
+            eligible.append(rng.choice([p for p in ('C', 'LW', 'RW') if p != position]))
+        pool.append({
+            'player_id': FREE_AGENT_FIRST_ID + i,
+            'position': position,
+            'eligible': eligible,
+            'talent': max(0.1, rng.gauss(0.7, 0.3)),
+        })
+
+    players = []
+    for week in sorted({m.week for m in data.matchups}):
+        for p in pool:
+            players.append(PlayerWeek(
+                player_id=p['player_id'],
+                team_id=FREE_AGENT_TEAM_ID,
+                week=week,
+                name=f"Free Agent {p['player_id'] - FREE_AGENT_FIRST_ID + 1}",
+                nhl_team=NHL_TEAMS[p['player_id'] % len(NHL_TEAMS)],
+                display_position=",".join(p['eligible']),
+                eligible_positions=list(p['eligible']),
+                selected_position=FREE_AGENT_POSITION,
+                stats=_unrostered_line(rng, p, num_skaters)
+            ))
+    return players
+
+
+def generate_leagues(num_leagues: int = 1, num_seasons: int = 1, num_teams: int = 10,
+                     num_weeks: int = 20, seed: int = 0,
+                     first_season: int = 2025) -> List[SeasonData]:
+    """
+    Generate N teams x W weeks x S seasons x L leagues of synthetic data.
+
+    Returns one SeasonData per league-season, ordered by league then season.
+    Team strengths carry over between seasons of the same league with some drift.
+    """
+    rng = random.Random(seed)
+    results = []
+
+    for league_index in range(num_leagues):
+        league_id = 10000 + league_index
+        league_rng = random.Random(rng.random())
+        strengths = _team_strengths(league_rng, list(range(1, num_teams + 1)))
+
+        for season_index in range(num_seasons):
+            year = first_season + season_index
+            if season_index > 0:
+                _drift_strengths(league_rng, strengths)
+
+            results.append(generate_season_data(
+                num_teams=num_teams,
+                num_weeks=num_weeks,
+                seed=league_rng.randrange(2**31),
+                league_id=league_id,
+                season=f"{year}-{year + 1}",
+                strengths=strengths
+            ))
+
+    return results
+
+
+def write_v1_database(seasons: List[SeasonData], db_path: str) -> int:
+    """
+    Write seasons into a legacy v1 (team-name keyed) database for migration tests.
+
+    v1 allows one row per week number, so each season's weeks are offset to
+    follow the previous one. Returns the number of category_outcomes rows.
+    """
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    for statement in V1_SCHEMA:
+        cursor.execute(statement)
+
+    week_offset = 0
+    outcome_rows = 0
+    for season_data in seasons:
+        last_week = 0
+        for week in sorted({m.week for m in season_data.matchups}):
+            matchups = [m for m in season_data.matchups if m.week == week]
+            week_num = week + week_offset
+            last_week = max(last_week, week)
+
+            cursor.execute(
+                "INSERT INTO weekly_snapshots (week_number, is_complete) VALUES (?, ?)",
+                (week_num, all(m.is_complete for m in matchups))
+            )
+            snapshot_id = cursor.lastrowid
+
+            for m in matchups:
+                winners = list(m.category_winners.values())
+                cursor.execute("""
+                    INSERT INTO matchup_results
+                    (snapshot_id, week_number, team1_name, team2_name, team1_manager, team2_manager,
+                     team1_category_wins, team2_category_wins, ties, is_complete)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (snapshot_id, week_num, m.team1.team_name, m.team2.team_name,
+                      m.team1.manager_name, m.team2.manager_name,
+                      winners.count(m.team1.team_name), winners.count(m.team2.team_name),
+                      winners.count("Tie"), m.is_complete))
+                matchup_id = cursor.lastrowid
+
+                rows = []
+                for category in ALL_CATEGORIES:
+                    v1 = getattr(m.team1, category)
+                    v2 = getattr(m.team2, category)
+                    winner = m.category_winners.get(category, "Tie")
+                    if winner == m.team1.team_name:
+                        winning, losing = v1, v2
+                    elif winner == m.team2.team_name:
+                        winning, losing = v2, v1
+                    else:
+                        winning = losing = None
+                    rows.append((matchup_id, week_num, category, v1, v2, winner,
+                                 winning, losing, m.is_complete))
+
+                cursor.executemany("""
+                    INSERT INTO category_outcomes
+                    (matchup_id, week_number, category, team1_value, team2_value, winner,
+                     winning_value, losing_value, is_complete)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                outcome_rows += len(rows)
+
+        week_offset += last_week
+
+    conn.commit()
+    conn.close()
+    return outcome_rows
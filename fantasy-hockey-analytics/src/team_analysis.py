@@ -1,7 +1,7 @@
 """Team-specific performance analysis engine."""
 
 import statistics
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional
 from .database import (
     get_team_by_id, 
@@ -9,7 +9,15 @@ from .database import (
     team_exists
 )
 from .analytics import calculate_all_thresholds, CategoryThresholds
-from .constants import ALL_CATEGORIES, LOWER_IS_BETTER
+from .rolling import calculate_rolling_thresholds, describe_threshold_mode
+from .snapshot import StatCube, load_snapshot
+from .schedule import get_team_sos
+from .impact import calculate_category_impacts, get_impact_priorities, CategoryImpact
+from .components import ComponentSeries, get_team_component_series
+from .constants import ALL_CATEGORIES, LOWER_IS_BETTER, RATIO_COMPONENTS
+
+# How improvement priorities can be ranked
+PRIORITY_MODES = ('gap', 'impact')
 
 
 @dataclass
@@ -38,6 +46,18 @@ class CategoryAssessment:
     # Qualitative
     assessment: str  # 'dominant', 'strong', 'competitive', 'weak', 'critical', 'no_data'
     trend: str  # 'improving', 'stable', 'declining', 'insufficient_data'
+    
+    # Strength of schedule (full season, None without data)
+    adjusted_average: Optional[float] = None  # Expected value vs an average opponent
+    schedule_effect: Optional[float] = None  # How much opponents moved the raw average
+    
+    # Opponent's value in each week of weekly_values (for what-if scenarios)
+    opponent_values: List[float] = field(default_factory=list)
+    
+    # SV%/GAA only: average (and trend) from summed components, not weekly ratios
+    from_components: bool = False
+    # ... and the first and last three weeks' component ratios the trend compared
+    trend_averages: Optional[Tuple[float, float]] = None
 
 
 @dataclass 
@@ -47,8 +67,13 @@ class TeamAnalysisResult:
     team_name: str
     weeks_analyzed: int
     assessments: Dict[str, CategoryAssessment]
-    improvement_priorities: List[Tuple[str, float]]  # (category, gap) sorted by priority
+    improvement_priorities: List[Tuple[str, float]]  # (category, gap or impact) sorted by priority
     strengths: List[Tuple[str, str]]  # (category, assessment) for strong/dominant
+    threshold_mode: str = 'full season'  # e.g. 'last 4 complete weeks'
+    priority_mode: str = 'gap'  # 'gap' or 'impact'
+    impacts: Optional[Dict[str, CategoryImpact]] = None  # Set when priority_mode == 'impact'
+    thresholds: Optional[Dict[str, CategoryThresholds]] = None  # Thresholds the assessments used
+    scenario: Optional[Dict[str, float]] = None  # Stat deltas applied (what-if results only)
 
 
 def has_goalie_data(weekly_values: List[float], category: str) -> bool:
@@ -68,7 +93,11 @@ def calculate_trend(weekly_values: List[float], direction: str) -> str:
     
     early_avg = statistics.mean(weekly_values[:3])
     recent_avg = statistics.mean(weekly_values[-3:])
-    
+    return trend_from_averages(early_avg, recent_avg, direction)
+
+
+def trend_from_averages(early_avg: float, recent_avg: float, direction: str) -> str:
+    """Classify the change from the first three weeks' average to the last three's."""
     # Avoid division by zero
     if early_avg == 0:
         if recent_avg == 0:
@@ -135,11 +164,21 @@ def calculate_gap(team_avg: float, threshold_median: float, direction: str) -> f
 
 def analyze_category(team_id: int, category: str,
                      threshold: CategoryThresholds,
-                     db_path: str = "fantasy_hockey.db") -> CategoryAssessment:
-    """Analyze single category for a team."""
+                     db_path: str = "fantasy_hockey.db",
+                     cube: Optional[StatCube] = None,
+                     components: Optional[ComponentSeries] = None) -> CategoryAssessment:
+    """
+    Analyze single category for a team (from the stat cube snapshot if given).
+    
+    SV% and GAA use exact ratios of the summed components when `components`
+    covers exactly the analyzed weeks, and the mean of weekly ratios otherwise.
+    """
     
     # Get team's weekly values for this category
-    values_data = get_team_category_values(team_id, category, complete_only=True, db_path=db_path)
+    if cube is not None:
+        values_data = cube.team_category_values(team_id, category, complete_only=True)
+    else:
+        values_data = get_team_category_values(team_id, category, complete_only=True, db_path=db_path)
     
     if not values_data:
         # No data for this category
@@ -187,8 +226,23 @@ def analyze_category(team_id: int, category: str,
             trend='insufficient_data'
         )
     
-    # Calculate team average
+    # Calculate team average (and trend)
     team_average = statistics.mean(weekly_values)
+    trend = calculate_trend(weekly_values, threshold.direction)
+    
+    from_components = (
+        category in RATIO_COMPONENTS and components is not None
+        and components.weeks == [v['week'] for v in values_data]
+    )
+    trend_averages = None
+    if from_components:
+        team_average = components.ratio(category)
+        if len(weekly_values) >= 4:
+            early_avg = components.ratio(category, 0, 3)
+            recent_avg = components.ratio(category, len(weekly_values) - 3)
+            if early_avg is not None and recent_avg is not None:
+                trend = trend_from_averages(early_avg, recent_avg, threshold.direction)
+                trend_averages = (early_avg, recent_avg)
     
     # Calculate win rate
     total_decisions = wins + losses
@@ -200,9 +254,6 @@ def analyze_category(team_id: int, category: str,
     # Determine assessment
     assessment = calculate_assessment(team_average, threshold, threshold.direction)
     
-    # Calculate trend
-    trend = calculate_trend(weekly_values, threshold.direction)
-    
     return CategoryAssessment(
         category=category,
         direction=threshold.direction,
@@ -218,7 +269,10 @@ def analyze_category(team_id: int, category: str,
         losses=losses,
         ties=ties,
         assessment=assessment,
-        trend=trend
+        trend=trend,
+        opponent_values=[v['opponent_value'] for v in values_data],
+        from_components=from_components,
+        trend_averages=trend_averages
     )
 
 
@@ -261,36 +315,61 @@ def identify_strengths(assessments: Dict[str, CategoryAssessment]) -> List[Tuple
     return strengths
 
 
-def analyze_team(team_id: int, db_path: str = "fantasy_hockey.db") -> TeamAnalysisResult:
+def analyze_team(team_id: int, db_path: str = "fantasy_hockey.db",
+                 window: Optional[int] = None, decay: Optional[float] = None,
+                 rank_by: str = 'gap',
+                 thresholds: Optional[Dict[str, CategoryThresholds]] = None) -> TeamAnalysisResult:
     """
     Full team analysis.
     
     1. Verify team exists
-    2. Get thresholds via calculate_all_thresholds()
-    3. For each category, call analyze_category()
-    4. Compute improvement_priorities (sorted by negative gap)
+    2. Get thresholds via calculate_all_thresholds() (or rolling/decayed
+       thresholds when window or decay is given)
+    3. For each category, call analyze_category() (exact SV%/GAA from
+       stored goalie components when available)
+    4. Compute improvement_priorities (sorted by negative gap, or with
+       rank_by='impact' by expected category wins gained per std)
     5. Identify strengths (dominant/strong categories)
+    6. Attach strength-of-schedule adjusted averages
+    
+    Pass `thresholds` to reuse full-season thresholds already calculated
+    for the league (ignored with window or decay).
     """
     
+    if rank_by not in PRIORITY_MODES:
+        raise ValueError(f"rank_by must be one of {PRIORITY_MODES}, got '{rank_by}'")
+    
     # Verify team exists
     team = get_team_by_id(team_id, db_path)
     if not team:
         raise ValueError(f"Team ID {team_id} not found in database")
     
     # Get league-wide thresholds
-    thresholds = calculate_all_thresholds(db_path)
+    if window is not None or decay is not None:
+        thresholds = calculate_rolling_thresholds(window, decay, db_path)
+    elif thresholds is None:
+        thresholds = calculate_all_thresholds(db_path)
     
     # Check if we have any threshold data
     if not thresholds or all(t.sample_size == 0 for t in thresholds.values()):
         raise ValueError("No threshold data available. Need at least one completed week.")
     
     # Analyze each category
+    cube = load_snapshot(db_path)
+    components = get_team_component_series(team_id, db_path)
     assessments = {}
     for category in ALL_CATEGORIES:
         threshold = thresholds[category]
-        assessment = analyze_category(team_id, category, threshold, db_path)
+        assessment = analyze_category(team_id, category, threshold, db_path, cube, components)
         assessments[category] = assessment
     
+    # Opponent-adjusted averages
+    sos = get_team_sos(team_id, db_path) or {}
+    for category, rating in sos.items():
+        if assessments[category].assessment != 'no_data':
+            assessments[category].adjusted_average = rating.adjusted_average
+            assessments[category].schedule_effect = rating.schedule_effect
+    
     # Calculate weeks analyzed (use max weeks from any category)
     weeks_analyzed = max(
         (a.weeks_played for a in assessments.values() if a.weeks_played > 0),
@@ -298,7 +377,16 @@ def analyze_team(team_id: int, db_path: str = "fantasy_hockey.db") -> TeamAnalys
     )
     
     # Get improvement priorities
-    improvement_priorities = get_improvement_priorities(assessments)
+    impacts = None
+    if rank_by == 'impact':
+        team_impacts = calculate_category_impacts(db_path, cube).get(team_id, {})
+        impacts = {
+            category: impact for category, impact in team_impacts.items()
+            if assessments[category].assessment != 'no_data'
+        }
+        improvement_priorities = get_impact_priorities(impacts)
+    else:
+        improvement_priorities = get_improvement_priorities(assessments)
     
     # Identify strengths
     strengths = identify_strengths(assessments)
@@ -309,5 +397,9 @@ def analyze_team(team_id: int, db_path: str = "fantasy_hockey.db") -> TeamAnalys
         weeks_analyzed=weeks_analyzed,
         assessments=assessments,
         improvement_priorities=improvement_priorities,
-        strengths=strengths
+        strengths=strengths,
+        threshold_mode=describe_threshold_mode(window, decay),
+        priority_mode=rank_by,
+        impacts=impacts,
+        thresholds=thresholds
     )
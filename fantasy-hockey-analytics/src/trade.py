@@ -0,0 +1,323 @@
+"""
+Trade evaluation: each side's change in expected category wins and
+playoff odds.
+
+The rest of the season is simulated from the category covariance model.
+Each remaining week, every team draws a correlated weekly line
+
+    x = mean + z @ L^T
+
+where L is the team's Cholesky factor. A roster change moves only the
+mean: it adds the projected lines (recommend.load_player_pool) of the
+players received and subtracts those of the players sent. SV%/GAA move
+through the team's mean weekly goalie components. The traded players are
+assumed to play as much for their new team as they did for the old one.
+
+Pairings are random each simulated week but fixed by the seed, and each
+team draws its z from its own seeded stream. The same team therefore sees
+the same luck in every evaluation (common random numbers), so a difference
+between two trades comes from the rosters and not from noise. A team's
+matchup points are added to its current record (stored complete matchups),
+and the top playoff_teams by points make the playoffs, with total category
+wins as the tiebreak.
+
+Per-team samples are cached by (team, roster fingerprint, data version),
+and so are the baseline league outcomes. Evaluating a trade samples only
+the two changed rosters (none if their fingerprints were seen before) and
+recomputes only the matchups they play in. Every other matchup is reused.
+New data changes the data version, which invalidates everything.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .database import (RATE_CATEGORIES, get_data_version, get_player_weeks, get_team_records,
+                       get_all_teams)
+from .components import load_component_series
+from .covariance import get_covariance_model
+from .recommend import load_player_pool
+from .snapshot import StatCube, load_snapshot, PRESENT, COMPLETE
+from .constants import ALL_CATEGORIES, COMPONENT_FIELDS, LOWER_IS_BETTER, RATIO_COMPONENTS
+
+DEFAULT_SIMULATIONS = 1000
+DEFAULT_SEASON_WEEKS = 20   # Regular-season weeks
+DEFAULT_PLAYOFF_TEAMS = 4
+DEFAULT_SEED = 0
+
+
+@dataclass
+class TeamOutlook:
+    """A team's simulated rest of season."""
+    expected_wins: float            # Category wins per remaining matchup
+    category_win: Dict[str, float]  # ... by category (ties count half)
+    expected_points: float          # Season matchup points (win 1, tie 0.5)
+    playoff_odds: float
+
+
+@dataclass
+class TradeSide:
+    """One team's half of a trade."""
+    team_id: int
+    team_name: str
+    sends: List[int]
+    receives: List[int]
+    before: TeamOutlook
+    after: TeamOutlook
+
+
+@dataclass
+class TradeResult:
+    """Both sides of one candidate trade."""
+    sides: List[TradeSide]
+    names: Dict[int, str]            # player_id -> name
+    remaining_weeks: int
+    simulations: int
+    sampled: int = 0                 # Team samples drawn for this trade (cache misses)
+
+
+def roster_fingerprint(player_ids: Iterable[int]) -> str:
+    """Order-independent hash of a roster's player ids."""
+    ids = ",".join(str(p) for p in sorted(set(int(p) for p in player_ids)))
+    return hashlib.sha1(ids.encode()).hexdigest()[:16]
+
+
+class TradeSimulator:
+    """Season simulations with per-team samples cached by roster fingerprint."""
+
+    def __init__(self, db_path: str = "fantasy_hockey.db", simulations: int = DEFAULT_SIMULATIONS,
+                 season_weeks: int = DEFAULT_SEASON_WEEKS, playoff_teams: int = DEFAULT_PLAYOFF_TEAMS,
+                 seed: int = DEFAULT_SEED):
+        if simulations <= 0:
+            raise ValueError(f"simulations must be positive, got {simulations}")
+        self.db_path = db_path
+        self.simulations = simulations
+        self.season_weeks = season_weeks
+        self.playoff_teams = playoff_teams
+        self.seed = seed
+        self.sampled = 0  # Team samples drawn (cache misses)
+        self._samples: Dict[Tuple[int, str, int], np.ndarray] = {}
+        self.data_version = None
+        self._refresh()
+
+    def _refresh(self):
+        """(Re)load league data when the data version changed."""
+        version = get_data_version(self.db_path)
+        if version == self.data_version:
+            return
+        self.data_version = version
+        self._samples = {key: value for key, value in self._samples.items() if key[2] == version}
+        self._baseline = None
+
+        cube = load_snapshot(self.db_path) or StatCube.from_database(self.db_path)
+        self.model = get_covariance_model(self.db_path)
+        self.team_ids = [int(t) for t in cube.team_ids]
+        self.team_index = {team_id: t for t, team_id in enumerate(self.team_ids)}
+        self.team_names = {team['team_id']: team['current_name'] for team in get_all_teams(self.db_path)}
+
+        # Latest stored rosters (every slot: injured players can be traded too)
+        self.rosters: Dict[int, List[int]] = {team_id: [] for team_id in self.team_ids}
+        self.player_names: Dict[int, str] = {}
+        if len(cube.weeks):
+            for row in get_player_weeks(week=int(cube.weeks[-1]), complete_only=False, db_path=self.db_path):
+                if row['team_id'] in self.rosters:
+                    self.rosters[row['team_id']].append(row['player_id'])
+                    self.player_names[row['player_id']] = row['name']
+
+        pool = load_player_pool(self.db_path, player_ids=[p for ids in self.rosters.values() for p in ids])
+        self.projections = {int(p): (pool.values[i], pool.components[i]) for i, p in enumerate(pool.player_ids)}
+        self.team_weeks = {
+            team_id: {name: total / len(series.weeks) for name, total in series.totals().items()}
+            for team_id, series in load_component_series(self.db_path).items()
+        }
+
+        records = get_team_records(self.db_path)
+        self.points = np.array([records.get(t, {}).get('wins', 0) + 0.5 * records.get(t, {}).get('ties', 0)
+                                for t in self.team_ids], dtype=float)
+        self.category_wins = np.array([records.get(t, {}).get('category_wins', 0) for t in self.team_ids],
+                                      dtype=float)
+
+        complete = ((cube.flags & (PRESENT | COMPLETE)) == (PRESENT | COMPLETE)).any(axis=0)
+        self.remaining_weeks = max(self.season_weeks - int(complete.sum()), 0)
+        # At least one week, so per-matchup expectations exist after the season too
+        self.weeks = max(self.remaining_weeks, 1)
+        self.opponents = _random_pairings(len(self.team_ids), self.simulations, self.weeks,
+                                          np.random.default_rng(self.seed))
+        self.byes = self.opponents == np.arange(len(self.team_ids))
+        # Fixed tiebreak noise for exactly equal standings
+        self.jitter = np.random.default_rng([self.seed, 1]).random((len(self.team_ids), self.simulations)) * 1e-3
+
+    def team_samples(self, team_id: int, roster: List[int]) -> np.ndarray:
+        """Weekly lines [simulations, weeks, C] for a team with `roster` (cached)."""
+        key = (team_id, roster_fingerprint(roster), self.data_version)
+        samples = self._samples.get(key)
+        if samples is None:
+            if team_id in self.model.team_index:
+                i = self.model.team_index[team_id]
+                mean, chol = self.model.team_means[i], self.model.team_chols[i]
+            else:
+                mean, chol = self.model.league_mean, self.model.league_chol
+            mean = mean + self._roster_shift(team_id, roster)
+            z = np.random.default_rng([self.seed, 0, team_id]).standard_normal(
+                (self.simulations, self.weeks, len(ALL_CATEGORIES)))
+            samples = (mean + z @ chol.T).astype(np.float32)
+            self._samples[key] = samples
+            self.sampled += 1
+        return samples
+
+    def _roster_shift(self, team_id: int, roster: List[int]) -> np.ndarray:
+        """Change in the team's mean weekly line from its stored roster to `roster`."""
+        stored = set(self.rosters.get(team_id, []))
+        received = [p for p in roster if p not in stored]
+        sent = [p for p in stored if p not in set(roster)]
+        values = np.zeros(len(ALL_CATEGORIES))
+        components = np.zeros(len(COMPONENT_FIELDS))
+        for players, sign in ((received, 1.0), (sent, -1.0)):
+            for player_id in players:
+                if player_id in self.projections:
+                    values += sign * self.projections[player_id][0]
+                    components += sign * self.projections[player_id][1]
+
+        shift = values.copy()
+        team_week = self.team_weeks.get(team_id)
+        for category in RATE_CATEGORIES:
+            c = ALL_CATEGORIES.index(category)
+            shift[c] = 0.0
+            if team_week is None:
+                continue
+            numerator, denominator, scale = RATIO_COMPONENTS[category]
+            base_num, base_den = team_week[numerator], team_week[denominator]
+            new_num = base_num + components[COMPONENT_FIELDS.index(numerator)]
+            new_den = base_den + components[COMPONENT_FIELDS.index(denominator)]
+            if base_den > 0 and new_den > 0:
+                shift[c] = scale * (new_num / new_den - base_num / base_den)
+        return shift
+
+    def _scores(self, samples: np.ndarray, rows: List[int]) -> np.ndarray:
+        """Category results [len(rows), S, W, C] (1 win, 0.5 tie, 0 loss) for `rows`' matchups."""
+        sims = np.arange(self.simulations)[:, None]
+        weeks = np.arange(self.weeks)[None, :]
+        lower = np.array([c in LOWER_IS_BETTER for c in ALL_CATEGORIES])
+        scores = []
+        for t in rows:
+            own = samples[t]
+            opponent = samples[self.opponents[:, :, t], sims, weeks]
+            better = np.where(lower, own < opponent, own > opponent)
+            scores.append(better + 0.5 * (own == opponent))
+        return np.array(scores, dtype=np.float32).reshape(len(rows), self.simulations, self.weeks, -1)
+
+    def _league(self, rosters: Dict[int, List[int]]) -> np.ndarray:
+        """Samples [T, S, W, C] for the whole league."""
+        return np.stack([self.team_samples(team_id, rosters[team_id]) for team_id in self.team_ids])
+
+    def _baseline_scores(self) -> np.ndarray:
+        if self._baseline is None:
+            samples = self._league(self.rosters)
+            self._baseline = self._scores(samples, list(range(len(self.team_ids))))
+        return self._baseline
+
+    def _outlooks(self, scores: np.ndarray, rows: List[int]) -> Dict[int, TeamOutlook]:
+        """Outlooks for `rows` from the whole league's category results."""
+        categories = len(ALL_CATEGORIES)
+        wins = scores.sum(axis=3)
+        points = np.where(wins > categories / 2, 1.0, np.where(wins == categories / 2, 0.5, 0.0))
+        points[self.byes.transpose(2, 0, 1)] = 0.0
+        counted = slice(0, self.remaining_weeks)
+        season_points = self.points[:, None] + points[:, :, counted].sum(axis=2)
+        season_wins = self.category_wins[:, None] + np.where(
+            self.byes.transpose(2, 0, 1), 0.0, wins)[:, :, counted].sum(axis=2)
+
+        # Points, then category wins (both at most a few hundred), then jitter
+        key = season_points * 1e4 + season_wins + self.jitter
+        rank = (-key).argsort(axis=0).argsort(axis=0)
+        playoffs = rank < self.playoff_teams
+
+        outlooks = {}
+        for t in rows:
+            played = ~self.byes[:, :, t]
+            matchups = max(int(played.sum()), 1)
+            per_category = (scores[t] * played[:, :, None]).sum(axis=(0, 1)) / matchups
+            outlooks[self.team_ids[t]] = TeamOutlook(
+                expected_wins=float(per_category.sum()),
+                category_win=dict(zip(ALL_CATEGORIES, per_category.tolist())),
+                expected_points=float(season_points[t].mean()),
+                playoff_odds=float(playoffs[t].mean())
+            )
+        return outlooks
+
+    def outlooks(self, rosters: Optional[Dict[int, List[int]]] = None) -> Dict[int, TeamOutlook]:
+        """Every team's outlook with `rosters` (default: as stored), scoring the whole league."""
+        self._refresh()
+        rosters = {**self.rosters, **(rosters or {})}
+        rows = list(range(len(self.team_ids)))
+        return self._outlooks(self._scores(self._league(rosters), rows), rows)
+
+    def evaluate_trade(self, team1_id: int, sends1: List[int],
+                       team2_id: int, sends2: List[int]) -> TradeResult:
+        """
+        team1 sends `sends1` to team2 and receives `sends2`.
+
+        Raises ValueError for unknown teams, players not on the sending
+        team's latest stored roster or an empty trade.
+        """
+        self._refresh()
+        for team_id in (team1_id, team2_id):
+            if team_id not in self.team_index:
+                raise ValueError(f"Team ID {team_id} not found in database")
+        if team1_id == team2_id:
+            raise ValueError("A trade needs two different teams")
+        if not sends1 and not sends2:
+            raise ValueError("A trade needs at least one player")
+        for team_id, sends in ((team1_id, sends1), (team2_id, sends2)):
+            missing = [p for p in sends if p not in self.rosters[team_id]]
+            if missing:
+                raise ValueError(f"Players {missing} are not on team {team_id}'s latest stored roster")
+
+        sampled = self.sampled
+        baseline = self._baseline_scores()
+
+        rosters = dict(self.rosters)
+        rosters[team1_id] = [p for p in self.rosters[team1_id] if p not in sends1] + list(sends2)
+        rosters[team2_id] = [p for p in self.rosters[team2_id] if p not in sends2] + list(sends1)
+        samples = self._league(rosters)
+
+        # Re-score only the changed teams' matchups; each opponent's result is the complement
+        changed = [self.team_index[team1_id], self.team_index[team2_id]]
+        scores = baseline.copy()
+        for t, team_scores in zip(changed, self._scores(samples, changed)):
+            scores[t] = team_scores
+            sims, weeks = np.nonzero(~self.byes[:, :, t])
+            scores[self.opponents[sims, weeks, t], sims, weeks] = 1.0 - team_scores[sims, weeks]
+
+        before = self._outlooks(baseline, changed)
+        after = self._outlooks(scores, changed)
+        sides = [
+            TradeSide(team_id=team_id, team_name=self.team_names.get(team_id, f"Team {team_id}"),
+                      sends=list(sends), receives=list(receives),
+                      before=before[team_id], after=after[team_id])
+            for team_id, sends, receives in ((team1_id, sends1, sends2), (team2_id, sends2, sends1))
+        ]
+        return TradeResult(sides=sides, names=self.player_names, remaining_weeks=self.remaining_weeks,
+                           simulations=self.simulations, sampled=self.sampled - sampled)
+
+
+def _random_pairings(num_teams: int, simulations: int, weeks: int,
+                     rng: np.random.Generator) -> np.ndarray:
+    """Opponent row [simulations, weeks, teams] of random weekly pairings (a bye is the team itself)."""
+    order = rng.permuted(np.tile(np.arange(num_teams), (simulations * weeks, 1)), axis=1)
+    opponents = np.tile(np.arange(num_teams), (simulations * weeks, 1))
+    pairs = num_teams // 2 * 2
+    first, second = order[:, 0:pairs:2], order[:, 1:pairs:2]
+    np.put_along_axis(opponents, first, second, axis=1)
+    np.put_along_axis(opponents, second, first, axis=1)
+    return opponents.reshape(simulations, weeks, num_teams)
+
+
+def evaluate_trade(team1_id: int, sends1: List[int], team2_id: int, sends2: List[int],
+                   db_path: str = "fantasy_hockey.db",
+                   simulator: Optional[TradeSimulator] = None) -> TradeResult:
+    """One trade; pass `simulator` to reuse its cache across a batch of candidates."""
+    simulator = simulator or TradeSimulator(db_path)
+    return simulator.evaluate_trade(team1_id, sends1, team2_id, sends2)
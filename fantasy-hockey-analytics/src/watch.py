@@ -0,0 +1,94 @@
+"""
+Live watch mode for the in-progress week.
+
+MatchupWatcher polls one week through a single DataFetcher (one
+authenticated yfpy query object) and keeps one SQLite connection open.
+Each poll fingerprints every matchup's raw status and stat values; only
+matchups whose fingerprint changed are parsed and their rows rewritten
+(replace_matchups), in one transaction. When every matchup of the week is
+complete the week is saved once through save_season_data, so it joins the
+analytics (and quantile sketches) exactly like a fetched week.
+
+Between polls the process just sleeps.
+"""
+
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from .data_fetcher import DataFetcher
+from .database import replace_matchups, save_season_data
+from .models import Matchup, SeasonData
+
+DEFAULT_INTERVAL = 60  # Seconds between polls
+
+
+@dataclass
+class PollResult:
+    """Outcome of one poll of the watched week."""
+    week: int
+    matchups: List[Matchup]  # Every matchup of the week, latest values, Yahoo's order
+    changed: List[Matchup] = field(default_factory=list)  # Re-parsed and re-saved this poll
+    week_complete: bool = False
+
+
+class MatchupWatcher:
+    """Poll one week's matchups and persist only what changed."""
+
+    def __init__(self, fetcher: DataFetcher, week: int, db_path: str = "fantasy_hockey.db"):
+        self.fetcher = fetcher
+        self.week = week
+        self.conn = sqlite3.connect(db_path)
+        self._fingerprints: Dict[tuple, tuple] = {}
+        self._matchups: Dict[tuple, Matchup] = {}
+
+    def poll(self) -> PollResult:
+        """Fetch the week once; reparse and save the matchups that changed."""
+        order = []
+        changed = []
+        for raw in self.fetcher.fetch_week_raw(self.week):
+            key = self.fetcher.matchup_key(raw)
+            order.append(key)
+            fingerprint = self.fetcher.matchup_fingerprint(raw)
+            if self._fingerprints.get(key) != fingerprint:
+                self._matchups[key] = self.fetcher._process_matchup(raw, self.week)
+                self._fingerprints[key] = fingerprint
+                changed.append(self._matchups[key])
+
+        matchups = [self._matchups[key] for key in order]
+        week_complete = bool(matchups) and all(m.is_complete for m in matchups)
+
+        if changed:
+            if week_complete:
+                # Whole week at once: marks it complete and folds it into the sketches
+                data = SeasonData(league_id=int(self.fetcher.league_id), season="2025-2026",
+                                  matchups=matchups)
+                save_season_data(data, conn=self.conn)
+            else:
+                replace_matchups(self.conn, changed)
+
+        return PollResult(week=self.week, matchups=matchups, changed=changed,
+                          week_complete=week_complete)
+
+    def close(self):
+        self.conn.close()
+
+
+def watch(watcher: MatchupWatcher, interval: float = DEFAULT_INTERVAL,
+          on_poll: Optional[Callable[[PollResult], None]] = None,
+          max_polls: Optional[int] = None,
+          sleep: Callable[[float], None] = time.sleep) -> PollResult:
+    """
+    Poll until the week is complete (or max_polls), sleeping `interval`
+    seconds between polls. Returns the last PollResult.
+    """
+    polls = 0
+    while True:
+        result = watcher.poll()
+        polls += 1
+        if on_poll is not None:
+            on_poll(result)
+        if result.week_complete or (max_polls is not None and polls >= max_polls):
+            return result
+        sleep(interval)
@@ -0,0 +1,244 @@
+"""
+Tests for the shared Yahoo session (token refresh, token.json persistence).
+No Yahoo API required: OAuth2 is replaced by an offline stand-in.
+"""
+
+import sys
+import os
+import json
+import time
+import threading
+
+import requests
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+import src.auth as auth
+from src.auth import YahooSession, read_token, write_token, token_lock, TOKEN_LIFETIME
+
+TEST_TOKEN = "test_token.json"
+REAL_OAUTH2 = auth.OAuth2
+
+
+class FakeOAuth2:
+    """yahoo_oauth.OAuth2 without the network: refreshes hand out numbered tokens."""
+    refresh_calls = 0
+    lock = threading.Lock()
+
+    def __init__(self, consumer_key, consumer_secret, **kwargs):
+        self.consumer_key = consumer_key
+        self.consumer_secret = consumer_secret
+        self.access_token = kwargs.get('access_token')
+        self.refresh_token = kwargs.get('refresh_token')
+        self.token_time = kwargs.get('token_time', 0.0)
+        self.token_type = kwargs.get('token_type')
+        self.guid = kwargs.get('guid')
+        if time.time() - self.token_time > 3540:
+            self.refresh_access_token()
+        self.session = requests.Session()
+        self.session.access_token = self.access_token
+
+    def refresh_access_token(self):
+        time.sleep(0.02)  # Token endpoint round trip
+        with FakeOAuth2.lock:
+            FakeOAuth2.refresh_calls += 1
+            self.access_token = f"access-{FakeOAuth2.refresh_calls}"
+        self.token_time = time.time()
+
+
+def store_token(age: float, **extra):
+    """token.json issued `age` seconds ago."""
+    write_token({'access_token': 'access-0', 'refresh_token': 'refresh', 'token_type': 'bearer',
+                 'token_time': time.time() - age, **extra}, TEST_TOKEN)
+
+
+def new_session(**options):
+    options.setdefault('background', False)
+    return YahooSession(TEST_TOKEN, client_id="id", client_secret="secret", **options)
+
+
+def expiring(*sessions):
+    """Age the stored token and the sessions' copies to 100s before expiry."""
+    token_time = time.time() - TOKEN_LIFETIME + 100
+    write_token({**read_token(TEST_TOKEN), 'token_time': token_time}, TEST_TOKEN)
+    for session in sessions:
+        session.oauth.token_time = token_time
+
+
+def setup():
+    cleanup()
+    auth.OAuth2 = FakeOAuth2
+    FakeOAuth2.refresh_calls = 0
+
+
+def test_token_file():
+    """Writes replace the whole file and leave no temp files; the lock excludes other holders."""
+    print("\n=== Test: Token File ===")
+
+    setup()
+    store_token(0, xoauth_yahoo_guid="GUID")
+    assert read_token(TEST_TOKEN)['xoauth_yahoo_guid'] == "GUID"
+    assert not [f for f in os.listdir('.') if f.startswith('.token.')]
+    with open(TEST_TOKEN, 'w') as f:
+        f.write("{not json")
+    assert read_token(TEST_TOKEN) is None
+    assert read_token("missing_token.json") is None
+
+    inside, overlaps = [0], []
+
+    def holder():
+        for _ in range(5):
+            with token_lock(TEST_TOKEN):
+                inside[0] += 1
+                overlaps.append(inside[0])
+                time.sleep(0.002)
+                inside[0] -= 1
+    threads = [threading.Thread(target=holder) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert overlaps == [1] * 20
+
+    # A lock left behind by a dead worker is taken over once stale
+    with open(TEST_TOKEN + ".lock", 'w') as f:
+        f.write("12345")
+    old = time.time() - auth.LOCK_STALE - 1
+    os.utime(TEST_TOKEN + ".lock", (old, old))
+    with token_lock(TEST_TOKEN, timeout=1):
+        pass
+    assert not os.path.exists(TEST_TOKEN + ".lock")
+    print("  ✓ Atomic writes, exclusive lock, stale lock recovery")
+
+
+def test_refresh_ahead_of_expiry():
+    """A token inside the margin is refreshed at connect; a fresh one is not."""
+    print("\n=== Test: Refresh Ahead of Expiry ===")
+
+    setup()
+    store_token(60, guid="GUID")
+    session = new_session()
+    assert session.oauth.access_token == "access-0" and session.refreshes == 0
+
+    # Still valid for yahoo_oauth, but inside our margin: refreshed and persisted
+    store_token(TOKEN_LIFETIME - 200, guid="GUID")
+    session = new_session()
+    assert session.oauth.access_token == "access-1" and session.refreshes == 1
+    stored = read_token(TEST_TOKEN)
+    assert stored['access_token'] == "access-1" and stored['guid'] == "GUID"
+    assert session.oauth.session.access_token == "access-1"
+    assert session.expires_in() > TOKEN_LIFETIME - 5
+
+    # Requests near expiry refresh inline when there is no background timer
+    expiring(session)
+    session.ensure_fresh()
+    assert session.oauth.access_token == "access-2"
+    print("  ✓ Refreshed inside the margin, other token fields kept")
+
+
+def test_parallel_workers_share_one_refresh():
+    """Workers racing on an expiring token: one refreshes, the rest adopt it from disk."""
+    print("\n=== Test: Parallel Workers ===")
+
+    setup()
+    store_token(60)
+    sessions = [new_session() for _ in range(6)]
+    expiring(*sessions)  # All loaded the same token, now close to expiry
+
+    threads = [threading.Thread(target=session.refresh) for session in sessions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert FakeOAuth2.refresh_calls == 1
+    assert {s.oauth.access_token for s in sessions} == {"access-1"}
+    assert read_token(TEST_TOKEN)['access_token'] == "access-1"
+    print("  ✓ 6 workers, 1 refresh")
+
+
+def test_queries_share_session():
+    """Every league's query uses the same token and connection pool."""
+    print("\n=== Test: Shared Session ===")
+
+    setup()
+    store_token(60)
+    session = new_session(pool_size=8)
+    first, second = session.query("16597"), session.query("20000")
+    assert session.query("16597") is first
+    assert first.oauth is second.oauth is session.oauth
+    assert first.league_id == "16597" and second.league_id == "20000"
+    assert first._yahoo_access_token_dict['access_token'] == "access-0"
+    assert first._yahoo_access_token_dict['consumer_key'] == "id"
+    assert session.oauth.session.get_adapter("https://fantasysports.yahooapis.com")._pool_maxsize == 8
+
+    # A 401 makes yfpy re-authenticate: that forces one refresh for everyone
+    first._authenticate()
+    assert FakeOAuth2.refresh_calls == 1 and second.oauth.access_token == "access-1"
+    assert first._yahoo_access_token_dict['access_token'] == "access-1"
+    session.close()
+    print("  ✓ 2 leagues, 1 session")
+
+
+def test_background_refresh():
+    """The timer refreshes before expiry without any request."""
+    print("\n=== Test: Background Refresh ===")
+
+    setup()
+    store_token(TOKEN_LIFETIME - auth.REFRESH_MARGIN - 0.2)  # Due in 0.2s
+    session = new_session(background=True)
+    assert session.oauth.access_token == "access-0"
+    deadline = time.time() + 5
+    while session.refreshes == 0 and time.time() < deadline:
+        time.sleep(0.05)
+    assert session.refreshes == 1 and read_token(TEST_TOKEN)['access_token'] == "access-1"
+    assert session.expires_in() > auth.REFRESH_MARGIN
+    session.close()
+    print("  ✓ Refreshed in the background")
+
+
+def cleanup():
+    auth.OAuth2 = REAL_OAUTH2
+    for path in (TEST_TOKEN, TEST_TOKEN + ".lock"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all session manager tests."""
+    print("=" * 70)
+    print("YAHOO SESSION TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_token_file()
+        test_refresh_ahead_of_expiry()
+        test_parallel_workers_share_one_refresh()
+        test_queries_share_session()
+        test_background_refresh()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL SESSION TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,172 @@
+"""
+Tests for process-pool batch analysis (NDJSON per league).
+No Yahoo API required.
+"""
+
+import sys
+import os
+import io
+import json
+import shutil
+import sqlite3
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import init_db, save_season_data
+from src.batch import run_batch, analyze_league, resolve_league, BatchSummary, _analyze_cached, _connection
+from src.snapshot import load_snapshot
+
+TEST_DIR = "test_batch_leagues"
+LEAGUE_IDS = ["101", "102", "103", "104"]
+
+
+def setup_leagues():
+    """Four league databases named by league ID, one with no complete weeks."""
+    cleanup()
+    os.makedirs(TEST_DIR)
+    leagues = {}
+    for i, league_id in enumerate(LEAGUE_IDS):
+        db_path = os.path.join(TEST_DIR, f"league_{league_id}.db")
+        init_db(db_path)
+        num_weeks = 1 if league_id == "104" else 6
+        data = generate_season_data(num_teams=8 + 2 * i, num_weeks=num_weeks, seed=50 + i, incomplete_weeks=1)
+        save_season_data(data, db_path)
+        leagues[league_id] = (db_path, data)
+    return leagues
+
+
+def read_lines(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_resolve_leagues():
+    """IDs map to league_<id>.db in the directory; paths pass through."""
+    print("\n=== Test: Resolve ===")
+
+    assert resolve_league("101", "leagues") == os.path.join("leagues", "league_101.db")
+    assert resolve_league("data/other.db", "leagues") == "data/other.db"
+    summary = BatchSummary(leagues=30, succeeded=30, failed=0, elapsed=15.0, workers=2)
+    assert summary.leagues_per_minute == 120.0
+    print("  ✓ IDs and paths")
+
+
+def test_pool_matches_in_process():
+    """Workers return exactly what analyze_league computes in this process."""
+    print("\n=== Test: Pool Results ===")
+
+    leagues = setup_leagues()
+    out = io.StringIO()
+    summary = run_batch(LEAGUE_IDS, out, max_workers=2, db_dir=TEST_DIR, resamples=100)
+    lines = read_lines(out.getvalue())
+    assert summary.leagues == 4 and summary.failed == 0 and summary.workers == 2
+    assert sorted(line['index'] for line in lines) == [0, 1, 2, 3]
+    assert len({line['worker'] for line in lines}) <= 2
+
+    for line in lines:
+        db_path, data = leagues[line['league']]
+        expected = json.loads(json.dumps(analyze_league(db_path, resamples=100), default=lambda v: v.tolist()))
+        for key in ('summary', 'thresholds', 'intervals', 'teams'):
+            assert line[key] == expected[key], f"{line['league']}: {key}"
+
+    by_league = {line['league']: line for line in lines}
+    assert len(by_league["103"]['teams']) == 12
+    assert by_league["103"]['intervals'] is not None
+    assert by_league["104"]['teams'] == [] and by_league["104"]['summary']['weeks_analyzed'] == 0
+    assert load_snapshot(leagues["101"][0]) is not None, "Snapshot written for the team analyses"
+    print(f"  ✓ {summary.leagues} leagues on {summary.workers} workers")
+
+
+def test_errors_and_options():
+    """A bad league is an error line; the rest still run. Options trim the work."""
+    print("\n=== Test: Errors and Options ===")
+
+    setup_leagues()
+    missing = os.path.join(TEST_DIR, "missing.db")
+    out = io.StringIO()
+    summary = run_batch(["101", missing, "999"], out, max_workers=1, db_dir=TEST_DIR,
+                        teams=False, confidence=False)
+    lines = sorted(read_lines(out.getvalue()), key=lambda line: line['index'])
+    assert summary.failed == 2 and summary.succeeded == 1
+    assert [line['ok'] for line in lines] == [True, False, False]
+    assert "Database not found" in lines[1]['error'] and lines[2]['db_path'].endswith("league_999.db")
+    assert not os.path.exists(missing), "Missing databases are never created"
+    assert lines[0]['teams'] == [] and lines[0]['intervals'] is None
+
+    assert run_batch([], io.StringIO()).leagues == 0
+    print("  ✓ 2 error lines, 1 result")
+
+
+def test_worker_cache():
+    """A worker reuses a league's result until its data version changes."""
+    print("\n=== Test: Worker Cache ===")
+
+    leagues = setup_leagues()
+    db_path, data = leagues["102"]
+    options = (True, False, 100)
+    first = _analyze_cached(db_path, options)
+    assert _analyze_cached(db_path, options) is first
+
+    out = io.StringIO()
+    run_batch(["102", "102"], out, max_workers=1, db_dir=TEST_DIR, confidence=False, resamples=100)
+    lines = read_lines(out.getvalue())
+    assert lines[0]['thresholds'] == lines[1]['thresholds']
+
+    conn = _connection(os.path.abspath(db_path))
+    save_season_data(data, db_path)
+
+    # The whole analysis runs on the worker's connection
+    opened = []
+    connect = sqlite3.connect
+    sqlite3.connect = lambda *args, **kwargs: opened.append(args) or connect(*args, **kwargs)
+    try:
+        assert _analyze_cached(db_path, (True, True, 100)) is not first
+    finally:
+        sqlite3.connect = connect
+    assert opened == [], f"{len(opened)} connections opened"
+    assert _connection(os.path.abspath(db_path)) is conn, "One connection per database"
+    print("  ✓ Reused, then recomputed after a save")
+
+
+def cleanup():
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all batch analysis tests."""
+    print("=" * 70)
+    print("BATCH ANALYSIS TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_resolve_leagues()
+        test_pool_matches_in_process()
+        test_errors_and_options()
+        test_worker_cache()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL BATCH TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
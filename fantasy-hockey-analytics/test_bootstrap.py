@@ -0,0 +1,142 @@
+"""
+Tests for bootstrap threshold confidence intervals and the analysis cache.
+No Yahoo API required.
+"""
+
+import sys
+import os
+import statistics
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import init_db, save_season_data
+from src.analytics import calculate_all_thresholds
+from src.bootstrap import bootstrap_percentiles, calculate_threshold_intervals
+from src.cache import get_cached, set_cached, clear_cache
+from src.constants import ALL_CATEGORIES
+
+TEST_DB = "test_bootstrap.db"
+
+
+def setup_test_database():
+    """10 complete weeks."""
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=10, num_weeks=10, seed=33)
+    save_season_data(data, TEST_DB)
+    return data
+
+
+def test_batched_resamples_match_loop():
+    """Each row of the batched resample matrix equals the scalar percentile rules."""
+    print("\n=== Test: Batched Percentiles ===")
+
+    values = np.random.default_rng(1).normal(100, 15, size=37).round()
+    batched = bootstrap_percentiles(values, resamples=50, rng=np.random.default_rng(7))
+
+    # Redraw the same indices one resample at a time
+    rng = np.random.default_rng(7)
+    indices = rng.integers(0, len(values), size=(50, len(values)))
+    for row, idx in zip(batched, indices):
+        sample = sorted(values[idx])
+        assert row[0] == statistics.median(sample)
+        assert row[1] == sample[int(len(sample) * 0.75)]
+        assert row[2] == sample[int(len(sample) * 0.90)]
+    print("  ✓ Matrix resampling matches per-resample calculation")
+
+
+def test_intervals_bracket_thresholds():
+    """Intervals contain the point estimates and widen with the confidence level."""
+    print("\n=== Test: Interval Coverage ===")
+
+    setup_test_database()
+    thresholds = calculate_all_thresholds(TEST_DB)
+    intervals = calculate_threshold_intervals(TEST_DB, use_cache=False)
+
+    assert set(intervals) == set(ALL_CATEGORIES)
+    for category, interval in intervals.items():
+        threshold = thresholds[category]
+        assert interval.sample_size == threshold.sample_size
+        assert interval.median_low <= threshold.median_winning <= interval.median_high
+        assert interval.p75_low <= interval.p75_high
+        assert interval.p90_low <= interval.p90_high
+
+    wide = calculate_threshold_intervals(TEST_DB, level=0.99, use_cache=False)['shots']
+    narrow = calculate_threshold_intervals(TEST_DB, level=0.50, use_cache=False)['shots']
+    assert wide.median_high - wide.median_low >= narrow.median_high - narrow.median_low
+
+    try:
+        calculate_threshold_intervals(TEST_DB, level=1.5)
+        assert False, "level outside (0, 1) should raise ValueError"
+    except ValueError:
+        pass
+    print("  ✓ Intervals bracket the median and widen with confidence level")
+
+
+def test_cache_follows_data_version():
+    """Cached intervals are reused until the data changes."""
+    print("\n=== Test: Cache Invalidation ===")
+
+    data = setup_test_database()
+    first = calculate_threshold_intervals(TEST_DB)
+    assert calculate_threshold_intervals(TEST_DB) == first
+    assert calculate_threshold_intervals(TEST_DB, use_cache=False) == first, "Seeded, so deterministic"
+
+    set_cached("example", {"value": 1}, TEST_DB)
+    assert get_cached("example", TEST_DB) == {"value": 1}
+
+    save_season_data(data, TEST_DB)  # Bumps data_version
+    assert get_cached("example", TEST_DB) is None
+
+    set_cached("example", {"value": 2}, TEST_DB)
+    clear_cache(TEST_DB)
+    assert get_cached("example", TEST_DB) is None
+    print("  ✓ Cache entries expire with the data version")
+
+
+def cleanup():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all bootstrap tests."""
+    print("=" * 70)
+    print("BOOTSTRAP INTERVAL TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_batched_resamples_match_loop()
+        test_intervals_bracket_thresholds()
+        test_cache_follows_data_version()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL BOOTSTRAP TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,192 @@
+"""
+Tests for week replacement on re-fetch and database compaction.
+No Yahoo API required.
+"""
+
+import sys
+import os
+import sqlite3
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import (
+    init_db,
+    save_season_data,
+    compact_database,
+    get_category_sketch,
+    get_data_version,
+    set_storage_layout,
+    LAYOUT_WIDE
+)
+from src.analytics import calculate_all_thresholds
+from src.bootstrap import calculate_threshold_intervals
+from src.cache import get_cached
+from src.team_analysis import analyze_team
+from src.constants import ALL_CATEGORIES
+
+TEST_DB = "test_compaction.db"
+
+
+def setup_test_database():
+    """8 complete weeks + 1 in progress."""
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=10, num_weeks=9, seed=30, incomplete_weeks=1)
+    save_season_data(data, TEST_DB)
+    return data
+
+
+def _outcome_count():
+    conn = sqlite3.connect(TEST_DB)
+    count = conn.execute("SELECT COUNT(*) FROM category_outcomes").fetchone()[0]
+    conn.close()
+    return count
+
+
+def _add_legacy_orphans(times):
+    """Re-create what old re-fetches left behind: outcome rows with no matchup."""
+    conn = sqlite3.connect(TEST_DB)
+    for _ in range(times):
+        conn.execute("""
+            INSERT INTO category_outcomes
+            (matchup_id, week_number, category, team1_id, team2_id, team1_value, team2_value,
+             winner_team_id, winning_value, losing_value, is_complete)
+            SELECT matchup_id + 100000, week_number, category, team1_id, team2_id, team1_value,
+                   team2_value, winner_team_id, winning_value, losing_value, is_complete
+            FROM category_outcomes WHERE matchup_id < 100000
+        """)
+    conn.commit()
+    conn.close()
+
+
+def test_refetch_does_not_grow():
+    """Re-saving the same weeks replaces rows instead of appending."""
+    print("\n=== Test: Re-fetch Replaces Weeks ===")
+
+    data = setup_test_database()
+    expected = 9 * 5 * len(ALL_CATEGORIES)
+    assert _outcome_count() == expected
+
+    thresholds = calculate_all_thresholds(TEST_DB)
+    analysis = analyze_team(1, TEST_DB)
+    for _ in range(3):
+        save_season_data(data, TEST_DB)
+
+    assert _outcome_count() == expected
+    assert calculate_all_thresholds(TEST_DB) == thresholds
+    assert analyze_team(1, TEST_DB).assessments == analysis.assessments
+    print(f"  ✓ {expected} rows after 4 saves")
+
+
+def test_failed_save_rolls_back():
+    """A save that fails part-way leaves the database unchanged."""
+    print("\n=== Test: Transactional Save ===")
+
+    data = setup_test_database()
+    before = _outcome_count()
+
+    # Break the last matchup so the save fails after earlier weeks were replaced
+    data.matchups[-1].team1.team_id = None
+    try:
+        save_season_data(data, TEST_DB)
+        assert False, "Saving a matchup without a team ID should fail"
+    except sqlite3.IntegrityError:
+        pass
+
+    assert _outcome_count() == before
+    print("  ✓ Failed save rolled back")
+
+
+def test_compact_removes_orphans():
+    """compact_database deletes orphaned rows and keeps thresholds intact."""
+    print("\n=== Test: Compaction ===")
+
+    setup_test_database()
+    clean = _outcome_count()
+    thresholds = calculate_all_thresholds(TEST_DB)
+
+    _add_legacy_orphans(2)
+    assert _outcome_count() == clean * 3
+
+    result = compact_database(TEST_DB)
+    assert result['rows_before'] == clean * 3
+    assert result['rows_after'] == clean
+    assert result['orphans_removed'] == clean * 2
+    assert result['duplicates_removed'] == 0
+    assert result['size_after'] < result['size_before']
+
+    assert calculate_all_thresholds(TEST_DB) == thresholds
+    assert get_category_sketch('hits', TEST_DB)['weeks'] == list(range(1, 9))
+
+    again = compact_database(TEST_DB)
+    assert again['orphans_removed'] == 0 and again['rows_after'] == clean
+    print(f"  ✓ Removed {result['orphans_removed']} orphaned rows, "
+          f"{(result['size_before'] - result['size_after']) // 1024} KB recovered")
+
+
+def test_compact_invalidates_cache():
+    """Compaction and layout changes bump data_version, so cached analyses are recomputed."""
+    print("\n=== Test: Cache Invalidation ===")
+
+    setup_test_database()
+    key = "threshold_intervals:resamples=50:level=0.9:seed=42"
+    intervals = calculate_threshold_intervals(TEST_DB, resamples=50, level=0.9, seed=42)
+    assert get_cached(key, TEST_DB) is not None
+
+    for step in (lambda: compact_database(TEST_DB), lambda: set_storage_layout(LAYOUT_WIDE, TEST_DB)):
+        version = get_data_version(TEST_DB)
+        step()
+        assert get_data_version(TEST_DB) == version + 1
+        assert get_cached(key, TEST_DB) is None, "Next call is a cache miss"
+        recomputed = calculate_threshold_intervals(TEST_DB, resamples=50, level=0.9, seed=42)
+        assert {c: i.sample_size for c, i in recomputed.items()} == \
+            {c: i.sample_size for c, i in intervals.items()}
+        assert get_cached(key, TEST_DB) is not None
+    print("  ✓ Cache missed after compact and layout change")
+
+
+def cleanup():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all compaction tests."""
+    print("=" * 70)
+    print("COMPACTION TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_refetch_does_not_grow()
+        test_failed_save_rolls_back()
+        test_compact_removes_orphans()
+        test_compact_invalidates_cache()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL COMPACTION TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
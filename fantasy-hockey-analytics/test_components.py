@@ -0,0 +1,162 @@
+"""
+Tests for exact SV%/GAA aggregation from stored goalie components.
+No Yahoo API required.
+"""
+
+import sys
+import os
+import statistics
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import (
+    init_db,
+    save_season_data,
+    set_storage_layout,
+    get_goalie_components,
+    LAYOUT_WIDE
+)
+from src.snapshot import snapshot_path
+from src.components import ComponentSeries, load_component_series, get_team_component_series
+from src.team_analysis import analyze_team
+from src.constants import COMPONENT_FIELDS
+
+TEST_DB = "test_components.db"
+
+
+def setup_test_database(strip_components: bool = False):
+    """10 teams, 12 complete weeks + 1 in progress."""
+    cleanup()
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=10, num_weeks=13, seed=39, incomplete_weeks=1)
+    if strip_components:
+        # A league that doesn't track the components
+        for matchup in data.matchups:
+            for team in (matchup.team1, matchup.team2):
+                for field in COMPONENT_FIELDS:
+                    setattr(team, field, None)
+    save_season_data(data, TEST_DB)
+    return data
+
+
+def test_prefix_sum_windows():
+    """Window ratios equal the ratio of summed components."""
+    print("\n=== Test: Prefix-Sum Windows ===")
+
+    rows = [
+        {'week': 1, 'saves': 90.0, 'shots_against': 100.0, 'goals_against': 10.0, 'minutes': 180.0},
+        {'week': 2, 'saves': 0.0, 'shots_against': 0.0, 'goals_against': 0.0, 'minutes': 0.0},
+        {'week': 4, 'saves': 140.0, 'shots_against': 150.0, 'goals_against': 10.0, 'minutes': 240.0},
+    ]
+    series = ComponentSeries.from_rows(7, rows)
+    assert abs(series.ratio('save_pct') - 230 / 250) < 1e-12
+    assert abs(series.ratio('gaa') - 60 * 20 / 420) < 1e-12
+    assert series.ratio('gaa', 1, 2) is None, "No goalie start, no ratio"
+    assert abs(series.ratio_between('save_pct', 2, 4) - 140 / 150) < 1e-12
+    assert series.totals(0, 2)['shots_against'] == 100.0
+
+    rows[1]['minutes'] = None
+    assert ComponentSeries.from_rows(7, rows) is None, "Missing components can't aggregate exactly"
+    print("  ✓ O(1) window totals and ratios")
+
+
+def test_components_stored_in_both_layouts():
+    """Components are saved per team-week and replaced on re-fetch."""
+    print("\n=== Test: Component Storage ===")
+
+    data = setup_test_database()
+    assert len(get_goalie_components(complete_only=False, db_path=TEST_DB)) == 2 * len(data.matchups)
+    assert len(get_goalie_components(complete_only=True, db_path=TEST_DB)) == 10 * 12
+
+    # Re-saving the same weeks doesn't duplicate rows
+    save_season_data(data, TEST_DB)
+    assert len(get_goalie_components(complete_only=False, db_path=TEST_DB)) == 2 * len(data.matchups)
+
+    rows_series = load_component_series(TEST_DB)
+    set_storage_layout(LAYOUT_WIDE, TEST_DB)
+    save_season_data(data, TEST_DB)
+    assert load_component_series(TEST_DB) == rows_series
+    assert len(rows_series) == 10
+    print("  ✓ One row per team-week in either layout")
+
+
+def test_analysis_uses_exact_ratios():
+    """analyze_team averages SV%/GAA from components, not weekly ratios."""
+    print("\n=== Test: Exact Team Averages ===")
+
+    setup_test_database()
+    for team_id in (1, 6):
+        result = analyze_team(team_id, TEST_DB)
+        series = get_team_component_series(team_id, TEST_DB)
+        totals = series.totals()
+
+        sv = result.assessments['save_pct']
+        gaa = result.assessments['gaa']
+        assert sv.from_components and gaa.from_components
+        assert not result.assessments['hits'].from_components
+        assert abs(sv.team_average - totals['saves'] / totals['shots_against']) < 1e-12
+        assert abs(gaa.team_average - 60 * totals['goals_against'] / totals['minutes']) < 1e-12
+
+    # The mean of weekly ratios differs (weeks have different workloads)
+    assert abs(gaa.team_average - statistics.mean(gaa.weekly_values)) > 1e-6
+    print("  ✓ SV% and GAA are exact season ratios")
+
+
+def test_fallback_without_components():
+    """Leagues without components keep the mean of weekly ratios."""
+    print("\n=== Test: Fallback ===")
+
+    setup_test_database(strip_components=True)
+    assert load_component_series(TEST_DB) == {}
+
+    gaa = analyze_team(3, TEST_DB).assessments['gaa']
+    assert not gaa.from_components
+    assert abs(gaa.team_average - statistics.mean(gaa.weekly_values)) < 1e-12
+    print("  ✓ Weekly ratio mean when components are missing")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all component aggregation tests."""
+    print("=" * 70)
+    print("GOALIE COMPONENT AGGREGATION TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_prefix_sum_windows()
+        test_components_stored_in_both_layouts()
+        test_analysis_uses_exact_ratios()
+        test_fallback_without_components()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL COMPONENT TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,164 @@
+"""
+Tests for the category covariance model and correlated sampler.
+No Yahoo API required.
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import init_db, save_season_data
+from src.snapshot import StatCube, snapshot_path
+from src.covariance import CategoryCovarianceModel, fit_covariance_model, get_covariance_model, _observations
+from src.constants import ALL_CATEGORIES
+
+TEST_DB = "test_covariance.db"
+
+
+def setup_test_database():
+    """20 complete weeks + 1 in progress."""
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=10, num_weeks=21, seed=35, incomplete_weeks=1)
+    save_season_data(data, TEST_DB)
+    return data
+
+
+def test_bulk_fit_matches_per_team_loop():
+    """Grouped moments equal np.cov per team; shrinkage blends toward the league."""
+    print("\n=== Test: Bulk Fit ===")
+
+    setup_test_database()
+    cube = StatCube.from_database(TEST_DB)
+    teams, values = _observations(cube)
+    assert np.all(values[:, ALL_CATEGORIES.index('gaa')] != 0), "No-goalie weeks excluded"
+
+    unshrunk = fit_covariance_model(cube, shrinkage_weeks=0)
+    shrunk = fit_covariance_model(cube, shrinkage_weeks=10)
+    assert np.allclose(unshrunk.league_cov, np.cov(values, rowvar=False))
+
+    for t in range(len(cube.team_ids)):
+        own = values[teams == t]
+        assert np.allclose(unshrunk.team_means[t], own.mean(axis=0))
+        assert np.allclose(unshrunk.team_covs[t], np.cov(own, rowvar=False))
+
+        n = len(own)
+        expected = ((n - 1) * np.cov(own, rowvar=False) + 10 * shrunk.league_cov) / (n - 1 + 10)
+        assert np.allclose(shrunk.team_covs[t], expected)
+        assert np.allclose(shrunk.team_chols[t] @ shrunk.team_chols[t].T, shrunk.team_covs[t])
+
+    correlation = shrunk.correlation()
+    points, assists = ALL_CATEGORIES.index('points'), ALL_CATEGORIES.index('assists')
+    assert correlation[points, assists] > 0.3, "Points and assists move together"
+    print("  ✓ Batched moments and Cholesky factors match direct computation")
+
+
+def test_sampler_reproduces_covariance():
+    """Correlated draws have the fitted mean and covariance."""
+    print("\n=== Test: Correlated Sampler ===")
+
+    rng = np.random.default_rng(0)
+    true_cov = np.diag(np.linspace(1.0, 5.0, len(ALL_CATEGORIES)))
+    true_cov[0, 2] = true_cov[2, 0] = 0.5
+    true_cov[1, 2] = true_cov[2, 1] = 0.8
+    means = np.arange(len(ALL_CATEGORIES), dtype=float)
+
+    model = CategoryCovarianceModel(
+        categories=list(ALL_CATEGORIES),
+        team_ids=[7],
+        team_weeks=[20],
+        league_mean=np.zeros(len(ALL_CATEGORIES)),
+        league_cov=np.eye(len(ALL_CATEGORIES)),
+        team_means=means[None, :],
+        team_covs=true_cov[None, :, :]
+    )
+
+    draws = model.sample(7, size=200000, rng=rng)
+    assert draws.shape == (200000, len(ALL_CATEGORIES))
+    assert np.allclose(draws.mean(axis=0), means, atol=0.05)
+    assert np.allclose(np.cov(draws, rowvar=False), true_cov, atol=0.1)
+
+    batch = model.sample_teams([7, 999], size=50000, rng=rng)
+    assert batch.shape == (2, 50000, len(ALL_CATEGORIES))
+    assert np.allclose(batch[1].mean(axis=0), 0.0, atol=0.05), "Unknown team draws from the league"
+
+    first = model.sample(7, size=5, rng=np.random.default_rng(7))
+    again = model.sample(7, size=5, rng=np.random.default_rng(7))
+    assert np.array_equal(first, again)
+    print("  ✓ Sample covariance matches the model")
+
+
+def test_cache_follows_data_version():
+    """Cached parameters round-trip exactly and expire with new data."""
+    print("\n=== Test: Cache ===")
+
+    data = setup_test_database()
+    fitted = get_covariance_model(TEST_DB)
+    cached = get_covariance_model(TEST_DB)
+    assert cached.team_ids == fitted.team_ids
+    assert np.array_equal(cached.team_covs, fitted.team_covs)
+    assert np.array_equal(cached.league_mean, fitted.league_mean)
+
+    for matchup in data.matchups:
+        matchup.is_complete = True
+    save_season_data(data, TEST_DB)
+    refitted = get_covariance_model(TEST_DB)
+    assert sum(refitted.team_weeks) > sum(fitted.team_weeks)
+
+    try:
+        get_covariance_model(TEST_DB, shrinkage_weeks=-1)
+        assert False, "Negative shrinkage should raise ValueError"
+    except ValueError:
+        pass
+    print("  ✓ Cache reused until the data changes")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all covariance model tests."""
+    print("=" * 70)
+    print("CATEGORY COVARIANCE TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_bulk_fit_matches_per_team_loop()
+        test_sampler_reproduces_covariance()
+        test_cache_follows_data_version()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL COVARIANCE TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
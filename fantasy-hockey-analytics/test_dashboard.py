@@ -0,0 +1,196 @@
+"""
+Tests for the static dashboard generator (incremental by content hash).
+No Yahoo API required.
+"""
+
+import sys
+import os
+import json
+import shutil
+import sqlite3
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import init_db, save_season_data
+from src.dashboard import build_dashboard, line_chart, MANIFEST, DATA_DIR
+from src.snapshot import snapshot_path, write_snapshot
+
+TEST_DB = "test_dashboard.db"
+OUTPUT_DIR = "test_dashboard_output"
+
+
+def setup_test_database():
+    """8 teams, 5 complete weeks + the live one."""
+    cleanup()
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=8, num_weeks=6, seed=47, incomplete_weeks=1)
+    save_season_data(data, TEST_DB)
+    write_snapshot(TEST_DB)
+    return data
+
+
+def page_count():
+    return 1 + 8  # index + one per team
+
+
+def test_full_build():
+    """Every page and bundle is written; the bundles hold the weekly values."""
+    print("\n=== Test: Full Build ===")
+
+    data = setup_test_database()
+    result = build_dashboard(OUTPUT_DIR, TEST_DB)
+    assert len(result.written) == page_count() and not result.unchanged
+    for page in result.written:
+        assert os.path.exists(os.path.join(OUTPUT_DIR, page))
+
+    with open(os.path.join(OUTPUT_DIR, DATA_DIR, "team_3.json")) as f:
+        bundle = json.load(f)
+    assert bundle['weeks'] == [1, 2, 3, 4, 5]
+    hits = [getattr(t, 'hits') for m in sorted(data.matchups, key=lambda m: m.week) if m.week <= 5
+            for t in (m.team1, m.team2) if t.team_id == 3]
+    assert bundle['hits'] == hits
+
+    with open(os.path.join(OUTPUT_DIR, "team_3.html"), encoding='utf-8') as f:
+        page = f.read()
+    assert page.count("<polyline") == 11 and "Team Analysis:" in page
+    with open(os.path.join(OUTPUT_DIR, "index.html"), encoding='utf-8') as f:
+        index = f.read()
+    assert 'href="team_8.html"' in index and "Winning Thresholds" in index
+    print(f"  ✓ {len(result.written)} pages")
+
+
+def test_incremental_rebuilds():
+    """Only pages whose weeks or teams changed are rebuilt."""
+    print("\n=== Test: Incremental ===")
+
+    data = setup_test_database()
+    build_dashboard(OUTPUT_DIR, TEST_DB)
+
+    again = build_dashboard(OUTPUT_DIR, TEST_DB)
+    assert again.written == [] and len(again.unchanged) == page_count()
+
+    # Live-week stats change: complete weeks are untouched
+    for m in data.matchups:
+        if m.week == 6:
+            m.team1.goals += 3
+    save_season_data(data, TEST_DB)
+    assert build_dashboard(OUTPUT_DIR, TEST_DB).written == []
+
+    # A rename: that team's page and the index
+    conn = sqlite3.connect(TEST_DB)
+    conn.execute("UPDATE teams SET current_name = 'Renamed' WHERE team_id = 2")
+    conn.commit()
+    conn.close()
+    renamed = build_dashboard(OUTPUT_DIR, TEST_DB)
+    assert sorted(renamed.written) == ["index.html", "team_2.html"]
+
+    # A missing file is rebuilt even though its hash is unchanged
+    os.remove(os.path.join(OUTPUT_DIR, "team_5.html"))
+    assert build_dashboard(OUTPUT_DIR, TEST_DB).written == ["team_5.html"]
+
+    # The live week completes: every threshold moves, every page is rebuilt
+    for m in data.matchups:
+        if m.week == 6:
+            m.is_complete = True
+    save_season_data(data, TEST_DB)
+    completed = build_dashboard(OUTPUT_DIR, TEST_DB)
+    assert len(completed.written) == page_count()
+
+    assert len(build_dashboard(OUTPUT_DIR, TEST_DB, force=True).written) == page_count()
+    print("  ✓ Live refresh 0 pages, rename 2, new complete week all")
+
+
+def test_removed_pages():
+    """Pages in the manifest for teams no longer stored are deleted."""
+    print("\n=== Test: Removed Pages ===")
+
+    setup_test_database()
+    build_dashboard(OUTPUT_DIR, TEST_DB)
+    manifest_path = os.path.join(OUTPUT_DIR, MANIFEST)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    manifest['pages']['team_99.html'] = "stale"
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f)
+    for path in ("team_99.html", os.path.join(DATA_DIR, "team_99.json")):
+        open(os.path.join(OUTPUT_DIR, path), 'w').close()
+
+    result = build_dashboard(OUTPUT_DIR, TEST_DB)
+    assert result.removed == ["team_99.html"] and result.written == []
+    assert not os.path.exists(os.path.join(OUTPUT_DIR, "team_99.html"))
+    assert not os.path.exists(os.path.join(OUTPUT_DIR, DATA_DIR, "team_99.json"))
+    print("  ✓ Stale page and bundle removed")
+
+
+def test_edge_cases():
+    """No complete weeks, teams without matchups and charts without values."""
+    print("\n=== Test: Edge Cases ===")
+
+    cleanup()
+    init_db(TEST_DB)
+    save_season_data(generate_season_data(num_teams=4, num_weeks=1, seed=47, incomplete_weeks=1), TEST_DB)
+    result = build_dashboard(OUTPUT_DIR, TEST_DB)
+    assert result.written == ["index.html"]
+    with open(os.path.join(OUTPUT_DIR, "index.html"), encoding='utf-8') as f:
+        assert "No completed weeks yet." in f.read()
+
+    # A team with no matchups gets no page (and doesn't break the build)
+    setup_test_database()
+    conn = sqlite3.connect(TEST_DB)
+    conn.execute("INSERT INTO teams (team_id, current_name) VALUES (42, 'No Games')")
+    conn.commit()
+    conn.close()
+    result = build_dashboard(OUTPUT_DIR, TEST_DB)
+    assert len(result.written) == page_count() and "team_42.html" not in result.written
+
+    assert "No data" in line_chart([1, 2], [None, None], 2.5)
+    assert line_chart([1, 2, 3], [2.0, 2.0, 2.0]).count("<circle") == 3
+    print("  ✓ Handled")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+    shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all dashboard tests."""
+    print("=" * 70)
+    print("DASHBOARD TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_full_build()
+        test_incremental_rebuilds()
+        test_removed_pages()
+        test_edge_cases()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL DASHBOARD TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,138 @@
+"""
+Tests for marginal category value (win-probability sensitivity).
+No Yahoo API required.
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import init_db, save_season_data, get_team_category_values
+from src.snapshot import StatCube, snapshot_path, PRESENT, COMPLETE
+from src.impact import calculate_category_impacts, win_curve, STAT_UNITS
+from src.team_analysis import analyze_team
+from src.constants import ALL_CATEGORIES, LOWER_IS_BETTER
+
+TEST_DB = "test_impact.db"
+
+
+def setup_test_database():
+    """10 teams, 12 complete weeks + 1 in progress."""
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=10, num_weeks=13, seed=37, incomplete_weeks=1)
+    save_season_data(data, TEST_DB)
+
+
+def test_win_curve():
+    """Empirical win curve counts values beaten, ties half, both directions."""
+    print("\n=== Test: Win Curve ===")
+
+    league = np.sort(np.array([1.0, 2.0, 2.0, 4.0]))
+    values = np.array([0.0, 2.0, 3.0, 5.0])
+    assert np.allclose(win_curve(league, values, False), [0.0, 0.5, 0.75, 1.0])
+    assert np.allclose(win_curve(league, values, True), [1.0, 0.5, 0.25, 0.0])
+    print("  ✓ Higher- and lower-is-better curves")
+
+
+def test_batch_matches_single_team():
+    """The all-teams batch equals a direct computation for one team."""
+    print("\n=== Test: Batched Impacts ===")
+
+    setup_test_database()
+    impacts = calculate_category_impacts(TEST_DB)
+    assert len(impacts) == 10
+
+    cube = StatCube.from_database(TEST_DB)
+    team_id = 4
+    for category in ALL_CATEGORIES:
+        lower = category in LOWER_IS_BETTER
+        c = cube.category_index[category]
+        complete = (cube.flags & (PRESENT | COMPLETE)) == (PRESENT | COMPLETE)
+        league = np.sort(cube.values[:, :, c][complete])
+        own = np.array([v['team_value'] for v in get_team_category_values(team_id, category, db_path=TEST_DB)])
+        if category in ('save_pct', 'gaa'):
+            league, own = league[league != 0], own[own != 0]
+
+        step = (-1 if lower else 1) * STAT_UNITS.get(category, 1.0)
+        base = win_curve(league, own, lower).mean()
+        expected_gain = win_curve(league, own + step, lower).mean() - base
+
+        impact = impacts[team_id][category]
+        assert abs(impact.win_rate - base) < 1e-12
+        assert abs(impact.gain_per_unit - expected_gain) < 1e-12
+        assert impact.gain_per_std >= impact.gain_per_unit >= 0, "Improving never lowers win rate"
+    print("  ✓ Per-unit and per-std gains match the direct calculation")
+
+
+def test_rank_by_impact():
+    """analyze_team can rank priorities by matchup impact."""
+    print("\n=== Test: Rank by Impact ===")
+
+    setup_test_database()
+    by_gap = analyze_team(2, TEST_DB)
+    assert by_gap.priority_mode == 'gap' and by_gap.impacts is None
+
+    by_impact = analyze_team(2, TEST_DB, rank_by='impact')
+    gains = [gain for _, gain in by_impact.improvement_priorities]
+    assert gains == sorted(gains, reverse=True)
+    assert {c for c, _ in by_impact.improvement_priorities} == set(by_impact.impacts)
+    assert by_impact.assessments == by_gap.assessments
+
+    try:
+        analyze_team(2, TEST_DB, rank_by='vibes')
+        assert False, "Unknown rank_by should raise ValueError"
+    except ValueError:
+        pass
+    print("  ✓ Priorities sorted by expected category wins gained")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all marginal value tests."""
+    print("=" * 70)
+    print("MARGINAL CATEGORY VALUE TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_win_curve()
+        test_batch_matches_single_team()
+        test_rank_by_impact()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL MARGINAL VALUE TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
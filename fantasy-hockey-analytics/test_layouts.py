@@ -0,0 +1,157 @@
+"""
+Tests for the wide (one row per team-week) storage layout.
+No Yahoo API required.
+"""
+
+import sys
+import os
+import sqlite3
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import (
+    init_db,
+    save_season_data,
+    get_all_category_outcomes,
+    get_team_category_values,
+    get_storage_layout,
+    set_storage_layout,
+    LAYOUT_ROWS,
+    LAYOUT_WIDE
+)
+from src.analytics import calculate_all_thresholds
+from src.rolling import calculate_rolling_thresholds
+from src.team_analysis import analyze_team
+from src.constants import ALL_CATEGORIES
+
+TEST_DBS = {LAYOUT_ROWS: "test_layout_rows.db", LAYOUT_WIDE: "test_layout_wide.db"}
+
+
+def setup_test_databases():
+    """Same season stored in both layouts."""
+    data = generate_season_data(num_teams=10, num_weeks=10, seed=31, incomplete_weeks=1)
+    for layout, db_path in TEST_DBS.items():
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        init_db(db_path)
+        set_storage_layout(layout, db_path)
+        save_season_data(data, db_path)
+    return data
+
+
+def _count(db_path, table):
+    conn = sqlite3.connect(db_path)
+    count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    conn.close()
+    return count
+
+
+def _without_id(outcomes, keys=('id',)):
+    return [{k: v for k, v in o.items() if k not in keys} for o in outcomes]
+
+
+def test_read_paths_match():
+    """Wide-layout reads return the same outcomes, team values and analysis."""
+    print("\n=== Test: Read Paths Match ===")
+
+    setup_test_databases()
+    rows_db, wide_db = TEST_DBS[LAYOUT_ROWS], TEST_DBS[LAYOUT_WIDE]
+
+    assert _count(wide_db, 'category_outcomes') == 0
+    assert _count(wide_db, 'team_weeks') == 10 * 10
+
+    for category in ALL_CATEGORIES:
+        for complete_only in (True, False):
+            assert (_without_id(get_all_category_outcomes(category, complete_only, rows_db)) ==
+                    get_all_category_outcomes(category, complete_only, wide_db))
+        assert (get_team_category_values(4, category, db_path=rows_db) ==
+                get_team_category_values(4, category, db_path=wide_db))
+
+    assert calculate_all_thresholds(rows_db) == calculate_all_thresholds(wide_db)
+    assert (calculate_all_thresholds(rows_db, use_sketch=True) ==
+            calculate_all_thresholds(wide_db, use_sketch=True))
+    assert calculate_rolling_thresholds(window=3, db_path=rows_db) == \
+        calculate_rolling_thresholds(window=3, db_path=wide_db)
+    assert analyze_team(4, rows_db) == analyze_team(4, wide_db)
+    print("  ✓ Both layouts produce identical analysis")
+
+
+def test_conversion_round_trip():
+    """Converting rows -> wide -> rows preserves every outcome and shrinks the file."""
+    print("\n=== Test: Layout Conversion ===")
+
+    data = setup_test_databases()
+    db_path = TEST_DBS[LAYOUT_ROWS]
+    expected = {c: _without_id(get_all_category_outcomes(c, False, db_path)) for c in ALL_CATEGORIES}
+    rows_size = os.path.getsize(db_path)
+
+    assert set_storage_layout(LAYOUT_WIDE, db_path) == len(data.matchups)
+    assert get_storage_layout(db_path) == LAYOUT_WIDE
+    assert set_storage_layout(LAYOUT_WIDE, db_path) == 0
+    assert os.path.getsize(db_path) < rows_size
+    for category in ALL_CATEGORIES:
+        assert get_all_category_outcomes(category, False, db_path) == expected[category]
+
+    # Re-fetch in the wide layout replaces rows rather than duplicating them
+    save_season_data(data, db_path)
+    assert _count(db_path, 'team_weeks') == 10 * 10
+
+    # (the re-fetch assigned new matchup ids)
+    set_storage_layout(LAYOUT_ROWS, db_path)
+    assert _count(db_path, 'team_weeks') == 0
+    for category in ALL_CATEGORIES:
+        ignore = ('id', 'matchup_id')
+        assert (_without_id(get_all_category_outcomes(category, False, db_path), ignore) ==
+                _without_id(expected[category], ignore))
+
+    try:
+        set_storage_layout('columnar', db_path)
+        assert False, "Unknown layout should raise ValueError"
+    except ValueError:
+        pass
+    print(f"  ✓ Round trip preserved outcomes ({rows_size // 1024} KB in the row layout)")
+
+
+def cleanup():
+    for db_path in TEST_DBS.values():
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all storage layout tests."""
+    print("=" * 70)
+    print("STORAGE LAYOUT TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_read_paths_match()
+        test_conversion_round_trip()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL STORAGE LAYOUT TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
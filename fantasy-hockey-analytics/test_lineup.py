@@ -0,0 +1,212 @@
+"""
+Tests for the lineup optimizer (branch-and-bound over roster slots).
+No Yahoo API required.
+"""
+
+import sys
+import os
+import itertools
+import time
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data, generate_player_weeks
+from src.database import init_db, save_season_data, save_player_weeks
+from src.lineup import LineupSearch, optimize_lineup, lineup_slots
+from src.snapshot import snapshot_path
+from src.constants import ALL_CATEGORIES, COMPONENT_FIELDS, ROSTER_SLOTS
+
+TEST_DB = "test_lineup.db"
+
+
+def setup_test_database(injured=None):
+    """10 teams, 7 complete weeks + the live one, with rosters."""
+    cleanup()
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=10, num_weeks=8, seed=44, incomplete_weeks=1)
+    save_season_data(data, TEST_DB)
+    players = generate_player_weeks(data, seed=44)
+    for p in players:
+        if p.player_id == injured and p.week == 8:
+            p.selected_position = 'IR'
+    save_player_weeks(players, TEST_DB)
+    return data, players
+
+
+def random_search(rng, num_players, slots):
+    """A LineupSearch over random projections and curves, and the eligibility lists."""
+    positions = ['C', 'LW', 'RW', 'D', 'G']
+    eligible = []
+    for _ in range(num_players):
+        first = rng.choice(positions)
+        extra = [rng.choice(['C', 'LW', 'RW'])] if first in ('C', 'LW', 'RW') and rng.random() < 0.4 else []
+        eligible.append(sorted({first, *extra}))
+    values = np.abs(rng.normal(3, 2, size=(num_players, len(ALL_CATEGORIES)))).round()
+    values[:, ALL_CATEGORIES.index('plus_minus')] -= 3
+    components = np.zeros((num_players, len(COMPONENT_FIELDS)))
+    for p, positions_p in enumerate(eligible):
+        if 'G' in positions_p:
+            shots = rng.uniform(40, 90)
+            saves = shots * rng.uniform(0.86, 0.94)
+            components[p] = [saves, shots, shots - saves, shots * 2]
+        else:
+            values[p, ALL_CATEGORIES.index('goalie_wins')] = 0
+    curves = {c: sorted((rng.normal(3, 2, size=8) * len(slots) / 2).tolist()) for c in ALL_CATEGORIES}
+    curves['save_pct'] = sorted(rng.uniform(0.88, 0.93, size=8).tolist())
+    curves['gaa'] = sorted(rng.uniform(2.0, 3.5, size=8).tolist())
+    return LineupSearch(values, components, eligible, curves, slots), eligible
+
+
+def test_matches_brute_force():
+    """Branch and bound finds the same optimum as enumerating every assignment."""
+    print("\n=== Test: Brute Force ===")
+
+    rng = np.random.default_rng(7)
+    slots = ['G', 'C', 'C', 'LW', 'D']
+    for trial in range(25):
+        search, eligible = random_search(rng, 8, slots)
+        picks, value = search.solve()
+
+        best = -1.0
+        options = [[p for p in range(8) if slot in eligible[p]] + [None] for slot in slots]
+        for assignment in itertools.product(*options):
+            chosen = [p for p in assignment if p is not None]
+            if len(chosen) == len(set(chosen)):
+                best = max(best, search.evaluate(list(assignment)))
+        assert abs(value - best) < 1e-9, f"trial {trial}: {value} vs {best}"
+        assert abs(search.evaluate(picks) - value) < 1e-9
+    print("  ✓ 25 random rosters: optimum matches enumeration")
+
+
+def test_pruning_keeps_optimum():
+    """On a full roster, pruning matches the exhaustive search with far fewer nodes."""
+    print("\n=== Test: Pruning ===")
+
+    rng = np.random.default_rng(8)
+    for trial in range(5):
+        search, _ = random_search(rng, 16, lineup_slots())
+        _, exhaustive = search.solve(prune=False)
+        full_nodes = search.nodes
+        _, pruned = search.solve()
+        assert abs(exhaustive - pruned) < 1e-9
+        assert search.nodes < full_nodes and search.pruned > 0
+    print(f"  ✓ {search.nodes} nodes vs {full_nodes} exhaustive")
+
+
+def test_empty_slot_for_weak_goalie():
+    """Starting a goalie who only hurts SV%/GAA is worse than leaving the slot empty."""
+    print("\n=== Test: Empty Slot ===")
+
+    values = np.zeros((2, len(ALL_CATEGORIES)))
+    values[0, ALL_CATEGORIES.index('goalie_wins')] = 3
+    components = np.array([[145.0, 150.0, 5.0, 300.0],    # .967 SV%, 1.00 GAA
+                           [90.0, 120.0, 30.0, 240.0]])   # .750 SV%, 7.50 GAA
+    curves = {c: [1.0, 2.0, 3.0, 4.0] for c in ALL_CATEGORIES}
+    curves['save_pct'] = [0.89, 0.90, 0.91, 0.92]
+    curves['gaa'] = [2.2, 2.6, 3.0, 3.4]
+    search = LineupSearch(values, components, [['G'], ['G']], curves, ['G', 'G'])
+    picks, value = search.solve()
+    assert picks == [0, None]
+    assert search.evaluate([0, 1]) < value
+    print("  ✓ Second goalie slot left empty")
+
+
+def test_optimize_lineup():
+    """Valid, no worse than the lineup as set, injured players never start, fast."""
+    print("\n=== Test: Optimize Lineup ===")
+
+    data, players = setup_test_database(injured=205)
+    slowest = 0.0
+    for team_id in range(1, 11):
+        start = time.perf_counter()
+        result = optimize_lineup(team_id, TEST_DB)
+        slowest = max(slowest, time.perf_counter() - start)
+
+        assert result.week == 8
+        opponent = next(m for m in data.matchups if m.week == 8 and team_id in (m.team1.team_id, m.team2.team_id))
+        assert result.opponent_id in (opponent.team1.team_id, opponent.team2.team_id)
+        assert result.opponent_id != team_id
+
+        started = [p for _, p in result.starters if p is not None]
+        assert len(started) == len(set(started))
+        assert all(slot in result.positions[p] for slot, p in result.starters if p is not None)
+        assert [slot for slot, _ in result.starters] == lineup_slots()
+        assert len(result.starters) == sum(ROSTER_SLOTS.values())
+        assert result.expected_wins >= result.current_expected_wins - 1e-9
+        assert abs(sum(result.category_win.values()) - result.expected_wins) < 1e-9
+        assert 205 not in started and 205 not in result.bench
+
+    assert slowest < 3.0, f"{slowest:.2f}s for one team"
+    print(f"  ✓ 10 teams, slowest {slowest * 1000:.0f} ms")
+
+
+def test_edge_cases():
+    """No player stats and a week without a matchup."""
+    print("\n=== Test: Edge Cases ===")
+
+    setup_test_database()
+    try:
+        optimize_lineup(1, TEST_DB, week=30)
+        assert False, "Week without a matchup should raise ValueError"
+    except ValueError:
+        pass
+
+    cleanup()
+    init_db(TEST_DB)
+    save_season_data(generate_season_data(num_teams=4, num_weeks=3, seed=44), TEST_DB)
+    for team_id in (1, 99):
+        try:
+            optimize_lineup(team_id, TEST_DB)
+            assert False, "Should raise ValueError"
+        except ValueError:
+            pass
+    print("  ✓ Handled")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all lineup optimizer tests."""
+    print("=" * 70)
+    print("LINEUP OPTIMIZER TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_matches_brute_force()
+        test_pruning_keeps_optimum()
+        test_empty_slot_for_weak_goalie()
+        test_optimize_lineup()
+        test_edge_cases()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL LINEUP TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
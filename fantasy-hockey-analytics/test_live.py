@@ -0,0 +1,197 @@
+"""
+Tests for live in-week win probabilities.
+No Yahoo API required.
+"""
+
+import sys
+import os
+import datetime
+import itertools
+import math
+import time
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import init_db, save_season_data
+from src.snapshot import StatCube, snapshot_path
+from src.live import (
+    LiveOddsModel,
+    calculate_live_odds,
+    default_days_left,
+    _norm_cdf,
+    DAYS_PER_WEEK
+)
+from src.constants import ALL_CATEGORIES
+
+TEST_DB = "test_live.db"
+
+
+def setup_test_database(incomplete_weeks: int = 1):
+    """10 teams, 12 complete weeks + the live one."""
+    cleanup()
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=10, num_weeks=13, seed=41, incomplete_weeks=incomplete_weeks)
+    save_season_data(data, TEST_DB)
+    return data
+
+
+def test_normal_cdf():
+    """The vectorized CDF matches math.erf."""
+    print("\n=== Test: Normal CDF ===")
+
+    x = np.linspace(-8, 8, 321)
+    exact = np.array([0.5 * (1 + math.erf(v / math.sqrt(2))) for v in x])
+    assert np.max(np.abs(_norm_cdf(x) - exact)) < 2e-7
+    assert default_days_left(datetime.date(2026, 10, 19)) == 7  # Monday
+    print("  ✓ |error| < 2e-7")
+
+
+def test_overall_matches_enumeration():
+    """Matchup odds equal enumerating all 3^11 category outcomes."""
+    print("\n=== Test: Overall Odds ===")
+
+    setup_test_database()
+    model = LiveOddsModel.from_cube(StatCube.from_database(TEST_DB))
+    current = np.array([[[10, 15, 25, 2, 8, 4, 40, 90, 1, 0.915, 2.4],
+                         [12, 14, 26, -1, 12, 5, 35, 85, 2, 0.0, 0.0]]], dtype=float)
+    team_ids = np.array([[1, 2]])
+    win, tie, overall = model.probabilities(current, team_ids, np.array([4 / 7]))
+    loss = 1 - win - tie
+
+    assert abs(overall.sum() - 1) < 1e-12
+    outcomes = np.array(list(itertools.product([1, 0, -1], repeat=len(ALL_CATEGORIES))))
+    likelihood = np.prod(np.where(outcomes == 1, win[0], np.where(outcomes == 0, tie[0], loss[0])), axis=1)
+    margin = outcomes.sum(axis=1)
+    assert abs(overall[0, 0] - likelihood[margin > 0].sum()) < 1e-12
+    assert abs(overall[0, 1] - likelihood[margin == 0].sum()) < 1e-12
+    print(f"  ✓ Team 1 {overall[0, 0]:.3f} / tie {overall[0, 1]:.3f} / team 2 {overall[0, 2]:.3f}")
+
+
+def test_no_days_left_is_settled():
+    """With the week over, odds are the current category results."""
+    print("\n=== Test: Settled Week ===")
+
+    setup_test_database()
+    for odds in calculate_live_odds(TEST_DB, days_left=0):
+        for category in ALL_CATEGORIES:
+            assert odds.category_win[category] + odds.category_tie[category] in (0.0, 1.0) \
+                or abs(odds.category_win[category] - 0.5) < 1e-9
+        assert max(odds.team1_win, odds.tie, odds.team2_win) == 1.0
+
+    # Lower GAA wins when settled
+    model = LiveOddsModel.from_cube(StatCube.from_database(TEST_DB))
+    current = np.zeros((1, 2, len(ALL_CATEGORIES)))
+    current[0, :, ALL_CATEGORIES.index('gaa')] = [2.1, 3.4]
+    win, _, _ = model.probabilities(current, np.array([[1, 2]]), np.array([0.0]))
+    assert win[0, ALL_CATEGORIES.index('gaa')] == 1.0
+    print("  ✓ Current leaders win with 0 days left")
+
+
+def test_uncertainty_grows_with_days_left():
+    """More days left pulls odds toward a coin flip."""
+    print("\n=== Test: Days Left ===")
+
+    setup_test_database()
+    spread = []
+    for days_left in (1, 3, 5):
+        odds = calculate_live_odds(TEST_DB, days_left=days_left)
+        assert len(odds) == 5 and all(o.week == 13 for o in odds)
+        spread.append(np.mean([abs(o.team1_win - o.team2_win) for o in odds]))
+    assert spread[0] > spread[1] > spread[2]
+    print(f"  ✓ Mean |P1 - P2|: {', '.join(f'{s:.2f}' for s in spread)}")
+
+
+def test_parsed_matchups_match_stored_week():
+    """Odds from parsed matchups (watch polls) equal the stored-week path; fast per poll."""
+    print("\n=== Test: Poll Path ===")
+
+    data = setup_test_database()
+    model = LiveOddsModel.from_cube(StatCube.from_database(TEST_DB))
+    live = [m for m in data.matchups if m.week == 13]
+    from_poll = {(o.team1_id, o.team2_id): o for o in model.evaluate_matchups(live, 3 / DAYS_PER_WEEK)}
+    for stored in calculate_live_odds(TEST_DB, days_left=3):
+        o = from_poll[(stored.team1_id, stored.team2_id)]
+        assert abs(o.team1_win - stored.team1_win) < 1e-12
+        assert o.category_win == stored.category_win
+
+    start = time.perf_counter()
+    for _ in range(200):
+        model.evaluate_matchups(live, 3 / DAYS_PER_WEEK)
+    per_poll = (time.perf_counter() - start) / 200
+    assert per_poll < 0.01, f"{per_poll * 1000:.1f} ms per poll"
+    print(f"  ✓ {per_poll * 1000:.2f} ms per poll for {len(live)} matchups")
+
+
+def test_edge_cases():
+    """No live week, no history and bad days_left."""
+    print("\n=== Test: Edge Cases ===")
+
+    setup_test_database(incomplete_weeks=0)
+    assert calculate_live_odds(TEST_DB, days_left=3) == []
+    for bad in (-1, 8):
+        try:
+            calculate_live_odds(TEST_DB, days_left=bad)
+            assert False, f"days_left={bad} should raise ValueError"
+        except ValueError:
+            pass
+
+    cleanup()
+    init_db(TEST_DB)
+    save_season_data(generate_season_data(num_teams=4, num_weeks=1, seed=41, incomplete_weeks=1), TEST_DB)
+    try:
+        calculate_live_odds(TEST_DB, days_left=3)
+        assert False, "No complete weeks should raise ValueError"
+    except ValueError:
+        pass
+    print("  ✓ Handled")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all live odds tests."""
+    print("=" * 70)
+    print("LIVE WIN PROBABILITY TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_normal_cdf()
+        test_overall_matches_enumeration()
+        test_no_days_left_is_settled()
+        test_uncertainty_grows_with_days_left()
+        test_parsed_matchups_match_stored_week()
+        test_edge_cases()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL LIVE ODDS TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,223 @@
+"""
+Tests for player-level stats ingestion (concurrent roster fetch, storage).
+Uses fake yfpy objects - no Yahoo API required.
+"""
+
+import sys
+import os
+import sqlite3
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data, generate_player_weeks
+from src.database import (
+    init_db,
+    save_season_data,
+    save_player_weeks,
+    get_player_weeks,
+    get_complete_player_weeks
+)
+from src.data_fetcher import DataFetcher
+from src.constants import ALL_CATEGORIES, ID_TO_FIELD, COMPONENT_STAT_IDS, BENCH_POSITIONS
+
+TEST_DB = "test_players.db"
+
+
+class FakeStat:
+    def __init__(self, stat_id, value):
+        self.stat_id = stat_id
+        self.value = value
+
+
+class FakePlayer:
+    """Just the yfpy Player attributes the fetcher reads."""
+    def __init__(self, pw):
+        self.player_id = pw.player_id
+        self.full_name = pw.name
+        self.editorial_team_abbr = pw.nhl_team
+        self.display_position = pw.display_position
+        self.eligible_positions = list(pw.eligible_positions)
+        self.selected_position_value = pw.selected_position
+        fields = {**ID_TO_FIELD, **COMPONENT_STAT_IDS}
+        self.stats = [{'stat': FakeStat(stat_id, '-' if pw.stats[name] is None else str(pw.stats[name]))}
+                      for stat_id, name in fields.items()]
+
+
+class FakeQuery:
+    """Serves generated rosters; tracks concurrency and can fail one team-week."""
+    def __init__(self, players, delay=0.0, fail=None):
+        self.rosters = {}
+        for p in players:
+            self.rosters.setdefault((p.team_id, p.week), []).append(p)
+        self.delay = delay
+        self.fail = fail
+        self.requests = 0
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def get_team_roster_player_stats_by_week(self, team_id, chosen_week):
+        with self.lock:
+            self.requests += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if (team_id, chosen_week) == self.fail:
+                raise RuntimeError("simulated HTTP 999")
+            return [FakePlayer(p) for p in self.rosters[(team_id, chosen_week)]]
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def setup_league():
+    """8 teams, 4 complete weeks + 1 in progress, with player lines."""
+    cleanup()
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=8, num_weeks=5, seed=42, incomplete_weeks=1)
+    save_season_data(data, TEST_DB)
+    return data, generate_player_weeks(data, seed=42)
+
+
+def test_synthetic_players_sum_to_team_totals():
+    """Starters' lines add up to the team's weekly totals."""
+    print("\n=== Test: Synthetic Players ===")
+
+    data, players = setup_league()
+    lines = {}
+    for p in players:
+        lines.setdefault((p.team_id, p.week), []).append(p)
+
+    for m in data.matchups:
+        for team in (m.team1, m.team2):
+            starters = [p for p in lines[(team.team_id, m.week)] if p.selected_position not in BENCH_POSITIONS]
+            assert len(starters) == 12
+            for category in ALL_CATEGORIES:
+                if category not in ('save_pct', 'gaa'):
+                    assert sum(p.stats[category] for p in starters) == getattr(team, category), category
+            assert sum(p.stats['saves'] or 0 for p in starters) == team.saves
+    print("  ✓ 12 starters per team-week sum exactly to the matchup totals")
+
+
+def test_concurrent_fetch():
+    """One request per team-week, run concurrently; failures are skipped and retried later."""
+    print("\n=== Test: Concurrent Fetch ===")
+
+    data, players = setup_league()
+    team_ids = list(range(1, 9))
+    weeks = [1, 2, 3, 4, 5]
+
+    query = FakeQuery(players, delay=0.02)
+    start = time.perf_counter()
+    fetched = DataFetcher(query, "99999").fetch_player_weeks(team_ids, weeks, max_workers=8)
+    elapsed = time.perf_counter() - start
+
+    assert query.requests == 40
+    assert query.max_active > 1, "Requests should overlap"
+    assert elapsed < 40 * 0.02 / 2, f"{elapsed:.2f}s is not concurrent"
+    assert [(p.week, p.team_id, p.player_id) for p in fetched] == \
+        sorted((p.week, p.team_id, p.player_id) for p in players)
+
+    original = {(p.week, p.player_id): p for p in players}
+    for p in fetched:
+        expected = original[(p.week, p.player_id)]
+        assert p.selected_position == expected.selected_position
+        assert p.eligible_positions == expected.eligible_positions
+        for name, value in expected.stats.items():
+            assert p.stats.get(name) == value or (value is None and p.stats.get(name) == 0), name
+
+    failing = FakeQuery(players, fail=(3, 2))
+    partial = DataFetcher(failing, "99999").fetch_player_weeks(team_ids, weeks)
+    assert len(partial) == len(players) - 16
+    assert not any(p.team_id == 3 and p.week == 2 for p in partial)
+
+    # The failed team-week keeps week 2 open for the next fetch
+    save_player_weeks(partial, TEST_DB, complete_weeks={week: True for week in weeks})
+    assert get_complete_player_weeks(TEST_DB) == [1, 3, 4, 5]
+    retry = DataFetcher(FakeQuery(players), "99999").fetch_player_weeks(team_ids, [2])
+    save_player_weeks(retry, TEST_DB, complete_weeks={2: True})
+    assert get_complete_player_weeks(TEST_DB) == [1, 2, 3, 4, 5]
+    print(f"  ✓ 40 team-weeks in {elapsed * 1000:.0f} ms (max {query.max_active} in flight)")
+
+
+def test_storage_and_incremental_rules():
+    """Team-weeks are replaced on re-save; only complete weeks are final."""
+    print("\n=== Test: Player Storage ===")
+
+    data, players = setup_league()
+    save_player_weeks(players, TEST_DB)
+    assert len(get_player_weeks(complete_only=False, db_path=TEST_DB)) == len(players)
+    assert get_complete_player_weeks(TEST_DB) == [1, 2, 3, 4]
+    assert all(row['week'] <= 4 for row in get_player_weeks(db_path=TEST_DB))
+
+    # Re-saving the live week replaces its rows
+    live = [p for p in players if p.week == 5]
+    save_player_weeks(live, TEST_DB)
+    assert len(get_player_weeks(complete_only=False, db_path=TEST_DB)) == len(players)
+
+    # The week completes: now final
+    save_player_weeks(live, TEST_DB, complete_weeks={5: True})
+    assert get_complete_player_weeks(TEST_DB) == [1, 2, 3, 4, 5]
+
+    rows = get_player_weeks(team_id=2, week=3, db_path=TEST_DB)
+    assert len(rows) == 16
+    assert rows[0]['eligible_positions'] and rows[0]['name'].startswith("Player")
+    goalie = next(r for r in rows if r['selected_position'] == 'G')
+    assert goalie['minutes'] is not None and goalie['save_pct'] > 0
+    skater = next(r for r in rows if r['selected_position'] == 'D')
+    assert skater['minutes'] is None
+
+    conn = sqlite3.connect(TEST_DB)
+    indexes = [row[1] for row in conn.execute("PRAGMA index_list(player_weeks)")]
+    plan = " ".join(str(row) for row in conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM player_weeks WHERE player_id = 201 AND week_number = 2"))
+    conn.close()
+    assert 'idx_player_weeks_player' in indexes and 'idx_player_weeks_player' in plan
+    print("  ✓ Indexed by team-week (PK) and player-week")
+
+
+def cleanup():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all player ingestion tests."""
+    print("=" * 70)
+    print("PLAYER STATS INGESTION TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_synthetic_players_sum_to_team_totals()
+        test_concurrent_fetch()
+        test_storage_and_incremental_rules()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL PLAYER TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
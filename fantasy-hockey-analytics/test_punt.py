@@ -0,0 +1,154 @@
+"""
+Tests for the punt-strategy analyzer.
+No Yahoo API required.
+"""
+
+import sys
+import os
+import itertools
+import time
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import init_db, save_season_data, get_all_teams
+from src.snapshot import snapshot_path
+from src.punt import (
+    analyze_punts,
+    score_all_subsets,
+    _pairwise_win_prob,
+    NUM_MASKS,
+    WINS_NEEDED
+)
+from src.constants import ALL_CATEGORIES
+
+TEST_DB = "test_punt.db"
+
+
+def setup_test_database():
+    """12 teams, 14 complete weeks."""
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+    init_db(TEST_DB)
+    save_season_data(generate_season_data(num_teams=12, num_weeks=14, seed=36), TEST_DB)
+
+
+def test_pairwise_win_prob():
+    """Pair counting with ties matches a brute-force comparison."""
+    print("\n=== Test: Pairwise Win Probability ===")
+
+    team = np.sort(np.array([3.0, 5.0, 5.0, 8.0]))
+    opponent = np.sort(np.array([1.0, 5.0, 6.0]))
+    for lower in (False, True):
+        wins = ties = 0
+        for x, y in itertools.product(team, opponent):
+            ties += x == y
+            wins += (x < y) if lower else (x > y)
+        expected = (wins + 0.5 * ties) / (len(team) * len(opponent))
+        assert abs(_pairwise_win_prob(team, opponent, lower) - expected) < 1e-12
+
+    assert _pairwise_win_prob(np.array([]), opponent, False) == 0.5
+    print("  ✓ Ties count half; lower-is-better reversed")
+
+
+def test_subset_scoring_matches_enumeration():
+    """Vectorized Poisson-binomial scoring equals enumerating every outcome."""
+    print("\n=== Test: Subset Scoring ===")
+
+    rng = np.random.default_rng(36)
+    probs = rng.uniform(0.1, 0.9, size=(2, len(ALL_CATEGORIES)))
+    expected_wins, win_prob = score_all_subsets(probs)
+    assert expected_wins.shape == win_prob.shape == (NUM_MASKS, 2)
+
+    outcomes = np.array(list(itertools.product([0, 1], repeat=len(ALL_CATEGORIES))))
+    for mask in (0, 1, 0b10100000101, NUM_MASKS - 1):
+        kept = np.array([not (mask >> c & 1) for c in range(len(ALL_CATEGORIES))])
+        for o in range(2):
+            p = probs[o] * kept
+            likelihood = np.prod(np.where(outcomes == 1, p, 1 - p), axis=1)
+            brute = likelihood[outcomes.sum(axis=1) >= WINS_NEEDED].sum()
+            assert abs(win_prob[mask, o] - brute) < 1e-12
+            assert abs(expected_wins[mask, o] - p.sum()) < 1e-12
+
+    assert np.all(win_prob[NUM_MASKS - 1] == 0.0), "Punting everything never wins"
+    print("  ✓ All 2048 masks scored exactly")
+
+
+def test_analyze_punts():
+    """Strategies are ranked within each punt size and run well under a second."""
+    print("\n=== Test: Punt Analysis ===")
+
+    setup_test_database()
+    teams = get_all_teams(TEST_DB)
+
+    start = time.perf_counter()
+    for team in teams:
+        analysis = analyze_punts(team['team_id'], TEST_DB, max_punts=3, top=4)
+    per_team = (time.perf_counter() - start) / len(teams)
+    assert per_team < 1.0, f"{per_team:.2f}s per team"
+
+    assert analysis.opponents == len(teams) - 1
+    assert analysis.weeks == 14
+    assert analysis.baseline.punted == ()
+    assert sorted(analysis.strategies) == [1, 2, 3]
+    for size, strategies in analysis.strategies.items():
+        assert len(strategies) == 4
+        assert all(len(s.punted) == size for s in strategies)
+        probs = [s.matchup_win_prob for s in strategies]
+        assert probs == sorted(probs, reverse=True)
+        assert all(s.change <= 1e-12 for s in strategies)
+
+    try:
+        analyze_punts(teams[0]['team_id'], TEST_DB, max_punts=0)
+        assert False, "max_punts=0 should raise ValueError"
+    except ValueError:
+        pass
+    print(f"  ✓ Ranked strategies in {per_team * 1000:.0f} ms per team")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all punt analysis tests."""
+    print("=" * 70)
+    print("PUNT STRATEGY TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_pairwise_win_prob()
+        test_subset_scoring_matches_enumeration()
+        test_analyze_punts()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL PUNT TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,245 @@
+"""
+Tests for free-agent recommendations (threshold top-k over per-category indexes).
+No Yahoo API required.
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data, generate_player_weeks, generate_free_agents
+from src.database import init_db, save_season_data, save_player_weeks
+from src.data_fetcher import DataFetcher
+from src.recommend import (
+    load_player_pool,
+    recommend_players,
+    threshold_top_k,
+    RECENT_WEEKS
+)
+from src.snapshot import snapshot_path
+from src.constants import ALL_CATEGORIES, ID_TO_FIELD, FREE_AGENT_TEAM_ID, FREE_AGENT_POSITION
+
+TEST_DB = "test_recommend.db"
+
+
+def setup_test_database(free_agents: int = 3000):
+    """10 teams, 7 complete weeks + 1 live, rosters and a free-agent pool."""
+    cleanup()
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=10, num_weeks=8, seed=43, incomplete_weeks=1)
+    save_season_data(data, TEST_DB)
+    players = generate_player_weeks(data, seed=43)
+    if free_agents:
+        players += generate_free_agents(data, count=free_agents, seed=43)
+    save_player_weeks(players, TEST_DB)
+    return data, players
+
+
+def test_threshold_top_k_matches_full_sort():
+    """Same top k as scoring everyone, including negatives, ties and a filter."""
+    print("\n=== Test: Threshold Top-k ===")
+
+    rng = np.random.default_rng(1)
+    for trial in range(30):
+        gains = rng.normal(size=(500, 4)).round(1)  # Rounded: plenty of ties
+        if trial % 3 == 0:
+            gains = np.abs(gains) * rng.gamma(2.0, size=(500, 1))  # Correlated columns
+        eligible = rng.random(500) < 0.4 if trial % 2 else None
+        orders = [np.argsort(-gains[:, j], kind='stable') for j in range(4)]
+
+        calls = []
+
+        def score(rows):
+            calls.append(len(rows))
+            return gains[rows]
+
+        ranked, evaluated = threshold_top_k(orders, score, 10, eligible)
+        assert evaluated == sum(calls) <= 500, "Each row scored at most once"
+        totals = gains.sum(axis=1)
+        rows = np.arange(500) if eligible is None else np.nonzero(eligible)[0]
+        expected = sorted(rows, key=lambda r: (-totals[r], r))[:10]
+        assert [row for row, _ in ranked] == expected, f"trial {trial}"
+        assert all(abs(score - totals[row]) < 1e-9 for row, score in ranked)
+
+    ranked, evaluated = threshold_top_k(orders, lambda rows: gains[rows], 0)
+    assert ranked == [] and evaluated == 0
+    print("  ✓ 30 random matrices match a full sort")
+
+
+def test_pool_excludes_rostered_players():
+    """Available = not on a roster in the latest week; projections use recent complete weeks."""
+    print("\n=== Test: Player Pool ===")
+
+    data, players = setup_test_database(free_agents=50)
+    pool = load_player_pool(TEST_DB)
+    latest_rostered = {p.player_id for p in players if p.week == 8 and p.team_id != FREE_AGENT_TEAM_ID}
+    assert len(pool) == 50
+    assert not latest_rostered & set(pool.player_ids.tolist())
+    assert pool.weeks == list(range(8 - RECENT_WEEKS, 8)), "Live week 8 is not projected from"
+
+    player_id = int(pool.player_ids[7])
+    lines = [p.stats['shots'] for p in players if p.player_id == player_id and p.week in pool.weeks]
+    assert abs(pool.values[7, ALL_CATEGORIES.index('shots')] - np.mean(lines)) < 1e-9
+    print(f"  ✓ {len(pool)} free agents, weeks {pool.weeks[0]}-{pool.weeks[-1]}")
+
+
+def test_recommendations_match_exhaustive_ranking():
+    """The early-stopping ranking equals scoring the whole pool, in well under a second."""
+    print("\n=== Test: Recommendations ===")
+
+    setup_test_database()
+    pool = load_player_pool(TEST_DB)
+
+    start = time.perf_counter()
+    top = recommend_players(3, TEST_DB, k=10, pool=pool)
+    elapsed = time.perf_counter() - start
+    everyone = recommend_players(3, TEST_DB, k=len(pool), pool=pool)
+
+    assert [r.player_id for r in top.recommendations] == [r.player_id for r in everyone.recommendations[:10]]
+    assert everyone.evaluated == len(pool) and top.evaluated < len(pool) // 2
+    assert elapsed < 1.0, f"{elapsed:.2f}s to rank {len(pool)} players"
+    best = top.recommendations[0]
+    assert abs(best.score - sum(best.gains.values())) < 1e-9
+    assert all(0 <= gain <= 1 for r in everyone.recommendations
+               for c, gain in r.gains.items() if c not in ('save_pct', 'gaa', 'plus_minus'))
+
+    # Position filter and a narrower focus
+    goalies = recommend_players(3, TEST_DB, k=5, position='G', pool=pool)
+    assert goalies.recommendations and all('G' in r.positions for r in goalies.recommendations)
+    focused = recommend_players(3, TEST_DB, k=5, focus=2, pool=pool)
+    assert set(focused.recommendations[0].gains) <= {c for c, _ in focused.priorities}
+    assert len(focused.priorities) == 2
+    print(f"  ✓ Top 10 of {len(pool)} in {elapsed * 1000:.0f} ms ({top.evaluated} scored)")
+
+
+def test_goalie_rate_gains():
+    """Higher-SV% goalies gain more; skaters never move SV% or GAA."""
+    print("\n=== Test: Goalie Rate Stats ===")
+
+    setup_test_database(free_agents=400)
+    result = recommend_players(4, TEST_DB, k=400, pool=load_player_pool(TEST_DB))
+    skaters = [r for r in result.recommendations if 'G' not in r.positions]
+    goalies = [r for r in result.recommendations if 'G' in r.positions]
+    assert skaters and goalies
+    assert all(r.gains.get('save_pct', 0) == 0 and r.gains.get('gaa', 0) == 0 for r in skaters)
+
+    by_sv = sorted(goalies, key=lambda r: r.projection['save_pct'])
+    worst, best = by_sv[0], by_sv[-1]
+    assert best.gains['save_pct'] > worst.gains['save_pct']
+    print(f"  ✓ SV% gain {worst.gains['save_pct']:+.3f} (worst) vs {best.gains['save_pct']:+.3f} (best)")
+
+
+def test_edge_cases():
+    """No player stats and unknown teams."""
+    print("\n=== Test: Edge Cases ===")
+
+    cleanup()
+    init_db(TEST_DB)
+    save_season_data(generate_season_data(num_teams=4, num_weeks=3, seed=43), TEST_DB)
+    result = recommend_players(1, TEST_DB)
+    assert result.pool_size == 0 and result.recommendations == []
+    try:
+        recommend_players(99, TEST_DB)
+        assert False, "Unknown team should raise ValueError"
+    except ValueError:
+        pass
+    print("  ✓ Handled")
+
+
+class FakeStat:
+    def __init__(self, stat_id, value):
+        self.stat_id = stat_id
+        self.value = value
+
+
+class FakePlayer:
+    def __init__(self, player_id):
+        self.player_id = player_id
+        self.full_name = f"Player {player_id}"
+        self.editorial_team_abbr = "BOS"
+        self.display_position = "C"
+        self.eligible_positions = ["C"]
+        self.selected_position_value = ""
+        self.stats = [{'stat': FakeStat(stat_id, '1')} for stat_id in ID_TO_FIELD]
+
+
+class FakeQuery:
+    """Pages a 60-player pool; the page at start=25 of week 2 fails."""
+    def __init__(self):
+        self.urls = []
+
+    def get_league_key(self):
+        return "nhl.l.99999"
+
+    def query(self, url, data_key_list):
+        self.urls.append(url)
+        start = int(url.split("start=")[1].split(";")[0])
+        if "week=2" in url and start == 25:
+            raise RuntimeError("simulated HTTP 999")
+        return [FakePlayer(i) for i in range(start, min(start + 25, 60))]
+
+
+def test_fetch_free_agents():
+    """Pages per week, stored under the free-agent team; failed pages skipped."""
+    print("\n=== Test: Free-Agent Fetch ===")
+
+    query = FakeQuery()
+    players = DataFetcher(query, "99999").fetch_free_agents([1, 2], limit=100)
+    assert len(query.urls) == 8 and all("status=A" in url for url in query.urls)
+    assert len([p for p in players if p.week == 1]) == 60
+    assert len([p for p in players if p.week == 2]) == 35
+    assert all(p.team_id == FREE_AGENT_TEAM_ID and p.selected_position == FREE_AGENT_POSITION for p in players)
+    assert players[0].stats['goals'] == 1.0
+    print("  ✓ 8 pages, 95 player-weeks")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all recommendation tests."""
+    print("=" * 70)
+    print("FREE-AGENT RECOMMENDATION TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_threshold_top_k_matches_full_sort()
+        test_pool_excludes_rostered_players()
+        test_recommendations_match_exhaustive_ranking()
+        test_goalie_rate_gains()
+        test_edge_cases()
+        test_fetch_free_agents()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL RECOMMENDATION TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
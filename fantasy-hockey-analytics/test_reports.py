@@ -0,0 +1,199 @@
+"""
+Tests for report documents and their text/JSON/HTML renderers.
+No Yahoo API required.
+"""
+
+import sys
+import os
+import io
+import json
+import shutil
+from contextlib import redirect_stdout
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import init_db, save_season_data, get_all_teams
+from src.analytics import calculate_all_thresholds, get_analysis_summary
+from src.bootstrap import calculate_threshold_intervals
+from src.team_analysis import analyze_team
+from src.display import print_team_analysis
+from src.reports import (
+    threshold_report,
+    team_analysis_report,
+    fetch_summary_report,
+    render,
+    write_report,
+    write_league_reports,
+    FORMATS
+)
+from src.snapshot import snapshot_path
+from src.constants import ALL_CATEGORIES
+
+TEST_DB = "test_reports.db"
+OUTPUT_DIR = "test_reports_output"
+
+
+def setup_test_database():
+    """10 teams, 6 complete weeks + the live one."""
+    cleanup()
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=10, num_weeks=7, seed=46, incomplete_weeks=1)
+    save_season_data(data, TEST_DB)
+    return data
+
+
+class CountingStream(io.StringIO):
+    """StringIO that counts write calls."""
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_threshold_report_formats():
+    """One document renders as text, parseable JSON and escaped HTML."""
+    print("\n=== Test: Threshold Report ===")
+
+    setup_test_database()
+    thresholds = calculate_all_thresholds(TEST_DB)
+    summary = get_analysis_summary(TEST_DB)
+    report = threshold_report(thresholds, summary, calculate_threshold_intervals(TEST_DB, resamples=50))
+
+    text = render(report, 'text')
+    assert "League Winning Thresholds" in text and "Weeks 1-6" in text
+    assert "Confidence Intervals" in text
+    assert text.count("\n") > 20
+
+    document = json.loads(render(report, 'json'))
+    assert document['report'] == 'thresholds'
+    assert document['data']['thresholds']['goals']['median_winning'] == thresholds['goals'].median_winning
+    assert len(document['sections'][0]['rows']) == len(ALL_CATEGORIES)
+    assert document['data']['summary']['weeks_analyzed'] == 6
+
+    page = render(report, 'html')
+    assert page.startswith("<!DOCTYPE html>") and page.rstrip().endswith("</html>")
+    assert page.count("<table>") == 2
+    assert "'Overlap Zone'" not in page and "&#x27;Overlap Zone&#x27;" in page
+
+    try:
+        render(report, 'pdf')
+        assert False, "Unknown format should raise ValueError"
+    except ValueError:
+        pass
+    print(f"  ✓ {', '.join(FORMATS)}")
+
+
+def test_single_buffered_write():
+    """A whole report goes out in one write call."""
+    print("\n=== Test: Buffered Write ===")
+
+    setup_test_database()
+    result = analyze_team(3, TEST_DB, rank_by='impact')
+    for fmt in FORMATS:
+        stream = CountingStream()
+        write_report(team_analysis_report(result), fmt, stream)
+        assert stream.writes == 1, f"{fmt}: {stream.writes} writes"
+
+    printed = io.StringIO()
+    with redirect_stdout(printed):
+        print_team_analysis(result)
+    assert printed.getvalue() == render(team_analysis_report(result), 'text')
+    assert "IMPROVEMENT PRIORITIES (by matchup impact)" in printed.getvalue()
+    print("  ✓ 1 write per report")
+
+
+def test_team_and_fetch_reports():
+    """Team analysis data round-trips through JSON; fetch summary counts weeks."""
+    print("\n=== Test: Team and Fetch Reports ===")
+
+    data = setup_test_database()
+    result = analyze_team(2, TEST_DB)
+    document = json.loads(render(team_analysis_report(result), 'json'))
+    assert document['data']['team_id'] == 2
+    assert document['data']['assessments']['hits']['team_average'] == result.assessments['hits'].team_average
+    assert [row[0] for row in document['sections'][0]['rows']][:2] == ['Goals', 'Assists']
+
+    summary = fetch_summary_report(data)
+    assert summary.data['complete'] == 6 and summary.data['in_progress'] == 1
+    assert "Week 7: 5 matchups (in progress)" in render(summary, 'text')
+    print("  ✓ Team analysis and fetch summary")
+
+
+def test_league_reports():
+    """Every team's report is written; parallel output matches serial output."""
+    print("\n=== Test: League Reports ===")
+
+    setup_test_database()
+    paths = write_league_reports(OUTPUT_DIR, TEST_DB, fmt='html', max_workers=4)
+    teams = get_all_teams(TEST_DB)
+    assert len(paths) == len(teams) + 1
+    assert os.path.basename(paths[0]) == "thresholds.html"
+    assert [os.path.basename(p) for p in paths[1:]] == [f"team_{t['team_id']}.html" for t in teams]
+
+    parallel = {p: open(p, encoding='utf-8').read() for p in paths}
+    write_league_reports(OUTPUT_DIR, TEST_DB, fmt='html', max_workers=1)
+    assert all(open(p, encoding='utf-8').read() == parallel[p] for p in paths)
+
+    with open(paths[1], encoding='utf-8') as f:
+        assert f"Team Analysis: {teams[0]['current_name']}" in f.read()
+
+    # No complete weeks: thresholds report only
+    cleanup()
+    init_db(TEST_DB)
+    save_season_data(generate_season_data(num_teams=4, num_weeks=1, seed=46, incomplete_weeks=1), TEST_DB)
+    paths = write_league_reports(OUTPUT_DIR, TEST_DB, fmt='json')
+    assert len(paths) == 1
+    with open(paths[0]) as f:
+        assert json.load(f)['title'] == "Insufficient Data"
+    print(f"  ✓ {len(teams) + 1} files, identical with 1 or 4 workers")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+    shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all report rendering tests."""
+    print("=" * 70)
+    print("REPORT RENDERING TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_threshold_report_formats()
+        test_single_buffered_write()
+        test_team_and_fetch_reports()
+        test_league_reports()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL REPORT TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
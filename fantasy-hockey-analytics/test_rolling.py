@@ -0,0 +1,160 @@
+"""
+Tests for rolling-window and recency-weighted thresholds.
+No Yahoo API required.
+"""
+
+import sys
+import os
+import statistics
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import init_db, save_season_data, get_all_category_outcomes
+from src.analytics import calculate_all_thresholds
+from src.rolling import (
+    calculate_rolling_thresholds,
+    calculate_threshold_series,
+    describe_threshold_mode,
+    RollingThresholdState,
+    MAX_WEIGHT
+)
+from src.team_analysis import analyze_team
+
+TEST_DB = "test_rolling.db"
+
+
+def setup_test_database():
+    """14 complete weeks + 1 in progress."""
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+    init_db(TEST_DB)
+    save_season_data(generate_season_data(num_teams=10, num_weeks=15, seed=21,
+                                          incomplete_weeks=1), TEST_DB)
+
+
+def _winning_values(category, weeks):
+    return [o['winning_value'] for o in get_all_category_outcomes(category, db_path=TEST_DB)
+            if o['winner_team_id'] is not None and o['week_number'] in weeks]
+
+
+def test_full_season_matches_exact():
+    """No window and no decay reproduces calculate_all_thresholds exactly."""
+    print("\n=== Test: Full Season Equivalence ===")
+
+    setup_test_database()
+    assert calculate_rolling_thresholds(db_path=TEST_DB) == calculate_all_thresholds(TEST_DB)
+    print("  ✓ Rolling thresholds with no window equal exact thresholds")
+
+
+def test_window_matches_recomputation():
+    """Each window in the series equals a from-scratch calculation over those weeks."""
+    print("\n=== Test: Sliding Window Series ===")
+
+    setup_test_database()
+    series = calculate_threshold_series('hits', window=4, db_path=TEST_DB)
+    assert [week for week, _ in series] == list(range(1, 15))
+
+    for week, threshold in series:
+        weeks = set(range(max(1, week - 3), week + 1))
+        values = sorted(_winning_values('hits', weeks))
+        assert threshold.weeks_analyzed == len(weeks)
+        assert threshold.sample_size == len(values)
+        assert threshold.median_winning == statistics.median(values)
+        assert threshold.p75_winning == values[int(len(values) * 0.75)]
+        assert threshold.min_winning == values[0] and threshold.max_winning == values[-1]
+    print("  ✓ Every window matches a full recomputation")
+
+
+def test_decay_favors_recent_weeks():
+    """Heavy decay pulls thresholds toward the latest week."""
+    print("\n=== Test: Recency Decay ===")
+
+    setup_test_database()
+    decayed = calculate_rolling_thresholds(decay=0.05, db_path=TEST_DB)['shots']
+    latest = sorted(_winning_values('shots', {14}))
+
+    # With near-zero weight on older weeks, the median falls inside week 14's values
+    assert latest[0] <= decayed.median_winning <= latest[-1]
+    assert decayed.weeks_analyzed == 14
+
+    assert calculate_rolling_thresholds(decay=1.0, db_path=TEST_DB) == calculate_all_thresholds(TEST_DB)
+
+    # A long decayed window rebases its weights instead of letting them grow
+    pairs_by_week = {week: [(float(week * 10 + i), 0.0) for i in range(5)] for week in range(1, 41)}
+    all_pairs = [pair for pairs in pairs_by_week.values() for pair in pairs]
+    state = RollingThresholdState('shots', all_pairs, decay=0.1)
+    for week in range(1, 41):
+        state.add_week(week, pairs_by_week[week])
+        if week > 3:
+            state.remove_week(week - 3)
+        assert max(weight for _, weight in state.weeks.values()) <= MAX_WEIGHT
+        fresh = RollingThresholdState('shots', all_pairs, decay=0.1)
+        for kept in sorted(state.weeks):
+            fresh.add_week(kept, pairs_by_week[kept])
+        assert state.thresholds() == fresh.thresholds(), f"week {week}"
+    print("  ✓ Decay weights recent weeks more heavily")
+
+
+def test_team_analysis_modes():
+    """analyze_team accepts window/decay and labels the threshold mode."""
+    print("\n=== Test: Team Analysis Threshold Modes ===")
+
+    setup_test_database()
+    result = analyze_team(1, TEST_DB, window=3)
+    assert result.threshold_mode == "last 3 complete weeks"
+    assert result.threshold_mode == describe_threshold_mode(window=3)
+
+    assert analyze_team(1, TEST_DB).threshold_mode == "full season"
+
+    try:
+        calculate_rolling_thresholds(window=0, db_path=TEST_DB)
+        assert False, "window=0 should raise ValueError"
+    except ValueError:
+        pass
+    print("  ✓ Team analysis supports rolling thresholds")
+
+
+def cleanup():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all rolling threshold tests."""
+    print("=" * 70)
+    print("ROLLING THRESHOLD TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_full_season_matches_exact()
+        test_window_matches_recomputation()
+        test_decay_favors_recent_weeks()
+        test_team_analysis_modes()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL ROLLING THRESHOLD TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,158 @@
+"""
+Tests for what-if scenarios on top of analyze_team.
+No Yahoo API required.
+"""
+
+import sys
+import os
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import init_db, save_season_data
+from src.snapshot import snapshot_path
+from src.team_analysis import analyze_team
+from src.scenarios import ScenarioEngine, apply_scenario, parse_scenario
+from src.constants import ALL_CATEGORIES
+
+TEST_DB = "test_scenarios.db"
+
+
+def setup_test_database():
+    """10 teams, 12 complete weeks."""
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+    init_db(TEST_DB)
+    save_season_data(generate_season_data(num_teams=10, num_weeks=12, seed=38), TEST_DB)
+
+
+def test_scenario_reassesses_touched_categories():
+    """Deltas shift averages, records and gaps of touched categories only."""
+    print("\n=== Test: Scenario Re-assessment ===")
+
+    setup_test_database()
+    baseline = analyze_team(5, TEST_DB)
+    assert apply_scenario(baseline, {}).assessments == baseline.assessments
+
+    result = apply_scenario(baseline, {'hits': 20, 'gaa': -0.25})
+    assert result.scenario == {'hits': 20, 'gaa': -0.25}
+    for category in ALL_CATEGORIES:
+        if category not in ('hits', 'gaa'):
+            assert result.assessments[category] is baseline.assessments[category]
+
+    hits, base_hits = result.assessments['hits'], baseline.assessments['hits']
+    assert abs(hits.team_average - (base_hits.team_average + 20)) < 1e-9
+    assert abs(hits.gap - (base_hits.gap + 20)) < 1e-9
+    expected_wins = sum(1 for v, o in zip(base_hits.weekly_values, base_hits.opponent_values) if v + 20 > o)
+    assert hits.wins == expected_wins and hits.wins >= base_hits.wins
+
+    gaa, base_gaa = result.assessments['gaa'], baseline.assessments['gaa']
+    assert abs(gaa.gap - (base_gaa.gap + 0.25)) < 1e-9, "Lower GAA is a better gap"
+    assert gaa.wins >= base_gaa.wins
+
+    # Baseline is untouched
+    assert analyze_team(5, TEST_DB) == baseline
+
+    # SV%/GAA keep their component-ratio trend basis: a tiny delta keeps the label
+    for team_id in range(1, 11):
+        team = analyze_team(team_id, TEST_DB)
+        shifted = apply_scenario(team, {'save_pct': 1e-9, 'gaa': -1e-9})
+        for category in ('save_pct', 'gaa'):
+            base, moved = team.assessments[category], shifted.assessments[category]
+            assert base.from_components and base.trend_averages is not None
+            assert moved.trend == base.trend, f"team {team_id} {category}"
+    print("  ✓ Only the touched categories are recomputed")
+
+
+def test_priorities_and_strengths_rebuilt():
+    """A large enough improvement moves a category from priorities to strengths."""
+    print("\n=== Test: Priorities Rebuilt ===")
+
+    setup_test_database()
+    baseline = analyze_team(5, TEST_DB)
+    category, _ = baseline.improvement_priorities[0]
+    threshold = baseline.thresholds[category]
+    # Just past the 75th percentile winning value (below it for GAA)
+    delta = (threshold.p75_winning - baseline.assessments[category].team_average) * 1.01
+
+    result = apply_scenario(baseline, {category: delta})
+    assert category not in [c for c, _ in result.improvement_priorities]
+    assert (category, 'dominant') in result.strengths
+    print(f"  ✓ {category} moved from priorities to dominant strengths")
+
+
+def test_engine_throughput_and_validation():
+    """Hundreds of scenarios per second; bad input is rejected."""
+    print("\n=== Test: Throughput + Validation ===")
+
+    setup_test_database()
+    engine = ScenarioEngine(analyze_team(5, TEST_DB))
+    scenarios = [{'hits': h, 'ppp': p / 2} for h in range(0, 50) for p in range(20)]
+
+    start = time.perf_counter()
+    results = engine.evaluate_many(scenarios)
+    rate = len(scenarios) / (time.perf_counter() - start)
+    assert len(results) == 1000
+    assert rate > 500, f"only {rate:.0f} scenarios/s"
+
+    assert parse_scenario(['hits=20', 'PPP=+0.5', 'hits=-5']) == {'hits': 15.0, 'ppp': 0.5}
+    for bad in (['hits'], ['fights=3'], ['hits=lots']):
+        try:
+            parse_scenario(bad)
+            assert False, f"{bad} should raise ValueError"
+        except ValueError:
+            pass
+
+    try:
+        ScenarioEngine(analyze_team(5, TEST_DB, rank_by='impact'))
+        assert False, "Impact-ranked baselines are not supported"
+    except ValueError:
+        pass
+    print(f"  ✓ {rate:,.0f} scenarios per second")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all scenario tests."""
+    print("=" * 70)
+    print("WHAT-IF SCENARIO TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_scenario_reassesses_touched_categories()
+        test_priorities_and_strengths_rebuilt()
+        test_engine_throughput_and_validation()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL SCENARIO TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,166 @@
+"""
+Tests for strength-of-schedule adjusted ratings.
+No Yahoo API required.
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import init_db, save_season_data
+from src.snapshot import StatCube, write_snapshot, snapshot_path, PRESENT, COMPLETE, TEAM1
+from src.schedule import fit_sos_ratings, calculate_sos_ratings
+from src.team_analysis import analyze_team
+from src.constants import ALL_CATEGORIES
+
+TEST_DB = "test_schedule.db"
+
+
+def setup_test_database():
+    """10 complete weeks + 1 in progress, no snapshot."""
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=8, num_weeks=11, seed=34, incomplete_weeks=1)
+    save_season_data(data, TEST_DB)
+    return data
+
+
+def build_round_robin_cube(ratings, allowed, num_weeks=14):
+    """Noise-free cube: value = 50 + ratings[team] + allowed[opponent] in every category."""
+    num_teams = len(ratings)
+    opponent = np.full((num_teams, num_weeks), -1, dtype='<i4')
+    flags = np.zeros((num_teams, num_weeks), dtype='u1')
+    values = np.zeros((num_teams, num_weeks, len(ALL_CATEGORIES)))
+
+    teams = list(range(num_teams))
+    for w in range(num_weeks):
+        # Circle method round robin
+        rotation = [teams[0]] + teams[1:][w % (num_teams - 1):] + teams[1:][:w % (num_teams - 1)]
+        for i in range(num_teams // 2):
+            t1, t2 = rotation[i], rotation[-1 - i]
+            opponent[t1, w], opponent[t2, w] = t2, t1
+            flags[t1, w] = PRESENT | COMPLETE | TEAM1
+            flags[t2, w] = PRESENT | COMPLETE
+            values[t1, w, :] = 50 + ratings[t1] + allowed[t2]
+            values[t2, w, :] = 50 + ratings[t2] + allowed[t1]
+
+    return StatCube(np.arange(1, num_teams + 1), np.arange(1, num_weeks + 1), opponent, flags, values)
+
+
+def test_recovers_planted_effects():
+    """Without noise the fit recovers team ratings and opponent effects exactly."""
+    print("\n=== Test: Planted Effects ===")
+
+    ratings = np.array([4.0, -1.0, 2.5, -3.0, 0.5, -3.0])
+    allowed = np.array([-2.0, 1.0, 0.0, 3.0, -1.5, -0.5])
+    fitted = fit_sos_ratings(build_round_robin_cube(ratings, allowed))
+
+    for t in range(len(ratings)):
+        for category in ALL_CATEGORIES:
+            r = fitted[t + 1][category]
+            assert abs(r.adjusted_average - (50 + ratings[t])) < 1e-9
+            assert abs(r.opponent_effect - allowed[t]) < 1e-9
+            assert abs(r.raw_average - (r.adjusted_average + r.schedule_effect)) < 1e-9
+    print("  ✓ Ratings and opponent effects recovered in every category")
+
+
+def test_ratings_on_league_data():
+    """Raw average splits into adjusted + schedule; snapshot and SQLite agree."""
+    print("\n=== Test: League Ratings ===")
+
+    setup_test_database()
+    ratings = calculate_sos_ratings(TEST_DB, use_cache=False)
+    assert len(ratings) == 8
+
+    for team_ratings in ratings.values():
+        assert set(team_ratings) <= set(ALL_CATEGORIES)
+        for r in team_ratings.values():
+            assert r.weeks <= 10, "In-progress week excluded"
+            assert abs(r.raw_average - (r.adjusted_average + r.schedule_effect)) < 1e-6
+            if r.category in ('save_pct', 'gaa'):
+                assert r.raw_average > 0, "Weeks without goalie starts excluded"
+
+    for category in ('pim', 'gaa'):
+        effects = [t[category].opponent_effect for t in ratings.values() if category in t]
+        assert abs(sum(effects)) < 1e-6
+
+    write_snapshot(TEST_DB)
+    from_snapshot = calculate_sos_ratings(TEST_DB, use_cache=False)
+    for team_id, team_ratings in ratings.items():
+        for category, r in team_ratings.items():
+            assert abs(from_snapshot[team_id][category].adjusted_average - r.adjusted_average) < 1e-9
+    print("  ✓ Ratings consistent across storage paths")
+
+
+def test_team_analysis_fields_and_cache():
+    """analyze_team carries adjusted averages; cached ratings expire with new data."""
+    print("\n=== Test: Team Analysis + Cache ===")
+
+    data = setup_test_database()
+    result = analyze_team(3, TEST_DB)
+    sos = calculate_sos_ratings(TEST_DB)
+    for category, assessment in result.assessments.items():
+        if assessment.assessment == 'no_data':
+            assert assessment.adjusted_average is None
+        else:
+            assert assessment.adjusted_average == sos[3][category].adjusted_average
+            assert assessment.schedule_effect == sos[3][category].schedule_effect
+
+    # Week 11 finishes: the cached fit must not be reused
+    for matchup in data.matchups:
+        matchup.is_complete = True
+    save_season_data(data, TEST_DB)
+    updated = calculate_sos_ratings(TEST_DB)
+    assert updated[3]['hits'].weeks == 11
+    print("  ✓ Team analysis shows adjusted values; cache follows data version")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB), snapshot_path(TEST_DB) + ".tmp"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all strength-of-schedule tests."""
+    print("=" * 70)
+    print("STRENGTH OF SCHEDULE TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_recovers_planted_effects()
+        test_ratings_on_league_data()
+        test_team_analysis_fields_and_cache()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL STRENGTH OF SCHEDULE TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
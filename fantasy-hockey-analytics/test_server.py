@@ -0,0 +1,275 @@
+"""
+Tests for the local JSON API (in-memory cache keyed by data version).
+No Yahoo API required.
+"""
+
+import sys
+import os
+import json
+import time
+import threading
+import http.client
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data, generate_player_weeks
+from src.database import init_db, save_season_data, save_player_weeks, get_data_version
+from src.analytics import calculate_all_thresholds, get_analysis_summary
+from src.reports import render, threshold_report
+from src.server import create_server, AnalyticsService, CACHE_SIZE
+from src.snapshot import snapshot_path
+
+TEST_DB = "test_server.db"
+
+
+def setup_test_database():
+    """10 teams, 6 complete weeks + the live one, with rosters."""
+    cleanup()
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=10, num_weeks=7, seed=48, incomplete_weeks=1)
+    save_season_data(data, TEST_DB)
+    save_player_weeks(generate_player_weeks(data, seed=48), TEST_DB)
+    return data
+
+
+class RunningServer:
+    """Server on a free port in a background thread."""
+    def __enter__(self):
+        self.server = create_server(TEST_DB, port=0, simulations=100)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.port = self.server.server_address[1]
+        return self
+
+    def connect(self):
+        return http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def get(conn, path):
+    conn.request("GET", path)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_endpoints():
+    """Every endpoint answers over one keep-alive connection."""
+    print("\n=== Test: Endpoints ===")
+
+    setup_test_database()
+    with RunningServer() as running:
+        conn = running.connect()
+
+        status, body = get(conn, "/status")
+        assert status == 200 and body['complete_weeks'] == 6
+        assert body['data_version'] == get_data_version(TEST_DB)
+
+        status, body = get(conn, "/teams")
+        assert status == 200 and len(body) == 10
+
+        status, body = get(conn, "/thresholds")
+        expected = json.loads(render(threshold_report(calculate_all_thresholds(TEST_DB),
+                                                      get_analysis_summary(TEST_DB)), 'json'))
+        assert status == 200 and body == expected, "Same document as report --format json"
+
+        status, body = get(conn, "/teams/3?rank_by=impact")
+        assert status == 200 and body['data']['team_id'] == 3
+        assert any("(by matchup impact)" in (s['title'] or "") for s in body['sections'])
+
+        status, body = get(conn, "/live?days_left=3")
+        assert status == 200 and len(body['matchups']) == 5 and body['days_left'] == 3
+
+        status, body = get(conn, "/outlook")
+        assert status == 200 and len(body['teams']) == 10
+        assert abs(sum(t['playoff_odds'] for t in body['teams'].values()) - 4) < 1e-9
+
+        roster1 = running.server.service._simulate(lambda s: s.rosters[1])
+        roster2 = running.server.service._simulate(lambda s: s.rosters[2])
+        status, body = get(conn, f"/trade?team=1&partner=2&give={roster1[0]},{roster1[1]}&get={roster2[0]}")
+        assert status == 200 and [side['team_id'] for side in body['sides']] == [1, 2]
+        assert body['sides'][0]['sends'] == roster1[:2]
+        conn.close()
+    print("  ✓ status, teams, thresholds, team, live, outlook, trade")
+
+
+def test_errors():
+    """Unknown paths and teams are 404, bad parameters 400."""
+    print("\n=== Test: Errors ===")
+
+    setup_test_database()
+    with RunningServer() as running:
+        conn = running.connect()
+        for path, code in (("/nope", 404), ("/teams/99", 404), ("/teams/3?rank_by=x", 400),
+                           ("/live?days_left=abc", 400), ("/live?days_left=9", 400),
+                           ("/live?days_left=2.5", 400), ("/live?days_left=-1", 400),
+                           ("/trade?team=1", 400), ("/trade?team=1&partner=2", 400),
+                           ("/trade?team=1&partner=99&give=1", 404)):
+            status, body = get(conn, path)
+            assert status == code and 'error' in body, f"{path}: {status}"
+        status, _ = get(conn, "/teams")
+        assert status == 200, "Connection still usable after errors"
+        conn.close()
+    print("  ✓ 404 / 400 with JSON errors")
+
+
+def test_cache_and_invalidation():
+    """Hits skip computation; a save clears the cache."""
+    print("\n=== Test: Cache ===")
+
+    data = setup_test_database()
+    service = AnalyticsService(TEST_DB, simulations=100)
+    first = service.team(3)
+    misses = service.misses
+
+    start = time.perf_counter()
+    for _ in range(200):
+        assert service.team(3) is first
+    elapsed = time.perf_counter() - start
+    assert service.misses == misses
+
+    # A save bumps data_version: recomputed on the next request
+    for m in data.matchups:
+        if m.team1.team_id == 3 and m.is_complete:
+            m.team1.hits += 50
+    save_season_data(data, TEST_DB)
+    refreshed = service.team(3)
+    assert refreshed != first and service.misses > misses
+    assert json.loads(refreshed)['data']['assessments']['hits']['team_average'] > \
+        json.loads(first)['data']['assessments']['hits']['team_average']
+    service.close()
+    print(f"  ✓ 200 hits in {elapsed * 1000:.1f} ms")
+
+
+def test_single_flight():
+    """Concurrent misses for one key run the computation once."""
+    print("\n=== Test: Single Flight ===")
+
+    setup_test_database()
+    service = AnalyticsService(TEST_DB)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.cached(('slow',), compute)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1 and results == ["value"] * 8
+
+    # A failed computation is not cached
+    def failing():
+        raise ValueError("boom")
+    for _ in range(2):
+        try:
+            service.cached(('failing',), failing)
+            assert False, "Should raise"
+        except ValueError:
+            pass
+    assert ('failing',) not in service._values
+    service.close()
+    print("  ✓ 8 callers, 1 computation")
+
+
+def test_cache_bounded():
+    """Distinct request keys evict the least recently used entry past CACHE_SIZE."""
+    print("\n=== Test: Cache Bounded ===")
+
+    setup_test_database()
+    service = AnalyticsService(TEST_DB)
+    service.cached(('hot',), lambda: "hot")
+    for i in range(CACHE_SIZE + 50):
+        service.cached(('body', 'trade', 1, 2, (i,), ()), lambda: "body")
+        service.cached(('hot',), lambda: "recomputed")
+    assert len(service._values) == CACHE_SIZE
+    assert service.cached(('hot',), lambda: "recomputed") == "hot", "Recently used entry kept"
+    assert ('body', 'trade', 1, 2, (0,), ()) not in service._values
+    service.close()
+    print(f"  ✓ {CACHE_SIZE} entries kept")
+
+
+def test_concurrent_throughput():
+    """Many keep-alive clients against warm results."""
+    print("\n=== Test: Throughput ===")
+
+    setup_test_database()
+    paths = ["/thresholds", "/teams/2", "/status", "/teams"]
+    with RunningServer() as running:
+        errors = []
+
+        def client(n):
+            conn = running.connect()
+            try:
+                for i in range(n):
+                    status, _ = get(conn, paths[i % len(paths)])
+                    if status != 200:
+                        errors.append(status)
+            finally:
+                conn.close()
+
+        client(len(paths))  # Warm the cache
+        start = time.perf_counter()
+        threads = [threading.Thread(target=client, args=(100,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        assert not errors
+    print(f"  ✓ {800 / elapsed:.0f} requests/s from 8 clients")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all JSON API tests."""
+    print("=" * 70)
+    print("JSON API TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_endpoints()
+        test_errors()
+        test_cache_and_invalidation()
+        test_single_flight()
+        test_cache_bounded()
+        test_concurrent_throughput()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL SERVER TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,230 @@
+"""
+Tests for KLL quantile sketches and sketch-based thresholds.
+No Yahoo API required.
+"""
+
+import sys
+import os
+import random
+import sqlite3
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.sketches import KLLSketch, rank_error
+from src.synthetic import generate_season_data
+from src.database import (
+    init_db, save_season_data, get_category_sketch, set_storage_layout, LAYOUT_WIDE
+)
+from src.analytics import (
+    calculate_all_thresholds,
+    calculate_cross_league_thresholds
+)
+from src.constants import ALL_CATEGORIES
+
+TEST_DBS = ["test_sketch_a.db", "test_sketch_b.db", "test_sketch_c.db"]
+
+
+def _rank_of(sorted_values, value):
+    """Fraction of values strictly below value."""
+    import bisect
+    return bisect.bisect_left(sorted_values, value) / len(sorted_values)
+
+
+def test_exact_below_k():
+    """Small sketches reproduce exact nearest-rank percentiles."""
+    print("\n=== Test: Exact Below k ===")
+
+    values = [random.Random(1).randint(0, 300) for _ in range(150)]
+    sketch = KLLSketch(k=200)
+    sketch.extend(values)
+
+    sorted_values = sorted(values)
+    for q in (0.25, 0.5, 0.75, 0.9):
+        assert sketch.quantile(q) == sorted_values[int(len(values) * q)]
+    assert sketch.min_value == min(values) and sketch.max_value == max(values)
+    print("  ✓ Exact results while n <= k")
+
+
+def test_error_bound_after_merge():
+    """Merged sketches stay within the documented rank error."""
+    print("\n=== Test: Merged Error Bound ===")
+
+    rng = random.Random(2)
+    values = [rng.gauss(120, 25) for _ in range(100_000)]
+
+    merged = KLLSketch()
+    for i in range(0, len(values), 500):
+        part = KLLSketch()
+        part.extend(values[i:i + 500])
+        merged.merge(part)
+
+    assert merged.n == len(values)
+    stored = sum(len(level) for level in merged.compactors)
+    assert stored < 4 * merged.k, f"Sketch should stay compact, holds {stored} items"
+
+    sorted_values = sorted(values)
+    for q in (0.5, 0.75, 0.9):
+        error = abs(_rank_of(sorted_values, merged.quantile(q)) - q)
+        assert error <= rank_error(), f"q={q}: rank error {error:.4f} above bound"
+    print(f"  ✓ {len(values)} values in {stored} items, within ±{rank_error():.2%}")
+
+
+def test_serialization_round_trip():
+    """Sketches survive JSON round trips unchanged."""
+    print("\n=== Test: Serialization ===")
+
+    sketch = KLLSketch()
+    sketch.extend(range(5000))
+    restored = KLLSketch.from_json(sketch.to_json())
+
+    assert restored.n == sketch.n
+    assert restored.quantile(0.75) == sketch.quantile(0.75)
+    print("  ✓ JSON round trip")
+
+
+def test_incremental_sketch_thresholds():
+    """save_season_data keeps sketches current; re-fetches don't double count."""
+    print("\n=== Test: Incremental Sketch Thresholds ===")
+
+    db_path = TEST_DBS[0]
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    init_db(db_path)
+
+    data = generate_season_data(num_teams=10, num_weeks=12, seed=9, incomplete_weeks=1)
+    save_season_data(data, db_path)
+
+    exact = calculate_all_thresholds(db_path)
+    sketched = calculate_all_thresholds(db_path, use_sketch=True)
+
+    for category in ALL_CATEGORIES:
+        e, s = exact[category], sketched[category]
+        assert s.sample_size == e.sample_size
+        assert s.weeks_analyzed == e.weeks_analyzed
+        assert s.min_winning == e.min_winning and s.max_winning == e.max_winning
+        assert s.p75_winning == e.p75_winning
+        assert s.max_losing == e.max_losing and s.min_losing == e.min_losing
+
+    save_season_data(data, db_path)  # Re-fetch
+    stored = get_category_sketch('hits', db_path)
+    assert stored['weeks'] == list(range(1, 12)), "Only complete weeks, each once"
+    assert stored['sketch'].n == sketched['hits'].sample_size, "Re-fetch should not double count"
+    print("  ✓ Sketch thresholds match exact thresholds on a single season")
+
+
+def test_corrected_week_rebuilds_sketch():
+    """A stat correction to an already sketched week shows up in the sketch (both layouts)."""
+    print("\n=== Test: Corrected Week ===")
+
+    db_path = TEST_DBS[2]
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    init_db(db_path)
+    data = generate_season_data(num_teams=10, num_weeks=6, seed=27, incomplete_weeks=1)
+    save_season_data(data, db_path)
+
+    for layout_step, bump in ((None, 1000), (LAYOUT_WIDE, 2000)):
+        if layout_step:
+            set_storage_layout(layout_step, db_path)
+        for m in data.matchups:
+            if m.week == 2:
+                winner = m.team1 if m.category_winners.get('hits') == m.team1.team_name else m.team2
+                winner.hits += bump
+
+        save_season_data(data, db_path)
+        exact = calculate_all_thresholds(db_path)['hits']
+        stored = get_category_sketch('hits', db_path)
+        assert stored['sketch'].max_value == exact.max_winning, f"{layout_step}: correction in sketch"
+        assert stored['sketch'].n == exact.sample_size and stored['weeks'] == list(range(1, 6))
+    print("  ✓ Sketch rebuilt after a stat correction")
+
+
+def test_cross_league_merge():
+    """Cross-league thresholds merge per-database sketches."""
+    print("\n=== Test: Cross-League Merge ===")
+
+    db_a, db_b = TEST_DBS[:2]
+    if os.path.exists(db_b):
+        os.remove(db_b)
+    init_db(db_b)
+    save_season_data(generate_season_data(num_teams=12, num_weeks=10, seed=10), db_b)
+
+    merged = calculate_cross_league_thresholds([db_a, db_b])
+    a = calculate_all_thresholds(db_a, use_sketch=True)
+    b = calculate_all_thresholds(db_b, use_sketch=True)
+
+    hits = merged['hits']
+    assert hits.sample_size == a['hits'].sample_size + b['hits'].sample_size
+    assert hits.weeks_analyzed == 11 + 10
+    assert hits.max_winning == max(a['hits'].max_winning, b['hits'].max_winning)
+    assert hits.min_losing == min(a['hits'].min_losing, b['hits'].min_losing)
+
+    # Other leagues' databases are only read: stale sketches are not rewritten
+    conn = sqlite3.connect(db_b)
+    conn.execute("DELETE FROM category_sketches")
+    conn.commit()
+    conn.close()
+    stale = calculate_cross_league_thresholds([db_a, db_b])
+    assert stale['hits'].sample_size == a['hits'].sample_size
+    assert get_category_sketch('hits', db_b) is None
+
+    missing = "test_sketch_missing.db"
+    try:
+        calculate_cross_league_thresholds([db_a, missing])
+        assert False, "A missing database should raise"
+    except FileNotFoundError:
+        pass
+    assert not os.path.exists(missing), "Missing databases are never created"
+
+    # A league's own sketch thresholds still rebuild its stale sketches
+    assert calculate_all_thresholds(db_b, use_sketch=True)['hits'].sample_size == b['hits'].sample_size
+    assert get_category_sketch('hits', db_b) is not None
+    print("  ✓ Merged thresholds across two leagues")
+
+
+def cleanup():
+    for db_path in TEST_DBS:
+        if os.path.exists(db_path):
+            os.remove(db_path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all sketch tests."""
+    print("=" * 70)
+    print("QUANTILE SKETCH TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_exact_below_k()
+        test_error_bound_after_merge()
+        test_serialization_round_trip()
+        test_incremental_sketch_thresholds()
+        test_corrected_week_rebuilds_sketch()
+        test_cross_league_merge()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL SKETCH TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
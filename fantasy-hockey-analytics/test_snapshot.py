@@ -0,0 +1,162 @@
+"""
+Tests for the memory-mapped stat cube snapshot.
+No Yahoo API required.
+"""
+
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import (
+    init_db,
+    save_season_data,
+    get_team_category_values,
+    get_data_version,
+    set_storage_layout,
+    compact_database,
+    LAYOUT_WIDE
+)
+from src.snapshot import StatCube, write_snapshot, load_snapshot, snapshot_path
+from src.analytics import calculate_all_thresholds
+from src.rolling import calculate_rolling_thresholds
+from src.team_analysis import analyze_team
+from src.constants import ALL_CATEGORIES
+
+TEST_DB = "test_snapshot.db"
+
+
+def setup_test_database(layout=None):
+    """12 complete weeks + 1 in progress, no snapshot yet."""
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+    init_db(TEST_DB)
+    if layout:
+        set_storage_layout(layout, TEST_DB)
+    data = generate_season_data(num_teams=10, num_weeks=13, seed=32, incomplete_weeks=1)
+    save_season_data(data, TEST_DB)
+    return data
+
+
+def test_snapshot_matches_sqlite():
+    """Analysis from the snapshot is identical to analysis from SQLite."""
+    print("\n=== Test: Snapshot Equivalence ===")
+
+    for layout in (None, LAYOUT_WIDE):
+        setup_test_database(layout)
+        assert load_snapshot(TEST_DB) is None
+
+        thresholds = calculate_all_thresholds(TEST_DB)
+        rolling = calculate_rolling_thresholds(window=4, decay=0.9, db_path=TEST_DB)
+        analysis = analyze_team(2, TEST_DB)
+        values = {c: get_team_category_values(2, c, db_path=TEST_DB) for c in ALL_CATEGORIES}
+
+        write_snapshot(TEST_DB)
+        cube = load_snapshot(TEST_DB)
+        assert cube is not None
+        assert cube.values.shape == (10, 13, len(ALL_CATEGORIES))
+
+        assert calculate_all_thresholds(TEST_DB) == thresholds
+        assert calculate_rolling_thresholds(window=4, decay=0.9, db_path=TEST_DB) == rolling
+        assert analyze_team(2, TEST_DB) == analysis
+        for category in ALL_CATEGORIES:
+            assert cube.team_category_values(2, category) == values[category]
+        del cube  # Release the mapping before the file is replaced
+    print("  ✓ Thresholds and team analysis match for both storage layouts")
+
+
+def test_stale_snapshot_falls_back():
+    """Saving new data makes the snapshot stale; readers fall back to SQLite."""
+    print("\n=== Test: Stale Snapshot ===")
+
+    data = setup_test_database()
+    write_snapshot(TEST_DB)
+    version = get_data_version(TEST_DB)
+    assert load_snapshot(TEST_DB).data_version == version
+
+    # Week 13 finishes: data changes, snapshot is not rewritten
+    for matchup in data.matchups:
+        matchup.is_complete = True
+    save_season_data(data, TEST_DB)
+
+    assert get_data_version(TEST_DB) == version + 1
+    assert load_snapshot(TEST_DB) is None
+    assert calculate_all_thresholds(TEST_DB)['hits'].weeks_analyzed == 13
+
+    write_snapshot(TEST_DB)
+    assert calculate_all_thresholds(TEST_DB)['hits'].weeks_analyzed == 13
+
+    # Compaction and layout changes rewrite rows too
+    for step in (lambda: compact_database(TEST_DB), lambda: set_storage_layout(LAYOUT_WIDE, TEST_DB)):
+        write_snapshot(TEST_DB)
+        step()
+        assert load_snapshot(TEST_DB) is None
+    print("  ✓ Stale snapshot ignored until rewritten")
+
+
+def test_corrupt_snapshot_ignored():
+    """Truncated or foreign files are rejected rather than misread."""
+    print("\n=== Test: Corrupt Snapshot ===")
+
+    setup_test_database()
+    path = write_snapshot(TEST_DB)
+
+    with open(path, "rb") as f:
+        content = f.read()
+    with open(path, "wb") as f:
+        f.write(content[:len(content) // 2])
+    assert StatCube.open(path) is None
+    assert load_snapshot(TEST_DB) is None
+
+    with open(path, "wb") as f:
+        f.write(b"not a snapshot")
+    assert load_snapshot(TEST_DB) is None
+    assert calculate_all_thresholds(TEST_DB)['hits'].sample_size > 0
+    print("  ✓ Corrupt snapshots fall back to SQLite")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB), snapshot_path(TEST_DB) + ".tmp"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all snapshot tests."""
+    print("=" * 70)
+    print("STAT CUBE SNAPSHOT TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_snapshot_matches_sqlite()
+        test_stale_snapshot_falls_back()
+        test_corrupt_snapshot_ignored()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL SNAPSHOT TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
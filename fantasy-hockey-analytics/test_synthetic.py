@@ -0,0 +1,170 @@
+"""
+Tests for the synthetic league generator and benchmark helpers.
+No Yahoo API required.
+"""
+
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data, generate_leagues, round_robin_schedule
+from src.database import init_db, save_season_data, get_all_teams, get_weeks_stored
+from src.analytics import calculate_all_thresholds
+from src.team_analysis import analyze_team
+from src.constants import LOWER_IS_BETTER
+from benchmark import compare_to_baseline
+
+TEST_DB = "test_synthetic.db"
+
+
+def test_seed_is_deterministic():
+    """Same seed gives identical data, different seed does not."""
+    print("\n=== Test: Deterministic Seeding ===")
+
+    a = generate_season_data(num_teams=8, num_weeks=6, seed=7)
+    b = generate_season_data(num_teams=8, num_weeks=6, seed=7)
+    c = generate_season_data(num_teams=8, num_weeks=6, seed=8)
+
+    assert [m.team1 for m in a.matchups] == [m.team1 for m in b.matchups]
+    assert [m.team1 for m in a.matchups] != [m.team1 for m in c.matchups]
+    print("  ✓ Seeded generation is reproducible")
+
+
+def test_schedule_shape():
+    """Every team plays exactly once per week."""
+    print("\n=== Test: Round Robin Schedule ===")
+
+    schedule = round_robin_schedule(12, 15)
+    assert len(schedule) == 15
+    for pairs in schedule:
+        teams = [t for pair in pairs for t in pair]
+        assert sorted(teams) == list(range(1, 13)), "Each team should play once per week"
+
+    try:
+        round_robin_schedule(9, 5)
+        assert False, "Odd team counts should raise ValueError"
+    except ValueError:
+        pass
+    print("  ✓ Schedule is a valid round robin")
+
+
+def test_realistic_values():
+    """Stat lines are internally consistent and winners match values."""
+    print("\n=== Test: Realistic Stat Lines ===")
+
+    data = generate_season_data(num_teams=10, num_weeks=20, seed=1, incomplete_weeks=2)
+    assert len(data.matchups) == 10 // 2 * 20
+
+    for m in data.matchups:
+        for team in (m.team1, m.team2):
+            assert team.points == team.goals + team.assists
+            assert 0 <= team.ppp <= team.points
+            assert team.save_pct == 0.0 or 0.8 <= team.save_pct <= 1.0
+
+        for category, winner in m.category_winners.items():
+            v1 = getattr(m.team1, category)
+            v2 = getattr(m.team2, category)
+            if v1 == v2:
+                assert winner == "Tie"
+            elif (v1 < v2) == (category in LOWER_IS_BETTER):
+                assert winner == m.team1.team_name
+            else:
+                assert winner == m.team2.team_name
+
+    incomplete = {m.week for m in data.matchups if not m.is_complete}
+    assert incomplete == {19, 20}, f"Expected weeks 19-20 in progress, got {incomplete}"
+    print("  ✓ Values and winners are consistent")
+
+
+def test_leagues_and_seasons():
+    """generate_leagues returns one SeasonData per league-season."""
+    print("\n=== Test: Leagues x Seasons ===")
+
+    seasons = generate_leagues(num_leagues=3, num_seasons=2, num_teams=6, num_weeks=4, seed=3)
+    assert len(seasons) == 6
+    assert len({s.league_id for s in seasons}) == 3
+    assert [s.season for s in seasons[:2]] == ["2025-2026", "2026-2027"]
+    print("  ✓ Generated 3 leagues x 2 seasons")
+
+
+def test_pipeline_on_synthetic_data():
+    """Generated data flows through save, thresholds and team analysis."""
+    print("\n=== Test: Pipeline on Synthetic Data ===")
+
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+    try:
+        init_db(TEST_DB)
+        save_season_data(generate_season_data(num_teams=10, num_weeks=8, seed=5,
+                                              incomplete_weeks=1), TEST_DB)
+
+        assert len(get_all_teams(TEST_DB)) == 10
+        assert sum(1 for w in get_weeks_stored(TEST_DB) if w['is_complete']) == 7
+
+        thresholds = calculate_all_thresholds(TEST_DB)
+        assert all(t.sample_size > 0 for t in thresholds.values())
+
+        result = analyze_team(1, TEST_DB)
+        assert result.weeks_analyzed == 7
+    finally:
+        if os.path.exists(TEST_DB):
+            os.remove(TEST_DB)
+
+    print("  ✓ Synthetic data analyzed end to end")
+
+
+def test_baseline_regression_detection():
+    """Stages slower than baseline beyond tolerance are reported."""
+    print("\n=== Test: Baseline Regression Detection ===")
+
+    baseline = {'results': [
+        {'scale': 'small', 'stage': 'analyze_team', 'seconds': 1.0},
+        {'scale': 'small', 'stage': 'cli_status', 'seconds': 0.001},
+    ]}
+    results = [
+        {'scale': 'small', 'stage': 'analyze_team', 'seconds': 1.5},
+        {'scale': 'small', 'stage': 'cli_status', 'seconds': 0.002},  # 2x but tiny
+        {'scale': 'medium', 'stage': 'analyze_team', 'seconds': 9.0},  # no baseline
+    ]
+
+    regressions = compare_to_baseline(results, baseline, tolerance=0.25, min_delta=0.005)
+    assert [(r['scale'], r['stage']) for r in regressions] == [('small', 'analyze_team')]
+
+    assert compare_to_baseline(results, baseline, tolerance=0.6, min_delta=0.005) == []
+    print("  ✓ Regressions detected against baseline")
+
+
+def run_all_tests():
+    """Run all synthetic generator tests."""
+    print("=" * 70)
+    print("SYNTHETIC DATA & BENCHMARK TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_seed_is_deterministic()
+        test_schedule_shape()
+        test_realistic_values()
+        test_leagues_and_seasons()
+        test_pipeline_on_synthetic_data()
+        test_baseline_regression_detection()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL SYNTHETIC DATA TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
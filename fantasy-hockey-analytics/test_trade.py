@@ -0,0 +1,207 @@
+"""
+Tests for trade evaluation (season simulation with cached per-team samples).
+No Yahoo API required.
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data, generate_player_weeks
+from src.database import init_db, save_season_data, save_player_weeks, get_team_records
+from src.trade import TradeSimulator, roster_fingerprint, _random_pairings
+from src.snapshot import snapshot_path
+from src.constants import ALL_CATEGORIES
+
+TEST_DB = "test_trade.db"
+
+
+def setup_test_database(num_weeks=8):
+    """12 teams, complete weeks + the live one, with rosters."""
+    cleanup()
+    init_db(TEST_DB)
+    data = generate_season_data(num_teams=12, num_weeks=num_weeks, seed=45, incomplete_weeks=1)
+    save_season_data(data, TEST_DB)
+    save_player_weeks(generate_player_weeks(data, seed=45), TEST_DB)
+    return data
+
+
+def test_fingerprint_and_pairings():
+    """Fingerprints ignore order; every simulated week is a valid pairing."""
+    print("\n=== Test: Fingerprints and Pairings ===")
+
+    assert roster_fingerprint([3, 1, 2]) == roster_fingerprint([1, 2, 3])
+    assert roster_fingerprint([1, 2, 3]) != roster_fingerprint([1, 2, 4])
+
+    for num_teams in (12, 7):
+        opponents = _random_pairings(num_teams, 50, 4, np.random.default_rng(0))
+        teams = np.arange(num_teams)
+        assert (np.take_along_axis(opponents, opponents, axis=2) == teams).all(), "Pairings are symmetric"
+        byes = (opponents == teams).sum(axis=2)
+        assert (byes == num_teams % 2).all()
+    print("  ✓ Symmetric weekly pairings, one bye for odd leagues")
+
+
+def test_records():
+    """Current records come from complete matchups."""
+    print("\n=== Test: Records ===")
+
+    data = setup_test_database()
+    records = get_team_records(TEST_DB)
+    complete = [m for m in data.matchups if m.is_complete]
+    assert sum(r['wins'] + r['losses'] + r['ties'] for r in records.values()) == 2 * len(complete)
+    assert sum(r['wins'] for r in records.values()) == sum(r['losses'] for r in records.values())
+    print(f"  ✓ {len(complete)} complete matchups")
+
+
+def test_trade_matches_full_simulation():
+    """Re-scoring only the traded teams' matchups equals simulating the whole league."""
+    print("\n=== Test: Incremental vs Full ===")
+
+    setup_test_database()
+    simulator = TradeSimulator(TEST_DB, simulations=300)
+    give, get = simulator.rosters[1][:2], simulator.rosters[2][3:4]
+    result = simulator.evaluate_trade(1, give, 2, get)
+
+    rosters = {1: [p for p in simulator.rosters[1] if p not in give] + get,
+               2: [p for p in simulator.rosters[2] if p not in get] + give}
+    full = simulator.outlooks(rosters)
+    baseline = simulator.outlooks()
+    for side in result.sides:
+        for name in ('expected_wins', 'expected_points', 'playoff_odds'):
+            assert abs(getattr(side.after, name) - getattr(full[side.team_id], name)) < 1e-6, name
+            assert abs(getattr(side.before, name) - getattr(baseline[side.team_id], name)) < 1e-6, name
+        assert abs(sum(side.after.category_win.values()) - side.after.expected_wins) < 1e-6
+        assert side.sends == (give if side.team_id == 1 else get)
+
+    # Playoff spots are conserved across the league
+    assert abs(sum(o.playoff_odds for o in full.values()) - simulator.playoff_teams) < 1e-9
+    assert abs(sum(o.playoff_odds for o in baseline.values()) - simulator.playoff_teams) < 1e-9
+    print(f"  ✓ Team 1 {result.sides[0].before.expected_wins:.2f} -> {result.sides[0].after.expected_wins:.2f}")
+
+
+def test_cache_reuse_and_invalidation():
+    """Only changed rosters are sampled; new data invalidates the cache."""
+    print("\n=== Test: Cache ===")
+
+    data = setup_test_database()
+    simulator = TradeSimulator(TEST_DB, simulations=300)
+    roster1, roster2 = simulator.rosters[1], simulator.rosters[2]
+
+    first = simulator.evaluate_trade(1, roster1[:1], 2, roster2[:1])
+    assert first.sampled == 12 + 2, "Baseline league plus the two new rosters"
+
+    start = time.perf_counter()
+    batch = [simulator.evaluate_trade(1, [roster1[i]], 2, [roster2[i]]) for i in range(1, 6)]
+    elapsed = time.perf_counter() - start
+    assert [r.sampled for r in batch] == [2] * 5, "Never the whole league"
+
+    again = simulator.evaluate_trade(1, roster1[:1], 2, roster2[:1])
+    assert again.sampled == 0, "Seen fingerprints come from the cache"
+    assert again.sides[0].after == first.sides[0].after
+
+    # A trade with a third team reuses team 1's sample for the same roster
+    other = simulator.evaluate_trade(1, roster1[:1], 3, [])
+    assert other.sampled == 2
+    repeat = simulator.evaluate_trade(1, roster1[:1], 3, [])
+    assert repeat.sampled == 0
+
+    # New data bumps the data version: everything is simulated again
+    save_season_data(data, TEST_DB)
+    refreshed = simulator.evaluate_trade(1, roster1[:1], 2, roster2[:1])
+    assert refreshed.sampled == 12 + 2
+    print(f"  ✓ 5 candidates in {elapsed * 1000:.0f} ms, 2 teams sampled each")
+
+
+def test_trade_direction():
+    """Receiving a stronger player for nothing raises that side's expectations."""
+    print("\n=== Test: Direction ===")
+
+    setup_test_database()
+    simulator = TradeSimulator(TEST_DB, simulations=500)
+    shots = ALL_CATEGORIES.index('shots')
+    skaters = [p for p in simulator.rosters[2] if p in simulator.projections
+               and simulator.projections[p][0][ALL_CATEGORIES.index('goalie_wins')] == 0]
+    best = max(skaters, key=lambda p: simulator.projections[p][0][shots])
+    result = simulator.evaluate_trade(1, [], 2, [best])
+    receiver, sender = result.sides
+    assert receiver.after.category_win['shots'] > receiver.before.category_win['shots']
+    assert sender.after.category_win['shots'] < sender.before.category_win['shots']
+    assert receiver.after.expected_wins > receiver.before.expected_wins
+    assert receiver.after.playoff_odds >= receiver.before.playoff_odds
+    print(f"  ✓ Shots win odds {receiver.before.category_win['shots']:.0%} -> "
+          f"{receiver.after.category_win['shots']:.0%}")
+
+
+def test_edge_cases():
+    """Unknown teams or players, empty trades and a finished regular season."""
+    print("\n=== Test: Edge Cases ===")
+
+    setup_test_database()
+    simulator = TradeSimulator(TEST_DB, simulations=100)
+    roster1 = simulator.rosters[1]
+    for args in ((1, roster1[:1], 99, []), (1, [999999], 2, []), (1, [], 2, []), (1, roster1[:1], 1, [])):
+        try:
+            simulator.evaluate_trade(*args)
+            assert False, f"{args} should raise ValueError"
+        except ValueError:
+            pass
+
+    # Season already over: odds follow the current standings
+    finished = TradeSimulator(TEST_DB, simulations=100, season_weeks=5)
+    assert finished.remaining_weeks == 0
+    outlooks = finished.outlooks()
+    assert all(o.playoff_odds in (0.0, 1.0) for o in outlooks.values())
+    print("  ✓ Handled")
+
+
+def cleanup():
+    for path in (TEST_DB, snapshot_path(TEST_DB)):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all trade evaluation tests."""
+    print("=" * 70)
+    print("TRADE EVALUATION TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_fingerprint_and_pairings()
+        test_records()
+        test_trade_matches_full_simulation()
+        test_cache_reuse_and_invalidation()
+        test_trade_direction()
+        test_edge_cases()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL TRADE TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())
@@ -0,0 +1,242 @@
+"""
+Tests for live watch mode (diffed polling, per-matchup saves, in-place redraw).
+Uses fake yfpy objects - no Yahoo API required.
+"""
+
+import sys
+import os
+import io
+import copy
+import sqlite3
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.synthetic import generate_season_data
+from src.database import (
+    init_db,
+    get_team_category_values,
+    get_data_version,
+    get_category_sketch,
+    set_storage_layout,
+    LAYOUT_WIDE
+)
+from src.data_fetcher import DataFetcher
+from src.watch import MatchupWatcher, watch
+from src.display import LiveTable, format_live_week
+from src.constants import ID_TO_FIELD, COMPONENT_STAT_IDS
+
+TEST_DB = "test_watch.db"
+WEEK = 3
+
+
+class FakeStat:
+    def __init__(self, stat_id, value):
+        self.stat_id = stat_id
+        self.value = value
+
+
+class FakeManager:
+    def __init__(self, nickname):
+        self.nickname = nickname
+
+
+class FakeTeam:
+    """Just the yfpy Team attributes the fetcher reads."""
+    def __init__(self, stats):
+        self.name = stats.team_name.encode('utf-8')
+        self.team_id = stats.team_id
+        self.team_key = f"nhl.l.99999.t.{stats.team_id}"
+        self.managers = [FakeManager(stats.manager_name)]
+        fields = {**ID_TO_FIELD, **COMPONENT_STAT_IDS}
+        self._extracted_data = {'team_stats': {'stats': [
+            {'stat': FakeStat(stat_id, str(getattr(stats, name)))} for stat_id, name in fields.items()
+        ]}}
+
+
+class FakeMatchup:
+    def __init__(self, matchup, complete):
+        self.teams = [FakeTeam(matchup.team1), FakeTeam(matchup.team2)]
+        self.status = 'postevent' if complete else 'midevent'
+
+
+class FakeQuery:
+    """Serves whatever the test put in self.matchups; counts requests."""
+    def __init__(self):
+        self.matchups = []
+        self.requests = 0
+
+    def get_league_matchups_by_week(self, chosen_week):
+        self.requests += 1
+        return [FakeMatchup(m, complete) for m, complete in self.matchups]
+
+
+class CountingFetcher(DataFetcher):
+    def __init__(self, query):
+        super().__init__(query, "99999")
+        self.parsed = 0
+
+    def _process_matchup(self, yfpy_matchup, week):
+        self.parsed += 1
+        return super()._process_matchup(yfpy_matchup, week)
+
+
+def setup_watcher(layout=None):
+    """8 teams; the watched week's stats come from a synthetic league."""
+    cleanup()
+    init_db(TEST_DB)
+    if layout:
+        set_storage_layout(layout, TEST_DB)
+    data = generate_season_data(num_teams=8, num_weeks=WEEK, seed=40)
+    query = FakeQuery()
+    query.matchups = [(copy.deepcopy(m), False) for m in data.matchups if m.week == WEEK]
+    fetcher = CountingFetcher(query)
+    return query, fetcher, MatchupWatcher(fetcher, WEEK, TEST_DB)
+
+
+def _matchup_ids():
+    conn = sqlite3.connect(TEST_DB)
+    rows = conn.execute("SELECT team1_id, id FROM matchup_results WHERE week_number = ?", (WEEK,)).fetchall()
+    conn.close()
+    return dict(rows)
+
+
+def test_only_changed_matchups_reparsed_and_saved():
+    """Unchanged matchups are neither parsed nor rewritten, in either layout."""
+    print("\n=== Test: Diffed Polling ===")
+
+    for layout in (None, LAYOUT_WIDE):
+        query, fetcher, watcher = setup_watcher(layout)
+        first = watcher.poll()
+        assert len(first.changed) == 4 and fetcher.parsed == 4 and not first.week_complete
+        ids_before = _matchup_ids()
+
+        # Nothing changed: no parsing, no writes
+        version = get_data_version(TEST_DB)
+        assert watcher.poll().changed == []
+        assert fetcher.parsed == 4 and get_data_version(TEST_DB) == version
+
+        # One team adds hits
+        team = query.matchups[1][0].team1
+        team.hits += 7
+        result = watcher.poll()
+        assert [m.team1.team_id for m in result.changed] == [team.team_id]
+        assert fetcher.parsed == 5
+
+        ids_after = _matchup_ids()
+        assert all(ids_after[t] == ids_before[t] for t in ids_before if t != team.team_id), \
+            "Other matchups' rows are untouched"
+        stored = get_team_category_values(team.team_id, 'hits', complete_only=False, db_path=TEST_DB)
+        assert stored == [{'week': WEEK, 'team_value': team.hits,
+                           'opponent_value': query.matchups[1][0].team2.hits,
+                           'won': stored[0]['won']}]
+        assert get_team_category_values(team.team_id, 'hits', db_path=TEST_DB) == [], \
+            "In-progress week stays out of the analytics"
+        assert query.requests == 3
+        watcher.close()
+    print("  ✓ Only the changed matchup was parsed and rewritten")
+
+
+def test_week_completion_saves_whole_week():
+    """Once every matchup is final the week is saved like a fetched week."""
+    print("\n=== Test: Week Completion ===")
+
+    query, fetcher, watcher = setup_watcher()
+    watcher.poll()
+    query.matchups = [(m, True) for m, _ in query.matchups[:3]] + [(query.matchups[3][0], False)]
+    assert not watcher.poll().week_complete
+    assert get_category_sketch('hits', TEST_DB) is None
+
+    query.matchups[3] = (query.matchups[3][0], True)
+    sleeps = []
+    result = watch(watcher, interval=5, sleep=sleeps.append)
+    assert result.week_complete and sleeps == []
+    assert len(get_team_category_values(1, 'hits', db_path=TEST_DB)) == 1
+    assert get_category_sketch('hits', TEST_DB)['weeks'] == [WEEK]
+    watcher.close()
+    print("  ✓ Final week is complete, analyzable and sketched")
+
+
+def test_watch_loop_sleeps_between_polls():
+    """watch() sleeps the interval between polls and honours max_polls."""
+    print("\n=== Test: Watch Loop ===")
+
+    query, fetcher, watcher = setup_watcher()
+    sleeps, polled = [], []
+    result = watch(watcher, interval=30, on_poll=polled.append, max_polls=3, sleep=sleeps.append)
+    assert sleeps == [30, 30] and len(polled) == 3
+    assert query.requests == 3 and fetcher.parsed == 4
+    assert not result.week_complete
+    watcher.close()
+    print("  ✓ One request per poll, parsing only on change")
+
+
+def test_live_table_redraws_changed_lines():
+    """Only differing lines are rewritten; a new line count redraws everything."""
+    print("\n=== Test: Live Table ===")
+
+    out = io.StringIO()
+    table = LiveTable(out)
+    assert table.render(["a", "b", "c"]) == 3
+    out.seek(0)
+    out.truncate()
+
+    assert table.render(["a", "B", "c"]) == 1
+    written = out.getvalue()
+    assert "B" in written and "a" not in written and "c" not in written
+    assert written == "\x1b[2F\x1b[2KB\x1b[2E"
+
+    out.truncate(0)
+    assert table.render(["a", "B", "c"]) == 0
+    assert table.render(["x"]) == 1
+
+    query, fetcher, watcher = setup_watcher()
+    lines = format_live_week(WEEK, watcher.poll().matchups, "12:00:00")
+    assert lines[0].startswith(f"Week {WEEK} live - 0/4 matchups final")
+    assert sum(1 for line in lines if line.startswith("Matchup:")) == 4
+    watcher.close()
+    print("  ✓ In-place redraw of changed lines only")
+
+
+def cleanup():
+    if os.path.exists(TEST_DB):
+        os.remove(TEST_DB)
+
+
+def teardown_module(module):
+    """pytest hook - the script runner calls cleanup() itself."""
+    cleanup()
+
+
+def run_all_tests():
+    """Run all watch mode tests."""
+    print("=" * 70)
+    print("LIVE WATCH MODE TEST SUITE")
+    print("=" * 70)
+
+    try:
+        test_only_changed_matchups_reparsed_and_saved()
+        test_week_completion_saves_whole_week()
+        test_watch_loop_sleeps_between_polls()
+        test_live_table_redraws_changed_lines()
+
+        print("\n" + "=" * 70)
+        print("✅ ALL WATCH TESTS PASSED")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print("\n" + "=" * 70)
+        print("❌ TEST FAILED")
+        print("=" * 70)
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(run_all_tests())